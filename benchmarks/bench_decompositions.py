@@ -0,0 +1,81 @@
+"""Compare cholesky(), qr() and eigh() with the inverse() based alternatives.
+
+Each row times one job both ways: a symmetric positive definite solve
+(``inverse() @ b`` against ``solve()``, which factors with Cholesky), a least
+squares fit (normal equations through ``inverse()`` against ``qr()``), and
+the factorizations themselves against one ``inverse()`` of the same matrix
+as a reference for their O(n^3) cost. Run from the repository root::
+
+    python -m benchmarks.bench_decompositions
+    python -m benchmarks.bench_decompositions --sizes 100 400 --engine legacy
+"""
+
+import argparse
+import timeit
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.cases import load_engine, matrix, positive_definite, symmetric, vector
+
+# Each job: (name, statement through inverse(), statement through the decomposition)
+JOBS: List[Tuple[str, str, str]] = [
+    ("spd solve", "a.inverse() @ b", "a.solve(b)"),
+    (
+        "least squares",
+        "(x.T @ x).inverse() @ (y @ x)",
+        "q, r = x.qr(); r.solve_triangular(y @ q)",
+    ),
+    ("cholesky", "a.inverse()", "a.cholesky()"),
+    ("qr", "s.inverse()", "s.qr()"),
+    ("eigh", "s.inverse()", "s.eigh()"),
+]
+
+
+def inputs(e: Any, n: int) -> Dict[str, Any]:
+    """Returns an n x n positive definite `a`, a symmetric `s` and a 2n x n
+    least squares problem (`x`, `y`), plus a right-hand side `b`."""
+    x = e.Matrix.from_rows(matrix(e, n, 1).to_list() + matrix(e, n, 2).to_list())
+    return {
+        "a": positive_definite(e, n),
+        "s": symmetric(e, n) + e.Matrix([[0]]).identity(n) * float(n),
+        "x": x,
+        "y": vector(e, 2 * n, 3),
+        "b": vector(e, n),
+    }
+
+
+def best_time(stmt: str, data: Dict[str, Any], repeat: int) -> float:
+    """Returns the best time per execution of ``stmt`` in seconds."""
+    timer = timeit.Timer(stmt, globals=data)
+    number, _ = timer.autorange()
+    return min(timer.repeat(number=number, repeat=repeat)) / number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 200, 500])
+    parser.add_argument("--engine", choices=["c", "legacy"], default="c")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    e = load_engine(args.engine)
+    # Every job repeats on the same matrices, so cached factorizations would
+    # turn all but the first call into lookups
+    e.set_caching(False)
+    print(
+        f"{'job':<14} {'n':>5} {'inverse (ms)':>13} "
+        f"{'decomposition (ms)':>19} {'speedup':>8}"
+    )
+    for n in args.sizes:
+        data = inputs(e, n)
+        for name, baseline, stmt in JOBS:
+            before = best_time(baseline, data, args.repeat)
+            after = best_time(stmt, data, args.repeat)
+            print(
+                f"{name:<14} {n:>5} {before * 1e3:>13.3f} {after * 1e3:>19.3f} "
+                f"{before / after:>7.1f}x",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
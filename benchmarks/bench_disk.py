@@ -0,0 +1,64 @@
+"""Compare in-memory products with tiled DiskMatrix products.
+
+Both operands are saved to a temporary directory and multiplied once as
+Matrix objects and once as DiskMatrix objects; the peak resident set size of
+each path is reported alongside the time. Uses whichever engine ``import
+matmath`` picks. Run from the repository root::
+
+    python -m benchmarks.bench_disk
+    python -m benchmarks.bench_disk --size 4000 --tile 512 --max-tiles 4
+"""
+
+import argparse
+import os
+import resource
+import tempfile
+import time
+
+from benchmarks.cases import values
+from matmath import DiskMatrix, Matrix
+
+
+def peak_rss() -> float:
+    """Returns the peak resident set size of the process in MB."""
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--size", type=int, default=2000, help="the order of the square operands"
+    )
+    parser.add_argument("--tile", type=int, default=256)
+    parser.add_argument("--max-tiles", type=int, default=8)
+    args = parser.parse_args()
+
+    n = args.size
+    with tempfile.TemporaryDirectory() as directory:
+        a_path = os.path.join(directory, "a.mm")
+        b_path = os.path.join(directory, "b.mm")
+        Matrix.frombuffer(values(n * n, 0), (n, n)).save(a_path)
+        Matrix.frombuffer(values(n * n, 1), (n, n)).save(b_path)
+
+        # Disk first: the peak RSS only ever grows
+        before = peak_rss()
+        options = {"tile": args.tile, "max_tiles": args.max_tiles}
+        with DiskMatrix(a_path, **options) as a, DiskMatrix(b_path, **options) as b:
+            start = time.perf_counter()
+            (a @ b).close()
+            disk_time = time.perf_counter() - start
+        disk_rss = peak_rss() - before
+
+        a, b = Matrix.load(a_path), Matrix.load(b_path)
+        start = time.perf_counter()
+        a @ b
+        memory_time = time.perf_counter() - start
+        memory_rss = peak_rss() - before
+
+    print(f"{'path':<12} {'time (s)':>9} {'peak RSS growth (MB)':>21}")
+    print(f"{'Matrix':<12} {memory_time:>9.3f} {memory_rss:>21.1f}")
+    print(f"{'DiskMatrix':<12} {disk_time:>9.3f} {disk_rss:>21.1f}")
+
+
+if __name__ == "__main__":
+    main()
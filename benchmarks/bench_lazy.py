@@ -0,0 +1,80 @@
+"""Compare eager element-wise expressions with the fused matmath.lazy() path.
+
+Each eager operator allocates a temporary and makes its own pass over memory;
+``lazy(...).eval()`` evaluates the whole expression in one pass with one
+allocation. The lazy timings include building and compiling the expression.
+Uses whichever engine ``import matmath`` picks. Run from the repository root::
+
+    python -m benchmarks.bench_lazy
+    python -m benchmarks.bench_lazy --sizes 500 2000 --threads 4
+"""
+
+import argparse
+import timeit
+from array import array
+from typing import Dict, List
+
+import matmath
+from benchmarks.cases import values
+from matmath import Matrix, lazy
+
+# Each expression, over placeholders for the matrices a, b, c and d
+EXPRESSIONS: List[str] = [
+    "({a} + {b}) * 0.5 - {c} / {d}",
+    "{a} * {b} + {c}",
+    "({a} - {b}) * ({a} - {b}) / {d}",
+    "{a} * 2.0 + {b} * 3.0 - {c} * 4.0 + {d}",
+]
+
+
+def inputs(n: int) -> Dict[str, object]:
+    """Returns four n x n matrices a, b, c and d (bounded away from zero), and
+    their lazy wrappers la, lb, lc and ld."""
+    data: Dict[str, object] = {
+        name: Matrix.frombuffer(values(n * n, seed), (n, n))
+        for seed, name in enumerate("abc")
+    }
+    data["d"] = Matrix.frombuffer(
+        array("d", (x + 2.0 for x in values(n * n, 3))), (n, n)
+    )
+    data.update(zip(("la", "lb", "lc", "ld"), lazy(*(data[name] for name in "abcd"))))
+    return data
+
+
+def best_time(stmt: str, data: Dict[str, object], repeat: int) -> float:
+    """Returns the best time per execution of ``stmt`` in seconds."""
+    timer = timeit.Timer(stmt, globals=data)
+    number, _ = timer.autorange()
+    return min(timer.repeat(number=number, repeat=repeat)) / number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--threads", type=int, default=1)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    matmath.set_num_threads(args.threads)
+    print(
+        f"{'expression':<34} {'n':>5} {'eager (ms)':>11} {'lazy (ms)':>10} "
+        f"{'speedup':>8}"
+    )
+    for n in args.sizes:
+        data = inputs(n)
+        for template in EXPRESSIONS:
+            expression = template.format(a="a", b="b", c="c", d="d")
+            fused_stmt = (
+                "(" + template.format(a="la", b="lb", c="lc", d="ld") + ").eval()"
+            )
+            eager = best_time(expression, data, args.repeat)
+            fused = best_time(fused_stmt, data, args.repeat)
+            print(
+                f"{expression:<34} {n:>5} {eager * 1e3:>11.3f} {fused * 1e3:>10.3f} "
+                f"{eager / fused:>7.1f}x",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Compare the pure Python engine with element-at-a-time nested-list code.
+
+``matmath.legacy`` is what ``import matmath`` falls back to where the C
+extensions cannot be built, PyPy being the common case. It stores matrices
+as flat ``array('d')`` buffers and works on whole rows and columns at a
+time. This times its core operations against the nested-list loops it used
+to be written with, on whatever interpreter runs the script::
+
+    python -m benchmarks.bench_legacy
+    pypy3 -m benchmarks.bench_legacy --sizes 16 64 256
+
+Only the standard library and ``matmath.legacy`` are imported, so the C
+extensions do not need to be built.
+"""
+
+import argparse
+import platform
+import random
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from matmath.legacy import Matrix, Vector
+from matmath.legacy.matrix import set_caching
+
+Rows = List[List[float]]
+
+
+# The nested-list baselines
+
+
+def lists_add(a: Rows, b: Rows) -> Rows:
+    return [[a[i][j] + b[i][j] for j in range(len(a[0]))] for i in range(len(a))]
+
+
+def lists_matmul(a: Rows, b: Rows) -> Rows:
+    result = [[0.0] * len(b[0]) for _ in range(len(a))]
+    for i in range(len(a)):
+        for j in range(len(b[0])):
+            for k in range(len(b)):
+                result[i][j] += a[i][k] * b[k][j]
+    return result
+
+
+def lists_matvec(a: Rows, x: List[float]) -> List[float]:
+    return [sum(a[i][j] * x[j] for j in range(len(x))) for i in range(len(a))]
+
+
+def lists_transpose(a: Rows) -> Rows:
+    return [[a[j][i] for j in range(len(a))] for i in range(len(a[0]))]
+
+
+def lists_determinant(a: Rows) -> float:
+    n = len(a)
+    lu = [list(row) for row in a]
+    det = 1.0
+    for j in range(n):
+        p = max(range(j, n), key=lambda i: abs(lu[i][j]))
+        if lu[p][j] == 0:
+            return 0.0
+        if p != j:
+            lu[j], lu[p] = lu[p], lu[j]
+            det = -det
+        det *= lu[j][j]
+        for i in range(j + 1, n):
+            factor = lu[i][j] / lu[j][j]
+            for k in range(j + 1, n):
+                lu[i][k] -= factor * lu[j][k]
+    return det
+
+
+def lists_adjoint(a: Rows) -> Rows:
+    # One (n-1) x (n-1) determinant per element
+    n = len(a)
+
+    def cofactor(i: int, j: int) -> float:
+        minor = [row[:j] + row[j + 1 :] for k, row in enumerate(a) if k != i]
+        return (-1) ** (i + j) * lists_determinant(minor)
+
+    return [[cofactor(j, i) for j in range(n)] for i in range(n)]
+
+
+# Each benchmark: (name, maximum size, nested-list call, engine call)
+Benchmark = Tuple[
+    str, int, Callable[[Dict[str, Any]], Any], Callable[[Dict[str, Any]], Any]
+]
+
+BENCHMARKS: List[Benchmark] = [
+    ("add", 4096, lambda d: lists_add(d["a"], d["b"]), lambda d: d["A"] + d["B"]),
+    ("matmul", 512, lambda d: lists_matmul(d["a"], d["b"]), lambda d: d["A"] @ d["B"]),
+    ("matvec", 4096, lambda d: lists_matvec(d["a"], d["x"]), lambda d: d["A"] @ d["X"]),
+    (
+        "transpose",
+        4096,
+        lambda d: lists_transpose(d["a"]),
+        lambda d: d["A"].transpose(),
+    ),
+    (
+        "determinant",
+        512,
+        lambda d: lists_determinant(d["a"]),
+        lambda d: d["A"].determinant(),
+    ),
+    ("adjoint", 16, lambda d: lists_adjoint(d["a"]), lambda d: d["A"].adjoint()),
+]
+
+
+def inputs(n: int) -> Dict[str, Any]:
+    rng = random.Random(n)
+    a = [
+        [rng.uniform(-1, 1) + (n if i == j else 0) for j in range(n)] for i in range(n)
+    ]
+    b = [[rng.uniform(-1, 1) for _ in range(n)] for _ in range(n)]
+    x = [rng.uniform(-1, 1) for _ in range(n)]
+    return {"a": a, "b": b, "x": x, "A": Matrix(a), "B": Matrix(b), "X": Vector(x)}
+
+
+def best_time(fn: Callable[[], Any], repeat: int, min_time: float) -> float:
+    """Returns the best time per call over ``repeat`` samples of at least
+    ``min_time`` seconds each."""
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2
+    best = elapsed / loops
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        best = min(best, (time.perf_counter() - start) / loops)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[8, 32, 128])
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument(
+        "--min-time", type=float, default=0.05, help="minimum seconds per sample"
+    )
+    args = parser.parse_args()
+
+    # Each operation repeats on one input; time the work, not cache lookups
+    set_caching(False)
+    print(f"{platform.python_implementation()} {platform.python_version()}")
+    print(
+        f"{'operation':<12} {'n':>6} {'lists (s)':>11} {'matmath (s)':>12} "
+        f"{'speedup':>8}"
+    )
+    for n in args.sizes:
+        data = inputs(n)
+        for name, max_size, lists_fn, engine_fn in BENCHMARKS:
+            if n > max_size:
+                continue
+            old = best_time(lambda: lists_fn(data), args.repeat, args.min_time)
+            new = best_time(lambda: engine_fn(data), args.repeat, args.min_time)
+            print(
+                f"{name:<12} {n:>6} {old:>11.3g} {new:>12.3g} {old / new:>7.1f}x",
+                flush=True,
+            )
+
+
+if __name__ == "__main__":
+    main()
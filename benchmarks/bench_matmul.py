@@ -0,0 +1,47 @@
+"""Benchmark ``Matrix @ Matrix`` throughput in GFLOP/s.
+
+Run from the repository root after building the C extensions::
+
+    python -m benchmarks.bench_matmul
+    python -m benchmarks.bench_matmul --sizes 64 256 --repeat 5
+"""
+
+import argparse
+import array
+import random
+import time
+
+from matmath import Matrix
+
+
+def random_matrix(n: int) -> Matrix:
+    """Returns an n x n matrix of uniform random values."""
+    values = array.array("d", (random.random() for _ in range(n * n)))
+    return Matrix.frombuffer(values, (n, n))
+
+
+def bench(n: int, repeat: int) -> float:
+    """Returns the best GFLOP/s over ``repeat`` runs of an n x n product."""
+    a = random_matrix(n)
+    b = random_matrix(n)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        a @ b
+        best = min(best, time.perf_counter() - start)
+    return 2.0 * n ** 3 / best / 1e9
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[64, 256, 1024, 2048])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(f"{'n':>6}  {'GFLOP/s':>8}")
+    for n in args.sizes:
+        print(f"{n:>6}  {bench(n, args.repeat):>8.2f}")
+
+
+if __name__ == "__main__":
+    main()
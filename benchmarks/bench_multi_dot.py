@@ -0,0 +1,76 @@
+"""Compare left-to-right chain products with matmath.multi_dot().
+
+Each chain is given as the dimensions p0, p1, ..., with operand i of order
+p[i] x p[i + 1]; a leading or trailing 1 makes that end a Vector. Uses
+whichever engine ``import matmath`` picks. Run from the repository root::
+
+    python -m benchmarks.bench_multi_dot
+    python -m benchmarks.bench_multi_dot --scale 2 --repeat 5
+"""
+
+import argparse
+import timeit
+from typing import Any, Dict, List, Tuple
+
+from benchmarks.cases import values
+from matmath import Matrix, Vector, multi_dot
+
+# Each chain: (name, dimensions before scaling)
+CHAINS: List[Tuple[str, List[int]]] = [
+    ("A @ B @ C @ v", [400, 400, 400, 400, 1]),
+    ("u @ A @ B", [1, 400, 400, 400]),
+    ("tall @ wide @ tall", [400, 20, 400, 20]),
+    ("wide @ tall @ wide", [20, 400, 20, 400]),
+    ("mixed", [300, 10, 200, 5, 300, 50]),
+]
+
+
+def operands(dims: List[int]) -> List[Any]:
+    """Returns random operands chaining the dimensions."""
+    result: List[Any] = []
+    last = len(dims) - 2
+    for i, (rows, cols) in enumerate(zip(dims, dims[1:])):
+        if i == 0 and rows == 1:
+            result.append(Vector.frombuffer(values(cols, i)))
+        elif i == last and cols == 1:
+            result.append(Vector.frombuffer(values(rows, i)))
+        else:
+            result.append(Matrix.frombuffer(values(rows * cols, i), (rows, cols)))
+    return result
+
+
+def best_time(stmt: str, data: Dict[str, Any], repeat: int) -> float:
+    """Returns the best time per execution of ``stmt`` in seconds."""
+    timer = timeit.Timer(stmt, globals=data)
+    number, _ = timer.autorange()
+    return min(timer.repeat(number=number, repeat=repeat)) / number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--scale", type=float, default=1.0, help="multiplies every dimension above 1"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    print(
+        f"{'chain':<20} {'left to right (ms)':>19} {'multi_dot (ms)':>15} "
+        f"{'speedup':>8}"
+    )
+    for name, dims in CHAINS:
+        dims = [d if d == 1 else max(1, int(d * args.scale)) for d in dims]
+        ops = operands(dims)
+        data = {"ops": ops, "multi_dot": multi_dot}
+        stmt = " @ ".join(f"ops[{i}]" for i in range(len(ops)))
+        before = best_time(stmt, data, args.repeat)
+        after = best_time("multi_dot(ops)", data, args.repeat)
+        print(
+            f"{name:<20} {before * 1e3:>19.3f} {after * 1e3:>15.3f} "
+            f"{before / after:>7.1f}x",
+            flush=True,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Compare the fixed-size 2 x 2, 3 x 3 and 4 x 4 kernels with the generic path.
+
+Square matrices of these orders are dispatched to unrolled closed-form
+kernels for ``@``, ``Matrix @ Vector``, ``determinant``, ``inverse`` and
+``transpose``. This times each operation with the dispatch on and off. Run
+from the repository root after building the C extensions::
+
+    python -m benchmarks.bench_small
+    python -m benchmarks.bench_small --sizes 4 --number 200000
+"""
+
+import argparse
+import random
+import timeit
+from typing import Dict, List, Tuple
+
+import matmath._matrix as engine
+from matmath import Matrix, Vector
+
+# Each operation: (name, statement over the inputs a, b and v)
+OPERATIONS: List[Tuple[str, str]] = [
+    ("matmul", "a @ b"),
+    ("matvec", "a @ v"),
+    ("determinant", "a.determinant()"),
+    ("inverse", "a.inverse()"),
+    ("transpose", "a.transpose()"),
+]
+
+
+def inputs(n: int) -> Dict[str, object]:
+    """Returns two well-conditioned n x n matrices and a vector of length n."""
+    rng = random.Random(n)
+    a, b = (
+        Matrix(
+            [
+                [rng.uniform(-1, 1) + (n if i == j else 0) for j in range(n)]
+                for i in range(n)
+            ]
+        )
+        for _ in range(2)
+    )
+    return {"a": a, "b": b, "v": Vector([rng.uniform(-1, 1) for _ in range(n)])}
+
+
+def best_time(stmt: str, data: Dict[str, object], number: int, repeat: int) -> float:
+    """Returns the best time per execution of ``stmt`` in seconds."""
+    return min(timeit.repeat(stmt, globals=data, number=number, repeat=repeat)) / number
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2, 3, 4])
+    parser.add_argument("--number", type=int, default=100000, help="calls per sample")
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(
+        f"{'operation':<12} {'n':>3} {'generic (ns)':>13} {'fixed (ns)':>11} "
+        f"{'speedup':>8}"
+    )
+    try:
+        for n in args.sizes:
+            data = inputs(n)
+            for name, stmt in OPERATIONS:
+                times = []
+                for enabled in (False, True):
+                    engine._set_small_kernels(enabled)
+                    times.append(best_time(stmt, data, args.number, args.repeat))
+                generic, fixed = times
+                print(
+                    f"{name:<12} {n:>3} {generic * 1e9:>13.1f} {fixed * 1e9:>11.1f} "
+                    f"{generic / fixed:>7.1f}x",
+                    flush=True,
+                )
+    finally:
+        engine._set_small_kernels(True)
+
+
+if __name__ == "__main__":
+    main()
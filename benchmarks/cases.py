@@ -0,0 +1,622 @@
+"""The operations timed by ``benchmarks.suite``.
+
+Each case is a function ``setup(engine, n)`` registered with ``@case`` that
+builds its inputs for size ``n`` and returns a zero-argument callable doing
+the work. ``n`` is the order of a square matrix, or the dimension of a
+vector. Inputs are chosen so predicates scan the whole matrix instead of
+returning at the first element (a symmetric matrix for ``is_symmetric``,
+and so on).
+
+``cost`` is the growth exponent of the operation in ``n`` and is used to
+skip sizes that would take too long; it may be a dict keyed by engine where
+the engines differ.
+"""
+
+import array
+import io
+import os
+import random
+import tempfile
+import types
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Tuple, Union
+
+ENGINES = ("c", "legacy")
+
+# Names that are aliases of another benchmarked method, see the README
+ALIASES = {
+    "Matrix": {
+        "adj",
+        "det",
+        "inv",
+        "size",
+        "is_diagonal_dominant",
+        "is_lower_hessenberg",
+        "is_upper_hessenberg",
+    },
+    "Vector": {"arg", "cross", "dot", "mod"},
+}
+
+
+class Case(NamedTuple):
+    type: str
+    name: str
+    cost: Union[int, Dict[str, int]]
+    sizes: Optional[Tuple[int, ...]]
+    setup: Callable[[Any, int], Callable[[], Any]]
+
+    def cost_for(self, engine: str) -> int:
+        return self.cost[engine] if isinstance(self.cost, dict) else self.cost
+
+
+CASES: List[Case] = []
+
+
+def case(type_: str, name: str, cost: Union[int, Dict[str, int]] = 2, sizes=None):
+    """Registers a benchmark of ``type_.name``.
+
+    ``sizes`` pins the case to fixed sizes, for operations only defined for
+    one dimension (``rotate_2d``, ``cross_product``, ...).
+    """
+
+    def register(setup):
+        CASES.append(Case(type_, name, cost, sizes, setup))
+        return setup
+
+    return register
+
+
+def load_engine(name: str) -> Any:
+    """Returns a namespace with the Matrix, Vector and VectorArray of an engine,
+    and its set_caching().
+
+    Raises ImportError if the C extensions are not built.
+    """
+    if name == "c":
+        from matmath._matrix import Matrix, set_caching
+        from matmath._vector import Vector, VectorArray
+    elif name == "legacy":
+        from matmath.legacy import Matrix, Vector, VectorArray
+        from matmath.legacy.matrix import set_caching
+    else:
+        raise ValueError(f"Unknown engine {name!r}")
+    return types.SimpleNamespace(
+        name=name,
+        Matrix=Matrix,
+        Vector=Vector,
+        VectorArray=VectorArray,
+        set_caching=set_caching,
+    )
+
+
+def uncovered(engine: Any) -> Dict[str, List[str]]:
+    """Returns the public methods of an engine without a benchmark."""
+    missing = {}
+    for type_ in ("Matrix", "Vector"):
+        cls = getattr(engine, type_)
+        # Slots such as the pure Python Matrix.rows are data, not methods
+        public = {
+            n
+            for n in dir(cls)
+            if not n.startswith("_")
+            and not isinstance(getattr(cls, n), types.MemberDescriptorType)
+        }
+        covered = {c.name for c in CASES if c.type == type_}
+        names = sorted(public - covered - ALIASES[type_])
+        if names:
+            missing[type_] = names
+    return missing
+
+
+# Inputs
+
+
+def values(n: int, seed: int = 0) -> array.array:
+    rng = random.Random(seed)
+    return array.array("d", (rng.uniform(-1, 1) for _ in range(n)))
+
+
+def matrix(e: Any, n: int, seed: int = 0) -> Any:
+    """Returns a random n x n matrix, made diagonally dominant so it is
+    well conditioned for the factorizations."""
+    data = values(n * n, seed)
+    for i in range(n):
+        data[i * n + i] += n
+    return e.Matrix.frombuffer(data, (n, n))
+
+
+def vector(e: Any, n: int, seed: int = 0) -> Any:
+    return e.Vector.frombuffer(values(n, seed))
+
+
+def triangular(e: Any, n: int, lower: bool = False) -> Any:
+    a = matrix(e, n).to_list()
+    for i in range(n):
+        for j in range(n):
+            if (j > i) if lower else (j < i):
+                a[i][j] = 0.0
+    return e.Matrix(a)
+
+
+def symmetric(e: Any, n: int) -> Any:
+    a = matrix(e, n)
+    return a + a.transpose()
+
+
+def positive_definite(e: Any, n: int) -> Any:
+    """Returns a symmetric matrix with a dominant positive diagonal."""
+    return symmetric(e, n) + diagonal(e, n, 2.0 * n)
+
+
+def diagonal(e: Any, n: int, value: float = 2.0) -> Any:
+    return e.Matrix([[0]]).identity(n) * value
+
+
+# Matrix
+
+
+@case("Matrix", "__init__")
+def _(e, n):
+    rows = matrix(e, n).to_list()
+    return lambda: e.Matrix(rows)
+
+
+@case("Matrix", "frombuffer")
+def _(e, n):
+    data = values(n * n)
+    return lambda: e.Matrix.frombuffer(data, (n, n))
+
+
+@case("Matrix", "from_rows")
+def _(e, n):
+    rows = [values(n, i) for i in range(n)]
+    return lambda: e.Matrix.from_rows(rows)
+
+
+@case("Matrix", "from_csv")
+def _(e, n):
+    text = "".join(matrix(e, n).iter_csv())
+    return lambda: e.Matrix.from_csv(io.StringIO(text))
+
+
+@case("Matrix", "iter_csv")
+def _(e, n):
+    a = matrix(e, n)
+    return lambda: list(a.iter_csv())
+
+
+@case("Matrix", "save")
+def _(e, n):
+    a = matrix(e, n)
+    path = os.path.join(tempfile.mkdtemp(prefix="matmath-bench-"), "save.mat")
+    return lambda: a.save(path)
+
+
+@case("Matrix", "load")
+def _(e, n):
+    path = os.path.join(tempfile.mkdtemp(prefix="matmath-bench-"), "load.mat")
+    matrix(e, n).save(path)
+    return lambda: e.Matrix.load(path, mmap=False)
+
+
+@case("Matrix", "to_list")
+def _(e, n):
+    return matrix(e, n).to_list
+
+
+@case("Matrix", "copy")
+def _(e, n):
+    return matrix(e, n).copy
+
+
+@case("Matrix", "identity")
+def _(e, n):
+    a = matrix(e, 2)
+    return lambda: a.identity(n)
+
+
+@case("Matrix", "zero")
+def _(e, n):
+    a = matrix(e, 2)
+    return lambda: a.zero((n, n))
+
+
+@case("Matrix", "fill")
+def _(e, n):
+    a = matrix(e, 2)
+    return lambda: a.fill(1.5, (n, n))
+
+
+@case("Matrix", "__getitem__", cost=0)
+def _(e, n):
+    a = matrix(e, n)
+    i = n // 2
+    return lambda: a[i, i]
+
+
+@case("Matrix", "__iter__")
+def _(e, n):
+    a = matrix(e, n)
+    return lambda: [x for row in a for x in row]
+
+
+@case("Matrix", "__eq__")
+def _(e, n):
+    a, b = matrix(e, n), matrix(e, n)
+    return lambda: a == b
+
+
+@case("Matrix", "__str__")
+def _(e, n):
+    return matrix(e, n).__str__
+
+
+@case("Matrix", "order", cost=0)
+def _(e, n):
+    a = matrix(e, n)
+    return lambda: a.order
+
+
+@case("Matrix", "row", cost=1)
+def _(e, n):
+    a = matrix(e, n)
+    return lambda: a.row(n // 2)
+
+
+@case("Matrix", "col", cost=1)
+def _(e, n):
+    a = matrix(e, n)
+    return lambda: a.col(n // 2)
+
+
+@case("Matrix", "T")
+def _(e, n):
+    a = matrix(e, n)
+    return lambda: a.T
+
+
+@case("Matrix", "transpose")
+def _(e, n):
+    return matrix(e, n).transpose
+
+
+@case("Matrix", "add")
+def _(e, n):
+    a, b = matrix(e, n, 1), matrix(e, n, 2)
+    return lambda: a.add(b)
+
+
+@case("Matrix", "sub")
+def _(e, n):
+    a, b = matrix(e, n, 1), matrix(e, n, 2)
+    return lambda: a.sub(b)
+
+
+@case("Matrix", "__add__")
+def _(e, n):
+    a, b = matrix(e, n, 1), matrix(e, n, 2)
+    return lambda: a + b
+
+
+@case("Matrix", "__iadd__")
+def _(e, n):
+    a, b = matrix(e, n, 1), matrix(e, n, 2)
+
+    def run():
+        nonlocal a
+        a += b
+
+    return run
+
+
+@case("Matrix", "__mul__")
+def _(e, n):
+    a = matrix(e, n)
+    return lambda: a * 1.5
+
+
+@case("Matrix", "__truediv__")
+def _(e, n):
+    a = matrix(e, n)
+    return lambda: a / 1.5
+
+
+@case("Matrix", "matmul", cost=3)
+def _(e, n):
+    a, b = matrix(e, n, 1), matrix(e, n, 2)
+    return lambda: a.matmul(b)
+
+
+@case("Matrix", "__matmul__", cost=3)
+def _(e, n):
+    a, b = matrix(e, n, 1), matrix(e, n, 2)
+    return lambda: a @ b
+
+
+@case("Matrix", "__matmul__(Vector)")
+def _(e, n):
+    a, v = matrix(e, n), vector(e, n)
+    return lambda: a @ v
+
+
+@case("Matrix", "apply")
+def _(e, n):
+    # 64 vectors of dimension n
+    a = matrix(e, n)
+    vectors = [vector(e, n, i) for i in range(64)]
+    return lambda: a.apply(vectors)
+
+
+@case("Matrix", "pow", cost=3)
+def _(e, n):
+    a = matrix(e, n) / n
+    return lambda: a.pow(5)
+
+
+@case("Matrix", "trace", cost=1)
+def _(e, n):
+    return matrix(e, n).trace
+
+
+@case("Matrix", "determinant", cost=3)
+def _(e, n):
+    return matrix(e, n).determinant
+
+
+@case("Matrix", "inverse", cost=3)
+def _(e, n):
+    return matrix(e, n).inverse
+
+
+@case("Matrix", "adjoint", cost=3)
+def _(e, n):
+    return matrix(e, n).adjoint
+
+
+@case("Matrix", "cofactor", cost=3)
+def _(e, n):
+    a = matrix(e, n)
+    return lambda: a.cofactor(0, 0)
+
+
+@case("Matrix", "minor", cost=3)
+def _(e, n):
+    a = matrix(e, n)
+    return lambda: a.minor(0, 0)
+
+
+@case("Matrix", "cut")
+def _(e, n):
+    a = matrix(e, n)
+    return lambda: a.cut(0, 0)
+
+
+@case("Matrix", "rotate")
+def _(e, n):
+    a = matrix(e, n)
+    return lambda: a.rotate(1)
+
+
+@case("Matrix", "lu", cost=3)
+def _(e, n):
+    return matrix(e, n).lu
+
+
+@case("Matrix", "solve", cost=3)
+def _(e, n):
+    a, b = matrix(e, n), vector(e, n)
+    return lambda: a.solve(b)
+
+
+@case("Matrix", "solve_triangular")
+def _(e, n):
+    a, b = triangular(e, n), vector(e, n)
+    return lambda: a.solve_triangular(b)
+
+
+@case("Matrix", "solve(symmetric)", cost=3)
+def _(e, n):
+    a, b = positive_definite(e, n), vector(e, n)
+    return lambda: a.solve(b)
+
+
+@case("Matrix", "cholesky", cost=3)
+def _(e, n):
+    return positive_definite(e, n).cholesky
+
+
+@case("Matrix", "qr", cost=3)
+def _(e, n):
+    return matrix(e, n).qr
+
+
+@case("Matrix", "eigh", cost=3)
+def _(e, n):
+    return symmetric(e, n).eigh
+
+
+@case("Matrix", "is_invertible", cost=3)
+def _(e, n):
+    return matrix(e, n).is_invertible
+
+
+@case("Matrix", "is_square", cost=0)
+def _(e, n):
+    return matrix(e, n).is_square
+
+
+@case("Matrix", "is_symmetric")
+def _(e, n):
+    return symmetric(e, n).is_symmetric
+
+
+@case("Matrix", "is_skew_symmetric")
+def _(e, n):
+    a = matrix(e, n)
+    return (a - a.transpose()).is_skew_symmetric
+
+
+@case("Matrix", "is_diagonal")
+def _(e, n):
+    return diagonal(e, n).is_diagonal
+
+
+@case("Matrix", "is_identity")
+def _(e, n):
+    return diagonal(e, n, 1.0).is_identity
+
+
+@case("Matrix", "is_null")
+def _(e, n):
+    return (diagonal(e, n) * 0.0).is_null
+
+
+@case("Matrix", "is_lower_triangular")
+def _(e, n):
+    return triangular(e, n, lower=True).is_lower_triangular
+
+
+@case("Matrix", "is_upper_triangular")
+def _(e, n):
+    return triangular(e, n).is_upper_triangular
+
+
+# Vector
+
+
+@case("Vector", "__init__", cost=1)
+def _(e, n):
+    data = list(values(n))
+    return lambda: e.Vector(data)
+
+
+@case("Vector", "frombuffer", cost=1)
+def _(e, n):
+    data = values(n)
+    return lambda: e.Vector.frombuffer(data)
+
+
+@case("Vector", "to_list", cost=1)
+def _(e, n):
+    return vector(e, n).to_list
+
+
+@case("Vector", "copy", cost=1)
+def _(e, n):
+    return vector(e, n).copy
+
+
+@case("Vector", "__getitem__", cost=0)
+def _(e, n):
+    v = vector(e, n)
+    i = n // 2
+    return lambda: v[i]
+
+
+@case("Vector", "__eq__", cost=1)
+def _(e, n):
+    v, w = vector(e, n), vector(e, n)
+    return lambda: v == w
+
+
+@case("Vector", "__add__", cost=1)
+def _(e, n):
+    v, w = vector(e, n, 1), vector(e, n, 2)
+    return lambda: v + w
+
+
+@case("Vector", "__sub__", cost=1)
+def _(e, n):
+    v, w = vector(e, n, 1), vector(e, n, 2)
+    return lambda: v - w
+
+
+@case("Vector", "__iadd__", cost=1)
+def _(e, n):
+    v, w = vector(e, n, 1), vector(e, n, 2)
+
+    def run():
+        nonlocal v
+        v += w
+
+    return run
+
+
+@case("Vector", "__mul__", cost=1)
+def _(e, n):
+    v = vector(e, n)
+    return lambda: v * 1.5
+
+
+@case("Vector", "__truediv__", cost=1)
+def _(e, n):
+    v = vector(e, n)
+    return lambda: v / 1.5
+
+
+@case("Vector", "__matmul__", cost=2)
+def _(e, n):
+    v, a = vector(e, n), matrix(e, n)
+    return lambda: v @ a
+
+
+@case("Vector", "modulus", cost=1)
+def _(e, n):
+    return vector(e, n).modulus
+
+
+@case("Vector", "argument", cost=1)
+def _(e, n):
+    return vector(e, n).argument
+
+
+@case("Vector", "unit_vector", cost=1)
+def _(e, n):
+    return vector(e, n).unit_vector
+
+
+@case("Vector", "magnify", cost=1)
+def _(e, n):
+    v = vector(e, n)
+    return lambda: v.magnify(1.5)
+
+
+@case("Vector", "dot_product", cost=1)
+def _(e, n):
+    v, w = vector(e, n, 1), vector(e, n, 2)
+    return lambda: v.dot_product(w)
+
+
+@case("Vector", "is_unit", cost=1)
+def _(e, n):
+    return vector(e, n).unit_vector().is_unit
+
+
+@case("Vector", "is_parallel", cost=1)
+def _(e, n):
+    v = vector(e, n)
+    w = v * 2.0
+    return lambda: v.is_parallel(w)
+
+
+@case("Vector", "is_orthogonal", cost=1)
+def _(e, n):
+    v, w = vector(e, n, 1), vector(e, n, 2)
+    return lambda: v.is_orthogonal(w)
+
+
+@case("Vector", "rotate_2d", cost=0, sizes=(2,))
+def _(e, n):
+    v = vector(e, n)
+    return lambda: v.rotate_2d(0.5)
+
+
+@case("Vector", "rotate_3d", cost=0, sizes=(3,))
+def _(e, n):
+    v, axis = vector(e, n, 1), vector(e, n, 2)
+    return lambda: v.rotate_3d(0.5, axis)
+
+
+@case("Vector", "cross_product", cost=0, sizes=(3,))
+def _(e, n):
+    v, w = vector(e, n, 1), vector(e, n, 2)
+    return lambda: v.cross_product(w)
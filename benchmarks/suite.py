@@ -0,0 +1,315 @@
+"""Time every public Matrix and Vector operation on both engines.
+
+Each operation in ``benchmarks.cases`` is timed for the C extensions and
+the pure Python ``matmath.legacy`` engine at sizes 2 to 2048, and the
+results are written as JSON. Two result files can then be compared to spot
+regressions between commits. Only the standard library is needed.
+
+Run from the repository root after building the C extensions::
+
+    python -m benchmarks.suite run --output before.json
+    python -m benchmarks.suite run --engine c --filter 'Matrix\\.(lu|solve)' \\
+        -o after.json
+    python -m benchmarks.suite compare before.json after.json
+    python -m benchmarks.suite list
+
+Sizes whose predicted time per call (extrapolated from the previous size
+with the growth exponent of the case) exceeds ``--max-time`` are recorded
+as skipped, which keeps the O(n^3) pure Python operations from running for
+hours at n = 2048.
+"""
+
+import argparse
+import json
+import math
+import os
+import platform
+import re
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+from benchmarks.cases import CASES, ENGINES, Case, load_engine, uncovered
+
+FORMAT_VERSION = 1
+DEFAULT_SIZES = [2, 8, 32, 128, 512, 2048]
+
+Key = Tuple[str, str, str, int]
+
+
+def format_time(seconds: float) -> str:
+    for unit, scale in (("s", 1.0), ("ms", 1e-3), ("us", 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.3g} {unit}"
+    return f"{seconds / 1e-9:.3g} ns"
+
+
+def timeit(
+    fn: Callable[[], Any], repeat: int, min_time: float
+) -> Tuple[int, List[float]]:
+    """Returns the loop count and ``repeat`` samples of the time per call.
+
+    The loop count is calibrated so that one sample takes at least
+    ``min_time`` seconds; the calibration doubles as the warm-up.
+    """
+    loops = 1
+    while True:
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 10 if elapsed < min_time / 10 else 2
+
+    samples = [elapsed / loops]
+    for _ in range(repeat - 1):
+        start = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        samples.append((time.perf_counter() - start) / loops)
+    return loops, samples
+
+
+def run_case(
+    engine: Any, case: Case, sizes: List[int], args: argparse.Namespace
+) -> Iterator[Dict[str, Any]]:
+    """Yields one result per size of ``case``."""
+    cost = case.cost_for(engine.name)
+    previous: Optional[Tuple[int, float]] = None
+    for n in case.sizes or sizes:
+        result = {
+            "engine": engine.name,
+            "type": case.type,
+            "name": case.name,
+            "size": n,
+        }
+        if previous is not None:
+            predicted = previous[1] * (n / previous[0]) ** cost
+            if predicted > args.max_time:
+                result["skipped"] = f"predicted {format_time(predicted)} per call"
+                yield result
+                continue
+        fn = case.setup(engine, n)
+        loops, samples = timeit(fn, args.repeat, args.min_time)
+        result.update(
+            loops=loops,
+            samples=samples,
+            min=min(samples),
+            median=statistics.median(samples),
+            mean=statistics.mean(samples),
+            stdev=statistics.stdev(samples) if len(samples) > 1 else 0.0,
+        )
+        previous = (n, result["min"])
+        yield result
+
+
+def git_revision() -> Optional[str]:
+    """Returns the current commit of the source checkout, if there is one."""
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    try:
+        revision = subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+        dirty = subprocess.run(
+            ["git", "status", "--porcelain", "--untracked-files=no"],
+            cwd=root,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return revision + ("-dirty" if dirty else "")
+
+
+def metadata() -> Dict[str, Any]:
+    import matmath
+
+    return {
+        "matmath": matmath.__version__,
+        "revision": git_revision(),
+        "python": f"{platform.python_implementation()} {platform.python_version()}",
+        "platform": platform.platform(),
+        "cpu_count": os.cpu_count(),
+        "num_threads": matmath.get_num_threads(),
+        "date": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+    }
+
+
+def selected(pattern: Optional[str]) -> List[Case]:
+    if pattern is None:
+        return list(CASES)
+    regex = re.compile(pattern)
+    return [c for c in CASES if regex.search(f"{c.type}.{c.name}")]
+
+
+def run(args: argparse.Namespace) -> int:
+    cases = selected(args.filter)
+    results: List[Dict[str, Any]] = []
+    print(f"{'engine':<8} {'case':<32} {'n':>6} {'time':>10}  {'stdev':>6}")
+    for name in args.engine:
+        try:
+            engine = load_engine(name)
+        except ImportError as e:
+            print(f"Skipping the {name} engine: {e}", file=sys.stderr)
+            continue
+        for type_, names in uncovered(engine).items():
+            print(
+                f"No benchmark for {type_} methods {', '.join(names)}", file=sys.stderr
+            )
+        # Repeated calls on one input would otherwise time cache lookups, and
+        # only the legacy engine caches matrices built by frombuffer()
+        caching = engine.set_caching(False)
+        try:
+            for case in cases:
+                for result in run_case(engine, case, args.sizes, args):
+                    results.append(result)
+                    label = f"{case.type}.{case.name}"
+                    if "skipped" in result:
+                        line = f"skipped ({result['skipped']})"
+                    else:
+                        mean = result["mean"]
+                        spread = result["stdev"] / mean if mean else 0.0
+                        line = f"{format_time(result['min']):>10}  {spread:>6.1%}"
+                    print(
+                        f"{name:<8} {label:<32} {result['size']:>6} {line}", flush=True
+                    )
+        finally:
+            engine.set_caching(caching)
+
+    if args.output:
+        document = {
+            "version": FORMAT_VERSION,
+            "metadata": metadata(),
+            "results": results,
+        }
+        with open(args.output, "w") as f:
+            json.dump(document, f, indent=1)
+            f.write("\n")
+        print(f"Wrote {len(results)} results to {args.output}")
+    return 0
+
+
+def load_results(path: str) -> Dict[Key, Dict[str, Any]]:
+    with open(path) as f:
+        document = json.load(f)
+    if document.get("version") != FORMAT_VERSION:
+        raise SystemExit(
+            f"{path}: unsupported results format {document.get('version')!r}"
+        )
+    return {
+        (r["engine"], r["type"], r["name"], r["size"]): r for r in document["results"]
+    }
+
+
+def compare(args: argparse.Namespace) -> int:
+    """Prints the change in time of every benchmark in both files.
+
+    Exits with status 1 if anything got slower by more than the threshold,
+    so the comparison can gate a CI job.
+    """
+    old, new = load_results(args.old), load_results(args.new)
+    rows = []
+    for key in old.keys() & new.keys():
+        a, b = old[key].get(args.stat), new[key].get(args.stat)
+        if a is None or b is None:
+            continue
+        ratio = b / a if a else math.inf
+        rows.append((ratio, key, a, b))
+    rows.sort(key=lambda row: row[0], reverse=True)
+
+    slower = faster = 0
+    print(f"{'engine':<8} {'case':<32} {'n':>6} {'old':>10} {'new':>10} {'ratio':>7}")
+    for ratio, (engine, type_, name, n), a, b in rows:
+        if ratio > 1 + args.threshold:
+            slower += 1
+            verdict = "slower"
+        elif ratio < 1 / (1 + args.threshold):
+            faster += 1
+            verdict = "faster"
+        elif args.all:
+            verdict = ""
+        else:
+            continue
+        label = f"{type_}.{name}"
+        print(
+            f"{engine:<8} {label:<32} {n:>6} {format_time(a):>10} {format_time(b):>10} "
+            f"{ratio:>6.2f}x  {verdict}"
+        )
+
+    unmatched = len(old.keys() ^ new.keys())
+    print(
+        f"\n{slower} slower, {faster} faster, {len(rows) - slower - faster} unchanged "
+        f"(threshold {args.threshold:.0%} on {args.stat}); {unmatched} only in one file"
+    )
+    return 1 if slower else 0
+
+
+def list_cases(args: argparse.Namespace) -> int:
+    for case in selected(args.filter):
+        label = f"{case.type}.{case.name}"
+        sizes = ", ".join(map(str, case.sizes)) if case.sizes else "all"
+        print(f"{label:<32} cost {case.cost!s:<24} sizes {sizes}")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="time the operations")
+    run_parser.add_argument(
+        "--engine", nargs="+", choices=ENGINES, default=list(ENGINES)
+    )
+    run_parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES)
+    run_parser.add_argument("--filter", help="regex matched against 'Type.name'")
+    run_parser.add_argument("--repeat", type=int, default=5, help="samples per size")
+    run_parser.add_argument(
+        "--min-time", type=float, default=0.02, help="minimum seconds per sample"
+    )
+    run_parser.add_argument(
+        "--max-time",
+        type=float,
+        default=1.0,
+        help="skip sizes predicted to exceed this per call",
+    )
+    run_parser.add_argument(
+        "-o", "--output", help="write the results to this JSON file"
+    )
+    run_parser.set_defaults(func=run)
+
+    compare_parser = commands.add_parser("compare", help="compare two result files")
+    compare_parser.add_argument("old")
+    compare_parser.add_argument("new")
+    compare_parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.1,
+        help="relative change reported (default 0.1)",
+    )
+    compare_parser.add_argument(
+        "--stat", choices=("min", "median", "mean"), default="min"
+    )
+    compare_parser.add_argument(
+        "--all", action="store_true", help="also list unchanged results"
+    )
+    compare_parser.set_defaults(func=compare)
+
+    list_parser = commands.add_parser("list", help="list the benchmarks")
+    list_parser.add_argument("--filter", help="regex matched against 'Type.name'")
+    list_parser.set_defaults(func=list_cases)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
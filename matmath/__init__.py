@@ -3,8 +3,19 @@
 import warnings
 
 try:
-    from matmath._vector import Vector
-    from matmath._matrix import Matrix
+    from matmath._matrix import (
+        Matrix,
+        cache_info,
+        clear_cache,
+        get_num_threads,
+        reset_stats,
+        set_caching,
+        set_num_threads,
+        set_profiling,
+        stats,
+    )
+    from matmath._sparse import SparseMatrix
+    from matmath._vector import Vector, VectorArray
 except ImportError:
     warnings.warn(
         "C extensions not available. Falling back to pure Python implementation. "
@@ -13,7 +24,36 @@ except ImportError:
         stacklevel=2,
     )
     from matmath.legacy.vector import Vector
-    from matmath.legacy.matrix import Matrix
+    from matmath.legacy.vectorarray import VectorArray
+    from matmath.legacy.matrix import Matrix, cache_info, clear_cache, set_caching
+    from matmath.legacy.sparse import SparseMatrix
+    from matmath.legacy.parallel import get_num_threads, set_num_threads
+    from matmath.legacy.profile import reset_stats, set_profiling, stats
+
+from matmath import solvers
+from matmath._chain import multi_dot
+from matmath._disk import DiskMatrix
+from matmath._lazy import LazyMatrix, lazy
+from matmath._profile import profile
 
 __version__ = "4.0.0"
-__all__ = ["Vector", "Matrix"]
+__all__ = [
+    "Vector",
+    "VectorArray",
+    "Matrix",
+    "SparseMatrix",
+    "DiskMatrix",
+    "LazyMatrix",
+    "lazy",
+    "multi_dot",
+    "get_num_threads",
+    "set_num_threads",
+    "profile",
+    "stats",
+    "reset_stats",
+    "set_profiling",
+    "cache_info",
+    "clear_cache",
+    "set_caching",
+    "solvers",
+]
@@ -0,0 +1,111 @@
+"""Products of chains of matrices in the cheapest order.
+
+``A @ B @ C @ v`` is evaluated left to right, which can cost orders of
+magnitude more than needed when the shapes differ: with A 1000 x 1000 and v a
+vector, ``A @ (B @ (C @ v))`` does three matrix-vector products instead of two
+matrix-matrix ones. multi_dot() picks the parenthesization with the fewest
+multiply-adds by the classic O(n^3) matrix-chain dynamic program over the
+operand orders, then multiplies in that order. Intermediate products that
+have been consumed are kept and written over by later products of the same
+order, through Matrix.matmul(out=).
+"""
+
+from typing import Any, Dict, List, Sequence, Tuple
+
+from matmath import Matrix, Vector
+
+__all__ = ["multi_dot"]
+
+
+def _orders(operands: Sequence[Any]) -> List[int]:
+    """Returns the dimensions p with operand i of order p[i] x p[i + 1]; a
+    Vector counts as a row at the start of the chain and a column at the end."""
+    dims: List[int] = []
+    last = len(operands) - 1
+    for i, operand in enumerate(operands):
+        if isinstance(operand, Vector) and i in (0, last):
+            rows, cols = (1, len(operand)) if i == 0 else (len(operand), 1)
+        elif isinstance(operand, Matrix):
+            rows, cols = operand.order
+        elif isinstance(operand, Vector):
+            raise TypeError("A Vector can only be the first or the last operand")
+        else:
+            raise TypeError("multi_dot() takes Matrix and Vector operands")
+        if dims and dims[-1] != rows:
+            raise ValueError("Matrix dimensions incompatible for multiplication")
+        if not dims:
+            dims.append(rows)
+        dims.append(cols)
+    return dims
+
+
+def _chain_order(dims: List[int]) -> List[List[int]]:
+    """Returns the split table of the matrix-chain dynamic program: the product
+    of operands i..j is cheapest as (i..split[i][j]) @ (split[i][j] + 1..j)."""
+    n = len(dims) - 1
+    cost = [[0] * n for _ in range(n)]
+    split = [[0] * n for _ in range(n)]
+    for length in range(1, n):
+        for i in range(n - length):
+            j = i + length
+            best = None
+            for k in range(i, j):
+                c = cost[i][k] + cost[k + 1][j] + dims[i] * dims[k + 1] * dims[j + 1]
+                if best is None or c < best:
+                    best, split[i][j] = c, k
+            cost[i][j] = best
+    return split
+
+
+def multi_dot(operands: Sequence[Any]) -> Any:
+    """Returns the product of two or more matrices, multiplied in the order
+    that needs the fewest floating point operations.
+
+    Example
+    -------
+    >>> x = matmath.multi_dot([A, B, C, v])  # A @ B @ C @ v, done as A @ (B @ (C @ v))
+
+    Parameters
+    ----------
+    operands (sequence of Matrix)
+        The factors, left to right. The first may be a Vector, taken as a
+        row, and the last a Vector, taken as a column.
+
+    Returns
+    -------
+    Matrix, Vector or float :
+        The product; a Vector if one end is a Vector, and a float if both are.
+
+    Raises
+    ------
+    ValueError
+        If there are fewer than two operands or their orders do not chain.
+    """
+    operands = list(operands)
+    if len(operands) < 2:
+        raise ValueError("multi_dot() needs at least two operands")
+    dims = _orders(operands)
+    split = _chain_order(dims)
+    # Consumed intermediate matrices by order, to be written over
+    spare: Dict[Tuple[int, int], List[Matrix]] = {}
+
+    def product(i: int, j: int) -> Tuple[Any, bool]:
+        """Returns the product of operands i..j and whether it is an intermediate."""
+        if i == j:
+            return operands[i], False
+        k = split[i][j]
+        (left, left_temp), (right, right_temp) = product(i, k), product(k + 1, j)
+        if isinstance(left, Vector) and isinstance(right, Vector):
+            result = left.dot(right)
+        else:
+            pool = spare.get((dims[i], dims[j + 1]))
+            if pool and isinstance(left, Matrix) and isinstance(right, Matrix):
+                result = left.matmul(right, out=pool.pop())
+            else:
+                result = left @ right
+        for operand, temp in ((left, left_temp), (right, right_temp)):
+            if temp and isinstance(operand, Matrix):
+                spare.setdefault(operand.order, []).append(operand)
+        return result, True
+
+    return product(0, len(operands) - 1)[0]
@@ -0,0 +1,472 @@
+"""Matrices kept on disk and processed a tile at a time.
+
+A Matrix holds all of its elements in process memory, so the largest product
+one machine can form is bounded by its RAM. A DiskMatrix instead maps a file
+of little-endian doubles (as written by Matrix.save(), or a headerless
+row-major block) and works on it one tile at a time. A tile is a block of up
+to ``tile`` x ``tile`` elements. It is copied out of the mapping into an
+ordinary Matrix, so products run the engine's own kernel on every tile (the
+blocked, threaded gemm of the C extension). Result tiles are written back
+through the mapping of the output file. Mapped pages are handed back to the
+kernel as soon as a tile has been copied in or out. So an operation never
+keeps more than ``max_tiles`` tiles resident, however large its operands
+and result are.
+"""
+
+import mmap as _mmap
+import os
+import sys
+import tempfile
+import weakref
+from array import array
+from typing import Any, Iterator, List, Optional, Tuple, Union
+
+from matmath import Matrix, _io
+
+__all__ = ["DiskMatrix"]
+
+# Products keep the tile being written, a scratch product and a tile of each operand
+_MIN_TILES = 4
+_DONTNEED = getattr(_mmap, "MADV_DONTNEED", None)
+
+
+def _blocks(n: int, size: int) -> List[Tuple[int, int]]:
+    """Returns the [start, stop) ranges splitting range(n) into blocks of `size`."""
+    return [(start, min(start + size, n)) for start in range(0, n, size)]
+
+
+def _close(
+    view: memoryview, mapped: _mmap.mmap, file: Any, path: Optional[str]
+) -> None:
+    view.release()
+    mapped.close()
+    file.close()
+    if path is not None:
+        os.remove(path)
+
+
+class DiskMatrix:
+    """A matrix stored in a memory-mapped file, processed a tile at a time.
+
+    Example
+    -------
+    >>> a = matmath.DiskMatrix("a.mm")          # written by Matrix.save()
+    >>> b = matmath.DiskMatrix("b.raw", order=(50000, 2000))
+    >>> c = a.matmul(b, out=matmath.DiskMatrix.create("c.mm", (a.order[0], 2000)))
+
+    Parameters
+    ----------
+    path (str or os.PathLike)
+        The file to map.
+    order (tuple, optional)
+        The (rows, cols) of a headerless file of raw little-endian doubles,
+        starting `offset` bytes in. When omitted the file must have been
+        written by Matrix.save().
+    mode (str, optional)
+        "r" (the default) to map the file read-only, or "r+" to allow it to
+        be used as `out`, with writes going to the file.
+    offset (int, optional)
+        Where the elements of a headerless file start. Defaults to 0.
+    tile (int, optional)
+        The side of the square tiles operations work on. Defaults to 1024,
+        8 MB per tile.
+    max_tiles (int, optional)
+        The most tiles an operation keeps in memory at once, at least 4.
+        Defaults to 8. Products keep a whole row of tiles of the left
+        operand resident when this allows it.
+
+    Raises
+    ------
+    ValueError
+        If the file is not a matmath matrix file, is too short for `order`,
+        or the options are out of range.
+
+    Attributes
+    ----------
+    path (str)
+        The mapped file.
+    order (tuple)
+        The (rows, cols) of the matrix.
+    """
+
+    __slots__ = (
+        "path",
+        "order",
+        "tile",
+        "max_tiles",
+        "_offset",
+        "_map",
+        "_view",
+        "_writable",
+        "_finalizer",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        path: _io.PathLike,
+        order: Optional[Tuple[int, int]] = None,
+        mode: str = "r",
+        offset: int = 0,
+        tile: int = 1024,
+        max_tiles: int = 8,
+    ) -> None:
+        if mode not in ("r", "r+"):
+            raise ValueError("mode must be 'r' or 'r+'")
+        if tile < 1:
+            raise ValueError("tile must be positive")
+        if max_tiles < _MIN_TILES:
+            raise ValueError(f"max_tiles must be at least {_MIN_TILES}")
+        if sys.byteorder != "little":
+            raise ValueError("DiskMatrix needs a little-endian platform")
+        file = open(path, "r+b" if mode == "r+" else "rb")
+        try:
+            if order is None:
+                rows, cols = _io._read_header(file.read(_io.HEADER.size), path)
+                offset = _io.HEADER.size
+            else:
+                rows, cols = order
+                if rows <= 0 or cols <= 0:
+                    raise ValueError("Matrix dimensions must be positive")
+                if offset < 0:
+                    raise ValueError("offset must not be negative")
+            if os.fstat(file.fileno()).st_size < offset + 8 * rows * cols:
+                raise ValueError(f"{os.fspath(path)!r} is truncated")
+            access = _mmap.ACCESS_WRITE if mode == "r+" else _mmap.ACCESS_READ
+            mapped = _mmap.mmap(file.fileno(), 0, access=access)
+        except BaseException:
+            file.close()
+            raise
+        self.path = os.fspath(path)
+        self.order = (rows, cols)
+        self.tile = tile
+        self.max_tiles = max_tiles
+        self._offset = offset
+        self._map = mapped
+        self._view = memoryview(mapped)
+        self._writable = mode == "r+"
+        self._finalizer = weakref.finalize(self, _close, self._view, mapped, file, None)
+
+    @classmethod
+    def create(
+        cls, path: _io.PathLike, order: Tuple[int, int], **kwargs: Any
+    ) -> "DiskMatrix":
+        """Returns a new zero matrix in a file written in the Matrix.save() format.
+
+        The file is extended without writing the elements, so on most file
+        systems its blocks are only allocated as tiles are written.
+
+        Parameters
+        ----------
+        path (str or os.PathLike)
+            The file to create, replacing any existing one.
+        order (tuple)
+            The (rows, cols) of the matrix.
+        **kwargs
+            The `tile` and `max_tiles` options of DiskMatrix.
+
+        Returns
+        -------
+        DiskMatrix :
+            The matrix, mapped with mode "r+".
+        """
+        rows, cols = order
+        if rows <= 0 or cols <= 0:
+            raise ValueError("Matrix dimensions must be positive")
+        with open(path, "wb") as f:
+            f.write(
+                _io.HEADER.pack(_io.MAGIC, _io.VERSION, _io.KIND_MATRIX, 0, rows, cols)
+            )
+            f.truncate(_io.HEADER.size + 8 * rows * cols)
+        return cls(path, mode="r+", **kwargs)
+
+    def _temporary(self, order: Tuple[int, int]) -> "DiskMatrix":
+        """Returns a zero matrix in a new file next to this one, removed when closed."""
+        fd, path = tempfile.mkstemp(
+            suffix=".mm", dir=os.path.dirname(os.path.abspath(self.path))
+        )
+        os.close(fd)
+        try:
+            result = DiskMatrix.create(
+                path, order, tile=self.tile, max_tiles=self.max_tiles
+            )
+        except BaseException:
+            os.remove(path)
+            raise
+        _, _, (view, mapped, file, _), _ = result._finalizer.detach()
+        result._finalizer = weakref.finalize(result, _close, view, mapped, file, path)
+        return result
+
+    def close(self) -> None:
+        """Unmaps the file; temporary results are deleted. Also done when the
+        matrix is garbage collected."""
+        self._finalizer()
+
+    def flush(self) -> None:
+        """Writes modified pages of the mapping back to the file."""
+        if self._writable:
+            self._map.flush()
+
+    def __enter__(self) -> "DiskMatrix":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def __repr__(self) -> str:
+        return f"DiskMatrix({self.path!r}, order={self.order})"
+
+    def __len__(self) -> int:
+        """Returns the number of rows in the matrix"""
+        return self.order[0]
+
+    def _release(self, start: int, stop: int) -> None:
+        """Drops the whole pages of [start, stop) from the mapping; they are
+        read back from the file (or the page cache) if touched again"""
+        page = _mmap.PAGESIZE
+        first, last = -(-start // page) * page, stop // page * page
+        if _DONTNEED is not None and last > first:
+            self._map.madvise(_DONTNEED, first, last - first)
+
+    def _read(self, r0: int, r1: int, c0: int, c1: int) -> Matrix:
+        """Returns a copy of the block [r0, r1) x [c0, c1)"""
+        cols = self.order[1]
+        start, stride, width = (
+            self._offset + 8 * (r0 * cols + c0),
+            8 * cols,
+            8 * (c1 - c0),
+        )
+        stop = start + stride * (r1 - r0 - 1) + width
+        data = array("d")
+        if c0 == 0 and c1 == cols:
+            data.frombytes(self._view[start:stop])
+        else:
+            for row in range(start, stop, stride):
+                data.frombytes(self._view[row : row + width])
+        self._release(start, stop)
+        return Matrix.frombuffer(data, (r1 - r0, c1 - c0))
+
+    def _write(self, r0: int, c0: int, block: Matrix) -> None:
+        """Copies `block` into the elements from (r0, c0) on"""
+        if not self._writable:
+            raise ValueError(f"{self.path!r} is mapped read-only")
+        rows, cols = block.order
+        source = memoryview(_io._payload(block)).cast("B")
+        start, stride, width = (
+            self._offset + 8 * (r0 * self.order[1] + c0),
+            8 * self.order[1],
+            8 * cols,
+        )
+        stop = start + stride * (rows - 1) + width
+        if width == stride:
+            self._view[start:stop] = source
+        else:
+            for i, row in enumerate(range(start, stop, stride)):
+                self._view[row : row + width] = source[i * width : (i + 1) * width]
+        self._release(start, stop)
+
+    def _output(
+        self, out: Optional["DiskMatrix"], order: Tuple[int, int]
+    ) -> "DiskMatrix":
+        if out is None:
+            return self._temporary(order)
+        if not isinstance(out, DiskMatrix):
+            raise TypeError("out must be a DiskMatrix")
+        if out.order != order:
+            raise ValueError(f"out must be a {order[0]}x{order[1]} matrix")
+        if not out._writable:
+            raise ValueError(f"{out.path!r} is mapped read-only")
+        return out
+
+    def iter_rows(self, chunk: Optional[int] = None) -> Iterator[Matrix]:
+        """Returns an iterator over consecutive bands of rows, as matrices.
+
+        Only the band being returned is held in memory.
+
+        Parameters
+        ----------
+        chunk (int, optional)
+            The rows per band (the last one may be shorter). Defaults to as
+            many rows as fill one tile.
+
+        Returns
+        -------
+        iterator of Matrix
+        """
+        rows, cols = self.order
+        if chunk is None:
+            chunk = max(1, self.tile * self.tile // cols)
+        elif chunk < 1:
+            raise ValueError("chunk must be positive")
+        for r0, r1 in _blocks(rows, chunk):
+            yield self._read(r0, r1, 0, cols)
+
+    def __iter__(self) -> Iterator[List[float]]:
+        """Returns an iterator over the rows of the matrix, as lists"""
+        for band in self.iter_rows():
+            yield from band
+
+    def to_matrix(self) -> Matrix:
+        """Returns the whole matrix, read into memory."""
+        rows, cols = self.order
+        return self._read(0, rows, 0, cols)
+
+    def add(
+        self, other: Union["DiskMatrix", Matrix], out: Optional["DiskMatrix"] = None
+    ) -> "DiskMatrix":
+        """Returns the sum of the matrices, a tile's worth of rows at a time.
+
+        Parameters
+        ----------
+        other (DiskMatrix or Matrix)
+            The matrix to add.
+        out (DiskMatrix, optional)
+            A writable matrix of the same order to hold the result. It may
+            be this matrix or `other`. Defaults to a temporary file next to
+            this one.
+
+        Returns
+        -------
+        DiskMatrix :
+            The sum.
+        """
+        if not isinstance(other, (DiskMatrix, Matrix)):
+            raise TypeError("Can only add a DiskMatrix or a Matrix to a DiskMatrix")
+        if other.order != self.order:
+            raise ValueError("The 2 matrices do not have the same order.")
+        out = self._output(out, self.order)
+        rows, cols = self.order
+        width = min(cols, self.tile * self.tile)
+        height = max(1, self.tile * self.tile // width)
+        for r0, r1 in _blocks(rows, height):
+            for c0, c1 in _blocks(cols, width):
+                block = self._read(r0, r1, c0, c1)
+                block += _block(other, r0, r1, c0, c1)
+                out._write(r0, c0, block)
+        return out
+
+    def __add__(self, other: Any) -> "DiskMatrix":
+        if not isinstance(other, (DiskMatrix, Matrix)):
+            return NotImplemented
+        return self.add(other)
+
+    def transpose(self, out: Optional["DiskMatrix"] = None) -> "DiskMatrix":
+        """Returns the transpose, one tile at a time.
+
+        Parameters
+        ----------
+        out (DiskMatrix, optional)
+            A writable cols x rows matrix to hold the result, other than this
+            one. Defaults to a temporary file next to this one.
+
+        Returns
+        -------
+        DiskMatrix :
+            The transposed matrix.
+        """
+        rows, cols = self.order
+        out = self._output(out, (cols, rows))
+        if _same_file(out, self):
+            raise ValueError("out must not be the matrix being transposed")
+        for r0, r1 in _blocks(rows, self.tile):
+            for c0, c1 in _blocks(cols, self.tile):
+                out._write(c0, r0, self._read(r0, r1, c0, c1).transpose())
+        return out
+
+    @property
+    def T(self) -> "DiskMatrix":
+        """The transpose, written to a temporary file"""
+        return self.transpose()
+
+    def matmul(
+        self, other: Union["DiskMatrix", Matrix], out: Optional["DiskMatrix"] = None
+    ) -> "DiskMatrix":
+        """Returns the matrix product, formed one output tile at a time.
+
+        Each output tile is the sum of the products of a row of tiles of
+        this matrix with a column of tiles of `other`, each product done by
+        Matrix.matmul. When `max_tiles` allows it, the row of tiles of this
+        matrix stays in memory for the whole row of output tiles, so it is
+        read only once.
+
+        Parameters
+        ----------
+        other (DiskMatrix or Matrix)
+            The right operand.
+        out (DiskMatrix, optional)
+            A writable matrix to hold the result, other than the operands.
+            Defaults to a temporary file next to this one.
+
+        Returns
+        -------
+        DiskMatrix :
+            The product.
+        """
+        if not isinstance(other, (DiskMatrix, Matrix)):
+            raise TypeError(
+                "Can only multiply a DiskMatrix by a DiskMatrix or a Matrix"
+            )
+        return _matmul(self, other, out, self)
+
+    def __matmul__(self, other: Any) -> "DiskMatrix":
+        if not isinstance(other, (DiskMatrix, Matrix)):
+            return NotImplemented
+        return self.matmul(other)
+
+    def __rmatmul__(self, other: Any) -> "DiskMatrix":
+        if not isinstance(other, Matrix):
+            return NotImplemented
+        return _matmul(other, self, None, self)
+
+
+def _same_file(a: Any, b: Any) -> bool:
+    """Returns True if a and b are DiskMatrix objects mapping the same file"""
+    if a is b:
+        return True
+    return (
+        isinstance(a, DiskMatrix)
+        and isinstance(b, DiskMatrix)
+        and os.path.samefile(a.path, b.path)
+    )
+
+
+def _block(
+    source: Union[DiskMatrix, Matrix], r0: int, r1: int, c0: int, c1: int
+) -> Matrix:
+    """Returns the block [r0, r1) x [c0, c1) of a DiskMatrix or a Matrix"""
+    if isinstance(source, DiskMatrix):
+        return source._read(r0, r1, c0, c1)
+    return source[r0:r1, c0:c1]
+
+
+def _matmul(
+    left: Union[DiskMatrix, Matrix],
+    right: Union[DiskMatrix, Matrix],
+    out: Optional[DiskMatrix],
+    disk: DiskMatrix,
+) -> DiskMatrix:
+    """Returns left @ right, tiled with the options of `disk` (one of the two)."""
+    (m, k), (k2, n) = left.order, right.order
+    if k != k2:
+        raise ValueError("Matrix dimensions incompatible for multiplication")
+    out = disk._output(out, (m, n))
+    if _same_file(out, left) or _same_file(out, right):
+        raise ValueError("out must not be one of the operands")
+    tile = disk.tile
+    inner = _blocks(k, tile)
+    # The tile being summed, the scratch product and the tile of `right` stay too
+    keep_row = len(inner) + 3 <= disk.max_tiles
+    for i0, i1 in _blocks(m, tile):
+        row = [_block(left, i0, i1, p0, p1) for p0, p1 in inner] if keep_row else None
+        for j0, j1 in _blocks(n, tile):
+            total = product = None
+            for p, (p0, p1) in enumerate(inner):
+                a = row[p] if row is not None else _block(left, i0, i1, p0, p1)
+                b = _block(right, p0, p1, j0, j1)
+                if total is None:
+                    total = a @ b
+                else:
+                    product = a.matmul(b, out=product) if product is not None else a @ b
+                    total += product
+            out._write(i0, j0, total)
+    return out
@@ -0,0 +1,97 @@
+"""Binary file format behind Matrix.save() and Matrix.load().
+
+A file is a 32-byte little-endian header followed by the elements as
+row-major little-endian doubles:
+
+    magic    8s   b"MATMATH\\0"
+    version  H    1
+    kind     H    0 (Matrix)
+    unused   I
+    rows     Q
+    cols     Q
+
+The header keeps the elements 8-byte aligned, so a file can be mapped and
+handed to Matrix.frombuffer() without parsing or copying.
+"""
+
+import mmap as _mmap
+import os
+import struct
+import sys
+from array import array
+from typing import Any, Tuple, Type, Union
+
+MAGIC = b"MATMATH\0"
+VERSION = 1
+KIND_MATRIX = 0
+HEADER = struct.Struct("<8sHHIQQ")
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+def _payload(matrix: Any) -> Any:
+    """Returns a contiguous little-endian buffer holding the elements."""
+    try:
+        view = memoryview(matrix)
+    except TypeError:
+        # The pure Python engine has no buffer protocol; its row-major `_data`
+        # is the storage itself, or a compact copy for a strided view
+        view = memoryview(matrix._data)
+    if not view.c_contiguous:
+        view = memoryview(matrix.copy())
+    if sys.byteorder == "big":
+        swapped = array("d", view.cast("B").cast("d"))
+        swapped.byteswap()
+        return swapped
+    return view
+
+
+def _read_header(data: bytes, path: PathLike) -> Tuple[int, int]:
+    if len(data) < HEADER.size:
+        raise ValueError(f"{os.fspath(path)!r} is not a matmath matrix file")
+    magic, version, kind, _, rows, cols = HEADER.unpack(data[: HEADER.size])
+    if magic != MAGIC or kind != KIND_MATRIX:
+        raise ValueError(f"{os.fspath(path)!r} is not a matmath matrix file")
+    if version != VERSION:
+        raise ValueError(f"Unsupported matmath file version {version}")
+    if rows <= 0 or cols <= 0:
+        raise ValueError("Matrix dimensions must be positive")
+    return rows, cols
+
+
+def save(matrix: Any, path: PathLike) -> None:
+    """Writes `matrix` to `path` in the matmath binary format."""
+    rows, cols = matrix.order
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, VERSION, KIND_MATRIX, 0, rows, cols))
+        f.write(_payload(matrix))
+
+
+def load(cls: Type[Any], path: PathLike, mmap: bool = True) -> Any:
+    """Reads a matrix written by save().
+
+    With mmap=True the file is mapped copy-on-write and the matrix shares the
+    mapping: pages are read lazily on first access, are shared with other
+    processes mapping the same file, and writes to the matrix never reach
+    the file.
+    """
+    with open(path, "rb") as f:
+        rows, cols = _read_header(f.read(HEADER.size), path)
+        size = rows * cols * 8
+        if mmap and sys.byteorder == "little":
+            mapped = _mmap.mmap(f.fileno(), 0, access=_mmap.ACCESS_COPY)
+            if len(mapped) < HEADER.size + size:
+                mapped.close()
+                raise ValueError(f"{os.fspath(path)!r} is truncated")
+            return cls.frombuffer(
+                memoryview(mapped)[HEADER.size : HEADER.size + size], (rows, cols)
+            )
+
+        data = bytearray(size)
+        if f.readinto(data) != size:
+            raise ValueError(f"{os.fspath(path)!r} is truncated")
+    if sys.byteorder == "big":
+        swapped = array("d", bytes(data))
+        swapped.byteswap()
+        data = bytearray(swapped.tobytes())
+    return cls.frombuffer(data, (rows, cols))
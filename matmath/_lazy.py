@@ -0,0 +1,190 @@
+"""Lazy, fused element-wise expressions.
+
+Every eager operator allocates its result and makes one pass over memory, so
+``(A + B) * 0.5 - C / D`` costs four passes and four matrices of temporaries.
+Matrices wrapped with ``lazy()`` record the operators applied to them in an
+expression tree instead; ``eval()`` compiles the tree to postfix code that the
+engine runs block by block in one pass, writing only the final result.
+
+Only element-wise operators are recorded: ``+``, ``-``, ``*``, ``/`` and
+``//`` between matrices of one order and numbers, and unary ``-``. The
+matrices are read when the expression is evaluated, not when it is built.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from matmath import Matrix
+
+if Matrix.__module__ == "matmath.legacy.matrix":
+    from matmath.legacy import matrix as _engine
+else:
+    from matmath import _matrix as _engine
+
+__all__ = ["LazyMatrix", "lazy"]
+
+# Opcodes of the postfix code run by _fused in both engines
+_LOAD, _CONST, _ADD, _SUB, _MUL, _DIV, _FLOORDIV, _NEG = range(8)
+
+number = Union[int, float]
+Operand = Union["LazyMatrix", float]
+
+
+class LazyMatrix:
+    """An element-wise expression over matrices, evaluated on demand.
+
+    Created with matmath.lazy(). Combining a LazyMatrix with a Matrix, another
+    LazyMatrix or a number gives a new LazyMatrix; nothing is computed until
+    eval() is called.
+
+    Attributes
+    ----------
+    order (tuple)
+        The (rows, cols) of the result.
+    """
+
+    __slots__ = ("_op", "_args", "order")
+
+    def __init__(self, op: int, args: Tuple[Any, ...], order: Tuple[int, int]) -> None:
+        self._op = op
+        self._args = args
+        self.order = order
+
+    def __repr__(self) -> str:
+        return f"LazyMatrix(order={self.order})"
+
+    @staticmethod
+    def _operand(other: Any) -> Optional[Operand]:
+        if isinstance(other, LazyMatrix):
+            return other
+        if isinstance(other, Matrix):
+            return LazyMatrix(_LOAD, (other,), other.order)
+        if isinstance(other, (int, float)):
+            return float(other)
+        return None
+
+    def _binary(self, op: int, other: Any, reflected: bool = False) -> "LazyMatrix":
+        operand = self._operand(other)
+        if operand is None:
+            return NotImplemented
+        if isinstance(operand, LazyMatrix) and operand.order != self.order:
+            raise ValueError("The 2 matrices do not have the same order.")
+        return LazyMatrix(
+            op, (operand, self) if reflected else (self, operand), self.order
+        )
+
+    def __add__(self, other: Any) -> "LazyMatrix":
+        return self._binary(_ADD, other)
+
+    def __radd__(self, other: Any) -> "LazyMatrix":
+        return self._binary(_ADD, other, reflected=True)
+
+    def __sub__(self, other: Any) -> "LazyMatrix":
+        return self._binary(_SUB, other)
+
+    def __rsub__(self, other: Any) -> "LazyMatrix":
+        return self._binary(_SUB, other, reflected=True)
+
+    def __mul__(self, other: Any) -> "LazyMatrix":
+        return self._binary(_MUL, other)
+
+    def __rmul__(self, other: Any) -> "LazyMatrix":
+        return self._binary(_MUL, other, reflected=True)
+
+    def __truediv__(self, other: Any) -> "LazyMatrix":
+        return self._binary(_DIV, other)
+
+    def __rtruediv__(self, other: Any) -> "LazyMatrix":
+        return self._binary(_DIV, other, reflected=True)
+
+    def __floordiv__(self, other: Any) -> "LazyMatrix":
+        return self._binary(_FLOORDIV, other)
+
+    def __rfloordiv__(self, other: Any) -> "LazyMatrix":
+        return self._binary(_FLOORDIV, other, reflected=True)
+
+    def __neg__(self) -> "LazyMatrix":
+        return LazyMatrix(_NEG, (self,), self.order)
+
+    def __pos__(self) -> "LazyMatrix":
+        return self
+
+    def _compile(self) -> Tuple[List[int], List[Any], List[float]]:
+        """Returns the postfix code of the expression as flat (opcode,
+        argument) pairs, with the distinct matrices and the constants it uses."""
+        code: List[int] = []
+        operands: List[Any] = []
+        constants: List[float] = []
+        index: Dict[int, int] = {}
+        # Iterative post-order walk, so long chains cannot hit the recursion limit
+        todo: List[Tuple[Operand, bool]] = [(self, False)]
+        while todo:
+            node, ready = todo.pop()
+            if isinstance(node, float):
+                code += (_CONST, len(constants))
+                constants.append(node)
+            elif node._op == _LOAD:
+                matrix = node._args[0]
+                k = index.setdefault(id(matrix), len(operands))
+                if k == len(operands):
+                    operands.append(matrix)
+                code += (_LOAD, k)
+            elif ready:
+                code += (node._op, 0)
+            else:
+                todo.append((node, True))
+                todo.extend((arg, False) for arg in reversed(node._args))
+        return code, operands, constants
+
+    def eval(self, out: Optional[Any] = None) -> Any:
+        """Evaluates the expression in one pass over its matrices.
+
+        Parameters
+        ----------
+        out (Matrix, optional)
+            A matrix of the same order to hold the result. It may be one of
+            the matrices in the expression. If a division by zero is raised,
+            `out` may have been partly written.
+
+        Returns
+        -------
+        Matrix :
+            `out`, or a new matrix when `out` is None.
+
+        Raises
+        ------
+        ZeroDivisionError
+            If the expression divides by zero.
+        """
+        code, operands, constants = self._compile()
+        return _engine._fused(code, operands, constants, out)
+
+
+def lazy(*matrices: Any) -> Any:
+    """Wraps matrices so the element-wise operators applied to them are fused.
+
+    Example
+    -------
+    >>> a, b, c, d = matmath.lazy(A, B, C, D)
+    >>> E = ((a + b) * 0.5 - c / d).eval()  # one pass, one allocation
+
+    A Matrix operand on the left of an operator does not defer to a
+    LazyMatrix, so wrap every matrix that can appear there.
+
+    Parameters
+    ----------
+    *matrices (Matrix)
+        The matrices to wrap.
+
+    Returns
+    -------
+    LazyMatrix or tuple :
+        One LazyMatrix per matrix; a single one when given a single matrix.
+    """
+    wrapped = []
+    for matrix in matrices:
+        if not isinstance(matrix, (Matrix, LazyMatrix)):
+            raise TypeError("lazy() takes Matrix arguments")
+        wrapped.append(LazyMatrix._operand(matrix))
+    if len(wrapped) == 1:
+        return wrapped[0]
+    return tuple(wrapped)
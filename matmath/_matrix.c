@@ -1,80 +1,2445 @@
 #define PY_SSIZE_T_CLEAN
 #include <Python.h>
+#include <float.h>
 #include <math.h>
+#include <stdint.h>
+#include <string.h>
 #include <structmember.h>
+#include "_parallel.h"
+#include "_matrix.h"
+#include "_vector.h"
 
-/* Matrix object structure */
+/* Forward declarations */
+static PyTypeObject MatrixType;
+
+/* Vector C API, imported from matmath._vector at module initialization */
+static MatmathVectorAPI *VectorAPI = NULL;
+
+/* Operation counters (see _profile.h)
+ *
+ * mm_profiling is the switch set by matmath.set_profiling(). The counters
+ * are only updated with the GIL held.
+ */
+typedef struct {
+    long long calls;
+    double total_time;
+    double max_time;
+    double bytes;
+    double flops;
+} ProfileCounter;
+
+static int mm_profiling = 0;
+static ProfileCounter mm_profile_counters[MM_OP_COUNT];
+
+static const char *const mm_profile_names[MM_OP_COUNT] = {
+    "add", "sub", "mul", "truediv", "floordiv", "matmul", "matvec", "apply", "transpose",
+    "copy", "determinant", "inverse", "adjoint", "lu", "solve", "solve_triangular", "cholesky",
+    "qr", "eigh", "pow", "fused", "sparse_matmul",
+};
+
+/* Helper function adding one call started at `start` to the counters */
+static void mm_profile_record(mm_op op, double start, double bytes, double flops) {
+    double elapsed = mm_clock() - start;
+    ProfileCounter *counter = &mm_profile_counters[op];
+    counter->calls++;
+    counter->total_time += elapsed;
+    if (elapsed > counter->max_time) {
+        counter->max_time = elapsed;
+    }
+    counter->bytes += bytes;
+    counter->flops += flops;
+}
+
+#define PROFILE_START MM_PROFILE_START(mm_profiling)
+#define PROFILE_STOP(op, bytes, flops) MM_PROFILE_STOP(mm_profile_record, op, bytes, flops)
+
+/* Helper function to allocate a contiguous rows x cols block */
+static double* alloc_matrix(Py_ssize_t rows, Py_ssize_t cols) {
+    if (rows < 0 || cols < 0 ||
+        (cols != 0 && rows > PY_SSIZE_T_MAX / cols / (Py_ssize_t)sizeof(double))) {
+        return NULL;
+    }
+    size_t size = (size_t)(rows * cols) * sizeof(double);
+    return (double *)PyMem_Malloc(size ? size : 1);
+}
+
+/* Helper function to free a block returned by alloc_matrix */
+static void free_matrix(double *data) {
+    if (data != NULL) {
+        PyMem_Free(data);
+    }
+}
+
+/* Freelist of deallocated Matrix objects
+ *
+ * Instances of Matrix itself (not of subclasses) are kept here on
+ * deallocation and reused by Matrix_obtain; together with the inline storage
+ * this makes a new matrix of up to 4 x 4 allocation free. Only touched with
+ * the GIL held.
+ */
+#define MATRIX_FREELIST_SIZE 128
+static MatrixObject *matrix_freelist[MATRIX_FREELIST_SIZE];
+static int matrix_numfree = 0;
+
+/* Helper function to create a new, empty Matrix, from the freelist when possible */
+static MatrixObject* Matrix_obtain(void) {
+    if (matrix_numfree > 0) {
+        MatrixObject *self = matrix_freelist[--matrix_numfree];
+        PyObject_Init((PyObject *)self, &MatrixType);
+        self->data = NULL;
+        self->rows = 0;
+        self->cols = 0;
+        self->row_stride = 0;
+        self->col_stride = 0;
+        self->base = NULL;
+        self->exports = 0;
+        self->busy = 0;
+        self->cache = NULL;
+        self->version = 0;
+        self->buffer_exports = 0;
+        return self;
+    }
+    return (MatrixObject *)MatrixType.tp_alloc(&MatrixType, 0);
+}
+
+/* Helper function to create a new Matrix with uninitialised storage */
+static MatrixObject* Matrix_alloc(Py_ssize_t rows, Py_ssize_t cols) {
+    MatrixObject *self = Matrix_obtain();
+    if (self != NULL) {
+        if (rows >= 0 && cols >= 0 && (cols == 0 || rows <= MATRIX_INLINE_SIZE / cols)) {
+            self->data = self->inline_data;
+        } else {
+            self->data = alloc_matrix(rows, cols);
+            if (self->data == NULL) {
+                Py_DECREF(self);
+                return (MatrixObject *)PyErr_NoMemory();
+            }
+        }
+        self->rows = rows;
+        self->cols = cols;
+        self->row_stride = cols;
+        self->col_stride = 1;
+    }
+    return self;
+}
+
+/* Helper function to release the storage of a Matrix */
+static void Matrix_release_data(MatrixObject *self) {
+    if (self->base != NULL) {
+        if (PyObject_TypeCheck(self->base, &MatrixType)) {
+            ((MatrixObject *)self->base)->exports--;
+        }
+        Py_CLEAR(self->base);
+    } else if (self->data != self->inline_data) {
+        free_matrix(self->data);
+    }
+    self->data = NULL;
+}
+
+/* Helper function to check a buffer holds native doubles */
+static int is_double_format(const char *format) {
+    if (format == NULL) {
+        return 0;
+    }
+    if (format[0] == '@' || format[0] == '=' ||
+#if PY_LITTLE_ENDIAN
+        format[0] == '<'
+#else
+        format[0] == '>' || format[0] == '!'
+#endif
+    ) {
+        format++;
+    }
+    return strcmp(format, "d") == 0;
+}
+
+/* Helper function to check a buffer holds raw bytes */
+static int is_byte_format(const char *format) {
+    return format == NULL || strcmp(format, "B") == 0 ||
+           strcmp(format, "b") == 0 || strcmp(format, "c") == 0;
+}
+
+/* Blocked matrix multiplication
+ *
+ * C = A @ B for row-major operands with leading dimensions lda, ldb, ldc.
+ * Large products follow the usual GotoBLAS layout: a KC x NC panel of B is
+ * packed into NR-wide column strips (kept in L2/L3), an MC x KC block of A is
+ * packed into MR-tall row strips (kept in L2), and a fixed-size MR x NR
+ * micro-kernel accumulates in registers while streaming both packed strips
+ * from L1. The fixed trip counts let the compiler vectorise the micro-kernel.
+ */
+#define GEMM_MR 4
+#define GEMM_NR 8
+#define GEMM_MC 64
+#define GEMM_KC 256
+#define GEMM_NC 1024
+
+/* Products smaller than this (in multiply-adds) skip packing */
+#define GEMM_SMALL 32768
+
+static void gemm_pack_a(Py_ssize_t mc, Py_ssize_t kc, const double *a, Py_ssize_t lda, double *buf) {
+    for (Py_ssize_t i = 0; i < mc; i += GEMM_MR) {
+        for (Py_ssize_t k = 0; k < kc; k++) {
+            for (Py_ssize_t r = 0; r < GEMM_MR; r++) {
+                *buf++ = (i + r < mc) ? a[(i + r) * lda + k] : 0.0;
+            }
+        }
+    }
+}
+
+static void gemm_pack_b(Py_ssize_t kc, Py_ssize_t nc, const double *b, Py_ssize_t ldb, double *buf) {
+    for (Py_ssize_t j = 0; j < nc; j += GEMM_NR) {
+        if (j + GEMM_NR <= nc) {
+            for (Py_ssize_t k = 0; k < kc; k++) {
+                const double *src = b + k * ldb + j;
+                for (Py_ssize_t c = 0; c < GEMM_NR; c++) {
+                    *buf++ = src[c];
+                }
+            }
+        } else {
+            for (Py_ssize_t k = 0; k < kc; k++) {
+                for (Py_ssize_t c = 0; c < GEMM_NR; c++) {
+                    *buf++ = (j + c < nc) ? b[k * ldb + j + c] : 0.0;
+                }
+            }
+        }
+    }
+}
+
+static void gemm_micro_kernel(Py_ssize_t kc, const double *restrict pa, const double *restrict pb,
+                              double *c, Py_ssize_t ldc, Py_ssize_t mr, Py_ssize_t nr) {
+    double acc[GEMM_MR][GEMM_NR] = {{0.0}};
+    
+    for (Py_ssize_t k = 0; k < kc; k++) {
+        for (int r = 0; r < GEMM_MR; r++) {
+            const double a = pa[r];
+            for (int col = 0; col < GEMM_NR; col++) {
+                acc[r][col] += a * pb[col];
+            }
+        }
+        pa += GEMM_MR;
+        pb += GEMM_NR;
+    }
+    
+    if (mr == GEMM_MR && nr == GEMM_NR) {
+        for (int r = 0; r < GEMM_MR; r++) {
+            for (int col = 0; col < GEMM_NR; col++) {
+                c[r * ldc + col] += acc[r][col];
+            }
+        }
+    } else {
+        for (Py_ssize_t r = 0; r < mr; r++) {
+            for (Py_ssize_t col = 0; col < nr; col++) {
+                c[r * ldc + col] += acc[r][col];
+            }
+        }
+    }
+}
+
+/* Computes C = A @ B (or C += A @ B when accumulate is set); returns -1 if
+ * the packing buffers cannot be allocated. Safe to call without the GIL. */
+static int gemm(Py_ssize_t m, Py_ssize_t n, Py_ssize_t p,
+                const double *a, Py_ssize_t lda, const double *b, Py_ssize_t ldb,
+                double *c, Py_ssize_t ldc, int accumulate) {
+    if (!accumulate) {
+        for (Py_ssize_t i = 0; i < m; i++) {
+            memset(c + i * ldc, 0, (size_t)n * sizeof(double));
+        }
+    }
+    
+    if (m * n * p <= GEMM_SMALL) {
+        /* i-k-j order so the inner loop streams along rows of B and C */
+        for (Py_ssize_t i = 0; i < m; i++) {
+            double *c_row = c + i * ldc;
+            const double *a_row = a + i * lda;
+            for (Py_ssize_t k = 0; k < p; k++) {
+                const double a_ik = a_row[k];
+                const double *b_row = b + k * ldb;
+                for (Py_ssize_t j = 0; j < n; j++) {
+                    c_row[j] += a_ik * b_row[j];
+                }
+            }
+        }
+        return 0;
+    }
+    
+    double *pack_a = (double *)PyMem_RawMalloc(GEMM_MC * GEMM_KC * sizeof(double));
+    double *pack_b = (double *)PyMem_RawMalloc(
+        (size_t)GEMM_KC * (GEMM_NC + GEMM_NR) * sizeof(double));
+    if (pack_a == NULL || pack_b == NULL) {
+        PyMem_RawFree(pack_a);
+        PyMem_RawFree(pack_b);
+        return -1;
+    }
+    
+    for (Py_ssize_t jc = 0; jc < n; jc += GEMM_NC) {
+        Py_ssize_t nc = n - jc < GEMM_NC ? n - jc : GEMM_NC;
+        for (Py_ssize_t pc = 0; pc < p; pc += GEMM_KC) {
+            Py_ssize_t kc = p - pc < GEMM_KC ? p - pc : GEMM_KC;
+            gemm_pack_b(kc, nc, b + pc * ldb + jc, ldb, pack_b);
+            for (Py_ssize_t ic = 0; ic < m; ic += GEMM_MC) {
+                Py_ssize_t mc = m - ic < GEMM_MC ? m - ic : GEMM_MC;
+                gemm_pack_a(mc, kc, a + ic * lda + pc, lda, pack_a);
+                for (Py_ssize_t jr = 0; jr < nc; jr += GEMM_NR) {
+                    Py_ssize_t nr = nc - jr < GEMM_NR ? nc - jr : GEMM_NR;
+                    for (Py_ssize_t ir = 0; ir < mc; ir += GEMM_MR) {
+                        Py_ssize_t mr = mc - ir < GEMM_MR ? mc - ir : GEMM_MR;
+                        gemm_micro_kernel(kc, pack_a + ir * kc, pack_b + jr * kc,
+                                          c + (ic + ir) * ldc + jc + jr, ldc, mr, nr);
+                    }
+                }
+            }
+        }
+    }
+    
+    PyMem_RawFree(pack_a);
+    PyMem_RawFree(pack_b);
+    return 0;
+}
+
+/* Parallel matrix multiplication
+ *
+ * Large products are split into bands of C (rows when C is tall, columns
+ * otherwise); each band is an independent gemm() call with its own packing
+ * buffers.
+ */
+#define GEMM_PARALLEL_MIN (1 << 20)
+
+typedef struct {
+    Py_ssize_t m, n, p;
+    const double *a;
+    Py_ssize_t lda;
+    const double *b;
+    Py_ssize_t ldb;
+    double *c;
+    Py_ssize_t ldc;
+    int accumulate;
+    int by_rows;
+    volatile int failed;
+} GemmTask;
+
+static void gemm_range(void *ctx, Py_ssize_t start, Py_ssize_t end) {
+    GemmTask *t = (GemmTask *)ctx;
+    int status;
+    if (t->by_rows) {
+        status = gemm(end - start, t->n, t->p, t->a + start * t->lda, t->lda,
+                      t->b, t->ldb, t->c + start * t->ldc, t->ldc, t->accumulate);
+    } else {
+        status = gemm(t->m, end - start, t->p, t->a, t->lda,
+                      t->b + start, t->ldb, t->c + start, t->ldc, t->accumulate);
+    }
+    if (status < 0) {
+        t->failed = 1;
+    }
+}
+
+/* gemm() spread over the worker pool; call without the GIL */
+static int gemm_parallel(Py_ssize_t m, Py_ssize_t n, Py_ssize_t p,
+                         const double *a, Py_ssize_t lda, const double *b, Py_ssize_t ldb,
+                         double *c, Py_ssize_t ldc, int accumulate) {
+    if (mm_num_threads < 2 || m * n * p < GEMM_PARALLEL_MIN) {
+        return gemm(m, n, p, a, lda, b, ldb, c, ldc, accumulate);
+    }
+    GemmTask task = {m, n, p, a, lda, b, ldb, c, ldc, accumulate, m >= n, 0};
+    if (task.by_rows) {
+        mm_parallel_for(m, GEMM_MC, gemm_range, &task);
+    } else {
+        mm_parallel_for(n, GEMM_MC, gemm_range, &task);
+    }
+    return task.failed ? -1 : 0;
+}
+
+/* Matrix-vector products
+ *
+ * gemv computes y = A x for an m x n row-major A, or y = x A (A^T x) when
+ * `transposed` is set. Bands of rows (or of columns for x A, so each thread
+ * streams through A row by row) are split across the pool.
+ */
+#define GEMV_GRAIN 16384
+
+typedef struct {
+    const double *a;
+    const double *x;
+    double *y;
+    Py_ssize_t m, n;
+} GemvTask;
+
+static void gemv_range(void *ctx, Py_ssize_t start, Py_ssize_t end) {
+    GemvTask *t = (GemvTask *)ctx;
+    for (Py_ssize_t i = start; i < end; i++) {
+        const double *row = t->a + i * t->n;
+        double sum = 0.0;
+        for (Py_ssize_t k = 0; k < t->n; k++) {
+            sum += row[k] * t->x[k];
+        }
+        t->y[i] = sum;
+    }
+}
+
+static void gemv_t_range(void *ctx, Py_ssize_t start, Py_ssize_t end) {
+    GemvTask *t = (GemvTask *)ctx;
+    double *y = t->y;
+    for (Py_ssize_t j = start; j < end; j++) {
+        y[j] = 0.0;
+    }
+    for (Py_ssize_t i = 0; i < t->m; i++) {
+        const double *row = t->a + i * t->n;
+        double xi = t->x[i];
+        for (Py_ssize_t j = start; j < end; j++) {
+            y[j] += xi * row[j];
+        }
+    }
+}
+
+static void gemv(const double *a, const double *x, double *y, Py_ssize_t m, Py_ssize_t n, int transposed) {
+    GemvTask task = {a, x, y, m, n};
+    MM_BEGIN_ALLOW_THREADS(m * n)
+    if (transposed) {
+        mm_parallel_for(n, GEMV_GRAIN / (m > 0 ? m : 1) + 1, gemv_t_range, &task);
+    } else {
+        mm_parallel_for(m, GEMV_GRAIN / (n > 0 ? n : 1) + 1, gemv_range, &task);
+    }
+    MM_END_ALLOW_THREADS
+}
+
+/* Element-wise kernels
+ *
+ * out[k] = a[k] (op) b[k], or a[k] (op) scalar when b is NULL. `out` may
+ * alias `a`. Large arrays are split across the worker pool.
+ */
+#define ELEMENTWISE_GRAIN 32768
+
+typedef enum {
+    EW_ADD,
+    EW_SUB,
+    EW_MUL,
+    EW_DIV,
+    EW_FLOORDIV,
+} ElementwiseOp;
+
+typedef struct {
+    ElementwiseOp op;
+    const double *a;
+    const double *b;
+    double scalar;
+    double *out;
+} ElementwiseTask;
+
+#define EW_LOOP(expr) \
+    for (Py_ssize_t k = start; k < end; k++) { \
+        out[k] = (expr); \
+    }
+
+static void elementwise_range(void *ctx, Py_ssize_t start, Py_ssize_t end) {
+    ElementwiseTask *t = (ElementwiseTask *)ctx;
+    const double *a = t->a;
+    const double *b = t->b;
+    const double s = t->scalar;
+    double *out = t->out;
+    
+    switch (t->op) {
+    case EW_ADD:
+        if (b != NULL) {
+            EW_LOOP(a[k] + b[k])
+        } else {
+            EW_LOOP(a[k] + s)
+        }
+        break;
+    case EW_SUB:
+        if (b != NULL) {
+            EW_LOOP(a[k] - b[k])
+        } else {
+            EW_LOOP(a[k] - s)
+        }
+        break;
+    case EW_MUL:
+        if (b != NULL) {
+            EW_LOOP(a[k] * b[k])
+        } else {
+            EW_LOOP(a[k] * s)
+        }
+        break;
+    case EW_DIV:
+        if (b != NULL) {
+            EW_LOOP(a[k] / b[k])
+        } else {
+            EW_LOOP(a[k] / s)
+        }
+        break;
+    case EW_FLOORDIV:
+        if (b != NULL) {
+            EW_LOOP(floor(a[k] / b[k]))
+        } else {
+            EW_LOOP(floor(a[k] / s))
+        }
+        break;
+    }
+}
+
+/* Returns 1 if any of the n values is zero */
+static int contains_zero(const double *values, Py_ssize_t n) {
+    int found = 0;
+    for (Py_ssize_t k = 0; k < n; k++) {
+        found |= values[k] == 0.0;
+    }
+    return found;
+}
+
+/* Runs an element-wise kernel, releasing the GIL for large inputs.
+ * Divisions by zero raise ZeroDivisionError before anything is written. */
+static int elementwise(ElementwiseOp op, const double *a, const double *b, double scalar,
+                       double *out, Py_ssize_t n) {
+    if (op == EW_DIV || op == EW_FLOORDIV) {
+        int zero;
+        if (b == NULL) {
+            zero = scalar == 0.0;
+        } else {
+            MM_BEGIN_ALLOW_THREADS(n)
+            zero = contains_zero(b, n);
+            MM_END_ALLOW_THREADS
+        }
+        if (zero) {
+            PyErr_SetString(PyExc_ZeroDivisionError, "Division by zero");
+            return -1;
+        }
+    }
+    
+    ElementwiseTask task = {op, a, b, scalar, out};
+    MM_BEGIN_ALLOW_THREADS(n)
+    mm_parallel_for(n, ELEMENTWISE_GRAIN, elementwise_range, &task);
+    MM_END_ALLOW_THREADS
+    return 0;
+}
+
+/* Tiled transpose
+ *
+ * dst (cols x rows) = src (rows x cols)^T, copied in square tiles so both
+ * source and destination stay in cache. Row tiles are split across the pool.
+ */
+#define TRANSPOSE_TILE 32
+
+typedef struct {
+    const double *src;
+    double *dst;
+    Py_ssize_t rows;
+    Py_ssize_t cols;
+} TransposeTask;
+
+static void transpose_range(void *ctx, Py_ssize_t start, Py_ssize_t end) {
+    TransposeTask *t = (TransposeTask *)ctx;
+    Py_ssize_t rows = t->rows, cols = t->cols;
+    for (Py_ssize_t tile_i = start; tile_i < end; tile_i++) {
+        Py_ssize_t ii = tile_i * TRANSPOSE_TILE;
+        Py_ssize_t i_end = ii + TRANSPOSE_TILE < rows ? ii + TRANSPOSE_TILE : rows;
+        for (Py_ssize_t jj = 0; jj < cols; jj += TRANSPOSE_TILE) {
+            Py_ssize_t j_end = jj + TRANSPOSE_TILE < cols ? jj + TRANSPOSE_TILE : cols;
+            for (Py_ssize_t i = ii; i < i_end; i++) {
+                for (Py_ssize_t j = jj; j < j_end; j++) {
+                    t->dst[j * rows + i] = t->src[i * cols + j];
+                }
+            }
+        }
+    }
+}
+
+static void transpose(const double *src, double *dst, Py_ssize_t rows, Py_ssize_t cols) {
+    TransposeTask task = {src, dst, rows, cols};
+    Py_ssize_t tiles = (rows + TRANSPOSE_TILE - 1) / TRANSPOSE_TILE;
+    MM_BEGIN_ALLOW_THREADS(rows * cols)
+    mm_parallel_for(tiles, (ELEMENTWISE_GRAIN / TRANSPOSE_TILE) / (cols > 0 ? cols : 1) + 1,
+                    transpose_range, &task);
+    MM_END_ALLOW_THREADS
+}
+
+/* Strided copies
+ *
+ * Views select a rows x cols window of another matrix with arbitrary element
+ * strides. strided_pack gathers such a window into a compact row-major block
+ * (falling back to the tiled transpose when the window is a transposed
+ * compact block) and strided_unpack scatters a compact block back into one.
+ */
+static void strided_pack(const double *src, Py_ssize_t rows, Py_ssize_t cols,
+                         Py_ssize_t row_stride, Py_ssize_t col_stride, double *dst) {
+    if (col_stride != 1 && row_stride == 1 && col_stride == rows) {
+        transpose(src, dst, cols, rows);
+        return;
+    }
+    
+    MM_BEGIN_ALLOW_THREADS(rows * cols)
+    for (Py_ssize_t i = 0; i < rows; i++) {
+        const double *row = src + i * row_stride;
+        double *out = dst + i * cols;
+        if (col_stride == 1) {
+            memcpy(out, row, (size_t)cols * sizeof(double));
+        } else {
+            for (Py_ssize_t j = 0; j < cols; j++) {
+                out[j] = row[j * col_stride];
+            }
+        }
+    }
+    MM_END_ALLOW_THREADS
+}
+
+static void strided_unpack(const double *src, Py_ssize_t rows, Py_ssize_t cols,
+                           Py_ssize_t row_stride, Py_ssize_t col_stride, double *dst) {
+    MM_BEGIN_ALLOW_THREADS(rows * cols)
+    for (Py_ssize_t i = 0; i < rows; i++) {
+        const double *in = src + i * cols;
+        double *row = dst + i * row_stride;
+        if (col_stride == 1) {
+            memcpy(row, in, (size_t)cols * sizeof(double));
+        } else {
+            for (Py_ssize_t j = 0; j < cols; j++) {
+                row[j * col_stride] = in[j];
+            }
+        }
+    }
+    MM_END_ALLOW_THREADS
+}
+
+/* Returns the [lo, hi) address range touched by a strided window */
+static void strided_span(const double *data, Py_ssize_t rows, Py_ssize_t cols,
+                         Py_ssize_t row_stride, Py_ssize_t col_stride,
+                         const double **lo, const double **hi) {
+    if (rows == 0 || cols == 0) {
+        *lo = *hi = data;
+        return;
+    }
+    Py_ssize_t row_extent = (rows - 1) * row_stride;
+    Py_ssize_t col_extent = (cols - 1) * col_stride;
+    *lo = data + (row_extent < 0 ? row_extent : 0) + (col_extent < 0 ? col_extent : 0);
+    *hi = data + (row_extent > 0 ? row_extent : 0) + (col_extent > 0 ? col_extent : 0) + 1;
+}
+
+/* Binary exponentiation
+ *
+ * Raises an n x n block to power >= 1 by squaring: `base` holds the running
+ * square (it must start as a copy of the matrix) and `out` the product of
+ * the squares picked so far. Every product goes into a spare block and the
+ * pointers are swapped, so three n x n blocks cover any power. Returns the
+ * block holding the result (one of base/out/tmp; the other two are scratch)
+ * or NULL if gemm() ran out of memory. Call without the GIL.
+ */
+static double* matrix_power(double *base, double *out, double *tmp, Py_ssize_t n, Py_ssize_t power) {
+    int have_result = 0;
+    for (;;) {
+        if (power & 1) {
+            if (have_result) {
+                if (gemm_parallel(n, n, n, out, n, base, n, tmp, n, 0) < 0) {
+                    return NULL;
+                }
+                double *swap = out;
+                out = tmp;
+                tmp = swap;
+            } else {
+                memcpy(out, base, (size_t)(n * n) * sizeof(double));
+                have_result = 1;
+            }
+        }
+        power >>= 1;
+        if (power == 0) {
+            return out;
+        }
+        if (gemm_parallel(n, n, n, base, n, base, n, tmp, n, 0) < 0) {
+            return NULL;
+        }
+        double *swap = base;
+        base = tmp;
+        tmp = swap;
+    }
+}
+
+/* LU factorization with partial pivoting
+ *
+ * lu_factor overwrites the n x n row-major block `a` with L (unit diagonal,
+ * stored below the diagonal) and U (on and above it) so that P A = L U, where
+ * row i was swapped with row piv[i] at step i. Panels of LU_BLOCK columns are
+ * factored column by column; the trailing submatrix is then updated with a
+ * single gemm() per panel. A pivot that is exactly zero is left in place
+ * (the matrix is singular) and its column is skipped.
+ */
+#define LU_BLOCK 64
+
+/* c -= l @ b, with the rows x depth block `l` negated into `scratch` first */
+static int gemm_sub(Py_ssize_t rows, Py_ssize_t cols, Py_ssize_t depth,
+                    const double *l, Py_ssize_t ldl, const double *b, Py_ssize_t ldb,
+                    double *c, Py_ssize_t ldc, double *scratch) {
+    if (rows == 0 || cols == 0 || depth == 0) {
+        return 0;
+    }
+    for (Py_ssize_t i = 0; i < rows; i++) {
+        for (Py_ssize_t k = 0; k < depth; k++) {
+            scratch[i * depth + k] = -l[i * ldl + k];
+        }
+    }
+    return gemm_parallel(rows, cols, depth, scratch, depth, b, ldb, c, ldc, 1);
+}
+
+static void swap_rows(double *a, Py_ssize_t ld, Py_ssize_t i, Py_ssize_t j, Py_ssize_t len) {
+    double *ri = a + i * ld, *rj = a + j * ld;
+    for (Py_ssize_t k = 0; k < len; k++) {
+        double tmp = ri[k];
+        ri[k] = rj[k];
+        rj[k] = tmp;
+    }
+}
+
+/* Returns -1 if scratch memory could not be allocated; call without the GIL */
+static int lu_factor(double *a, Py_ssize_t n, Py_ssize_t *piv, int *sign) {
+    double *scratch = NULL;
+    if (n > LU_BLOCK) {
+        scratch = (double *)PyMem_RawMalloc((size_t)n * LU_BLOCK * sizeof(double));
+        if (scratch == NULL) {
+            return -1;
+        }
+    }
+    
+    *sign = 1;
+    for (Py_ssize_t k0 = 0; k0 < n; k0 += LU_BLOCK) {
+        Py_ssize_t k1 = k0 + LU_BLOCK < n ? k0 + LU_BLOCK : n;
+        
+        /* Factor the panel a[k0:n, k0:k1] */
+        for (Py_ssize_t j = k0; j < k1; j++) {
+            Py_ssize_t p = j;
+            double best = fabs(a[j * n + j]);
+            for (Py_ssize_t i = j + 1; i < n; i++) {
+                double v = fabs(a[i * n + j]);
+                if (v > best) {
+                    best = v;
+                    p = i;
+                }
+            }
+            piv[j] = p;
+            if (p != j) {
+                swap_rows(a, n, j, p, n);
+                *sign = -*sign;
+            }
+            
+            double pivot = a[j * n + j];
+            if (pivot == 0.0) {
+                continue;
+            }
+            const double *pivot_row = a + j * n;
+            for (Py_ssize_t i = j + 1; i < n; i++) {
+                double *row = a + i * n;
+                double l = row[j] /= pivot;
+                if (l != 0.0) {
+                    for (Py_ssize_t k = j + 1; k < k1; k++) {
+                        row[k] -= l * pivot_row[k];
+                    }
+                }
+            }
+        }
+        if (k1 == n) {
+            break;
+        }
+        
+        /* U12 = L11^-1 A12 */
+        for (Py_ssize_t j = k0; j < k1; j++) {
+            const double *pivot_row = a + j * n;
+            for (Py_ssize_t i = j + 1; i < k1; i++) {
+                double *row = a + i * n;
+                double l = row[j];
+                if (l != 0.0) {
+                    for (Py_ssize_t k = k1; k < n; k++) {
+                        row[k] -= l * pivot_row[k];
+                    }
+                }
+            }
+        }
+        
+        /* A22 -= L21 U12 */
+        if (gemm_sub(n - k1, n - k1, k1 - k0, a + k1 * n + k0, n,
+                     a + k0 * n + k1, n, a + k1 * n + k1, n, scratch) < 0) {
+            PyMem_RawFree(scratch);
+            return -1;
+        }
+    }
+    
+    PyMem_RawFree(scratch);
+    return 0;
+}
+
+/* Triangular solves
+ *
+ * Solve T X = B in place for an n x n triangular T (row-major) and an n x k
+ * row-major block B. Only the referenced triangle of T is read; with
+ * unit_diagonal its diagonal is taken to be 1. Rows are processed LU_BLOCK at
+ * a time: the contribution of the rows already solved is subtracted with one
+ * gemm(), then the block itself is solved row by row. `scratch` must hold
+ * n * LU_BLOCK doubles when n > LU_BLOCK.
+ */
+static int trsm_lower(const double *t, Py_ssize_t n, int unit_diagonal,
+                      double *b, Py_ssize_t k, double *scratch) {
+    for (Py_ssize_t i0 = 0; i0 < n; i0 += LU_BLOCK) {
+        Py_ssize_t i1 = i0 + LU_BLOCK < n ? i0 + LU_BLOCK : n;
+        if (gemm_sub(i1 - i0, k, i0, t + i0 * n, n, b, k, b + i0 * k, k, scratch) < 0) {
+            return -1;
+        }
+        for (Py_ssize_t i = i0; i < i1; i++) {
+            double *row = b + i * k;
+            for (Py_ssize_t j = i0; j < i; j++) {
+                double l = t[i * n + j];
+                if (l != 0.0) {
+                    const double *src = b + j * k;
+                    for (Py_ssize_t c = 0; c < k; c++) {
+                        row[c] -= l * src[c];
+                    }
+                }
+            }
+            if (!unit_diagonal) {
+                double diag = t[i * n + i];
+                for (Py_ssize_t c = 0; c < k; c++) {
+                    row[c] /= diag;
+                }
+            }
+        }
+    }
+    return 0;
+}
+
+static int trsm_upper(const double *t, Py_ssize_t n, int unit_diagonal,
+                      double *b, Py_ssize_t k, double *scratch) {
+    for (Py_ssize_t i1 = n; i1 > 0; ) {
+        Py_ssize_t i0 = i1 > LU_BLOCK ? i1 - LU_BLOCK : 0;
+        if (gemm_sub(i1 - i0, k, n - i1, t + i0 * n + i1, n, b + i1 * k, k, b + i0 * k, k, scratch) < 0) {
+            return -1;
+        }
+        for (Py_ssize_t i = i1 - 1; i >= i0; i--) {
+            double *row = b + i * k;
+            for (Py_ssize_t j = i + 1; j < i1; j++) {
+                double u = t[i * n + j];
+                if (u != 0.0) {
+                    const double *src = b + j * k;
+                    for (Py_ssize_t c = 0; c < k; c++) {
+                        row[c] -= u * src[c];
+                    }
+                }
+            }
+            if (!unit_diagonal) {
+                double diag = t[i * n + i];
+                for (Py_ssize_t c = 0; c < k; c++) {
+                    row[c] /= diag;
+                }
+            }
+        }
+        i1 = i0;
+    }
+    return 0;
+}
+
+/* Solves T X = B for a triangular T; returns -1 if scratch memory could not
+ * be allocated. Call without the GIL.
+ */
+static int triangular_solve(const double *t, Py_ssize_t n, int lower, double *b, Py_ssize_t k) {
+    double *scratch = NULL;
+    if (n > LU_BLOCK) {
+        scratch = (double *)PyMem_RawMalloc((size_t)n * LU_BLOCK * sizeof(double));
+        if (scratch == NULL) {
+            return -1;
+        }
+    }
+    int status = lower ? trsm_lower(t, n, 0, b, k, scratch) : trsm_upper(t, n, 0, b, k, scratch);
+    PyMem_RawFree(scratch);
+    return status;
+}
+
+/* Solves A X = B in place, where `b` is n x k row-major and `lu`/`piv` come
+ * from lu_factor. U must have a non-zero diagonal. Returns -1 if scratch
+ * memory could not be allocated; call without the GIL.
+ */
+static int lu_solve(const double *lu, const Py_ssize_t *piv, Py_ssize_t n, double *b, Py_ssize_t k) {
+    double *scratch = NULL;
+    if (n > LU_BLOCK) {
+        scratch = (double *)PyMem_RawMalloc((size_t)n * LU_BLOCK * sizeof(double));
+        if (scratch == NULL) {
+            return -1;
+        }
+    }
+    
+    for (Py_ssize_t i = 0; i < n; i++) {
+        if (piv[i] != i) {
+            swap_rows(b, k, i, piv[i], k);
+        }
+    }
+    int status = trsm_lower(lu, n, 1, b, k, scratch);
+    if (status == 0) {
+        status = trsm_upper(lu, n, 0, b, k, scratch);
+    }
+    
+    PyMem_RawFree(scratch);
+    return status;
+}
+
+/* Cholesky factorization
+ *
+ * Factors a symmetric positive definite n x n matrix (row-major) in place
+ * into the lower triangular L with A = L L^T, reading only the lower triangle.
+ * Blocked like lu_factor: the LU_BLOCK columns of a panel are factored with
+ * dot products over contiguous row segments, then the lower triangle of the
+ * trailing submatrix is updated with one gemm() per LU_BLOCK rows. On success
+ * L^T is mirrored into the upper triangle, so trsm_lower and trsm_upper can
+ * both solve with the result. Returns 1 if the matrix is not positive
+ * definite and -1 if scratch memory could not be allocated; call without the
+ * GIL.
+ */
+static int cholesky_factor(double *a, Py_ssize_t n) {
+    double *scratch = NULL, *panel = NULL;
+    if (n > LU_BLOCK) {
+        scratch = (double *)PyMem_RawMalloc((size_t)LU_BLOCK * LU_BLOCK * sizeof(double));
+        panel = (double *)PyMem_RawMalloc((size_t)n * LU_BLOCK * sizeof(double));
+        if (scratch == NULL || panel == NULL) {
+            PyMem_RawFree(scratch);
+            PyMem_RawFree(panel);
+            return -1;
+        }
+    }
+    
+    int status = 0;
+    for (Py_ssize_t k0 = 0; k0 < n && status == 0; k0 += LU_BLOCK) {
+        Py_ssize_t k1 = k0 + LU_BLOCK < n ? k0 + LU_BLOCK : n;
+        
+        /* Factor the panel a[k0:n, k0:k1] */
+        for (Py_ssize_t j = k0; j < k1; j++) {
+            double *pivot_row = a + j * n;
+            double d = pivot_row[j];
+            for (Py_ssize_t k = k0; k < j; k++) {
+                d -= pivot_row[k] * pivot_row[k];
+            }
+            if (!(d > 0.0)) {
+                status = 1;
+                break;
+            }
+            d = sqrt(d);
+            pivot_row[j] = d;
+            for (Py_ssize_t i = j + 1; i < n; i++) {
+                double *row = a + i * n;
+                double s = row[j];
+                for (Py_ssize_t k = k0; k < j; k++) {
+                    s -= row[k] * pivot_row[k];
+                }
+                row[j] = s / d;
+            }
+        }
+        if (status != 0 || k1 == n) {
+            break;
+        }
+        
+        /* A22 -= L21 L21^T, lower triangle only */
+        Py_ssize_t width = k1 - k0, rest = n - k1;
+        for (Py_ssize_t i = 0; i < rest; i++) {
+            const double *row = a + (k1 + i) * n + k0;
+            for (Py_ssize_t k = 0; k < width; k++) {
+                panel[k * rest + i] = row[k];
+            }
+        }
+        for (Py_ssize_t i0 = k1; i0 < n; i0 += LU_BLOCK) {
+            Py_ssize_t i1 = i0 + LU_BLOCK < n ? i0 + LU_BLOCK : n;
+            if (gemm_sub(i1 - i0, i1 - k1, width, a + i0 * n + k0, n, panel, rest,
+                         a + i0 * n + k1, n, scratch) < 0) {
+                status = -1;
+                break;
+            }
+        }
+    }
+    
+    if (status == 0) {
+        for (Py_ssize_t i = 0; i < n; i++) {
+            for (Py_ssize_t j = 0; j < i; j++) {
+                a[j * n + i] = a[i * n + j];
+            }
+        }
+    }
+    PyMem_RawFree(scratch);
+    PyMem_RawFree(panel);
+    return status;
+}
+
+/* Solves A X = B in place given the factor left by cholesky_factor; returns
+ * -1 if scratch memory could not be allocated. Call without the GIL.
+ */
+static int cholesky_solve(const double *l, Py_ssize_t n, double *b, Py_ssize_t k) {
+    double *scratch = NULL;
+    if (n > LU_BLOCK) {
+        scratch = (double *)PyMem_RawMalloc((size_t)n * LU_BLOCK * sizeof(double));
+        if (scratch == NULL) {
+            return -1;
+        }
+    }
+    int status = trsm_lower(l, n, 0, b, k, scratch);
+    if (status == 0) {
+        status = trsm_upper(l, n, 0, b, k, scratch);
+    }
+    PyMem_RawFree(scratch);
+    return status;
+}
+
+/* Householder QR
+ *
+ * Factors an m x n matrix A = Q R, with Q (m x k) having orthonormal columns
+ * and R (k x n) upper triangular, k = min(m, n). The kernels work on the
+ * n x m transpose `at` of A, so the columns a reflector touches are
+ * contiguous rows. Reflector j is stored LAPACK style next to R's diagonal:
+ * H_j = I - tau[j] v v^T, with v[0] = 1 implied and v[1:] in at[j, j+1:].
+ *
+ * Like lu_factor, panels of QR_BLOCK columns are factored one reflector at a
+ * time (a dot product and an axpy per column). The panel's reflectors are
+ * then combined into the block reflector I - V T V^T (T upper triangular, as
+ * in LAPACK's dlarft), which updates the trailing columns, and later forms
+ * Q, with three gemm() calls.
+ */
+#define QR_BLOCK 32
+
+/* x -= tau v (v . x) for `count` columns of length len, `ld` apart */
+static void reflect(double *x, Py_ssize_t count, Py_ssize_t ld, const double *v, Py_ssize_t len, double tau) {
+    if (tau == 0.0) {
+        return;
+    }
+    for (Py_ssize_t c = 0; c < count; c++, x += ld) {
+        double w = x[0];
+        for (Py_ssize_t i = 1; i < len; i++) {
+            w += v[i] * x[i];
+        }
+        w *= tau;
+        x[0] -= w;
+        for (Py_ssize_t i = 1; i < len; i++) {
+            x[i] -= w * v[i];
+        }
+    }
+}
+
+/* Work space for the block reflectors of an m x n factorization */
+typedef struct {
+    double *vt;              /* V^T, QR_BLOCK x m, with the implied ones and zeros */
+    double *v;               /* V, m x QR_BLOCK */
+    double *t;               /* T, QR_BLOCK x QR_BLOCK */
+    double *w;               /* Products with V, max(m, n) x QR_BLOCK */
+    double *wt;
+    double *scratch;         /* For gemm_sub, max(m, n) x QR_BLOCK */
+} QRWork;
+
+static int QRWork_alloc(QRWork *work, Py_ssize_t m, Py_ssize_t n) {
+    size_t rows = (size_t)(m > n ? m : n);
+    work->vt = (double *)PyMem_RawMalloc((size_t)m * QR_BLOCK * sizeof(double));
+    work->v = (double *)PyMem_RawMalloc((size_t)m * QR_BLOCK * sizeof(double));
+    work->t = (double *)PyMem_RawMalloc((size_t)QR_BLOCK * QR_BLOCK * sizeof(double));
+    work->w = (double *)PyMem_RawMalloc(rows * QR_BLOCK * sizeof(double));
+    work->wt = (double *)PyMem_RawMalloc(rows * QR_BLOCK * sizeof(double));
+    work->scratch = (double *)PyMem_RawMalloc(rows * QR_BLOCK * sizeof(double));
+    if (work->vt == NULL || work->v == NULL || work->t == NULL ||
+        work->w == NULL || work->wt == NULL || work->scratch == NULL) {
+        return -1;
+    }
+    return 0;
+}
+
+static void QRWork_free(QRWork *work) {
+    PyMem_RawFree(work->vt);
+    PyMem_RawFree(work->v);
+    PyMem_RawFree(work->t);
+    PyMem_RawFree(work->w);
+    PyMem_RawFree(work->wt);
+    PyMem_RawFree(work->scratch);
+}
+
+/* Builds V, V^T and T for the reflectors j0 <= j < j0 + nb, with rows j0..m */
+static void qr_block_reflector(const double *at, Py_ssize_t m, Py_ssize_t j0, Py_ssize_t nb,
+                               const double *tau, QRWork *work) {
+    Py_ssize_t len = m - j0;
+    for (Py_ssize_t p = 0; p < nb; p++) {
+        double *row = work->vt + p * len;
+        memset(row, 0, (size_t)p * sizeof(double));
+        row[p] = 1.0;
+        memcpy(row + p + 1, at + (j0 + p) * m + j0 + p + 1, (size_t)(len - p - 1) * sizeof(double));
+        for (Py_ssize_t i = 0; i < len; i++) {
+            work->v[i * nb + p] = row[i];
+        }
+    }
+    
+    /* T[:i, i] = -tau_i T[:i, :i] V[:, :i]^T v_i */
+    double *t = work->t;
+    for (Py_ssize_t i = 0; i < nb; i++) {
+        const double *vi = work->vt + i * len;
+        for (Py_ssize_t p = 0; p < i; p++) {
+            const double *vp = work->vt + p * len;
+            double dot = 0.0;
+            for (Py_ssize_t r = i; r < len; r++) {
+                dot += vp[r] * vi[r];
+            }
+            t[p * nb + i] = -tau[j0 + i] * dot;
+        }
+        for (Py_ssize_t p = 0; p < i; p++) {
+            double sum = 0.0;
+            for (Py_ssize_t q = p; q < i; q++) {
+                sum += t[p * nb + q] * t[q * nb + i];
+            }
+            t[p * nb + i] = sum;
+        }
+        t[i * nb + i] = tau[j0 + i];
+        for (Py_ssize_t p = i + 1; p < nb; p++) {
+            t[p * nb + i] = 0.0;
+        }
+    }
+}
+
+/* Applies H = I - V T V^T (or H^T, with `transposed`) to `count` columns
+ * stored as rows of length len, `ld` apart. With the columns as the rows of
+ * X this is X -= ((X V) T^T) V^T for H, and X -= ((X V) T) V^T for H^T. */
+static int qr_apply_block(double *x, Py_ssize_t count, Py_ssize_t ld, Py_ssize_t len, Py_ssize_t nb,
+                          int transposed, QRWork *work) {
+    if (count == 0) {
+        return 0;
+    }
+    if (gemm_parallel(count, nb, len, x, ld, work->v, nb, work->w, nb, 0) < 0) {
+        return -1;
+    }
+    const double *t = work->t;
+    for (Py_ssize_t r = 0; r < count; r++) {
+        const double *w = work->w + r * nb;
+        double *wt = work->wt + r * nb;
+        for (Py_ssize_t j = 0; j < nb; j++) {
+            double sum = 0.0;
+            if (transposed) {
+                for (Py_ssize_t q = 0; q <= j; q++) {
+                    sum += w[q] * t[q * nb + j];
+                }
+            } else {
+                for (Py_ssize_t q = j; q < nb; q++) {
+                    sum += w[q] * t[j * nb + q];
+                }
+            }
+            wt[j] = sum;
+        }
+    }
+    return gemm_sub(count, len, nb, work->wt, nb, work->vt, len, x, ld, work->scratch);
+}
+
+/* Factors `at` in place, leaving R on and above its diagonal (transposed)
+ * and the reflectors below; `tau` holds k doubles. Call without the GIL.
+ */
+static int qr_factor(double *at, Py_ssize_t m, Py_ssize_t n, double *tau, QRWork *work) {
+    Py_ssize_t k = m < n ? m : n;
+    for (Py_ssize_t j0 = 0; j0 < k; j0 += QR_BLOCK) {
+        Py_ssize_t j1 = j0 + QR_BLOCK < k ? j0 + QR_BLOCK : k;
+        
+        /* Factor the panel at[j0:j1], one reflector at a time */
+        for (Py_ssize_t j = j0; j < j1; j++) {
+            double *x = at + j * m + j;
+            Py_ssize_t len = m - j;
+            double tail = 0.0;
+            for (Py_ssize_t i = 1; i < len; i++) {
+                tail += x[i] * x[i];
+            }
+            
+            /* A column already zero below the diagonal needs no reflection */
+            tau[j] = 0.0;
+            if (tail != 0.0) {
+                double alpha = x[0];
+                double beta = sqrt(alpha * alpha + tail);
+                if (alpha > 0.0) {
+                    beta = -beta;
+                }
+                tau[j] = (beta - alpha) / beta;
+                double scale = 1.0 / (alpha - beta);
+                for (Py_ssize_t i = 1; i < len; i++) {
+                    x[i] *= scale;
+                }
+                x[0] = beta;
+            }
+            reflect(x + m, j1 - j - 1, m, x, len, tau[j]);
+        }
+        
+        /* Apply the panel's block reflector to the trailing columns */
+        if (j1 < n) {
+            qr_block_reflector(at, m, j0, j1 - j0, tau, work);
+            if (qr_apply_block(at + j1 * m + j0, n - j1, m, m - j0, j1 - j0, 1, work) < 0) {
+                return -1;
+            }
+        }
+    }
+    return 0;
+}
+
+/* Forms the k x m transpose of Q from the reflectors left by qr_factor, by
+ * applying the block reflectors in reverse order to the first k columns of
+ * the identity. Call without the GIL.
+ */
+static int qr_form_q(const double *at, Py_ssize_t m, Py_ssize_t n, const double *tau, double *qt,
+                     QRWork *work) {
+    Py_ssize_t k = m < n ? m : n;
+    memset(qt, 0, (size_t)(k * m) * sizeof(double));
+    for (Py_ssize_t i = 0; i < k; i++) {
+        qt[i * m + i] = 1.0;
+    }
+    for (Py_ssize_t j0 = (k - 1) / QR_BLOCK * QR_BLOCK; j0 >= 0; j0 -= QR_BLOCK) {
+        Py_ssize_t j1 = j0 + QR_BLOCK < k ? j0 + QR_BLOCK : k;
+        qr_block_reflector(at, m, j0, j1 - j0, tau, work);
+        if (qr_apply_block(qt + j0 * m + j0, k - j0, m, m - j0, j1 - j0, 0, work) < 0) {
+            return -1;
+        }
+    }
+    return 0;
+}
+
+/* Symmetric eigendecomposition
+ *
+ * Householder reduction to tridiagonal form followed by the implicit QL
+ * algorithm, after tred2 and tql2 of EISPACK. Both kernels keep W = V^T, the
+ * transpose of the eigenvector matrix, so the rotations and reflections run
+ * along contiguous rows. `w` starts as A^T (only the lower triangle of A is
+ * read) and ends with one eigenvector per row; `d` receives the eigenvalues
+ * in ascending order and `e` is n doubles of scratch.
+ */
+#define QL_MAX_ITER 64
+
+static void tridiagonalize(double *w, Py_ssize_t n, double *d, double *e) {
+    for (Py_ssize_t j = 0; j < n; j++) {
+        d[j] = w[j * n + n - 1];
+    }
+    
+    for (Py_ssize_t i = n - 1; i > 0; i--) {
+        double *wi = w + i * n;
+        double scale = 0.0, h = 0.0;
+        for (Py_ssize_t k = 0; k < i; k++) {
+            scale += fabs(d[k]);
+        }
+        if (scale == 0.0) {
+            e[i] = d[i - 1];
+            for (Py_ssize_t j = 0; j < i; j++) {
+                d[j] = w[j * n + i - 1];
+                w[j * n + i] = 0.0;
+                wi[j] = 0.0;
+            }
+        } else {
+            /* Householder vector of row i, scaled to avoid underflow */
+            for (Py_ssize_t k = 0; k < i; k++) {
+                d[k] /= scale;
+                h += d[k] * d[k];
+            }
+            double f = d[i - 1];
+            double g = sqrt(h);
+            if (f > 0.0) {
+                g = -g;
+            }
+            e[i] = scale * g;
+            h -= f * g;
+            d[i - 1] = f - g;
+            for (Py_ssize_t j = 0; j < i; j++) {
+                e[j] = 0.0;
+            }
+            
+            /* e = A d / h, then the similarity transformation */
+            for (Py_ssize_t j = 0; j < i; j++) {
+                double *wj = w + j * n;
+                f = d[j];
+                wi[j] = f;
+                g = e[j] + wj[j] * f;
+                for (Py_ssize_t k = j + 1; k < i; k++) {
+                    g += wj[k] * d[k];
+                    e[k] += wj[k] * f;
+                }
+                e[j] = g;
+            }
+            f = 0.0;
+            for (Py_ssize_t j = 0; j < i; j++) {
+                e[j] /= h;
+                f += e[j] * d[j];
+            }
+            double hh = f / (h + h);
+            for (Py_ssize_t j = 0; j < i; j++) {
+                e[j] -= hh * d[j];
+            }
+            for (Py_ssize_t j = 0; j < i; j++) {
+                double *wj = w + j * n;
+                f = d[j];
+                g = e[j];
+                for (Py_ssize_t k = j; k < i; k++) {
+                    wj[k] -= f * e[k] + g * d[k];
+                }
+                d[j] = wj[i - 1];
+                wj[i] = 0.0;
+            }
+        }
+        d[i] = h;
+    }
+    
+    /* Accumulate the transformations */
+    for (Py_ssize_t i = 0; i < n - 1; i++) {
+        double *wi = w + i * n, *next = w + (i + 1) * n;
+        wi[n - 1] = wi[i];
+        wi[i] = 1.0;
+        double h = d[i + 1];
+        if (h != 0.0) {
+            for (Py_ssize_t k = 0; k <= i; k++) {
+                d[k] = next[k] / h;
+            }
+            for (Py_ssize_t j = 0; j <= i; j++) {
+                double *wj = w + j * n;
+                double g = 0.0;
+                for (Py_ssize_t k = 0; k <= i; k++) {
+                    g += next[k] * wj[k];
+                }
+                for (Py_ssize_t k = 0; k <= i; k++) {
+                    wj[k] -= g * d[k];
+                }
+            }
+        }
+        for (Py_ssize_t k = 0; k <= i; k++) {
+            next[k] = 0.0;
+        }
+    }
+    for (Py_ssize_t j = 0; j < n; j++) {
+        d[j] = w[j * n + n - 1];
+        w[j * n + n - 1] = 0.0;
+    }
+    w[n * n - 1] = 1.0;
+    e[0] = 0.0;
+}
+
+/* Diagonalizes the tridiagonal matrix (d, e) left by tridiagonalize and sorts
+ * the eigenpairs; returns 1 if an eigenvalue does not converge within
+ * QL_MAX_ITER iterations.
+ */
+static int tridiagonal_ql(double *w, Py_ssize_t n, double *d, double *e) {
+    for (Py_ssize_t i = 1; i < n; i++) {
+        e[i - 1] = e[i];
+    }
+    e[n - 1] = 0.0;
+    
+    double f = 0.0, tst1 = 0.0;
+    for (Py_ssize_t l = 0; l < n; l++) {
+        /* Find a small subdiagonal element */
+        double t = fabs(d[l]) + fabs(e[l]);
+        if (t > tst1) {
+            tst1 = t;
+        }
+        Py_ssize_t m = l;
+        while (m < n - 1 && fabs(e[m]) > DBL_EPSILON * tst1) {
+            m++;
+        }
+        
+        int iter = 0;
+        while (m > l && fabs(e[l]) > DBL_EPSILON * tst1) {
+            if (++iter > QL_MAX_ITER) {
+                return 1;
+            }
+            
+            /* Implicit shift */
+            double g = d[l];
+            double p = (d[l + 1] - g) / (2.0 * e[l]);
+            double r = hypot(p, 1.0);
+            if (p < 0.0) {
+                r = -r;
+            }
+            d[l] = e[l] / (p + r);
+            d[l + 1] = e[l] * (p + r);
+            double dl1 = d[l + 1];
+            double h = g - d[l];
+            for (Py_ssize_t i = l + 2; i < n; i++) {
+                d[i] -= h;
+            }
+            f += h;
+            
+            /* QL sweep, rotating pairs of eigenvector rows */
+            p = d[m];
+            double c = 1.0, c2 = 1.0, c3 = 1.0, s = 0.0, s2 = 0.0;
+            double el1 = e[l + 1];
+            for (Py_ssize_t i = m - 1; i >= l; i--) {
+                c3 = c2;
+                c2 = c;
+                s2 = s;
+                g = c * e[i];
+                h = c * p;
+                r = hypot(p, e[i]);
+                e[i + 1] = s * r;
+                s = e[i] / r;
+                c = p / r;
+                p = c * d[i] - s * g;
+                d[i + 1] = h + s * (c * g + s * d[i]);
+                double *wa = w + (i + 1) * n, *wb = w + i * n;
+                for (Py_ssize_t k = 0; k < n; k++) {
+                    double x = wa[k];
+                    wa[k] = s * wb[k] + c * x;
+                    wb[k] = c * wb[k] - s * x;
+                }
+            }
+            p = -s * s2 * c3 * el1 * e[l] / dl1;
+            e[l] = s * p;
+            d[l] = c * p;
+        }
+        d[l] += f;
+        e[l] = 0.0;
+    }
+    
+    /* Selection sort, keeping each eigenvector with its eigenvalue */
+    for (Py_ssize_t i = 0; i < n - 1; i++) {
+        Py_ssize_t k = i;
+        for (Py_ssize_t j = i + 1; j < n; j++) {
+            if (d[j] < d[k]) {
+                k = j;
+            }
+        }
+        if (k != i) {
+            double p = d[k];
+            d[k] = d[i];
+            d[i] = p;
+            swap_rows(w, n, i, k, n);
+        }
+    }
+    return 0;
+}
+
+/* Helper function checking a Matrix is laid out as one compact row-major block */
+static int Matrix_is_contiguous(MatrixObject *m) {
+    return (m->col_stride == 1 || m->cols <= 1) && (m->row_stride == m->cols || m->rows <= 1);
+}
+
+/* Helper function checking whether two matrices share any memory */
+static int Matrix_overlaps(MatrixObject *a, MatrixObject *b) {
+    const double *a_lo, *a_hi, *b_lo, *b_hi;
+    strided_span(a->data, a->rows, a->cols, a->row_stride, a->col_stride, &a_lo, &a_hi);
+    strided_span(b->data, b->rows, b->cols, b->row_stride, b->col_stride, &b_lo, &b_hi);
+    return a_lo < b_hi && b_lo < a_hi;
+}
+
+/* Helper function checking two matrices address exactly the same elements */
+static int Matrix_same_layout(MatrixObject *a, MatrixObject *b) {
+    return a->data == b->data && a->rows == b->rows && a->cols == b->cols &&
+           a->row_stride == b->row_stride && a->col_stride == b->col_stride;
+}
+
+/* Helper function copying a Matrix into a compact row-major block */
+static void Matrix_pack(MatrixObject *m, double *dst) {
+    MM_PIN(m);
+    strided_pack(m->data, m->rows, m->cols, m->row_stride, m->col_stride, dst);
+    MM_UNPIN(m);
+}
+
+/* Helper function copying a compact row-major block into a Matrix */
+static void Matrix_unpack(MatrixObject *m, const double *src) {
+    MM_PIN(m);
+    strided_unpack(src, m->rows, m->cols, m->row_stride, m->col_stride, m->data);
+    MM_UNPIN(m);
+}
+
+/* Helper function copying the transpose of a Matrix into a compact row-major block */
+static void Matrix_pack_transposed(MatrixObject *m, double *dst) {
+    MM_PIN(m);
+    strided_pack(m->data, m->cols, m->rows, m->col_stride, m->row_stride, dst);
+    MM_UNPIN(m);
+}
+
+/* Helper function returning m itself when contiguous, else a compact copy (new reference) */
+static MatrixObject* Matrix_compact(MatrixObject *m) {
+    if (Matrix_is_contiguous(m)) {
+        Py_INCREF(m);
+        return m;
+    }
+    MatrixObject *copy = Matrix_alloc(m->rows, m->cols);
+    if (copy != NULL) {
+        Matrix_pack(m, copy->data);
+    }
+    return copy;
+}
+
+/* Helper function returning m itself when its rows are contiguous (any row
+ * stride, as gemm takes a leading dimension), else a compact copy (new reference) */
+static MatrixObject* Matrix_unit_col_stride(MatrixObject *m) {
+    if (m->col_stride == 1 || m->cols <= 1) {
+        Py_INCREF(m);
+        return m;
+    }
+    return Matrix_compact(m);
+}
+
+/* Helper function creating a view sharing the storage of `parent`
+ *
+ * The view keeps the parent alive through `base` and counts as one of its
+ * exports, so the parent cannot be re-initialised underneath it.
+ */
+static MatrixObject* Matrix_view(MatrixObject *parent, double *data, Py_ssize_t rows, Py_ssize_t cols,
+                                 Py_ssize_t row_stride, Py_ssize_t col_stride) {
+    MatrixObject *view = Matrix_obtain();
+    if (view == NULL) {
+        return NULL;
+    }
+    view->data = data;
+    view->rows = rows;
+    view->cols = cols;
+    view->row_stride = row_stride;
+    view->col_stride = col_stride;
+    Py_INCREF(parent);
+    view->base = (PyObject *)parent;
+    parent->exports++;
+    return view;
+}
+
+/* Fixed-size kernels
+ *
+ * Graphics and robotics code multiplies and inverts 2 x 2, 3 x 3 and 4 x 4
+ * matrices at a high rate, where packing, the thread pool and a separate LU
+ * object cost more than the arithmetic. Square operands of these orders are
+ * dispatched here instead. The kernels read their inputs through the strides,
+ * so views need no packing, and the compile-time trip counts let the compiler
+ * unroll them completely. matmath._matrix._set_small_kernels(False) turns the
+ * dispatch off, for tests and benchmarks against the generic path.
+ */
+#define SMALL_MAX 4
+
+static int mm_small_kernels = 1;
+
+/* Helper function checking a square order has a fixed-size kernel */
+static int is_small_order(Py_ssize_t n) {
+    return mm_small_kernels && n >= 2 && n <= SMALL_MAX;
+}
+
+/* c (N x N, compact) = a @ b, for a and b given by their data and strides */
+#define DEFINE_SMALL_MATMUL(N)                                                                   \
+static void small_matmul_##N(const double *a, Py_ssize_t ars, Py_ssize_t acs,                  \
+                             const double *b, Py_ssize_t brs, Py_ssize_t bcs, double *c) {     \
+    for (int i = 0; i < N; i++) {                                                              \
+        for (int j = 0; j < N; j++) {                                                          \
+            double sum = 0.0;                                                                  \
+            for (int k = 0; k < N; k++) {                                                      \
+                sum += a[i * ars + k * acs] * b[k * brs + j * bcs];                            \
+            }                                                                                  \
+            c[i * N + j] = sum;                                                                \
+        }                                                                                      \
+    }                                                                                          \
+}
+
+/* y = a @ x; swapping the strides gives x @ a */
+#define DEFINE_SMALL_MATVEC(N)                                                                   \
+static void small_matvec_##N(const double *a, Py_ssize_t rs, Py_ssize_t cs,                    \
+                             const double *x, double *y) {                                     \
+    for (int i = 0; i < N; i++) {                                                              \
+        double sum = 0.0;                                                                      \
+        for (int k = 0; k < N; k++) {                                                          \
+            sum += a[i * rs + k * cs] * x[k];                                                  \
+        }                                                                                      \
+        y[i] = sum;                                                                            \
+    }                                                                                          \
+}
+
+/* dst (N x N, compact) = a^T */
+#define DEFINE_SMALL_TRANSPOSE(N)                                                                \
+static void small_transpose_##N(const double *a, Py_ssize_t rs, Py_ssize_t cs, double *dst) { \
+    for (int i = 0; i < N; i++) {                                                              \
+        for (int j = 0; j < N; j++) {                                                          \
+            dst[i * N + j] = a[j * rs + i * cs];                                               \
+        }                                                                                      \
+    }                                                                                          \
+}
+
+DEFINE_SMALL_MATMUL(2)
+DEFINE_SMALL_MATMUL(3)
+DEFINE_SMALL_MATMUL(4)
+DEFINE_SMALL_MATVEC(2)
+DEFINE_SMALL_MATVEC(3)
+DEFINE_SMALL_MATVEC(4)
+DEFINE_SMALL_TRANSPOSE(2)
+DEFINE_SMALL_TRANSPOSE(3)
+DEFINE_SMALL_TRANSPOSE(4)
+
+static void small_matmul(MatrixObject *a, MatrixObject *b, double *c) {
+    switch (a->rows) {
+    case 2:
+        small_matmul_2(a->data, a->row_stride, a->col_stride, b->data, b->row_stride, b->col_stride, c);
+        break;
+    case 3:
+        small_matmul_3(a->data, a->row_stride, a->col_stride, b->data, b->row_stride, b->col_stride, c);
+        break;
+    default:
+        small_matmul_4(a->data, a->row_stride, a->col_stride, b->data, b->row_stride, b->col_stride, c);
+        break;
+    }
+}
+
+static void small_matvec(MatrixObject *a, const double *x, double *y, int transposed) {
+    Py_ssize_t rs = transposed ? a->col_stride : a->row_stride;
+    Py_ssize_t cs = transposed ? a->row_stride : a->col_stride;
+    switch (a->rows) {
+    case 2:
+        small_matvec_2(a->data, rs, cs, x, y);
+        break;
+    case 3:
+        small_matvec_3(a->data, rs, cs, x, y);
+        break;
+    default:
+        small_matvec_4(a->data, rs, cs, x, y);
+        break;
+    }
+}
+
+static void small_transpose(MatrixObject *a, double *dst) {
+    switch (a->rows) {
+    case 2:
+        small_transpose_2(a->data, a->row_stride, a->col_stride, dst);
+        break;
+    case 3:
+        small_transpose_3(a->data, a->row_stride, a->col_stride, dst);
+        break;
+    default:
+        small_transpose_4(a->data, a->row_stride, a->col_stride, dst);
+        break;
+    }
+}
+
+#define A(i, j) MATRIX_AT(m, i, j)
+
+/* Helper function returning the determinant of a small square Matrix
+ *
+ * The 4 x 4 case expands along the top two rows: each 2 x 2 minor there is
+ * paired with its complementary minor in the bottom two rows.
+ */
+static double small_determinant(MatrixObject *m) {
+    switch (m->rows) {
+    case 2:
+        return A(0, 0) * A(1, 1) - A(0, 1) * A(1, 0);
+    case 3:
+        return A(0, 0) * (A(1, 1) * A(2, 2) - A(1, 2) * A(2, 1)) -
+               A(0, 1) * (A(1, 0) * A(2, 2) - A(1, 2) * A(2, 0)) +
+               A(0, 2) * (A(1, 0) * A(2, 1) - A(1, 1) * A(2, 0));
+    default: {
+        double s0 = A(0, 0) * A(1, 1) - A(1, 0) * A(0, 1);
+        double s1 = A(0, 0) * A(1, 2) - A(1, 0) * A(0, 2);
+        double s2 = A(0, 0) * A(1, 3) - A(1, 0) * A(0, 3);
+        double s3 = A(0, 1) * A(1, 2) - A(1, 1) * A(0, 2);
+        double s4 = A(0, 1) * A(1, 3) - A(1, 1) * A(0, 3);
+        double s5 = A(0, 2) * A(1, 3) - A(1, 2) * A(0, 3);
+        double c5 = A(2, 2) * A(3, 3) - A(3, 2) * A(2, 3);
+        double c4 = A(2, 1) * A(3, 3) - A(3, 1) * A(2, 3);
+        double c3 = A(2, 1) * A(3, 2) - A(3, 1) * A(2, 2);
+        double c2 = A(2, 0) * A(3, 3) - A(3, 0) * A(2, 3);
+        double c1 = A(2, 0) * A(3, 2) - A(3, 0) * A(2, 2);
+        double c0 = A(2, 0) * A(3, 1) - A(3, 0) * A(2, 1);
+        return s0 * c5 - s1 * c4 + s2 * c3 + s3 * c2 - s4 * c1 + s5 * c0;
+    }
+    }
+}
+
+/* Helper function writing the adjugate of a small square Matrix into adj
+ * (compact) and returning its determinant */
+static double small_adjugate(MatrixObject *m, double *adj) {
+    switch (m->rows) {
+    case 2:
+        adj[0] = A(1, 1);
+        adj[1] = -A(0, 1);
+        adj[2] = -A(1, 0);
+        adj[3] = A(0, 0);
+        return A(0, 0) * A(1, 1) - A(0, 1) * A(1, 0);
+    case 3:
+        adj[0] = A(1, 1) * A(2, 2) - A(1, 2) * A(2, 1);
+        adj[1] = A(0, 2) * A(2, 1) - A(0, 1) * A(2, 2);
+        adj[2] = A(0, 1) * A(1, 2) - A(0, 2) * A(1, 1);
+        adj[3] = A(1, 2) * A(2, 0) - A(1, 0) * A(2, 2);
+        adj[4] = A(0, 0) * A(2, 2) - A(0, 2) * A(2, 0);
+        adj[5] = A(0, 2) * A(1, 0) - A(0, 0) * A(1, 2);
+        adj[6] = A(1, 0) * A(2, 1) - A(1, 1) * A(2, 0);
+        adj[7] = A(0, 1) * A(2, 0) - A(0, 0) * A(2, 1);
+        adj[8] = A(0, 0) * A(1, 1) - A(0, 1) * A(1, 0);
+        return A(0, 0) * adj[0] + A(0, 1) * adj[3] + A(0, 2) * adj[6];
+    default: {
+        double s0 = A(0, 0) * A(1, 1) - A(1, 0) * A(0, 1);
+        double s1 = A(0, 0) * A(1, 2) - A(1, 0) * A(0, 2);
+        double s2 = A(0, 0) * A(1, 3) - A(1, 0) * A(0, 3);
+        double s3 = A(0, 1) * A(1, 2) - A(1, 1) * A(0, 2);
+        double s4 = A(0, 1) * A(1, 3) - A(1, 1) * A(0, 3);
+        double s5 = A(0, 2) * A(1, 3) - A(1, 2) * A(0, 3);
+        double c5 = A(2, 2) * A(3, 3) - A(3, 2) * A(2, 3);
+        double c4 = A(2, 1) * A(3, 3) - A(3, 1) * A(2, 3);
+        double c3 = A(2, 1) * A(3, 2) - A(3, 1) * A(2, 2);
+        double c2 = A(2, 0) * A(3, 3) - A(3, 0) * A(2, 3);
+        double c1 = A(2, 0) * A(3, 2) - A(3, 0) * A(2, 2);
+        double c0 = A(2, 0) * A(3, 1) - A(3, 0) * A(2, 1);
+        adj[0] = A(1, 1) * c5 - A(1, 2) * c4 + A(1, 3) * c3;
+        adj[1] = -A(0, 1) * c5 + A(0, 2) * c4 - A(0, 3) * c3;
+        adj[2] = A(3, 1) * s5 - A(3, 2) * s4 + A(3, 3) * s3;
+        adj[3] = -A(2, 1) * s5 + A(2, 2) * s4 - A(2, 3) * s3;
+        adj[4] = -A(1, 0) * c5 + A(1, 2) * c2 - A(1, 3) * c1;
+        adj[5] = A(0, 0) * c5 - A(0, 2) * c2 + A(0, 3) * c1;
+        adj[6] = -A(3, 0) * s5 + A(3, 2) * s2 - A(3, 3) * s1;
+        adj[7] = A(2, 0) * s5 - A(2, 2) * s2 + A(2, 3) * s1;
+        adj[8] = A(1, 0) * c4 - A(1, 1) * c2 + A(1, 3) * c0;
+        adj[9] = -A(0, 0) * c4 + A(0, 1) * c2 - A(0, 3) * c0;
+        adj[10] = A(3, 0) * s4 - A(3, 1) * s2 + A(3, 3) * s0;
+        adj[11] = -A(2, 0) * s4 + A(2, 1) * s2 - A(2, 3) * s0;
+        adj[12] = -A(1, 0) * c3 + A(1, 1) * c1 - A(1, 2) * c0;
+        adj[13] = A(0, 0) * c3 - A(0, 1) * c1 + A(0, 2) * c0;
+        adj[14] = -A(3, 0) * s3 + A(3, 1) * s1 - A(3, 2) * s0;
+        adj[15] = A(2, 0) * s3 - A(2, 1) * s1 + A(2, 2) * s0;
+        return s0 * c5 - s1 * c4 + s2 * c3 + s3 * c2 - s4 * c1 + s5 * c0;
+    }
+    }
+}
+
+#undef A
+
+/* Defined with the derived results cache below */
+static void Matrix_changed(MatrixObject *m);
+
+/* Helper function running an element-wise kernel on matrices that may be views
+ *
+ * `out` may alias a or b. Contiguous operands go straight to elementwise();
+ * otherwise the inputs are packed and the result is scattered into `out`.
+ */
+static int Matrix_elementwise(ElementwiseOp op, MatrixObject *a, MatrixObject *b, double scalar,
+                              MatrixObject *out) {
+    Py_ssize_t size = a->rows * a->cols;
+    Matrix_changed(out);
+    int out_clear = (!Matrix_overlaps(out, a) || Matrix_same_layout(out, a)) &&
+                    (b == NULL || !Matrix_overlaps(out, b) || Matrix_same_layout(out, b));
+    if (out_clear && Matrix_is_contiguous(a) && Matrix_is_contiguous(out) &&
+        (b == NULL || Matrix_is_contiguous(b))) {
+        MM_PIN(a);
+        MM_PIN(b);
+        MM_PIN(out);
+        int status = elementwise(op, a->data, b == NULL ? NULL : b->data, scalar, out->data, size);
+        MM_UNPIN(a);
+        MM_UNPIN(b);
+        MM_UNPIN(out);
+        return status;
+    }
+    
+    MatrixObject *ca = Matrix_compact(a);
+    MatrixObject *cb = b == NULL ? NULL : Matrix_compact(b);
+    int direct = out_clear && Matrix_is_contiguous(out);
+    double *dst = direct ? out->data : alloc_matrix(a->rows, a->cols);
+    int status = -1;
+    if (ca == NULL || (b != NULL && cb == NULL) || dst == NULL) {
+        if (dst == NULL) {
+            PyErr_NoMemory();
+        }
+    } else {
+        /* The compact copies may be a and b themselves */
+        MM_PIN(ca);
+        MM_PIN(cb);
+        MM_PIN(out);
+        status = elementwise(op, ca->data, cb == NULL ? NULL : cb->data, scalar, dst, size);
+        MM_UNPIN(ca);
+        MM_UNPIN(cb);
+        MM_UNPIN(out);
+        if (status == 0 && !direct) {
+            Matrix_unpack(out, dst);
+        }
+    }
+    if (!direct) {
+        free_matrix(dst);
+    }
+    Py_XDECREF(ca);
+    Py_XDECREF(cb);
+    return status;
+}
+
+/* Helper function copying the right-hand side of a linear system
+ *
+ * Returns a new Matrix or Vector holding a copy of b (n rows), and points
+ * *data / *k at its storage and number of columns.
+ */
+static PyObject* solve_rhs_copy(PyObject *b, Py_ssize_t n, double **data, Py_ssize_t *k) {
+    if (PyObject_TypeCheck(b, &MatrixType)) {
+        MatrixObject *rhs = (MatrixObject *)b;
+        if (rhs->rows != n) {
+            PyErr_SetString(PyExc_ValueError, "The number of rows of b must match the order of the matrix.");
+            return NULL;
+        }
+        MatrixObject *result = Matrix_alloc(rhs->rows, rhs->cols);
+        if (result != NULL) {
+            Matrix_pack(rhs, result->data);
+            *data = result->data;
+            *k = result->cols;
+        }
+        return (PyObject *)result;
+    }
+    
+    if (PyObject_TypeCheck(b, VectorAPI->VectorType)) {
+        VectorObject *rhs = (VectorObject *)b;
+        if (rhs->length != n) {
+            PyErr_SetString(PyExc_ValueError, "The length of b must match the order of the matrix.");
+            return NULL;
+        }
+        VectorObject *result = VectorAPI->Vector_new_from_data(rhs->data, rhs->length);
+        if (result != NULL) {
+            *data = result->data;
+            *k = 1;
+        }
+        return (PyObject *)result;
+    }
+    
+    PyErr_SetString(PyExc_TypeError, "b must be a Matrix or a Vector.");
+    return NULL;
+}
+
+/* Helper function checking a square matrix is lower triangular */
+static int is_lower_triangular(MatrixObject *self) {
+    for (Py_ssize_t i = 0; i < self->rows; i++) {
+        for (Py_ssize_t j = i + 1; j < self->cols; j++) {
+            if (MATRIX_AT(self, i, j) != 0.0) {
+                return 0;
+            }
+        }
+    }
+    return 1;
+}
+
+/* Helper function checking a square matrix is upper triangular */
+static int is_upper_triangular(MatrixObject *self) {
+    for (Py_ssize_t i = 0; i < self->rows; i++) {
+        for (Py_ssize_t j = 0; j < i; j++) {
+            if (MATRIX_AT(self, i, j) != 0.0) {
+                return 0;
+            }
+        }
+    }
+    return 1;
+}
+
+/* Helper function checking a matrix is symmetric */
+static int is_symmetric(MatrixObject *self) {
+    if (self->rows != self->cols) {
+        return 0;
+    }
+    for (Py_ssize_t i = 0; i < self->rows; i++) {
+        for (Py_ssize_t j = i + 1; j < self->cols; j++) {
+            if (MATRIX_AT(self, i, j) != MATRIX_AT(self, j, i)) {
+                return 0;
+            }
+        }
+    }
+    return 1;
+}
+
+/* Helper function solving T X = B in place for a triangular Matrix T */
+static int Matrix_triangular_solve_into(MatrixObject *self, int lower, double *b, Py_ssize_t k) {
+    Py_ssize_t n = self->rows;
+    for (Py_ssize_t i = 0; i < n; i++) {
+        if (MATRIX_AT(self, i, i) == 0.0) {
+            PyErr_SetString(PyExc_ValueError, "The given matrix is not invertible.");
+            return -1;
+        }
+    }
+    
+    MatrixObject *t = Matrix_compact(self);
+    if (t == NULL) {
+        return -1;
+    }
+    int status;
+    MM_PIN(t);
+    MM_BEGIN_ALLOW_THREADS(n * n * k)
+    status = triangular_solve(t->data, n, lower, b, k);
+    MM_END_ALLOW_THREADS
+    MM_UNPIN(t);
+    Py_DECREF(t);
+    if (status < 0) {
+        PyErr_NoMemory();
+        return -1;
+    }
+    return 0;
+}
+
+/* LU object structure */
+typedef struct {
+    PyObject_HEAD
+    double *lu;              /* L below the diagonal (unit diagonal implied), U on and above */
+    Py_ssize_t *piv;         /* Row i was swapped with row piv[i] */
+    Py_ssize_t n;
+    int sign;                /* Sign of the row permutation */
+} LUObject;
+
+static PyTypeObject LUType;
+
+/* Helper function to factor a square Matrix into a new LU object */
+static LUObject* LU_from_matrix(MatrixObject *matrix) {
+    if (matrix->rows != matrix->cols) {
+        PyErr_SetString(PyExc_ValueError, "The given matrix is not a square matrix.");
+        return NULL;
+    }
+    
+    Py_ssize_t n = matrix->rows;
+    LUObject *self = (LUObject *)LUType.tp_alloc(&LUType, 0);
+    if (self == NULL) {
+        return NULL;
+    }
+    self->n = n;
+    self->lu = alloc_matrix(n, n);
+    self->piv = (Py_ssize_t *)PyMem_Malloc((n > 0 ? n : 1) * sizeof(Py_ssize_t));
+    if (self->lu == NULL || self->piv == NULL) {
+        Py_DECREF(self);
+        return (LUObject *)PyErr_NoMemory();
+    }
+    Matrix_pack(matrix, self->lu);
+    
+    int status;
+    MM_BEGIN_ALLOW_THREADS(n * n * n)
+    status = lu_factor(self->lu, n, self->piv, &self->sign);
+    MM_END_ALLOW_THREADS
+    if (status < 0) {
+        Py_DECREF(self);
+        return (LUObject *)PyErr_NoMemory();
+    }
+    return self;
+}
+
+/* Helper functions estimating the bytes allocated and the FLOPs of factoring
+ * an n x n matrix, and the FLOPs of inverting it (the factorization plus n
+ * solves of 2n^2 each), for the operation counters */
+static double LU_bytes(Py_ssize_t n) {
+    return (double)n * n * sizeof(double) + (double)n * sizeof(Py_ssize_t);
+}
+
+static double LU_flops(Py_ssize_t n) {
+    return 2.0 * n * n * n / 3.0;
+}
+
+static double LU_inverse_flops(Py_ssize_t n) {
+    return LU_flops(n) + 2.0 * n * n * n;
+}
+
+/* Helper functions estimating the FLOPs of the Cholesky factorization, of a
+ * QR factorization with k = min(m, n) reflectors that also forms the m x k Q,
+ * and of a symmetric eigendecomposition with eigenvectors */
+static double cholesky_flops(Py_ssize_t n) {
+    return (double)n * n * n / 3.0;
+}
+
+static double qr_flops(Py_ssize_t m, Py_ssize_t n) {
+    double k = m < n ? m : n;
+    return 4.0 * m * n * k - 2.0 * n * k * k + 2.0 * k * k * k / 3.0;
+}
+
+static double eigh_flops(Py_ssize_t n) {
+    return 9.0 * n * n * n;
+}
+
+/* Helper function returning the determinant of a factored matrix */
+static double LU_determinant(LUObject *self) {
+    double det = self->sign;
+    for (Py_ssize_t i = 0; i < self->n; i++) {
+        det *= self->lu[i * self->n + i];
+    }
+    return det;
+}
+
+/* Helper function to check the factorization has a non-zero U diagonal */
+static int LU_is_singular(LUObject *self) {
+    for (Py_ssize_t i = 0; i < self->n; i++) {
+        if (self->lu[i * self->n + i] == 0.0) {
+            return 1;
+        }
+    }
+    return 0;
+}
+
+/* Helper function solving A X = B in place for an n x k block */
+static int LU_solve_into(LUObject *self, double *b, Py_ssize_t k) {
+    if (LU_is_singular(self)) {
+        PyErr_SetString(PyExc_ValueError, "The given matrix is not invertible.");
+        return -1;
+    }
+    
+    int status;
+    MM_BEGIN_ALLOW_THREADS(self->n * self->n * k)
+    status = lu_solve(self->lu, self->piv, self->n, b, k);
+    MM_END_ALLOW_THREADS
+    if (status < 0) {
+        PyErr_NoMemory();
+        return -1;
+    }
+    return 0;
+}
+
+/* Helper function factoring a square Matrix into `l` with cholesky_factor;
+ * returns 1 if it is not positive definite and -1 with an exception set */
+static int Matrix_cholesky_into(MatrixObject *self, double *l) {
+    Py_ssize_t n = self->rows;
+    Matrix_pack(self, l);
+    int status;
+    MM_BEGIN_ALLOW_THREADS(n * n * n)
+    status = cholesky_factor(l, n);
+    MM_END_ALLOW_THREADS
+    if (status < 0) {
+        PyErr_NoMemory();
+    }
+    return status;
+}
+
+/* Helper function solving A X = B in place given the Cholesky factor of A,
+ * as left by Matrix_cholesky_into() */
+static int Matrix_cholesky_solve_into(MatrixObject *l, double *b, Py_ssize_t k) {
+    Py_ssize_t n = l->rows;
+    int status;
+    MM_PIN(l);
+    MM_BEGIN_ALLOW_THREADS(n * n * k)
+    status = cholesky_solve(l->data, n, b, k);
+    MM_END_ALLOW_THREADS
+    MM_UNPIN(l);
+    if (status < 0) {
+        PyErr_NoMemory();
+        return -1;
+    }
+    return 0;
+}
+
+/* Helper function returning the inverse of a factored matrix */
+static MatrixObject* LU_inverse_matrix(LUObject *self) {
+    Py_ssize_t n = self->n;
+    MatrixObject *result = Matrix_alloc(n, n);
+    if (result == NULL) {
+        return NULL;
+    }
+    memset(result->data, 0, (size_t)(n * n) * sizeof(double));
+    for (Py_ssize_t i = 0; i < n; i++) {
+        result->data[i * n + i] = 1.0;
+    }
+    
+    if (LU_solve_into(self, result->data, n) < 0) {
+        Py_DECREF(result);
+        return NULL;
+    }
+    return result;
+}
+
+/* Derived results cache
+ *
+ * Square matrices larger than the fixed-size kernels remember what has been
+ * derived from their elements: the determinant, the trace, the symmetry and
+ * triangularity checks, the LU and Cholesky factorizations and the inverse.
+ * So is_invertible(), determinant() and inverse() on one matrix share one
+ * factorization, and repeated solve() calls only pay for the substitutions.
+ *
+ * Every write to a Matrix goes through Matrix_changed(), which bumps the
+ * version of the matrix owning the storage; a cache is only used while that
+ * version matches the one its entries were computed at, so a write through
+ * any view invalidates the caches of all of them. Storage that can change
+ * behind our back (borrowed through frombuffer() or load(), or exported as
+ * a buffer) is not cached. All of this runs with the GIL held.
+ */
+enum {
+    CACHE_DET = 1 << 0,
+    CACHE_TRACE = 1 << 1,
+    CACHE_SYMMETRIC = 1 << 2,
+    CACHE_UPPER = 1 << 3,
+    CACHE_LOWER = 1 << 4,
+    CACHE_LU = 1 << 5,
+    CACHE_CHOLESKY = 1 << 6,
+    CACHE_INVERSE = 1 << 7,
+};
+
+typedef struct MatrixCache {
+    struct MatrixCache *prev, *next;    /* All live caches, for clear_cache() */
+    MatrixObject *owner;
+    unsigned long long version;         /* Storage version of the entries */
+    int known;                          /* CACHE_* entries present */
+    int flags;                          /* Values of the CACHE_SYMMETRIC / UPPER / LOWER entries */
+    double det;
+    double trace;
+    LUObject *lu;
+    MatrixObject *cholesky;             /* L with L^T mirrored above the diagonal, NULL if not positive definite */
+    MatrixObject *inverse;
+} MatrixCache;
+
+static MatrixCache *cache_list = NULL;
+static int cache_enabled = 1;
+static long long cache_hits = 0, cache_misses = 0, cache_invalidations = 0;
+
+/* Helper function returning the Matrix owning the storage of m */
+static MatrixObject* Matrix_root(MatrixObject *m) {
+    while (m->base != NULL && PyObject_TypeCheck(m->base, &MatrixType)) {
+        m = (MatrixObject *)m->base;
+    }
+    return m;
+}
+
+/* Helper function returning the owner of m's storage if m can be cached, else NULL */
+static MatrixObject* Matrix_cache_root(MatrixObject *m) {
+    if (!cache_enabled || m->rows != m->cols || m->rows * m->cols <= MATRIX_INLINE_SIZE) {
+        return NULL;
+    }
+    MatrixObject *root = Matrix_root(m);
+    return root->base == NULL && root->buffer_exports == 0 ? root : NULL;
+}
+
+/* Helper function freeing the cache of m */
+static void Matrix_cache_drop(MatrixObject *m) {
+    MatrixCache *cache = m->cache;
+    if (cache == NULL) {
+        return;
+    }
+    if (cache->prev != NULL) {
+        cache->prev->next = cache->next;
+    } else {
+        cache_list = cache->next;
+    }
+    if (cache->next != NULL) {
+        cache->next->prev = cache->prev;
+    }
+    m->cache = NULL;
+    Py_XDECREF(cache->lu);
+    Py_XDECREF(cache->cholesky);
+    Py_XDECREF(cache->inverse);
+    PyMem_Free(cache);
+}
+
+/* Helper function recording that the elements of m are about to change */
+static void Matrix_changed(MatrixObject *m) {
+    if (m->cache != NULL) {
+        Matrix_cache_drop(m);
+        cache_invalidations++;
+    }
+    Matrix_root(m)->version++;
+}
+
+/* Helper function looking up `item` for m
+ *
+ * Returns the cache holding it, or NULL on a miss. *version receives the
+ * storage version to pass to cache_put() once the item is computed. Only
+ * matrices that can be cached count towards the hits and misses.
+ */
+static MatrixCache* cache_get(MatrixObject *m, int item, unsigned long long *version) {
+    MatrixObject *root = Matrix_cache_root(m);
+    *version = root != NULL ? root->version : 0;
+    if (root == NULL) {
+        return NULL;
+    }
+    if (m->cache != NULL && m->cache->version != root->version) {
+        Matrix_cache_drop(m);
+        cache_invalidations++;
+    }
+    if (m->cache != NULL && (m->cache->known & item)) {
+        cache_hits++;
+        return m->cache;
+    }
+    cache_misses++;
+    return NULL;
+}
+
+/* Helper function returning the cache to record `item` in, computed from m
+ * at storage `version`; NULL if it cannot be kept (m cannot be cached, was
+ * written meanwhile or memory is short). The caller fills in the entry. */
+static MatrixCache* cache_put(MatrixObject *m, int item, unsigned long long version) {
+    MatrixObject *root = Matrix_cache_root(m);
+    if (root == NULL || root->version != version) {
+        return NULL;
+    }
+    MatrixCache *cache = m->cache;
+    if (cache == NULL) {
+        cache = (MatrixCache *)PyMem_Calloc(1, sizeof(MatrixCache));
+        if (cache == NULL) {
+            return NULL;
+        }
+        cache->owner = m;
+        cache->version = version;
+        cache->next = cache_list;
+        if (cache_list != NULL) {
+            cache_list->prev = cache;
+        }
+        cache_list = cache;
+        m->cache = cache;
+    }
+    cache->known |= item;
+    return cache;
+}
+
+/* Helper function returning a predicate of a square Matrix, from the cache when possible */
+static int Matrix_cached_flag(MatrixObject *m, int item, int (*test)(MatrixObject *)) {
+    unsigned long long version;
+    MatrixCache *cache = cache_get(m, item, &version);
+    if (cache != NULL) {
+        return (cache->flags & item) != 0;
+    }
+    int value = test(m);
+    if ((cache = cache_put(m, item, version)) != NULL && value) {
+        cache->flags |= item;
+    }
+    return value;
+}
+
+/* Helper function returning the LU factorization of m (a new reference),
+ * from the cache when possible; *factored is set when it was computed */
+static LUObject* Matrix_cached_lu(MatrixObject *m, int *factored) {
+    unsigned long long version;
+    MatrixCache *cache = cache_get(m, CACHE_LU, &version);
+    if (cache != NULL) {
+        Py_INCREF(cache->lu);
+        return cache->lu;
+    }
+    LUObject *lu = LU_from_matrix(m);
+    if (lu != NULL) {
+        *factored = 1;
+        if ((cache = cache_put(m, CACHE_LU, version)) != NULL) {
+            Py_INCREF(lu);
+            cache->lu = lu;
+        }
+    }
+    return lu;
+}
+
+/* Helper function computing the determinant of a square Matrix through its
+ * LU factorization, from the cache when possible; *factored is set when the
+ * factorization was computed */
+static int Matrix_cached_det(MatrixObject *m, double *det, int *factored) {
+    unsigned long long version;
+    MatrixCache *cache = cache_get(m, CACHE_DET, &version);
+    if (cache != NULL) {
+        *det = cache->det;
+        return 0;
+    }
+    LUObject *lu = Matrix_cached_lu(m, factored);
+    if (lu == NULL) {
+        return -1;
+    }
+    *det = LU_determinant(lu);
+    Py_DECREF(lu);
+    if ((cache = cache_put(m, CACHE_DET, version)) != NULL) {
+        cache->det = *det;
+    }
+    return 0;
+}
+
+/* Helper function returning the Cholesky factor of a square Matrix, with L^T
+ * mirrored above the diagonal, from the cache when possible
+ *
+ * Returns 0 with a new reference in *factor, 1 if the matrix is not positive
+ * definite and -1 on error. *factored is set when the factor was computed.
+ */
+static int Matrix_cached_cholesky(MatrixObject *m, MatrixObject **factor, int *factored) {
+    unsigned long long version;
+    MatrixCache *cache = cache_get(m, CACHE_CHOLESKY, &version);
+    if (cache != NULL) {
+        if (cache->cholesky == NULL) {
+            return 1;
+        }
+        Py_INCREF(cache->cholesky);
+        *factor = cache->cholesky;
+        return 0;
+    }
+    
+    MatrixObject *l = Matrix_alloc(m->rows, m->rows);
+    if (l == NULL) {
+        return -1;
+    }
+    int status = Matrix_cholesky_into(m, l->data);
+    if (status != 0) {
+        Py_DECREF(l);
+        if (status > 0) {
+            cache_put(m, CACHE_CHOLESKY, version);
+        }
+        return status;
+    }
+    *factored = 1;
+    if ((cache = cache_put(m, CACHE_CHOLESKY, version)) != NULL) {
+        Py_INCREF(l);
+        cache->cholesky = l;
+    }
+    *factor = l;
+    return 0;
+}
+
+/* Helper function returning the bytes held by the cache entries */
+static double MatrixCache_bytes(MatrixCache *cache) {
+    double n = (double)cache->owner->rows, bytes = 0.0;
+    if (cache->lu != NULL) {
+        bytes += LU_bytes(cache->owner->rows);
+    }
+    if (cache->cholesky != NULL) {
+        bytes += n * n * sizeof(double);
+    }
+    if (cache->inverse != NULL) {
+        bytes += n * n * sizeof(double);
+    }
+    return bytes;
+}
+
+/* Matrix.__new__ */
+static PyObject* Matrix_new(PyTypeObject *type, PyObject *args, PyObject *kwds) {
+    MatrixObject *self;
+    self = type == &MatrixType ? Matrix_obtain() : (MatrixObject *)type->tp_alloc(type, 0);
+    if (self != NULL) {
+        self->data = NULL;
+        self->rows = 0;
+        self->cols = 0;
+        self->row_stride = 0;
+        self->col_stride = 1;
+    }
+    return (PyObject *)self;
+}
+
+/* Row streaming
+ *
+ * RowBuffer collects rows of one width into a single row-major block that
+ * grows geometrically, so constructors can consume iterators and files
+ * without materialising a list of lists first.
+ */
 typedef struct {
-    PyObject_HEAD
-    double **data;
+    double *data;
     Py_ssize_t rows;
-    Py_ssize_t cols;
-} MatrixObject;
+    Py_ssize_t cols;         /* 0 until the first row fixes the width */
+    Py_ssize_t capacity;     /* In rows */
+} RowBuffer;
 
-/* Forward declarations */
-static PyTypeObject MatrixType;
-
-/* Helper function to allocate 2D array */
-static double** alloc_matrix(Py_ssize_t rows, Py_ssize_t cols) {
-    double **matrix = (double **)PyMem_Malloc(rows * sizeof(double *));
-    if (matrix == NULL) {
-        return NULL;
-    }
-    for (Py_ssize_t i = 0; i < rows; i++) {
-        matrix[i] = (double *)PyMem_Malloc(cols * sizeof(double));
-        if (matrix[i] == NULL) {
-            for (Py_ssize_t j = 0; j < i; j++) {
-                PyMem_Free(matrix[j]);
-            }
-            PyMem_Free(matrix);
+/* Helper function returning storage for one more row (NULL with MemoryError) */
+static double* RowBuffer_append(RowBuffer *buf) {
+    if (buf->rows == buf->capacity || buf->data == NULL) {
+        Py_ssize_t capacity = buf->data == NULL ? (buf->capacity > 0 ? buf->capacity : 16) : buf->capacity * 2;
+        if (capacity > PY_SSIZE_T_MAX / buf->cols / (Py_ssize_t)sizeof(double)) {
+            PyErr_NoMemory();
             return NULL;
         }
+        double *data = (double *)PyMem_Realloc(buf->data, (size_t)(capacity * buf->cols) * sizeof(double));
+        if (data == NULL) {
+            PyErr_NoMemory();
+            return NULL;
+        }
+        buf->data = data;
+        buf->capacity = capacity;
+    }
+    return buf->data + buf->rows++ * buf->cols;
+}
+
+/* Helper function fixing or checking the row width */
+static int RowBuffer_check_width(RowBuffer *buf, Py_ssize_t n) {
+    if (buf->cols == 0) {
+        if (n == 0) {
+            PyErr_SetString(PyExc_ValueError, "Matrix rows cannot be empty");
+            return -1;
+        }
+        buf->cols = n;
+    } else if (n != buf->cols) {
+        PyErr_SetString(PyExc_ValueError, "The matrix is not a proper matrix.");
+        return -1;
     }
-    return matrix;
+    return 0;
 }
 
-/* Helper function to free 2D array */
-static void free_matrix(double **matrix, Py_ssize_t rows) {
-    if (matrix != NULL) {
-        for (Py_ssize_t i = 0; i < rows; i++) {
-            if (matrix[i] != NULL) {
-                PyMem_Free(matrix[i]);
+/* Helper function appending a row given as a buffer of doubles or any iterable of numbers */
+static int RowBuffer_append_row(RowBuffer *buf, PyObject *row) {
+    if (PyObject_CheckBuffer(row)) {
+        Py_buffer view;
+        if (PyObject_GetBuffer(row, &view, PyBUF_FORMAT | PyBUF_C_CONTIGUOUS) == 0) {
+            if (view.itemsize == sizeof(double) && is_double_format(view.format)) {
+                double *dst = NULL;
+                if (RowBuffer_check_width(buf, view.len / (Py_ssize_t)sizeof(double)) == 0) {
+                    dst = RowBuffer_append(buf);
+                }
+                if (dst != NULL) {
+                    memcpy(dst, view.buf, (size_t)view.len);
+                }
+                PyBuffer_Release(&view);
+                return dst != NULL ? 0 : -1;
             }
+            PyBuffer_Release(&view);
+        } else {
+            PyErr_Clear();
+        }
+    }
+    
+    PyObject *seq = PySequence_Fast(row, "Matrix rows must be iterables of numbers");
+    if (seq == NULL) {
+        return -1;
+    }
+    Py_ssize_t n = PySequence_Fast_GET_SIZE(seq);
+    double *dst = RowBuffer_check_width(buf, n) == 0 ? RowBuffer_append(buf) : NULL;
+    if (dst == NULL) {
+        Py_DECREF(seq);
+        return -1;
+    }
+    
+    PyObject **items = PySequence_Fast_ITEMS(seq);
+    for (Py_ssize_t j = 0; j < n; j++) {
+        if (!PyFloat_Check(items[j]) && !PyLong_Check(items[j])) {
+            Py_DECREF(seq);
+            PyErr_SetString(PyExc_TypeError, "All elements must be numbers");
+            return -1;
+        }
+        dst[j] = PyFloat_AsDouble(items[j]);
+        if (dst[j] == -1.0 && PyErr_Occurred()) {
+            Py_DECREF(seq);
+            return -1;
         }
-        PyMem_Free(matrix);
     }
+    Py_DECREF(seq);
+    return 0;
 }
 
-/* Helper function to create a new Matrix */
-static MatrixObject* Matrix_new_from_data(double **data, Py_ssize_t rows, Py_ssize_t cols) {
-    MatrixObject *self = (MatrixObject *)MatrixType.tp_alloc(&MatrixType, 0);
-    if (self != NULL) {
-        self->data = alloc_matrix(rows, cols);
-        if (self->data == NULL) {
-            Py_DECREF(self);
-            return (MatrixObject *)PyErr_NoMemory();
+/* Helper function releasing the slack of a filled buffer; fails if no rows were read */
+static int RowBuffer_finish(RowBuffer *buf) {
+    if (buf->rows == 0) {
+        PyMem_Free(buf->data);
+        buf->data = NULL;
+        PyErr_SetString(PyExc_ValueError, "Matrix cannot be empty");
+        return -1;
+    }
+    double *data = (double *)PyMem_Realloc(buf->data, (size_t)(buf->rows * buf->cols) * sizeof(double));
+    if (data != NULL) {
+        buf->data = data;
+    }
+    return 0;
+}
+
+/* Helper function reading every row of an iterable into buf */
+static int RowBuffer_read_rows(RowBuffer *buf, PyObject *iterable) {
+    PyObject *it = PyObject_GetIter(iterable);
+    if (it == NULL) {
+        if (PyErr_ExceptionMatches(PyExc_TypeError)) {
+            PyErr_SetString(PyExc_TypeError, "Matrix must be built from an iterable of rows");
         }
-        for (Py_ssize_t i = 0; i < rows; i++) {
-            for (Py_ssize_t j = 0; j < cols; j++) {
-                self->data[i][j] = data[i][j];
-            }
+        return -1;
+    }
+    if (buf->capacity == 0) {
+        Py_ssize_t hint = PyObject_LengthHint(iterable, 16);
+        if (hint < 0) {
+            Py_DECREF(it);
+            return -1;
         }
-        self->rows = rows;
-        self->cols = cols;
+        buf->capacity = hint;
     }
-    return self;
+    
+    PyObject *row;
+    while ((row = PyIter_Next(it)) != NULL) {
+        int status = RowBuffer_append_row(buf, row);
+        Py_DECREF(row);
+        if (status < 0) {
+            break;
+        }
+    }
+    Py_DECREF(it);
+    
+    if (PyErr_Occurred()) {
+        PyMem_Free(buf->data);
+        buf->data = NULL;
+        return -1;
+    }
+    return RowBuffer_finish(buf);
 }
 
-/* Matrix.__new__ */
-static PyObject* Matrix_new(PyTypeObject *type, PyObject *args, PyObject *kwds) {
-    MatrixObject *self;
-    self = (MatrixObject *)type->tp_alloc(type, 0);
-    if (self != NULL) {
-        self->data = NULL;
-        self->rows = 0;
-        self->cols = 0;
+/* Helper function handing a finished buffer to a Matrix without storage
+ *
+ * Small matrices copy it into their inline storage and give the block back.
+ */
+static void RowBuffer_move_to(RowBuffer *buf, MatrixObject *m) {
+    if (buf->rows * buf->cols <= MATRIX_INLINE_SIZE) {
+        memcpy(m->inline_data, buf->data, (size_t)(buf->rows * buf->cols) * sizeof(double));
+        free_matrix(buf->data);
+        m->data = m->inline_data;
+    } else {
+        m->data = buf->data;
     }
-    return (PyObject *)self;
+    buf->data = NULL;
+    m->rows = buf->rows;
+    m->cols = buf->cols;
+    m->row_stride = buf->cols;
+    m->col_stride = 1;
+}
+
+/* Helper function wrapping a finished buffer in a new Matrix that owns its data */
+static PyObject* RowBuffer_to_matrix(RowBuffer *buf) {
+    MatrixObject *result = Matrix_obtain();
+    if (result == NULL) {
+        PyMem_Free(buf->data);
+        return NULL;
+    }
+    RowBuffer_move_to(buf, result);
+    return (PyObject *)result;
 }
 
 /* Matrix.__init__ */
@@ -85,109 +2450,619 @@ static int Matrix_init(MatrixObject *self, PyObject *args, PyObject *kwds) {
     if (!PyArg_ParseTupleAndKeywords(args, kwds, "O", kwlist, &mat)) {
         return -1;
     }
-
-    if (!PyList_Check(mat)) {
-        PyErr_SetString(PyExc_TypeError, "Argument must be a list of lists");
+
+    RowBuffer buf = {NULL, 0, 0, 0};
+    if (RowBuffer_read_rows(&buf, mat) < 0) {
+        return -1;
+    }
+
+    if (self->exports > 0) {
+        free_matrix(buf.data);
+        PyErr_SetString(PyExc_BufferError, "Cannot re-initialise a Matrix with exported buffers");
+        return -1;
+    }
+    if (self->busy > 0) {
+        free_matrix(buf.data);
+        PyErr_SetString(PyExc_BufferError, "Cannot re-initialise a Matrix while another thread is using it");
+        return -1;
+    }
+
+    /* Free old data if exists */
+    Matrix_changed(self);
+    Matrix_release_data(self);
+
+    RowBuffer_move_to(&buf, self);
+    return 0;
+}
+
+/* Matrix.from_rows - class method */
+static PyObject* Matrix_from_rows(PyObject *cls, PyObject *args, PyObject *kwds) {
+    PyObject *rows;
+    Py_ssize_t cols = 0;
+    static char *kwlist[] = {"rows", "cols", NULL};
+    
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|n", kwlist, &rows, &cols)) {
+        return NULL;
+    }
+    if (cols < 0) {
+        PyErr_SetString(PyExc_ValueError, "Matrix dimensions must be positive");
+        return NULL;
+    }
+    
+    RowBuffer buf = {NULL, 0, cols, 0};
+    if (RowBuffer_read_rows(&buf, rows) < 0) {
+        return NULL;
+    }
+    return RowBuffer_to_matrix(&buf);
+}
+
+/* CSV parsing
+ *
+ * Fields are parsed with PyOS_string_to_double straight from the bytes read,
+ * so no str or float objects are created per element. Fields may be padded
+ * with spaces and wrapped in double quotes; blank lines are skipped.
+ */
+
+/* Helper function skipping spaces and tabs, stopping at the delimiter (which may be either) */
+static const char* csv_skip_blank(const char *p, char delimiter) {
+    while ((*p == ' ' || *p == '\t') && *p != delimiter) {
+        p++;
+    }
+    return p;
+}
+
+/* Helper function parsing one NUL-terminated line into buf */
+static int csv_parse_line(RowBuffer *buf, const char *line, char delimiter, Py_ssize_t lineno) {
+    const char *p = csv_skip_blank(line, '\0');
+    if (*p == '\0') {
+        return 0;
+    }
+    p = line;
+    
+    if (buf->cols == 0) {
+        Py_ssize_t fields = 1;
+        for (const char *q = p; *q != '\0'; q++) {
+            fields += *q == delimiter;
+        }
+        buf->cols = fields;
+    }
+    double *dst = RowBuffer_append(buf);
+    if (dst == NULL) {
+        return -1;
+    }
+    
+    for (Py_ssize_t j = 0; j < buf->cols; j++) {
+        p = csv_skip_blank(p, delimiter);
+        int quoted = *p == '"';
+        p += quoted;
+        
+        char *end;
+        dst[j] = PyOS_string_to_double(p, &end, NULL);
+        if (PyErr_Occurred() || end == p) {
+            goto error;
+        }
+        p = end;
+        if (quoted && *p++ != '"') {
+            goto error;
+        }
+        
+        p = csv_skip_blank(p, delimiter);
+        if (j + 1 < buf->cols ? *p++ != delimiter : *p != '\0') {
+            goto error;
+        }
+    }
+    return 0;
+
+error:
+    PyErr_Clear();
+    PyErr_Format(PyExc_ValueError, "Line %zd of the CSV is not a row of %zd numbers", lineno, buf->cols);
+    return -1;
+}
+
+/* Helper function parsing every complete line of text[0:*len]; the unparsed tail is moved to the front */
+static int csv_parse_chunk(RowBuffer *buf, char *text, Py_ssize_t *len, int final, char delimiter,
+                           Py_ssize_t *lineno, int *skip) {
+    char *start = text;
+    char *stop = text + *len;
+    for (;;) {
+        char *newline = memchr(start, '\n', (size_t)(stop - start));
+        if (newline == NULL) {
+            if (!final || start == stop) {
+                break;
+            }
+            newline = stop;
+        }
+        *newline = '\0';
+        if (newline > start && newline[-1] == '\r') {
+            newline[-1] = '\0';
+        }
+        (*lineno)++;
+        if (*skip) {
+            *skip = 0;
+        } else if (csv_parse_line(buf, start, delimiter, *lineno) < 0) {
+            return -1;
+        }
+        start = newline + (newline < stop);
+        if (start >= stop) {
+            break;
+        }
+    }
+    *len = stop - start;
+    memmove(text, start, (size_t)*len);
+    return 0;
+}
+
+/* Helper function reading a CSV file object into buf, roughly chunk_rows lines per read() */
+static int csv_read(RowBuffer *buf, PyObject *file, char delimiter, int header) {
+    char *text = NULL;
+    Py_ssize_t len = 0, size = 0;
+    Py_ssize_t lineno = 0;
+    int skip = header;
+    int status = -1;
+    
+    for (;;) {
+        /* Guess 24 characters per number once the width is known */
+        Py_ssize_t request = buf->capacity * (buf->cols > 0 ? buf->cols * 24 : 64);
+        PyObject *chunk = PyObject_CallMethod(file, "read", "n", request);
+        if (chunk == NULL) {
+            goto done;
+        }
+        
+        const char *bytes;
+        Py_ssize_t n;
+        if (PyBytes_Check(chunk)) {
+            bytes = PyBytes_AS_STRING(chunk);
+            n = PyBytes_GET_SIZE(chunk);
+        } else if (PyUnicode_Check(chunk)) {
+            bytes = PyUnicode_AsUTF8AndSize(chunk, &n);
+        } else {
+            PyErr_SetString(PyExc_TypeError, "read() must return bytes or str");
+            bytes = NULL;
+        }
+        if (bytes == NULL) {
+            Py_DECREF(chunk);
+            goto done;
+        }
+        
+        if (len + n + 1 > size) {
+            size = (len + n + 1) * 2;
+            char *grown = (char *)PyMem_Realloc(text, (size_t)size);
+            if (grown == NULL) {
+                Py_DECREF(chunk);
+                PyErr_NoMemory();
+                goto done;
+            }
+            text = grown;
+        }
+        memcpy(text + len, bytes, (size_t)n);
+        len += n;
+        text[len] = '\0';
+        Py_DECREF(chunk);
+        
+        if (csv_parse_chunk(buf, text, &len, n == 0, delimiter, &lineno, &skip) < 0) {
+            goto done;
+        }
+        if (n == 0) {
+            break;
+        }
+    }
+    status = 0;
+
+done:
+    PyMem_Free(text);
+    return status;
+}
+
+/* Matrix.from_csv - class method */
+static PyObject* Matrix_from_csv(PyObject *cls, PyObject *args, PyObject *kwds) {
+    PyObject *source;
+    Py_ssize_t chunk_rows = 1024;
+    const char *delimiter = ",";
+    int header = 0;
+    static char *kwlist[] = {"source", "chunk_rows", "delimiter", "header", NULL};
+    
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|nsp", kwlist, &source, &chunk_rows, &delimiter, &header)) {
+        return NULL;
+    }
+    if (chunk_rows <= 0) {
+        PyErr_SetString(PyExc_ValueError, "chunk_rows must be positive");
+        return NULL;
+    }
+    if (strlen(delimiter) != 1 || delimiter[0] == '"' || delimiter[0] == '\n' || delimiter[0] == '\r') {
+        PyErr_SetString(PyExc_ValueError, "delimiter must be a single character");
+        return NULL;
+    }
+    
+    /* Paths are opened (and closed) here; anything else must have a read() method */
+    PyObject *file;
+    int owned = !PyObject_HasAttrString(source, "read");
+    if (owned) {
+        PyObject *io = PyImport_ImportModule("io");
+        if (io == NULL) {
+            return NULL;
+        }
+        file = PyObject_CallMethod(io, "open", "Os", source, "rb");
+        Py_DECREF(io);
+        if (file == NULL) {
+            return NULL;
+        }
+    } else {
+        file = source;
+        Py_INCREF(file);
+    }
+    
+    RowBuffer buf = {NULL, 0, 0, chunk_rows};
+    int status = csv_read(&buf, file, delimiter[0], header);
+    if (owned) {
+        PyObject *type, *value, *traceback;
+        PyErr_Fetch(&type, &value, &traceback);
+        PyObject *closed = PyObject_CallMethod(file, "close", NULL);
+        if (closed == NULL) {
+            status = -1;
+        }
+        Py_XDECREF(closed);
+        if (type != NULL) {
+            PyErr_Restore(type, value, traceback);
+        }
+    }
+    Py_DECREF(file);
+    
+    if (status < 0) {
+        PyMem_Free(buf.data);
+        return NULL;
+    }
+    if (RowBuffer_finish(&buf) < 0) {
+        return NULL;
+    }
+    return RowBuffer_to_matrix(&buf);
+}
+
+/* Iterator returned by Matrix.iter_csv */
+typedef struct {
+    PyObject_HEAD
+    MatrixObject *matrix;
+    Py_ssize_t row;
+    char delimiter;
+    char *line;              /* Scratch space reused for every row */
+    Py_ssize_t capacity;
+} MatrixCSVIterObject;
+
+static void MatrixCSVIter_dealloc(MatrixCSVIterObject *self) {
+    Py_XDECREF(self->matrix);
+    PyMem_Free(self->line);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+static PyObject* MatrixCSVIter_next(MatrixCSVIterObject *self) {
+    MatrixObject *m = self->matrix;
+    if (self->row >= m->rows) {
+        return NULL;
+    }
+    
+    Py_ssize_t len = 0;
+    for (Py_ssize_t j = 0; j < m->cols; j++) {
+        char *text = PyOS_double_to_string(MATRIX_AT(m, self->row, j), 'r', 0, Py_DTSF_ADD_DOT_0, NULL);
+        if (text == NULL) {
+            return NULL;
+        }
+        Py_ssize_t n = (Py_ssize_t)strlen(text);
+        if (len + n + 2 > self->capacity) {
+            Py_ssize_t capacity = (len + n + 2) * 2;
+            char *grown = (char *)PyMem_Realloc(self->line, (size_t)capacity);
+            if (grown == NULL) {
+                PyMem_Free(text);
+                return PyErr_NoMemory();
+            }
+            self->line = grown;
+            self->capacity = capacity;
+        }
+        memcpy(self->line + len, text, (size_t)n);
+        len += n;
+        self->line[len++] = j + 1 < m->cols ? self->delimiter : '\n';
+        PyMem_Free(text);
+    }
+    
+    self->row++;
+    return PyUnicode_FromStringAndSize(self->line, len);
+}
+
+static PyTypeObject MatrixCSVIterType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "matmath._matrix.MatrixCSVIterator",
+    .tp_doc = "Iterator over the CSV lines of a Matrix, returned by Matrix.iter_csv()",
+    .tp_basicsize = sizeof(MatrixCSVIterObject),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_dealloc = (destructor)MatrixCSVIter_dealloc,
+    .tp_iter = PyObject_SelfIter,
+    .tp_iternext = (iternextfunc)MatrixCSVIter_next,
+};
+
+/* Matrix.iter_csv */
+static PyObject* Matrix_iter_csv(MatrixObject *self, PyObject *args, PyObject *kwds) {
+    const char *delimiter = ",";
+    static char *kwlist[] = {"delimiter", NULL};
+    
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|s", kwlist, &delimiter)) {
+        return NULL;
+    }
+    if (strlen(delimiter) != 1) {
+        PyErr_SetString(PyExc_ValueError, "delimiter must be a single character");
+        return NULL;
+    }
+    
+    MatrixCSVIterObject *it = PyObject_New(MatrixCSVIterObject, &MatrixCSVIterType);
+    if (it == NULL) {
+        return NULL;
+    }
+    Py_INCREF(self);
+    it->matrix = self;
+    it->row = 0;
+    it->delimiter = delimiter[0];
+    it->line = NULL;
+    it->capacity = 0;
+    return (PyObject *)it;
+}
+
+/* Matrix.__dealloc__ */
+static void Matrix_dealloc(MatrixObject *self) {
+    Matrix_cache_drop(self);
+    Matrix_release_data(self);
+    if (Py_IS_TYPE(self, &MatrixType) && matrix_numfree < MATRIX_FREELIST_SIZE) {
+        matrix_freelist[matrix_numfree++] = self;
+        return;
+    }
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+/* Matrix.__len__ */
+static Py_ssize_t Matrix_length(MatrixObject *self) {
+    return self->rows;
+}
+
+/* Matrix.__getitem__ */
+static PyObject* Matrix_getitem(MatrixObject *self, Py_ssize_t index) {
+    if (index < 0 || index >= self->rows) {
+        PyErr_SetString(PyExc_IndexError, "Matrix row index out of range");
+        return NULL;
+    }
+    
+    PyObject *row = PyList_New(self->cols);
+    if (row == NULL) {
+        return NULL;
+    }
+    
+    for (Py_ssize_t j = 0; j < self->cols; j++) {
+        PyObject *item = PyFloat_FromDouble(MATRIX_AT(self, index, j));
+        if (item == NULL) {
+            Py_DECREF(row);
+            return NULL;
+        }
+        PyList_SET_ITEM(row, j, item);
+    }
+    
+    return row;
+}
+
+/* A strided window of a Matrix selected by an index */
+typedef struct {
+    double *data;
+    Py_ssize_t rows;
+    Py_ssize_t cols;
+    Py_ssize_t row_stride;
+    Py_ssize_t col_stride;
+    Py_ssize_t first_row;    /* Index of the first selected row in the matrix */
+} MatrixWindow;
+
+typedef enum {
+    MATRIX_INDEX_ELEMENT,    /* m[i, j] */
+    MATRIX_INDEX_ROW,        /* m[i] */
+    MATRIX_INDEX_WINDOW,     /* anything involving a slice */
+} MatrixIndexKind;
+
+/* Helper function resolving one axis of a Matrix index
+ *
+ * Returns 0 for an integer and 1 for a slice, filling in the first index,
+ * the number of indices and the step; -1 with an exception set on error.
+ */
+static int Matrix_index_axis(PyObject *key, Py_ssize_t length, Py_ssize_t *start,
+                             Py_ssize_t *count, Py_ssize_t *step) {
+    if (PySlice_Check(key)) {
+        Py_ssize_t stop;
+        if (PySlice_Unpack(key, start, &stop, step) < 0) {
+            return -1;
+        }
+        *count = PySlice_AdjustIndices(length, start, &stop, *step);
+        return 1;
+    }
+    if (!PyIndex_Check(key)) {
+        PyErr_SetString(PyExc_TypeError, "Matrix indices must be integers, slices or a pair of them");
+        return -1;
+    }
+    
+    Py_ssize_t index = PyNumber_AsSsize_t(key, PyExc_IndexError);
+    if (index == -1 && PyErr_Occurred()) {
+        return -1;
+    }
+    if (index < 0) {
+        index += length;
+    }
+    if (index < 0 || index >= length) {
+        PyErr_SetString(PyExc_IndexError, "Matrix index out of range");
         return -1;
     }
+    *start = index;
+    *count = 1;
+    *step = 1;
+    return 0;
+}
 
-    Py_ssize_t rows = PyList_Size(mat);
-    if (rows == 0) {
-        PyErr_SetString(PyExc_ValueError, "Matrix cannot be empty");
+/* Helper function resolving m[key] to the window of m it selects */
+static int Matrix_resolve_index(MatrixObject *self, PyObject *key, MatrixWindow *window,
+                                MatrixIndexKind *kind) {
+    PyObject *row_key = key, *col_key = NULL;
+    if (PyTuple_Check(key)) {
+        if (PyTuple_GET_SIZE(key) != 2) {
+            PyErr_SetString(PyExc_IndexError, "Matrix indices take at most 2 axes");
+            return -1;
+        }
+        row_key = PyTuple_GET_ITEM(key, 0);
+        col_key = PyTuple_GET_ITEM(key, 1);
+    }
+    
+    Py_ssize_t row_start, rows, row_step;
+    Py_ssize_t col_start = 0, cols = self->cols, col_step = 1;
+    int row_slice = Matrix_index_axis(row_key, self->rows, &row_start, &rows, &row_step);
+    if (row_slice < 0) {
         return -1;
     }
+    int col_slice = 1;
+    if (col_key != NULL) {
+        col_slice = Matrix_index_axis(col_key, self->cols, &col_start, &cols, &col_step);
+        if (col_slice < 0) {
+            return -1;
+        }
+    }
+    
+    window->rows = rows;
+    window->cols = cols;
+    window->first_row = row_start;
+    window->row_stride = self->row_stride * row_step;
+    window->col_stride = self->col_stride * col_step;
+    window->data = rows == 0 || cols == 0 ? self->data :
+                   self->data + row_start * self->row_stride + col_start * self->col_stride;
+    if (col_key == NULL) {
+        *kind = row_slice ? MATRIX_INDEX_WINDOW : MATRIX_INDEX_ROW;
+    } else {
+        *kind = row_slice || col_slice ? MATRIX_INDEX_WINDOW : MATRIX_INDEX_ELEMENT;
+    }
+    return 0;
+}
 
-    PyObject *first_row = PyList_GetItem(mat, 0);
-    if (!PyList_Check(first_row)) {
-        PyErr_SetString(PyExc_TypeError, "Matrix must be a list of lists");
-        return -1;
+/* Matrix.__getitem__ (mapping form: m[i], m[i, j], m[r0:r1, c0:c1]) */
+static PyObject* Matrix_subscript(MatrixObject *self, PyObject *key) {
+    MatrixWindow window;
+    MatrixIndexKind kind;
+    if (Matrix_resolve_index(self, key, &window, &kind) < 0) {
+        return NULL;
+    }
+    
+    switch (kind) {
+    case MATRIX_INDEX_ELEMENT:
+        return PyFloat_FromDouble(window.data[0]);
+    case MATRIX_INDEX_ROW:
+        return Matrix_getitem(self, window.first_row);
+    default:
+        /* Matrices are never empty, as in the constructors */
+        if (window.rows == 0) {
+            PyErr_SetString(PyExc_ValueError, "Matrix cannot be empty");
+            return NULL;
+        }
+        if (window.cols == 0) {
+            PyErr_SetString(PyExc_ValueError, "Matrix rows cannot be empty");
+            return NULL;
+        }
+        return (PyObject *)Matrix_view(self, window.data, window.rows, window.cols,
+                                       window.row_stride, window.col_stride);
     }
+}
 
-    Py_ssize_t cols = PyList_Size(first_row);
-    if (cols == 0) {
-        PyErr_SetString(PyExc_ValueError, "Matrix rows cannot be empty");
+/* Matrix.__setitem__ */
+static int Matrix_ass_subscript(MatrixObject *self, PyObject *key, PyObject *value) {
+    if (value == NULL) {
+        PyErr_SetString(PyExc_TypeError, "Matrix elements cannot be deleted");
         return -1;
     }
-
-    /* Allocate matrix */
-    double **data = alloc_matrix(rows, cols);
-    if (data == NULL) {
-        PyErr_NoMemory();
+    
+    MatrixWindow window;
+    MatrixIndexKind kind;
+    if (Matrix_resolve_index(self, key, &window, &kind) < 0) {
         return -1;
     }
-
-    /* Fill matrix and validate */
-    for (Py_ssize_t i = 0; i < rows; i++) {
-        PyObject *row = PyList_GetItem(mat, i);
-        if (!PyList_Check(row)) {
-            free_matrix(data, rows);
-            PyErr_SetString(PyExc_TypeError, "All rows must be lists");
+    
+    /* Cached results are only dropped once a write is certain to happen */
+    if (PyFloat_Check(value) || PyLong_Check(value)) {
+        double scalar = PyFloat_AsDouble(value);
+        if (scalar == -1.0 && PyErr_Occurred()) {
             return -1;
         }
-        
-        if (PyList_Size(row) != cols) {
-            free_matrix(data, rows);
-            PyErr_SetString(PyExc_ValueError, "The matrix is not a proper matrix.");
-            return -1;
+        if (window.rows > 0 && window.cols > 0) {
+            Matrix_changed(self);
         }
-        
-        for (Py_ssize_t j = 0; j < cols; j++) {
-            PyObject *item = PyList_GetItem(row, j);
-            if (!PyFloat_Check(item) && !PyLong_Check(item)) {
-                free_matrix(data, rows);
-                PyErr_SetString(PyExc_TypeError, "All elements must be numbers");
-                return -1;
+        for (Py_ssize_t i = 0; i < window.rows; i++) {
+            for (Py_ssize_t j = 0; j < window.cols; j++) {
+                window.data[i * window.row_stride + j * window.col_stride] = scalar;
             }
-            data[i][j] = PyFloat_AsDouble(item);
         }
+        return 0;
     }
-
-    /* Free old data if exists */
-    if (self->data != NULL) {
-        free_matrix(self->data, self->rows);
+    
+    if (!PyObject_TypeCheck(value, &MatrixType)) {
+        PyErr_SetString(PyExc_TypeError, "Can only assign a number or a Matrix");
+        return -1;
     }
-
-    self->data = data;
-    self->rows = rows;
-    self->cols = cols;
+    MatrixObject *source = (MatrixObject *)value;
+    if (source->rows != window.rows || source->cols != window.cols) {
+        PyErr_SetString(PyExc_ValueError, "The 2 matrices do not have the same order.");
+        return -1;
+    }
+    /* m[...] op= x hands back the very view it just updated */
+    if (source->data == window.data && source->row_stride == window.row_stride &&
+        source->col_stride == window.col_stride) {
+        return 0;
+    }
+    
+    /* Going through a compact copy keeps overlapping source and target correct */
+    double *tmp = alloc_matrix(window.rows, window.cols);
+    if (tmp == NULL) {
+        PyErr_NoMemory();
+        return -1;
+    }
+    Matrix_pack(source, tmp);
+    Matrix_changed(self);
+    MM_PIN(self);
+    strided_unpack(tmp, window.rows, window.cols, window.row_stride, window.col_stride, window.data);
+    MM_UNPIN(self);
+    free_matrix(tmp);
     return 0;
 }
 
-/* Matrix.__dealloc__ */
-static void Matrix_dealloc(MatrixObject *self) {
-    if (self->data != NULL) {
-        free_matrix(self->data, self->rows);
+/* Matrix.row */
+static PyObject* Matrix_row(MatrixObject *self, PyObject *args, PyObject *kwds) {
+    Py_ssize_t i;
+    static char *kwlist[] = {"i", NULL};
+    
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "n", kwlist, &i)) {
+        return NULL;
     }
-    Py_TYPE(self)->tp_free((PyObject *)self);
-}
-
-/* Matrix.__len__ */
-static Py_ssize_t Matrix_length(MatrixObject *self) {
-    return self->rows;
-}
-
-/* Matrix.__getitem__ */
-static PyObject* Matrix_getitem(MatrixObject *self, Py_ssize_t index) {
-    if (index < 0 || index >= self->rows) {
+    if (i < 0) {
+        i += self->rows;
+    }
+    if (i < 0 || i >= self->rows) {
         PyErr_SetString(PyExc_IndexError, "Matrix row index out of range");
         return NULL;
     }
+    return (PyObject *)Matrix_view(self, self->data + i * self->row_stride, 1, self->cols,
+                                   self->row_stride, self->col_stride);
+}
+
+/* Matrix.col */
+static PyObject* Matrix_col(MatrixObject *self, PyObject *args, PyObject *kwds) {
+    Py_ssize_t j;
+    static char *kwlist[] = {"j", NULL};
     
-    PyObject *row = PyList_New(self->cols);
-    if (row == NULL) {
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "n", kwlist, &j)) {
         return NULL;
     }
-    
-    for (Py_ssize_t j = 0; j < self->cols; j++) {
-        PyObject *item = PyFloat_FromDouble(self->data[index][j]);
-        if (item == NULL) {
-            Py_DECREF(row);
-            return NULL;
-        }
-        PyList_SET_ITEM(row, j, item);
+    if (j < 0) {
+        j += self->cols;
     }
-    
-    return row;
+    if (j < 0 || j >= self->cols) {
+        PyErr_SetString(PyExc_IndexError, "Matrix column index out of range");
+        return NULL;
+    }
+    return (PyObject *)Matrix_view(self, self->data + j * self->col_stride, self->rows, 1,
+                                   self->row_stride, self->col_stride);
 }
 
 /* Matrix.__repr__ */
@@ -207,7 +3082,7 @@ static PyObject* Matrix_repr(MatrixObject *self) {
                 Py_DECREF(result);
                 result = temp;
             }
-            PyObject *num = PyUnicode_FromFormat("%.10g", self->data[i][j]);
+            PyObject *num = PyUnicode_FromFormat("%.10g", MATRIX_AT(self, i, j));
             PyObject *temp = PyUnicode_Concat(result, num);
             Py_DECREF(result);
             Py_DECREF(num);
@@ -232,7 +3107,7 @@ static PyObject* Matrix_str(MatrixObject *self) {
         widths[j] = 0;
         for (Py_ssize_t i = 0; i < self->rows; i++) {
             char buffer[64];
-            snprintf(buffer, sizeof(buffer), "%.10g", self->data[i][j]);
+            snprintf(buffer, sizeof(buffer), "%.10g", MATRIX_AT(self, i, j));
             Py_ssize_t len = strlen(buffer);
             if (len > widths[j]) {
                 widths[j] = len;
@@ -255,7 +3130,7 @@ static PyObject* Matrix_str(MatrixObject *self) {
         
         for (Py_ssize_t j = 0; j < self->cols; j++) {
             char buffer[128];
-            snprintf(buffer, sizeof(buffer), "%*.10g ", (int)widths[j], self->data[i][j]);
+            snprintf(buffer, sizeof(buffer), "%*.10g ", (int)widths[j], MATRIX_AT(self, i, j));
             temp = PyUnicode_Concat(result, PyUnicode_FromString(buffer));
             Py_DECREF(result);
             result = temp;
@@ -268,10 +3143,27 @@ static PyObject* Matrix_str(MatrixObject *self) {
     return temp;
 }
 
-/* Matrix.__add__ */
-static PyObject* Matrix_add(MatrixObject *self, PyObject *other) {
+/* Checks that `out` is a Matrix of the given order */
+static int Matrix_check_out(PyObject *out, Py_ssize_t rows, Py_ssize_t cols) {
+    if (!PyObject_TypeCheck(out, &MatrixType)) {
+        PyErr_SetString(PyExc_TypeError, "out must be a Matrix");
+        return -1;
+    }
+    
+    MatrixObject *out_mat = (MatrixObject *)out;
+    if (out_mat->rows != rows || out_mat->cols != cols) {
+        PyErr_Format(PyExc_ValueError, "out must be a %zdx%zd matrix", rows, cols);
+        return -1;
+    }
+    return 0;
+}
+
+/* Helper for + and -; writes into `out` (which may be self or other), or a new Matrix when NULL */
+static PyObject* Matrix_add_or_sub(MatrixObject *self, PyObject *other, ElementwiseOp op,
+                                   MatrixObject *out) {
     if (!PyObject_TypeCheck(other, &MatrixType)) {
-        PyErr_SetString(PyExc_TypeError, "Can only add Matrix to Matrix");
+        PyErr_SetString(PyExc_TypeError, op == EW_ADD ? "Can only add Matrix to Matrix"
+                                                      : "Can only subtract Matrix from Matrix");
         return NULL;
     }
     
@@ -281,234 +3173,544 @@ static PyObject* Matrix_add(MatrixObject *self, PyObject *other) {
         return NULL;
     }
     
-    double **result_data = alloc_matrix(self->rows, self->cols);
-    if (result_data == NULL) {
-        return PyErr_NoMemory();
+    PROFILE_START;
+    Py_ssize_t size = self->rows * self->cols;
+    Py_ssize_t allocated = out == NULL ? size : 0;
+    if (out == NULL) {
+        out = Matrix_alloc(self->rows, self->cols);
+        if (out == NULL) {
+            return NULL;
+        }
+    } else {
+        Py_INCREF(out);
     }
     
-    for (Py_ssize_t i = 0; i < self->rows; i++) {
-        for (Py_ssize_t j = 0; j < self->cols; j++) {
-            result_data[i][j] = self->data[i][j] + other_mat->data[i][j];
-        }
+    if (Matrix_elementwise(op, self, other_mat, 0.0, out) < 0) {
+        Py_DECREF(out);
+        return NULL;
+    }
+    PROFILE_STOP(op == EW_ADD ? MM_OP_ADD : MM_OP_SUB, allocated * sizeof(double), size);
+    return (PyObject *)out;
+}
+
+/* Matrix.__add__ */
+static PyObject* Matrix_add(MatrixObject *self, PyObject *other) {
+    if (!PyObject_TypeCheck((PyObject *)self, &MatrixType)) {
+        Py_RETURN_NOTIMPLEMENTED;
     }
+    return Matrix_add_or_sub(self, other, EW_ADD, NULL);
+}
+
+/* Matrix.__iadd__ */
+static PyObject* Matrix_iadd(MatrixObject *self, PyObject *other) {
+    return Matrix_add_or_sub(self, other, EW_ADD, self);
+}
+
+/* Matrix.add */
+static PyObject* Matrix_add_method(MatrixObject *self, PyObject *args, PyObject *kwds) {
+    PyObject *other, *out = Py_None;
+    static char *kwlist[] = {"other", "out", NULL};
     
-    MatrixObject *result = Matrix_new_from_data(result_data, self->rows, self->cols);
-    free_matrix(result_data, self->rows);
-    return (PyObject *)result;
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|O", kwlist, &other, &out)) {
+        return NULL;
+    }
+    if (out != Py_None && Matrix_check_out(out, self->rows, self->cols) < 0) {
+        return NULL;
+    }
+    return Matrix_add_or_sub(self, other, EW_ADD, out == Py_None ? NULL : (MatrixObject *)out);
 }
 
 /* Matrix.__sub__ */
 static PyObject* Matrix_sub(MatrixObject *self, PyObject *other) {
-    if (!PyObject_TypeCheck(other, &MatrixType)) {
-        PyErr_SetString(PyExc_TypeError, "Can only subtract Matrix from Matrix");
+    if (!PyObject_TypeCheck((PyObject *)self, &MatrixType)) {
+        Py_RETURN_NOTIMPLEMENTED;
+    }
+    return Matrix_add_or_sub(self, other, EW_SUB, NULL);
+}
+
+/* Matrix.__isub__ */
+static PyObject* Matrix_isub(MatrixObject *self, PyObject *other) {
+    return Matrix_add_or_sub(self, other, EW_SUB, self);
+}
+
+/* Matrix.sub */
+static PyObject* Matrix_sub_method(MatrixObject *self, PyObject *args, PyObject *kwds) {
+    PyObject *other, *out = Py_None;
+    static char *kwlist[] = {"other", "out", NULL};
+    
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|O", kwlist, &other, &out)) {
+        return NULL;
+    }
+    if (out != Py_None && Matrix_check_out(out, self->rows, self->cols) < 0) {
+        return NULL;
+    }
+    return Matrix_add_or_sub(self, other, EW_SUB, out == Py_None ? NULL : (MatrixObject *)out);
+}
+
+/* Helper for the scalar-or-matrix operators (*, /, //); `out` may be self */
+static int Matrix_scalar_or_elementwise(MatrixObject *self, PyObject *other, ElementwiseOp op,
+                                        MatrixObject *out, const char *type_error) {
+    PROFILE_START;
+    int status;
+    if (PyFloat_Check(other) || PyLong_Check(other)) {
+        double scalar = PyFloat_AsDouble(other);
+        if (scalar == -1.0 && PyErr_Occurred()) {
+            return -1;
+        }
+        status = Matrix_elementwise(op, self, NULL, scalar, out);
+    } else if (PyObject_TypeCheck(other, &MatrixType)) {
+        MatrixObject *other_mat = (MatrixObject *)other;
+        if (self->rows != other_mat->rows || self->cols != other_mat->cols) {
+            PyErr_SetString(PyExc_ValueError, "The 2 matrices do not have the same order.");
+            return -1;
+        }
+        status = Matrix_elementwise(op, self, other_mat, 0.0, out);
+    } else {
+        PyErr_SetString(PyExc_TypeError, type_error);
+        return -1;
+    }
+    
+    if (status == 0) {
+        /* A result other than self was allocated by the caller */
+        Py_ssize_t size = self->rows * self->cols;
+        PROFILE_STOP(op == EW_MUL ? MM_OP_MUL : op == EW_DIV ? MM_OP_TRUEDIV : MM_OP_FLOORDIV,
+                     out != self ? size * (Py_ssize_t)sizeof(double) : 0, size);
+    }
+    return status;
+}
+
+/* Matrix.__mul__ */
+static PyObject* Matrix_mul(MatrixObject *self, PyObject *other) {
+    if (!PyObject_TypeCheck((PyObject *)self, &MatrixType)) {
+        /* Reflected operand (scalar * matrix); both products commute */
+        PyObject *left = (PyObject *)self;
+        self = (MatrixObject *)other;
+        other = left;
+    }
+    
+    MatrixObject *result = Matrix_alloc(self->rows, self->cols);
+    if (result == NULL) {
         return NULL;
     }
     
-    MatrixObject *other_mat = (MatrixObject *)other;
-    if (self->rows != other_mat->rows || self->cols != other_mat->cols) {
-        PyErr_SetString(PyExc_ValueError, "The 2 matrices do not have the same order.");
+    if (Matrix_scalar_or_elementwise(self, other, EW_MUL, result,
+            "Multiplication not supported between Matrix and given type.") < 0) {
+        Py_DECREF(result);
         return NULL;
     }
     
-    double **result_data = alloc_matrix(self->rows, self->cols);
-    if (result_data == NULL) {
-        return PyErr_NoMemory();
+    return (PyObject *)result;
+}
+
+/* Helper function for Matrix @ Vector and Vector @ Matrix */
+static PyObject* Matrix_vector_product(MatrixObject *matrix, VectorObject *vector, int vector_first) {
+    Py_ssize_t inner = vector_first ? matrix->rows : matrix->cols;
+    if (vector->length != inner) {
+        PyErr_SetString(PyExc_ValueError, "Matrix and Vector dimensions incompatible for multiplication");
+        return NULL;
     }
     
-    for (Py_ssize_t i = 0; i < self->rows; i++) {
-        for (Py_ssize_t j = 0; j < self->cols; j++) {
-            result_data[i][j] = self->data[i][j] - other_mat->data[i][j];
+    PROFILE_START;
+    if (matrix->rows == matrix->cols && is_small_order(matrix->rows)) {
+        VectorObject *result = VectorAPI->Vector_alloc(matrix->rows);
+        if (result != NULL) {
+            small_matvec(matrix, vector->data, result->data, vector_first);
+            PROFILE_STOP(MM_OP_MATVEC, result->length * sizeof(double), 2 * matrix->rows * matrix->cols);
         }
+        return (PyObject *)result;
     }
     
-    MatrixObject *result = Matrix_new_from_data(result_data, self->rows, self->cols);
-    free_matrix(result_data, self->rows);
+    MatrixObject *a = Matrix_compact(matrix);
+    if (a == NULL) {
+        return NULL;
+    }
+    VectorObject *result = VectorAPI->Vector_alloc(vector_first ? matrix->cols : matrix->rows);
+    if (result != NULL) {
+        MM_PIN(a);
+        MM_PIN(vector);
+        gemv(a->data, vector->data, result->data, matrix->rows, matrix->cols, vector_first);
+        MM_UNPIN(a);
+        MM_UNPIN(vector);
+        PROFILE_STOP(MM_OP_MATVEC, result->length * sizeof(double), 2 * matrix->rows * matrix->cols);
+    }
+    Py_DECREF(a);
     return (PyObject *)result;
 }
 
-/* Matrix.__mul__ */
-static PyObject* Matrix_mul(MatrixObject *self, PyObject *other) {
-    double **result_data = alloc_matrix(self->rows, self->cols);
-    if (result_data == NULL) {
-        return PyErr_NoMemory();
+/* Helper for Matrix @ Matrix once the orders are checked; `out` may alias either operand */
+static PyObject* Matrix_matmul_into(MatrixObject *self, MatrixObject *other_mat, MatrixObject *out) {
+    Py_ssize_t m = self->rows, n = other_mat->cols, p = self->cols;
+    PROFILE_START;
+    if (out != NULL) {
+        Matrix_changed(out);
     }
     
-    if (PyFloat_Check(other) || PyLong_Check(other)) {
-        /* Scalar multiplication */
-        double scalar = PyFloat_AsDouble(other);
-        for (Py_ssize_t i = 0; i < self->rows; i++) {
-            for (Py_ssize_t j = 0; j < self->cols; j++) {
-                result_data[i][j] = self->data[i][j] * scalar;
+    if (m == n && n == p && is_small_order(n)) {
+        /* Formed on the stack, so out may alias either operand */
+        double c[SMALL_MAX * SMALL_MAX];
+        small_matmul(self, other_mat, c);
+        int allocated = out == NULL || (out->col_stride != 1 && n > 1) ||
+                        Matrix_overlaps(out, self) || Matrix_overlaps(out, other_mat);
+        if (out == NULL) {
+            out = Matrix_alloc(n, n);
+            if (out == NULL) {
+                return NULL;
             }
+        } else {
+            Py_INCREF(out);
         }
-    } else if (PyObject_TypeCheck(other, &MatrixType)) {
-        /* Element-wise multiplication */
-        MatrixObject *other_mat = (MatrixObject *)other;
-        if (self->rows != other_mat->rows || self->cols != other_mat->cols) {
-            free_matrix(result_data, self->rows);
-            PyErr_SetString(PyExc_ValueError, "The 2 matrices do not have the same order.");
+        Matrix_unpack(out, c);
+        PROFILE_STOP(MM_OP_MATMUL, allocated ? n * n * sizeof(double) : 0, 2.0 * n * n * n);
+        return (PyObject *)out;
+    }
+    
+    /* gemm takes leading dimensions, so only views with a column stride are packed */
+    MatrixObject *a = Matrix_unit_col_stride(self);
+    MatrixObject *b = a == NULL ? NULL : Matrix_unit_col_stride(other_mat);
+    if (b == NULL) {
+        Py_XDECREF(a);
+        return NULL;
+    }
+    
+    double *scratch = NULL;
+    double *dst;
+    Py_ssize_t ldc = n;
+    int allocated = out == NULL;
+    if (out == NULL) {
+        out = Matrix_alloc(m, n);
+        if (out == NULL) {
+            Py_DECREF(a);
+            Py_DECREF(b);
             return NULL;
         }
-        for (Py_ssize_t i = 0; i < self->rows; i++) {
-            for (Py_ssize_t j = 0; j < self->cols; j++) {
-                result_data[i][j] = self->data[i][j] * other_mat->data[i][j];
+        dst = out->data;
+    } else {
+        Py_INCREF(out);
+        dst = out->data;
+        ldc = out->row_stride;
+        if ((out->col_stride != 1 && n > 1) || Matrix_overlaps(out, self) ||
+            Matrix_overlaps(out, other_mat)) {
+            scratch = alloc_matrix(m, n);
+            if (scratch == NULL) {
+                Py_DECREF(a);
+                Py_DECREF(b);
+                Py_DECREF(out);
+                return PyErr_NoMemory();
             }
+            dst = scratch;
+            ldc = n;
+            allocated = 1;
         }
-    } else {
-        free_matrix(result_data, self->rows);
-        PyErr_SetString(PyExc_TypeError, "Multiplication not supported between Matrix and given type.");
-        return NULL;
     }
     
-    MatrixObject *result = Matrix_new_from_data(result_data, self->rows, self->cols);
-    free_matrix(result_data, self->rows);
-    return (PyObject *)result;
+    /* a and b may be the operands themselves */
+    int status;
+    MM_PIN(a);
+    MM_PIN(b);
+    MM_PIN(out);
+    MM_BEGIN_ALLOW_THREADS(m * n * p)
+    status = gemm_parallel(m, n, p, a->data, a->row_stride, b->data, b->row_stride, dst, ldc, 0);
+    MM_END_ALLOW_THREADS
+    MM_UNPIN(a);
+    MM_UNPIN(b);
+    MM_UNPIN(out);
+    Py_DECREF(a);
+    Py_DECREF(b);
+    if (status == 0 && scratch != NULL) {
+        Matrix_unpack(out, scratch);
+    }
+    free_matrix(scratch);
+    if (status < 0) {
+        Py_DECREF(out);
+        return PyErr_NoMemory();
+    }
+    
+    /* Either a new result or scratch for out was allocated, never both */
+    PROFILE_STOP(MM_OP_MATMUL, allocated ? m * n * sizeof(double) : 0, 2.0 * m * n * p);
+    return (PyObject *)out;
 }
 
 /* Matrix.__matmul__ (matrix multiplication) */
-static PyObject* Matrix_matmul(MatrixObject *self, PyObject *other) {
-    if (!PyObject_TypeCheck(other, &MatrixType)) {
-        PyErr_SetString(PyExc_TypeError, "Can only matrix multiply Matrix with Matrix");
+static PyObject* Matrix_matmul(PyObject *left, PyObject *right) {
+    if (!PyObject_TypeCheck(left, &MatrixType)) {
+        if (PyObject_TypeCheck(left, VectorAPI->VectorType)) {
+            return Matrix_vector_product((MatrixObject *)right, (VectorObject *)left, 1);
+        }
+        Py_RETURN_NOTIMPLEMENTED;
+    }
+    
+    MatrixObject *self = (MatrixObject *)left;
+    if (PyObject_TypeCheck(right, VectorAPI->VectorType)) {
+        return Matrix_vector_product(self, (VectorObject *)right, 0);
+    }
+    if (!PyObject_TypeCheck(right, &MatrixType)) {
+        /* Let types such as SparseMatrix provide the reflected product */
+        PyNumberMethods *nb = Py_TYPE(right)->tp_as_number;
+        if (nb != NULL && nb->nb_matrix_multiply != NULL) {
+            Py_RETURN_NOTIMPLEMENTED;
+        }
+        PyErr_SetString(PyExc_TypeError, "Can only matrix multiply Matrix with Matrix or Vector");
         return NULL;
     }
     
-    MatrixObject *other_mat = (MatrixObject *)other;
+    MatrixObject *other_mat = (MatrixObject *)right;
     if (self->cols != other_mat->rows) {
         PyErr_SetString(PyExc_ValueError, "Matrix dimensions incompatible for multiplication");
         return NULL;
     }
     
-    double **result_data = alloc_matrix(self->rows, other_mat->cols);
-    if (result_data == NULL) {
-        return PyErr_NoMemory();
-    }
-    
-    /* Initialize to zero */
-    for (Py_ssize_t i = 0; i < self->rows; i++) {
-        for (Py_ssize_t j = 0; j < other_mat->cols; j++) {
-            result_data[i][j] = 0.0;
+    return Matrix_matmul_into(self, other_mat, NULL);
+}
+
+/* Matrix.__imatmul__ */
+static PyObject* Matrix_imatmul(MatrixObject *self, PyObject *other) {
+    /* Only a square right operand keeps the order, so only then is self reused */
+    if (PyObject_TypeCheck(other, &MatrixType)) {
+        MatrixObject *other_mat = (MatrixObject *)other;
+        if (other_mat->rows == self->cols && other_mat->cols == self->cols) {
+            return Matrix_matmul_into(self, other_mat, self);
         }
     }
+    return Matrix_matmul((PyObject *)self, other);
+}
+
+/* Matrix.matmul */
+static PyObject* Matrix_matmul_method(MatrixObject *self, PyObject *args, PyObject *kwds) {
+    PyObject *other, *out = Py_None;
+    static char *kwlist[] = {"other", "out", NULL};
     
-    /* Matrix multiplication */
-    for (Py_ssize_t i = 0; i < self->rows; i++) {
-        for (Py_ssize_t j = 0; j < other_mat->cols; j++) {
-            for (Py_ssize_t k = 0; k < self->cols; k++) {
-                result_data[i][j] += self->data[i][k] * other_mat->data[k][j];
-            }
-        }
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|O", kwlist, &other, &out)) {
+        return NULL;
+    }
+    if (out == Py_None) {
+        return PyNumber_MatrixMultiply((PyObject *)self, other);
+    }
+    if (!PyObject_TypeCheck(other, &MatrixType)) {
+        PyErr_SetString(PyExc_TypeError, "out is only supported for Matrix @ Matrix");
+        return NULL;
     }
     
-    MatrixObject *result = Matrix_new_from_data(result_data, self->rows, other_mat->cols);
-    free_matrix(result_data, self->rows);
-    return (PyObject *)result;
+    MatrixObject *other_mat = (MatrixObject *)other;
+    if (self->cols != other_mat->rows) {
+        PyErr_SetString(PyExc_ValueError, "Matrix dimensions incompatible for multiplication");
+        return NULL;
+    }
+    if (Matrix_check_out(out, self->rows, other_mat->cols) < 0) {
+        return NULL;
+    }
+    return Matrix_matmul_into(self, other_mat, (MatrixObject *)out);
 }
 
-/* Matrix.__truediv__ */
-static PyObject* Matrix_truediv(MatrixObject *self, PyObject *other) {
-    double **result_data = alloc_matrix(self->rows, self->cols);
-    if (result_data == NULL) {
-        return PyErr_NoMemory();
+/* Matrix.apply */
+static PyObject* Matrix_apply(MatrixObject *self, PyObject *args, PyObject *kwds) {
+    PyObject *vectors;
+    static char *kwlist[] = {"vectors", NULL};
+    
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O", kwlist, &vectors)) {
+        return NULL;
     }
     
-    if (PyFloat_Check(other) || PyLong_Check(other)) {
-        /* Scalar division */
-        double scalar = PyFloat_AsDouble(other);
-        if (scalar == 0.0) {
-            free_matrix(result_data, self->rows);
-            PyErr_SetString(PyExc_ZeroDivisionError, "Division by zero");
+    Py_ssize_t m = self->rows, n = self->cols;
+    PROFILE_START;
+    
+    /* A VectorArray is already one packed block: Y = X @ A^T straight into a new array */
+    if (PyObject_TypeCheck(vectors, VectorAPI->VectorArrayType)) {
+        VectorArrayObject *arr = (VectorArrayObject *)vectors;
+        if (arr->dim != n) {
+            PyErr_SetString(PyExc_ValueError, "Matrix and Vector dimensions incompatible for multiplication");
             return NULL;
         }
-        for (Py_ssize_t i = 0; i < self->rows; i++) {
-            for (Py_ssize_t j = 0; j < self->cols; j++) {
-                result_data[i][j] = self->data[i][j] / scalar;
-            }
+        VectorArrayObject *result = VectorAPI->VectorArray_alloc(arr->count, m);
+        double *at = alloc_matrix(n, m);
+        if (result == NULL || at == NULL) {
+            Py_XDECREF(result);
+            free_matrix(at);
+            return PyErr_NoMemory();
         }
-    } else if (PyObject_TypeCheck(other, &MatrixType)) {
-        /* Element-wise division */
-        MatrixObject *other_mat = (MatrixObject *)other;
-        if (self->rows != other_mat->rows || self->cols != other_mat->cols) {
-            free_matrix(result_data, self->rows);
-            PyErr_SetString(PyExc_ValueError, "The 2 matrices do not have the same order.");
+        Matrix_pack_transposed(self, at);
+        int status;
+        MM_BEGIN_ALLOW_THREADS(arr->count * m * n)
+        status = gemm_parallel(arr->count, m, n, arr->data, n, at, m, result->data, m, 0);
+        MM_END_ALLOW_THREADS
+        free_matrix(at);
+        if (status < 0) {
+            Py_DECREF(result);
+            return PyErr_NoMemory();
+        }
+        PROFILE_STOP(MM_OP_APPLY, (arr->count * m + n * m) * sizeof(double), 2.0 * arr->count * m * n);
+        return (PyObject *)result;
+    }
+    
+    PyObject *seq = PySequence_Fast(vectors, "vectors must be an iterable of Vectors");
+    if (seq == NULL) {
+        return NULL;
+    }
+    
+    Py_ssize_t count = PySequence_Fast_GET_SIZE(seq);
+    PyObject **items = PySequence_Fast_ITEMS(seq);
+    for (Py_ssize_t v = 0; v < count; v++) {
+        if (!PyObject_TypeCheck(items[v], VectorAPI->VectorType)) {
+            PyErr_SetString(PyExc_TypeError, "vectors must be an iterable of Vectors");
+            Py_DECREF(seq);
             return NULL;
         }
-        for (Py_ssize_t i = 0; i < self->rows; i++) {
-            for (Py_ssize_t j = 0; j < self->cols; j++) {
-                if (other_mat->data[i][j] == 0.0) {
-                    free_matrix(result_data, self->rows);
-                    PyErr_SetString(PyExc_ZeroDivisionError, "Division by zero");
-                    return NULL;
-                }
-                result_data[i][j] = self->data[i][j] / other_mat->data[i][j];
-            }
+        if (((VectorObject *)items[v])->length != n) {
+            PyErr_SetString(PyExc_ValueError, "Matrix and Vector dimensions incompatible for multiplication");
+            Py_DECREF(seq);
+            return NULL;
         }
-    } else {
-        free_matrix(result_data, self->rows);
-        PyErr_SetString(PyExc_TypeError, "Division not supported between Matrix and given type.");
-        return NULL;
     }
     
-    MatrixObject *result = Matrix_new_from_data(result_data, self->rows, self->cols);
-    free_matrix(result_data, self->rows);
-    return (PyObject *)result;
-}
-
-/* Matrix.transpose */
-static PyObject* Matrix_transpose(MatrixObject *self, PyObject *Py_UNUSED(ignored)) {
-    double **result_data = alloc_matrix(self->cols, self->rows);
-    if (result_data == NULL) {
+    /* Y (count x m) = X (count x n) @ A^T, with the inputs gathered into X */
+    double *x = alloc_matrix(count, n);
+    double *at = alloc_matrix(n, m);
+    double *y = alloc_matrix(count, m);
+    PyObject *result = PyList_New(count);
+    if (x == NULL || at == NULL || y == NULL || result == NULL) {
+        free_matrix(x);
+        free_matrix(at);
+        free_matrix(y);
+        Py_XDECREF(result);
+        Py_DECREF(seq);
+        return result == NULL ? NULL : PyErr_NoMemory();
+    }
+    for (Py_ssize_t v = 0; v < count; v++) {
+        memcpy(x + v * n, ((VectorObject *)items[v])->data, (size_t)n * sizeof(double));
+    }
+    Py_DECREF(seq);
+    
+    Matrix_pack_transposed(self, at);
+    int status;
+    MM_BEGIN_ALLOW_THREADS(count * m * n)
+    status = gemm_parallel(count, m, n, x, n, at, m, y, m, 0);
+    MM_END_ALLOW_THREADS
+    free_matrix(x);
+    free_matrix(at);
+    if (status < 0) {
+        free_matrix(y);
+        Py_DECREF(result);
         return PyErr_NoMemory();
     }
     
-    for (Py_ssize_t i = 0; i < self->cols; i++) {
-        for (Py_ssize_t j = 0; j < self->rows; j++) {
-            result_data[i][j] = self->data[j][i];
+    for (Py_ssize_t v = 0; v < count; v++) {
+        VectorObject *item = VectorAPI->Vector_new_from_data(y + v * m, m);
+        if (item == NULL) {
+            free_matrix(y);
+            Py_DECREF(result);
+            return NULL;
         }
+        PyList_SET_ITEM(result, v, (PyObject *)item);
+    }
+    free_matrix(y);
+    PROFILE_STOP(MM_OP_APPLY, (count * n + n * m + 2 * count * m) * sizeof(double), 2.0 * count * m * n);
+    return result;
+}
+
+/* Matrix.__truediv__ */
+static PyObject* Matrix_truediv(MatrixObject *self, PyObject *other) {
+    if (!PyObject_TypeCheck((PyObject *)self, &MatrixType)) {
+        Py_RETURN_NOTIMPLEMENTED;
+    }
+    
+    MatrixObject *result = Matrix_alloc(self->rows, self->cols);
+    if (result == NULL) {
+        return NULL;
+    }
+    
+    if (Matrix_scalar_or_elementwise(self, other, EW_DIV, result,
+            "Division not supported between Matrix and given type.") < 0) {
+        Py_DECREF(result);
+        return NULL;
     }
     
-    MatrixObject *result = Matrix_new_from_data(result_data, self->cols, self->rows);
-    free_matrix(result_data, self->cols);
     return (PyObject *)result;
 }
 
-/* Matrix.determinant */
-static PyObject* Matrix_determinant(MatrixObject *self, PyObject *Py_UNUSED(ignored)) {
-    if (self->rows != self->cols) {
-        PyErr_SetString(PyExc_ValueError, "The given matrix is not a square matrix.");
+/* Matrix.__itruediv__ */
+static PyObject* Matrix_itruediv(MatrixObject *self, PyObject *other) {
+    if (Matrix_scalar_or_elementwise(self, other, EW_DIV, self,
+            "Division not supported between Matrix and given type.") < 0) {
         return NULL;
     }
     
-    /* Create a copy for Gaussian elimination */
-    double **mat = alloc_matrix(self->rows, self->cols);
-    if (mat == NULL) {
-        return PyErr_NoMemory();
+    Py_INCREF(self);
+    return (PyObject *)self;
+}
+
+/* Matrix.transpose */
+static PyObject* Matrix_transpose(MatrixObject *self, PyObject *args, PyObject *kwds) {
+    PyObject *out = Py_None;
+    static char *kwlist[] = {"out", NULL};
+    
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|O", kwlist, &out)) {
+        return NULL;
     }
     
-    for (Py_ssize_t i = 0; i < self->rows; i++) {
-        for (Py_ssize_t j = 0; j < self->cols; j++) {
-            mat[i][j] = self->data[i][j];
+    /* Packing the transposed window of self is the transpose */
+    PROFILE_START;
+    Py_ssize_t bytes = self->rows * self->cols * sizeof(double);
+    if (out == Py_None) {
+        MatrixObject *result = Matrix_alloc(self->cols, self->rows);
+        if (result == NULL) {
+            return NULL;
+        }
+        if (self->rows == self->cols && is_small_order(self->rows)) {
+            small_transpose(self, result->data);
+        } else {
+            Matrix_pack_transposed(self, result->data);
         }
+        PROFILE_STOP(MM_OP_TRANSPOSE, bytes, 0);
+        return (PyObject *)result;
     }
     
-    double determinant = 1.0;
-    
-    for (Py_ssize_t i = 0; i < self->rows; i++) {
-        for (Py_ssize_t j = i + 1; j < self->rows; j++) {
-            if (mat[i][i] == 0.0) {
-                mat[i][i] = 1.0;
-            }
-            double x = mat[j][i] / mat[i][i];
-            for (Py_ssize_t k = 0; k < self->rows; k++) {
-                mat[j][k] -= x * mat[i][k];
-            }
+    if (Matrix_check_out(out, self->cols, self->rows) < 0) {
+        return NULL;
+    }
+    MatrixObject *out_mat = (MatrixObject *)out;
+    Matrix_changed(out_mat);
+    if (Matrix_is_contiguous(out_mat) && !Matrix_overlaps(out_mat, self)) {
+        MM_PIN(out_mat);
+        Matrix_pack_transposed(self, out_mat->data);
+        MM_UNPIN(out_mat);
+        bytes = 0;
+    } else {
+        double *scratch = alloc_matrix(self->cols, self->rows);
+        if (scratch == NULL) {
+            return PyErr_NoMemory();
         }
+        Matrix_pack_transposed(self, scratch);
+        Matrix_unpack(out_mat, scratch);
+        free_matrix(scratch);
     }
+    PROFILE_STOP(MM_OP_TRANSPOSE, bytes, 0);
     
-    for (Py_ssize_t i = 0; i < self->rows; i++) {
-        determinant *= mat[i][i];
+    Py_INCREF(out);
+    return out;
+}
+
+/* Matrix.T property */
+static PyObject* Matrix_get_T(MatrixObject *self, void *closure) {
+    return (PyObject *)Matrix_view(self, self->data, self->cols, self->rows,
+                                   self->col_stride, self->row_stride);
+}
+
+/* Matrix.determinant */
+static PyObject* Matrix_determinant(MatrixObject *self, PyObject *Py_UNUSED(ignored)) {
+    PROFILE_START;
+    if (self->rows == self->cols && is_small_order(self->rows)) {
+        double determinant = small_determinant(self);
+        PROFILE_STOP(MM_OP_DETERMINANT, LU_bytes(self->rows), LU_flops(self->rows));
+        return PyFloat_FromDouble(determinant);
     }
     
-    free_matrix(mat, self->rows);
+    double determinant;
+    int factored = 0;
+    if (Matrix_cached_det(self, &determinant, &factored) < 0) {
+        return NULL;
+    }
+    if (factored) {
+        PROFILE_STOP(MM_OP_DETERMINANT, LU_bytes(self->rows), LU_flops(self->rows));
+    }
     return PyFloat_FromDouble(determinant);
 }
 
@@ -519,11 +3721,20 @@ static PyObject* Matrix_trace(MatrixObject *self, PyObject *Py_UNUSED(ignored))
         return NULL;
     }
     
+    unsigned long long version;
+    MatrixCache *cache = cache_get(self, CACHE_TRACE, &version);
+    if (cache != NULL) {
+        return PyFloat_FromDouble(cache->trace);
+    }
+    
     double total = 0.0;
     for (Py_ssize_t i = 0; i < self->rows; i++) {
-        total += self->data[i][i];
+        total += MATRIX_AT(self, i, i);
     }
     
+    if ((cache = cache_put(self, CACHE_TRACE, version)) != NULL) {
+        cache->trace = total;
+    }
     return PyFloat_FromDouble(total);
 }
 
@@ -537,18 +3748,7 @@ static PyObject* Matrix_is_square(MatrixObject *self, PyObject *Py_UNUSED(ignore
 
 /* Matrix.is_symmetric */
 static PyObject* Matrix_is_symmetric(MatrixObject *self, PyObject *Py_UNUSED(ignored)) {
-    if (self->rows != self->cols) {
-        Py_RETURN_FALSE;
-    }
-    
-    for (Py_ssize_t i = 0; i < self->rows; i++) {
-        for (Py_ssize_t j = i; j < self->cols; j++) {
-            if (self->data[i][j] != self->data[j][i]) {
-                Py_RETURN_FALSE;
-            }
-        }
-    }
-    Py_RETURN_TRUE;
+    return PyBool_FromLong(Matrix_cached_flag(self, CACHE_SYMMETRIC, is_symmetric));
 }
 
 /* Matrix.is_diagonal */
@@ -559,7 +3759,7 @@ static PyObject* Matrix_is_diagonal(MatrixObject *self, PyObject *Py_UNUSED(igno
     
     for (Py_ssize_t i = 0; i < self->rows; i++) {
         for (Py_ssize_t j = 0; j < self->cols; j++) {
-            if (i != j && self->data[i][j] != 0.0) {
+            if (i != j && MATRIX_AT(self, i, j) != 0.0) {
                 Py_RETURN_FALSE;
             }
         }
@@ -576,7 +3776,7 @@ static PyObject* Matrix_is_identity(MatrixObject *self, PyObject *Py_UNUSED(igno
     for (Py_ssize_t i = 0; i < self->rows; i++) {
         for (Py_ssize_t j = 0; j < self->cols; j++) {
             double expected = (i == j) ? 1.0 : 0.0;
-            if (fabs(self->data[i][j] - expected) > 1e-10) {
+            if (fabs(MATRIX_AT(self, i, j) - expected) > 1e-10) {
                 Py_RETURN_FALSE;
             }
         }
@@ -586,7 +3786,13 @@ static PyObject* Matrix_is_identity(MatrixObject *self, PyObject *Py_UNUSED(igno
 
 /* Matrix.copy */
 static PyObject* Matrix_copy(MatrixObject *self, PyObject *Py_UNUSED(ignored)) {
-    return (PyObject *)Matrix_new_from_data(self->data, self->rows, self->cols);
+    PROFILE_START;
+    MatrixObject *result = Matrix_alloc(self->rows, self->cols);
+    if (result != NULL) {
+        Matrix_pack(self, result->data);
+        PROFILE_STOP(MM_OP_COPY, self->rows * self->cols * sizeof(double), 0);
+    }
+    return (PyObject *)result;
 }
 
 /* Matrix.to_list */
@@ -604,7 +3810,7 @@ static PyObject* Matrix_to_list(MatrixObject *self, PyObject *Py_UNUSED(ignored)
         }
         
         for (Py_ssize_t j = 0; j < self->cols; j++) {
-            PyObject *item = PyFloat_FromDouble(self->data[i][j]);
+            PyObject *item = PyFloat_FromDouble(MATRIX_AT(self, i, j));
             if (item == NULL) {
                 Py_DECREF(row);
                 Py_DECREF(result);
@@ -621,88 +3827,45 @@ static PyObject* Matrix_to_list(MatrixObject *self, PyObject *Py_UNUSED(ignored)
 
 /* Matrix.__iter__ */
 static PyObject* Matrix_iter(MatrixObject *self) {
-    PyObject *list = Matrix_to_list(self, NULL);
-    if (list == NULL) {
-        return NULL;
-    }
-    PyObject *iter = PyObject_GetIter(list);
-    Py_DECREF(list);
-    return iter;
+    /* Rows are built one at a time through sq_item as the iterator advances */
+    return PySeqIter_New((PyObject *)self);
 }
 
 /* Matrix.__floordiv__ */
 static PyObject* Matrix_floordiv(MatrixObject *self, PyObject *other) {
-    double **result_data = alloc_matrix(self->rows, self->cols);
-    if (result_data == NULL) {
-        return PyErr_NoMemory();
+    if (!PyObject_TypeCheck((PyObject *)self, &MatrixType)) {
+        Py_RETURN_NOTIMPLEMENTED;
     }
     
-    if (PyFloat_Check(other) || PyLong_Check(other)) {
-        /* Scalar floor division */
-        double scalar = PyFloat_AsDouble(other);
-        if (scalar == 0.0) {
-            free_matrix(result_data, self->rows);
-            PyErr_SetString(PyExc_ZeroDivisionError, "Division by zero");
-            return NULL;
-        }
-        for (Py_ssize_t i = 0; i < self->rows; i++) {
-            for (Py_ssize_t j = 0; j < self->cols; j++) {
-                result_data[i][j] = floor(self->data[i][j] / scalar);
-            }
-        }
-    } else if (PyObject_TypeCheck(other, &MatrixType)) {
-        /* Element-wise floor division */
-        MatrixObject *other_mat = (MatrixObject *)other;
-        if (self->rows != other_mat->rows || self->cols != other_mat->cols) {
-            free_matrix(result_data, self->rows);
-            PyErr_SetString(PyExc_ValueError, "The 2 matrices do not have the same order.");
-            return NULL;
-        }
-        for (Py_ssize_t i = 0; i < self->rows; i++) {
-            for (Py_ssize_t j = 0; j < self->cols; j++) {
-                if (other_mat->data[i][j] == 0.0) {
-                    free_matrix(result_data, self->rows);
-                    PyErr_SetString(PyExc_ZeroDivisionError, "Division by zero");
-                    return NULL;
-                }
-                result_data[i][j] = floor(self->data[i][j] / other_mat->data[i][j]);
-            }
-        }
-    } else {
-        free_matrix(result_data, self->rows);
-        PyErr_SetString(PyExc_TypeError, "Floor division not supported between Matrix and given type.");
+    MatrixObject *result = Matrix_alloc(self->rows, self->cols);
+    if (result == NULL) {
+        return NULL;
+    }
+    
+    if (Matrix_scalar_or_elementwise(self, other, EW_FLOORDIV, result,
+            "Floor division not supported between Matrix and given type.") < 0) {
+        Py_DECREF(result);
         return NULL;
     }
     
-    MatrixObject *result = Matrix_new_from_data(result_data, self->rows, self->cols);
-    free_matrix(result_data, self->rows);
     return (PyObject *)result;
 }
 
 /* Matrix.__imul__ */
 static PyObject* Matrix_imul(MatrixObject *self, PyObject *other) {
-    if (PyFloat_Check(other) || PyLong_Check(other)) {
-        /* Scalar multiplication */
-        double scalar = PyFloat_AsDouble(other);
-        for (Py_ssize_t i = 0; i < self->rows; i++) {
-            for (Py_ssize_t j = 0; j < self->cols; j++) {
-                self->data[i][j] *= scalar;
-            }
-        }
-    } else if (PyObject_TypeCheck(other, &MatrixType)) {
-        /* Element-wise multiplication */
-        MatrixObject *other_mat = (MatrixObject *)other;
-        if (self->rows != other_mat->rows || self->cols != other_mat->cols) {
-            PyErr_SetString(PyExc_ValueError, "The 2 matrices do not have the same order.");
-            return NULL;
-        }
-        for (Py_ssize_t i = 0; i < self->rows; i++) {
-            for (Py_ssize_t j = 0; j < self->cols; j++) {
-                self->data[i][j] *= other_mat->data[i][j];
-            }
-        }
-    } else {
-        PyErr_SetString(PyExc_TypeError, "Multiplication not supported between Matrix and given type.");
+    if (Matrix_scalar_or_elementwise(self, other, EW_MUL, self,
+            "Multiplication not supported between Matrix and given type.") < 0) {
+        return NULL;
+    }
+    
+    Py_INCREF(self);
+    return (PyObject *)self;
+}
+
+/* Matrix.__ifloordiv__ */
+static PyObject* Matrix_ifloordiv(MatrixObject *self, PyObject *other) {
+    if (Matrix_scalar_or_elementwise(self, other, EW_FLOORDIV, self,
+            "Floor division not supported between Matrix and given type.") < 0) {
         return NULL;
     }
     
@@ -753,9 +3916,9 @@ static PyObject* Matrix_cut(MatrixObject *self, PyObject *args, PyObject *kwds)
     Py_ssize_t new_rows = remove_row ? self->rows - 1 : self->rows;
     Py_ssize_t new_cols = remove_col ? self->cols - 1 : self->cols;
     
-    double **result_data = alloc_matrix(new_rows, new_cols);
-    if (result_data == NULL) {
-        return PyErr_NoMemory();
+    MatrixObject *result = Matrix_alloc(new_rows, new_cols);
+    if (result == NULL) {
+        return NULL;
     }
     
     Py_ssize_t dest_i = 0;
@@ -768,14 +3931,12 @@ static PyObject* Matrix_cut(MatrixObject *self, PyObject *args, PyObject *kwds)
             if (remove_col && src_j == j) {
                 continue;
             }
-            result_data[dest_i][dest_j] = self->data[src_i][src_j];
+            MATRIX_AT(result, dest_i, dest_j) = MATRIX_AT(self, src_i, src_j);
             dest_j++;
         }
         dest_i++;
     }
     
-    MatrixObject *result = Matrix_new_from_data(result_data, new_rows, new_cols);
-    free_matrix(result_data, new_rows);
     return (PyObject *)result;
 }
 
@@ -793,36 +3954,303 @@ static PyObject* Matrix_minor(MatrixObject *self, PyObject *args, PyObject *kwds
         return NULL;
     }
     
-    PyObject *reduced = Matrix_cut(self, cut_args, NULL);
-    Py_DECREF(cut_args);
-    if (reduced == NULL) {
-        return NULL;
+    PyObject *reduced = Matrix_cut(self, cut_args, NULL);
+    Py_DECREF(cut_args);
+    if (reduced == NULL) {
+        return NULL;
+    }
+    
+    PyObject *det = Matrix_determinant((MatrixObject *)reduced, NULL);
+    Py_DECREF(reduced);
+    return det;
+}
+
+/* Matrix.cofactor */
+static PyObject* Matrix_cofactor(MatrixObject *self, PyObject *args, PyObject *kwds) {
+    Py_ssize_t i, j;
+    static char *kwlist[] = {"i", "j", NULL};
+    
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "nn", kwlist, &i, &j)) {
+        return NULL;
+    }
+    
+    PyObject *minor_val = Matrix_minor(self, args, kwds);
+    if (minor_val == NULL) {
+        return NULL;
+    }
+    
+    double minor = PyFloat_AsDouble(minor_val);
+    Py_DECREF(minor_val);
+    
+    double sign = ((i + j) % 2 == 0) ? 1.0 : -1.0;
+    return PyFloat_FromDouble(sign * minor);
+}
+
+/* Helper function computing the (i, j) cofactor for Matrix.adjoint, which
+ * counts the determinants it takes as part of itself */
+static int Matrix_cofactor_value(MatrixObject *self, Py_ssize_t i, Py_ssize_t j, double *out) {
+    PyObject *cut_args = Py_BuildValue("(nn)", i, j);
+    if (cut_args == NULL) {
+        return -1;
+    }
+    
+    PyObject *reduced = Matrix_cut(self, cut_args, NULL);
+    Py_DECREF(cut_args);
+    if (reduced == NULL) {
+        return -1;
+    }
+    
+    LUObject *lu = LU_from_matrix((MatrixObject *)reduced);
+    Py_DECREF(reduced);
+    if (lu == NULL) {
+        return -1;
+    }
+    *out = ((i + j) % 2 == 0 ? 1.0 : -1.0) * LU_determinant(lu);
+    Py_DECREF(lu);
+    return 0;
+}
+
+/* Matrix.lu */
+static PyObject* Matrix_lu(MatrixObject *self, PyObject *Py_UNUSED(ignored)) {
+    PROFILE_START;
+    int factored = 0;
+    LUObject *lu = Matrix_cached_lu(self, &factored);
+    if (lu != NULL && factored) {
+        PROFILE_STOP(MM_OP_LU, LU_bytes(lu->n), LU_flops(lu->n));
+    }
+    return (PyObject *)lu;
+}
+
+/* Matrix.solve */
+static PyObject* Matrix_solve(MatrixObject *self, PyObject *args, PyObject *kwds) {
+    PyObject *b;
+    static char *kwlist[] = {"b", NULL};
+    
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O", kwlist, &b)) {
+        return NULL;
+    }
+    if (self->rows != self->cols) {
+        PyErr_SetString(PyExc_ValueError, "The given matrix is not a square matrix.");
+        return NULL;
+    }
+    
+    PROFILE_START;
+    double *data;
+    Py_ssize_t k;
+    PyObject *result = solve_rhs_copy(b, self->rows, &data, &k);
+    if (result == NULL) {
+        return NULL;
+    }
+    
+    /* Triangular systems need no factorization; factorizations from earlier
+     * calls are reused and only counted when computed here */
+    Py_ssize_t n = self->rows;
+    double bytes = (double)n * k * sizeof(double), flops = (double)n * n * k;
+    int status, factored = 0;
+    if (Matrix_cached_flag(self, CACHE_UPPER, is_upper_triangular)) {
+        status = Matrix_triangular_solve_into(self, 0, data, k);
+    } else if (Matrix_cached_flag(self, CACHE_LOWER, is_lower_triangular)) {
+        status = Matrix_triangular_solve_into(self, 1, data, k);
+    } else {
+        /* Symmetric positive definite systems take half the work with Cholesky */
+        status = 1;
+        if (Matrix_cached_flag(self, CACHE_SYMMETRIC, is_symmetric)) {
+            MatrixObject *l = NULL;
+            status = Matrix_cached_cholesky(self, &l, &factored);
+            if (status == 0) {
+                status = Matrix_cholesky_solve_into(l, data, k);
+                Py_DECREF(l);
+                bytes += factored ? (double)n * n * sizeof(double) : 0.0;
+                flops = (factored ? cholesky_flops(n) : 0.0) + 2.0 * n * n * k;
+            }
+        }
+        if (status > 0) {
+            factored = 0;
+            LUObject *lu = Matrix_cached_lu(self, &factored);
+            if (lu == NULL) {
+                Py_DECREF(result);
+                return NULL;
+            }
+            status = LU_solve_into(lu, data, k);
+            Py_DECREF(lu);
+            bytes = (double)n * k * sizeof(double) + (factored ? LU_bytes(n) : 0.0);
+            flops = (factored ? LU_flops(n) : 0.0) + 2.0 * n * n * k;
+        }
+    }
+    
+    if (status < 0) {
+        Py_DECREF(result);
+        return NULL;
+    }
+    PROFILE_STOP(MM_OP_SOLVE, bytes, flops);
+    return result;
+}
+
+/* Matrix.solve_triangular */
+static PyObject* Matrix_solve_triangular(MatrixObject *self, PyObject *args, PyObject *kwds) {
+    PyObject *b;
+    int lower = 0;
+    static char *kwlist[] = {"b", "lower", NULL};
+    
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|p", kwlist, &b, &lower)) {
+        return NULL;
+    }
+    if (self->rows != self->cols) {
+        PyErr_SetString(PyExc_ValueError, "The given matrix is not a square matrix.");
+        return NULL;
+    }
+    
+    PROFILE_START;
+    double *data;
+    Py_ssize_t k;
+    PyObject *result = solve_rhs_copy(b, self->rows, &data, &k);
+    if (result == NULL) {
+        return NULL;
+    }
+    if (Matrix_triangular_solve_into(self, lower, data, k) < 0) {
+        Py_DECREF(result);
+        return NULL;
+    }
+    PROFILE_STOP(MM_OP_SOLVE_TRIANGULAR, (double)self->rows * k * sizeof(double),
+                 (double)self->rows * self->rows * k);
+    return result;
+}
+
+/* Matrix.cholesky */
+static PyObject* Matrix_cholesky(MatrixObject *self, PyObject *Py_UNUSED(ignored)) {
+    if (self->rows != self->cols) {
+        PyErr_SetString(PyExc_ValueError, "The given matrix is not a square matrix.");
+        return NULL;
+    }
+    
+    PROFILE_START;
+    Py_ssize_t n = self->rows;
+    MatrixObject *factor = NULL;
+    int factored = 0;
+    int status = Matrix_cached_cholesky(self, &factor, &factored);
+    if (status != 0) {
+        if (status > 0) {
+            PyErr_SetString(PyExc_ValueError, "The given matrix is not positive definite.");
+        }
+        return NULL;
+    }
+    
+    /* The factor may be the cached one, which callers must not see change */
+    MatrixObject *result = factor;
+    if (Py_REFCNT(factor) > 1) {
+        result = Matrix_alloc(n, n);
+        if (result == NULL) {
+            Py_DECREF(factor);
+            return NULL;
+        }
+        memcpy(result->data, factor->data, (size_t)(n * n) * sizeof(double));
+        Py_DECREF(factor);
+    }
+    
+    /* Clear the copy of L^T above the diagonal */
+    for (Py_ssize_t i = 0; i < n; i++) {
+        memset(result->data + i * n + i + 1, 0, (size_t)(n - i - 1) * sizeof(double));
+    }
+    if (factored) {
+        PROFILE_STOP(MM_OP_CHOLESKY, (double)n * n * sizeof(double), cholesky_flops(n));
+    }
+    return (PyObject *)result;
+}
+
+/* Matrix.qr */
+static PyObject* Matrix_qr(MatrixObject *self, PyObject *Py_UNUSED(ignored)) {
+    PROFILE_START;
+    Py_ssize_t m = self->rows, n = self->cols, k = m < n ? m : n;
+    MatrixObject *q = NULL, *r = NULL;
+    PyObject *result = NULL;
+    QRWork work = {NULL};
+    int status;
+    double *at = alloc_matrix(n, m), *qt = alloc_matrix(k, m), *tau = alloc_matrix(k, 1);
+    if (at == NULL || qt == NULL || tau == NULL || QRWork_alloc(&work, m, n) < 0) {
+        PyErr_NoMemory();
+        goto done;
+    }
+    q = Matrix_alloc(m, k);
+    if (q == NULL || (r = Matrix_alloc(k, n)) == NULL) {
+        goto done;
+    }
+    
+    Matrix_pack_transposed(self, at);
+    MM_BEGIN_ALLOW_THREADS(m * n * k)
+    status = qr_factor(at, m, n, tau, &work);
+    if (status == 0) {
+        status = qr_form_q(at, m, n, tau, qt, &work);
+    }
+    MM_END_ALLOW_THREADS
+    if (status < 0) {
+        PyErr_NoMemory();
+        goto done;
+    }
+    transpose(qt, q->data, k, m);
+    for (Py_ssize_t i = 0; i < k; i++) {
+        for (Py_ssize_t j = 0; j < n; j++) {
+            r->data[i * n + j] = j >= i ? at[j * m + i] : 0.0;
+        }
     }
     
-    PyObject *det = Matrix_determinant((MatrixObject *)reduced, NULL);
-    Py_DECREF(reduced);
-    return det;
+    result = PyTuple_Pack(2, (PyObject *)q, (PyObject *)r);
+    if (result != NULL) {
+        PROFILE_STOP(MM_OP_QR, (double)(m * n + 2 * m * k + k * n + k) * sizeof(double), qr_flops(m, n));
+    }
+done:
+    QRWork_free(&work);
+    free_matrix(at);
+    free_matrix(qt);
+    free_matrix(tau);
+    Py_XDECREF(q);
+    Py_XDECREF(r);
+    return result;
 }
 
-/* Matrix.cofactor */
-static PyObject* Matrix_cofactor(MatrixObject *self, PyObject *args, PyObject *kwds) {
-    Py_ssize_t i, j;
-    static char *kwlist[] = {"i", "j", NULL};
-    
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "nn", kwlist, &i, &j)) {
+/* Matrix.eigh */
+static PyObject* Matrix_eigh(MatrixObject *self, PyObject *Py_UNUSED(ignored)) {
+    if (self->rows != self->cols) {
+        PyErr_SetString(PyExc_ValueError, "The given matrix is not a square matrix.");
         return NULL;
     }
     
-    PyObject *minor_val = Matrix_minor(self, args, kwds);
-    if (minor_val == NULL) {
-        return NULL;
+    PROFILE_START;
+    Py_ssize_t n = self->rows;
+    VectorObject *values = NULL;
+    MatrixObject *vectors = NULL;
+    PyObject *result = NULL;
+    int status;
+    double *w = alloc_matrix(n, n), *e = alloc_matrix(n, 1);
+    if (w == NULL || e == NULL) {
+        PyErr_NoMemory();
+        goto done;
+    }
+    values = VectorAPI->Vector_alloc(n);
+    if (values == NULL || (vectors = Matrix_alloc(n, n)) == NULL) {
+        goto done;
     }
     
-    double minor = PyFloat_AsDouble(minor_val);
-    Py_DECREF(minor_val);
+    Matrix_pack_transposed(self, w);
+    MM_BEGIN_ALLOW_THREADS(n * n * n)
+    tridiagonalize(w, n, values->data, e);
+    status = tridiagonal_ql(w, n, values->data, e);
+    MM_END_ALLOW_THREADS
+    if (status != 0) {
+        PyErr_SetString(PyExc_ValueError, "The eigenvalue iteration did not converge.");
+        goto done;
+    }
+    transpose(w, vectors->data, n, n);
     
-    double sign = ((i + j) % 2 == 0) ? 1.0 : -1.0;
-    return PyFloat_FromDouble(sign * minor);
+    result = PyTuple_Pack(2, (PyObject *)values, (PyObject *)vectors);
+    if (result != NULL) {
+        PROFILE_STOP(MM_OP_EIGH, (double)(2 * n * n + 2 * n) * sizeof(double), eigh_flops(n));
+    }
+done:
+    free_matrix(w);
+    free_matrix(e);
+    Py_XDECREF(values);
+    Py_XDECREF(vectors);
+    return result;
 }
 
 /* Matrix.adjoint */
@@ -832,88 +4260,151 @@ static PyObject* Matrix_adjoint(MatrixObject *self, PyObject *Py_UNUSED(ignored)
         return NULL;
     }
     
-    double **result_data = alloc_matrix(self->rows, self->cols);
-    if (result_data == NULL) {
-        return PyErr_NoMemory();
+    PROFILE_START;
+    Py_ssize_t n = self->rows;
+    if (is_small_order(n)) {
+        MatrixObject *result = Matrix_alloc(n, n);
+        if (result == NULL) {
+            return NULL;
+        }
+        double det = small_adjugate(self, result->data);
+        PROFILE_STOP(MM_OP_ADJOINT, LU_bytes(n) + n * n * sizeof(double),
+                     det != 0.0 ? LU_inverse_flops(n) + n * n : LU_flops(n) + n * n * LU_flops(n - 1));
+        return (PyObject *)result;
+    }
+    
+    /* adj(A) = det(A) A^-1 whenever the inverse exists */
+    LUObject *lu = LU_from_matrix(self);
+    if (lu == NULL) {
+        return NULL;
+    }
+    if (!LU_is_singular(lu)) {
+        double det = LU_determinant(lu);
+        MatrixObject *result = LU_inverse_matrix(lu);
+        Py_DECREF(lu);
+        if (result == NULL) {
+            return NULL;
+        }
+        elementwise(EW_MUL, result->data, NULL, det, result->data, result->rows * result->cols);
+        PROFILE_STOP(MM_OP_ADJOINT, LU_bytes(n) + n * n * sizeof(double), LU_inverse_flops(n) + n * n);
+        return (PyObject *)result;
+    }
+    Py_DECREF(lu);
+    
+    MatrixObject *result = Matrix_alloc(self->rows, self->cols);
+    if (result == NULL) {
+        return NULL;
     }
     
     for (Py_ssize_t i = 0; i < self->rows; i++) {
         for (Py_ssize_t j = 0; j < self->cols; j++) {
-            PyObject *args = Py_BuildValue("(nn)", i, j);
-            if (args == NULL) {
-                free_matrix(result_data, self->rows);
-                return NULL;
-            }
-            
-            PyObject *cof = Matrix_cofactor(self, args, NULL);
-            Py_DECREF(args);
-            if (cof == NULL) {
-                free_matrix(result_data, self->rows);
+            if (Matrix_cofactor_value(self, i, j, &MATRIX_AT(result, j, i)) < 0) {  // Transposed
+                Py_DECREF(result);
                 return NULL;
             }
-            
-            result_data[j][i] = PyFloat_AsDouble(cof);  // Transposed
-            Py_DECREF(cof);
         }
     }
     
-    MatrixObject *result = Matrix_new_from_data(result_data, self->rows, self->cols);
-    free_matrix(result_data, self->rows);
+    /* One (n-1) x (n-1) determinant per element */
+    PROFILE_STOP(MM_OP_ADJOINT, LU_bytes(n) + n * n * sizeof(double), LU_flops(n) + n * n * LU_flops(n - 1));
     return (PyObject *)result;
 }
 
-/* Matrix.inverse */
-static PyObject* Matrix_inverse(MatrixObject *self, PyObject *Py_UNUSED(ignored)) {
-    if (self->rows != self->cols) {
-        PyErr_SetString(PyExc_ValueError, "The given matrix is not a square matrix.");
-        return NULL;
+/* Helper function returning the inverse of a square Matrix
+ *
+ * *factored and *solved are set when the LU factorization and the inverse
+ * were computed here rather than taken from the cache.
+ */
+static MatrixObject* Matrix_invert(MatrixObject *self, int *factored, int *solved) {
+    if (self->rows == self->cols && is_small_order(self->rows)) {
+        Py_ssize_t n = self->rows;
+        double adj[SMALL_MAX * SMALL_MAX];
+        double det = small_adjugate(self, adj);
+        if (fabs(det) < 1e-10) {
+            PyErr_SetString(PyExc_ValueError, "The given matrix is not invertible.");
+            return NULL;
+        }
+        MatrixObject *result = Matrix_alloc(n, n);
+        if (result != NULL) {
+            for (Py_ssize_t k = 0; k < n * n; k++) {
+                result->data[k] = adj[k] / det;
+            }
+        }
+        *factored = *solved = 1;
+        return result;
     }
     
-    PyObject *det_obj = Matrix_determinant(self, NULL);
-    if (det_obj == NULL) {
-        return NULL;
+    /* The cache keeps its own copy, so callers are free to modify theirs */
+    unsigned long long version;
+    MatrixCache *cache = cache_get(self, CACHE_INVERSE, &version);
+    MatrixObject *result;
+    if (cache != NULL) {
+        Py_ssize_t n = self->rows;
+        result = Matrix_alloc(n, n);
+        if (result != NULL) {
+            memcpy(result->data, cache->inverse->data, (size_t)(n * n) * sizeof(double));
+        }
+        return result;
     }
     
-    double det = PyFloat_AsDouble(det_obj);
-    Py_DECREF(det_obj);
-    
-    if (fabs(det) < 1e-10) {
-        PyErr_SetString(PyExc_ValueError, "The given matrix is not invertible.");
+    LUObject *lu = Matrix_cached_lu(self, factored);
+    if (lu == NULL) {
         return NULL;
     }
     
-    PyObject *adj = Matrix_adjoint(self, NULL);
-    if (adj == NULL) {
+    if (fabs(LU_determinant(lu)) < 1e-10) {
+        Py_DECREF(lu);
+        PyErr_SetString(PyExc_ValueError, "The given matrix is not invertible.");
         return NULL;
     }
     
-    PyObject *scalar = PyFloat_FromDouble(1.0 / det);
-    if (scalar == NULL) {
-        Py_DECREF(adj);
+    result = LU_inverse_matrix(lu);
+    Py_DECREF(lu);
+    if (result == NULL) {
         return NULL;
     }
-    
-    PyObject *result = Matrix_mul((MatrixObject *)adj, scalar);
-    Py_DECREF(adj);
-    Py_DECREF(scalar);
-    
+    *solved = 1;
+    if (Matrix_cache_root(self) != NULL) {
+        MatrixObject *copy = Matrix_alloc(result->rows, result->cols);
+        if (copy == NULL) {
+            PyErr_Clear();
+        } else if ((cache = cache_put(self, CACHE_INVERSE, version)) != NULL) {
+            memcpy(copy->data, result->data, (size_t)(result->rows * result->cols) * sizeof(double));
+            cache->inverse = copy;
+        } else {
+            Py_DECREF(copy);
+        }
+    }
     return result;
 }
 
+/* Matrix.inverse */
+static PyObject* Matrix_inverse(MatrixObject *self, PyObject *Py_UNUSED(ignored)) {
+    PROFILE_START;
+    int factored = 0, solved = 0;
+    MatrixObject *result = Matrix_invert(self, &factored, &solved);
+    if (result != NULL && solved) {
+        Py_ssize_t n = result->rows;
+        PROFILE_STOP(MM_OP_INVERSE, (factored ? LU_bytes(n) : 0.0) + n * n * sizeof(double),
+                     factored ? LU_inverse_flops(n) : LU_inverse_flops(n) - LU_flops(n));
+    }
+    return (PyObject *)result;
+}
+
 /* Matrix.is_invertible */
 static PyObject* Matrix_is_invertible(MatrixObject *self, PyObject *Py_UNUSED(ignored)) {
     if (self->rows != self->cols) {
         Py_RETURN_FALSE;
     }
     
-    PyObject *det_obj = Matrix_determinant(self, NULL);
-    if (det_obj == NULL) {
+    double det;
+    int factored = 0;
+    if (is_small_order(self->rows)) {
+        det = small_determinant(self);
+    } else if (Matrix_cached_det(self, &det, &factored) < 0) {
         return NULL;
     }
     
-    double det = PyFloat_AsDouble(det_obj);
-    Py_DECREF(det_obj);
-    
     if (fabs(det) < 1e-10) {
         Py_RETURN_FALSE;
     }
@@ -924,7 +4415,7 @@ static PyObject* Matrix_is_invertible(MatrixObject *self, PyObject *Py_UNUSED(ig
 static PyObject* Matrix_is_null(MatrixObject *self, PyObject *Py_UNUSED(ignored)) {
     for (Py_ssize_t i = 0; i < self->rows; i++) {
         for (Py_ssize_t j = 0; j < self->cols; j++) {
-            if (self->data[i][j] != 0.0) {
+            if (MATRIX_AT(self, i, j) != 0.0) {
                 Py_RETURN_FALSE;
             }
         }
@@ -940,7 +4431,7 @@ static PyObject* Matrix_is_skew_symmetric(MatrixObject *self, PyObject *Py_UNUSE
     
     for (Py_ssize_t i = 0; i < self->rows; i++) {
         for (Py_ssize_t j = i; j < self->cols; j++) {
-            if (self->data[i][j] != -self->data[j][i]) {
+            if (MATRIX_AT(self, i, j) != -MATRIX_AT(self, j, i)) {
                 Py_RETURN_FALSE;
             }
         }
@@ -950,34 +4441,102 @@ static PyObject* Matrix_is_skew_symmetric(MatrixObject *self, PyObject *Py_UNUSE
 
 /* Matrix.is_lower_triangular */
 static PyObject* Matrix_is_lower_triangular(MatrixObject *self, PyObject *Py_UNUSED(ignored)) {
-    if (self->rows != self->cols) {
-        Py_RETURN_FALSE;
-    }
-    
-    for (Py_ssize_t i = 0; i < self->rows; i++) {
-        for (Py_ssize_t j = i + 1; j < self->cols; j++) {
-            if (self->data[i][j] != 0.0) {
-                Py_RETURN_FALSE;
-            }
-        }
+    if (self->rows == self->cols && Matrix_cached_flag(self, CACHE_LOWER, is_lower_triangular)) {
+        Py_RETURN_TRUE;
     }
-    Py_RETURN_TRUE;
+    Py_RETURN_FALSE;
 }
 
 /* Matrix.is_upper_triangular */
 static PyObject* Matrix_is_upper_triangular(MatrixObject *self, PyObject *Py_UNUSED(ignored)) {
+    if (self->rows == self->cols && Matrix_cached_flag(self, CACHE_UPPER, is_upper_triangular)) {
+        Py_RETURN_TRUE;
+    }
+    Py_RETURN_FALSE;
+}
+
+/* Helper function raising a square Matrix to an integer power */
+static PyObject* Matrix_power_n(MatrixObject *self, Py_ssize_t power) {
     if (self->rows != self->cols) {
-        Py_RETURN_FALSE;
+        PyErr_SetString(PyExc_ValueError, "The given matrix is not a square matrix.");
+        return NULL;
     }
     
-    for (Py_ssize_t i = 0; i < self->rows; i++) {
-        for (Py_ssize_t j = 0; j < i; j++) {
-            if (self->data[i][j] != 0.0) {
-                Py_RETURN_FALSE;
-            }
+    Py_ssize_t n = self->rows;
+    PROFILE_START;
+    if (power == 0) {
+        MatrixObject *result = Matrix_alloc(n, n);
+        if (result == NULL) {
+            return NULL;
+        }
+        memset(result->data, 0, (size_t)(n * n) * sizeof(double));
+        for (Py_ssize_t i = 0; i < n; i++) {
+            result->data[i * n + i] = 1.0;
         }
+        PROFILE_STOP(MM_OP_POW, n * n * sizeof(double), 0);
+        return (PyObject *)result;
     }
-    Py_RETURN_TRUE;
+    
+    /* A^-k = (A^-1)^k, with the inverse taken from an LU factorization */
+    MatrixObject *base_matrix;
+    if (power < 0) {
+        if (power == PY_SSIZE_T_MIN) {
+            PyErr_SetString(PyExc_OverflowError, "The power of the matrix is too large");
+            return NULL;
+        }
+        int factored = 0, solved = 0;
+        base_matrix = Matrix_invert(self, &factored, &solved);
+        if (base_matrix == NULL) {
+            return NULL;
+        }
+        power = -power;
+    } else {
+        base_matrix = Matrix_alloc(n, n);
+        if (base_matrix == NULL) {
+            return NULL;
+        }
+        Matrix_pack(self, base_matrix->data);
+    }
+    if (power == 1) {
+        PROFILE_STOP(MM_OP_POW, n * n * sizeof(double), 0);
+        return (PyObject *)base_matrix;
+    }
+    
+    MatrixObject *result = Matrix_alloc(n, n);
+    double *tmp = alloc_matrix(n, n);
+    if (result == NULL || tmp == NULL) {
+        Py_XDECREF(result);
+        Py_DECREF(base_matrix);
+        free_matrix(tmp);
+        return PyErr_NoMemory();
+    }
+    
+    double *blocks[3] = {base_matrix->data, result->data, tmp};
+    double *answer;
+    MM_BEGIN_ALLOW_THREADS(n * n * n)
+    answer = matrix_power(blocks[0], blocks[1], blocks[2], n, power);
+    MM_END_ALLOW_THREADS
+    if (answer == NULL) {
+        Py_DECREF(result);
+        Py_DECREF(base_matrix);
+        free_matrix(tmp);
+        return PyErr_NoMemory();
+    }
+    
+    /* The blocks may live inside the objects, so copy rather than swap them */
+    if (answer != result->data) {
+        memcpy(result->data, answer, (size_t)(n * n) * sizeof(double));
+    }
+    free_matrix(tmp);
+    Py_DECREF(base_matrix);
+    
+    /* One product per squaring and one per extra set bit */
+    Py_ssize_t products = -2;
+    for (Py_ssize_t bits = power; bits > 0; bits >>= 1) {
+        products += 1 + (bits & 1);
+    }
+    PROFILE_STOP(MM_OP_POW, 2 * n * n * sizeof(double), 2.0 * n * n * n * products);
+    return (PyObject *)result;
 }
 
 /* Matrix.pow */
@@ -989,49 +4548,24 @@ static PyObject* Matrix_pow_method(MatrixObject *self, PyObject *args, PyObject
         return NULL;
     }
     
-    if (self->rows != self->cols) {
-        PyErr_SetString(PyExc_ValueError, "The given matrix is not a square matrix.");
-        return NULL;
+    return Matrix_power_n(self, power);
+}
+
+/* Matrix.__pow__ */
+static PyObject* Matrix_power(PyObject *self, PyObject *other, PyObject *modulo) {
+    if (!PyObject_TypeCheck(self, &MatrixType) || !PyLong_Check(other)) {
+        Py_RETURN_NOTIMPLEMENTED;
     }
-    
-    if (power < 0) {
-        PyErr_SetString(PyExc_ValueError, "The power of the matrix must be a natural number");
+    if (modulo != Py_None) {
+        PyErr_SetString(PyExc_TypeError, "pow() with a modulus is not supported for Matrix");
         return NULL;
     }
     
-    if (power == 0) {
-        // Return identity matrix
-        double **result_data = alloc_matrix(self->rows, self->cols);
-        if (result_data == NULL) {
-            return PyErr_NoMemory();
-        }
-        
-        for (Py_ssize_t i = 0; i < self->rows; i++) {
-            for (Py_ssize_t j = 0; j < self->cols; j++) {
-                result_data[i][j] = (i == j) ? 1.0 : 0.0;
-            }
-        }
-        
-        MatrixObject *result = Matrix_new_from_data(result_data, self->rows, self->cols);
-        free_matrix(result_data, self->rows);
-        return (PyObject *)result;
-    }
-    
-    MatrixObject *result = (MatrixObject *)Matrix_copy(self, NULL);
-    if (result == NULL) {
+    Py_ssize_t power = PyLong_AsSsize_t(other);
+    if (power == -1 && PyErr_Occurred()) {
         return NULL;
     }
-    
-    for (Py_ssize_t p = 1; p < power; p++) {
-        PyObject *temp = Matrix_matmul(result, (PyObject *)self);
-        Py_DECREF(result);
-        if (temp == NULL) {
-            return NULL;
-        }
-        result = (MatrixObject *)temp;
-    }
-    
-    return (PyObject *)result;
+    return Matrix_power_n((MatrixObject *)self, power);
 }
 
 /* Matrix.rotate */
@@ -1052,51 +4586,49 @@ static PyObject* Matrix_rotate(MatrixObject *self, PyObject *args, PyObject *kwd
         return Matrix_copy(self, NULL);
     }
     
-    double **result_data = NULL;
+    MatrixObject *result = NULL;
     Py_ssize_t new_rows, new_cols;
     
     if (turns == 2) {
         // 180 degree rotation
         new_rows = self->rows;
         new_cols = self->cols;
-        result_data = alloc_matrix(new_rows, new_cols);
-        if (result_data == NULL) {
-            return PyErr_NoMemory();
+        result = Matrix_alloc(new_rows, new_cols);
+        if (result == NULL) {
+            return NULL;
         }
         
         for (Py_ssize_t i = 0; i < self->rows; i++) {
             for (Py_ssize_t j = 0; j < self->cols; j++) {
-                result_data[new_rows - 1 - i][new_cols - 1 - j] = self->data[i][j];
+                MATRIX_AT(result, new_rows - 1 - i, new_cols - 1 - j) = MATRIX_AT(self, i, j);
             }
         }
     } else {
         // 90 or 270 degree rotation (dimensions swap)
         new_rows = self->cols;
         new_cols = self->rows;
-        result_data = alloc_matrix(new_rows, new_cols);
-        if (result_data == NULL) {
-            return PyErr_NoMemory();
+        result = Matrix_alloc(new_rows, new_cols);
+        if (result == NULL) {
+            return NULL;
         }
         
         if (turns == 1) {
             // 90 degree clockwise
             for (Py_ssize_t i = 0; i < self->rows; i++) {
                 for (Py_ssize_t j = 0; j < self->cols; j++) {
-                    result_data[j][self->rows - 1 - i] = self->data[i][j];
+                    MATRIX_AT(result, j, self->rows - 1 - i) = MATRIX_AT(self, i, j);
                 }
             }
         } else {  // turns == 3
             // 270 degree clockwise (90 counter-clockwise)
             for (Py_ssize_t i = 0; i < self->rows; i++) {
                 for (Py_ssize_t j = 0; j < self->cols; j++) {
-                    result_data[self->cols - 1 - j][i] = self->data[i][j];
+                    MATRIX_AT(result, self->cols - 1 - j, i) = MATRIX_AT(self, i, j);
                 }
             }
         }
     }
     
-    MatrixObject *result = Matrix_new_from_data(result_data, new_rows, new_cols);
-    free_matrix(result_data, new_rows);
     return (PyObject *)result;
 }
 
@@ -1114,19 +4646,17 @@ static PyObject* Matrix_identity(PyObject *cls, PyObject *args, PyObject *kwds)
         return NULL;
     }
     
-    double **data = alloc_matrix(n, n);
-    if (data == NULL) {
-        return PyErr_NoMemory();
+    MatrixObject *result = Matrix_alloc(n, n);
+    if (result == NULL) {
+        return NULL;
     }
     
     for (Py_ssize_t i = 0; i < n; i++) {
         for (Py_ssize_t j = 0; j < n; j++) {
-            data[i][j] = (i == j) ? 1.0 : 0.0;
+            MATRIX_AT(result, i, j) = (i == j) ? 1.0 : 0.0;
         }
     }
     
-    MatrixObject *result = Matrix_new_from_data(data, n, n);
-    free_matrix(data, n);
     return (PyObject *)result;
 }
 
@@ -1152,19 +4682,13 @@ static PyObject* Matrix_zero(PyObject *cls, PyObject *args, PyObject *kwds) {
         return NULL;
     }
     
-    double **data = alloc_matrix(rows, cols);
-    if (data == NULL) {
-        return PyErr_NoMemory();
+    MatrixObject *result = Matrix_alloc(rows, cols);
+    if (result == NULL) {
+        return NULL;
     }
     
-    for (Py_ssize_t i = 0; i < rows; i++) {
-        for (Py_ssize_t j = 0; j < cols; j++) {
-            data[i][j] = 0.0;
-        }
-    }
+    memset(result->data, 0, (size_t)(rows * cols) * sizeof(double));
     
-    MatrixObject *result = Matrix_new_from_data(data, rows, cols);
-    free_matrix(data, rows);
     return (PyObject *)result;
 }
 
@@ -1186,25 +4710,252 @@ static PyObject* Matrix_fill(PyObject *cls, PyObject *args, PyObject *kwds) {
     Py_ssize_t rows = PyLong_AsSsize_t(PyTuple_GetItem(order_obj, 0));
     Py_ssize_t cols = PyLong_AsSsize_t(PyTuple_GetItem(order_obj, 1));
     
-    if (rows <= 0 || cols <= 0) {
-        PyErr_SetString(PyExc_ValueError, "Matrix dimensions must be positive");
+    if (rows <= 0 || cols <= 0) {
+        PyErr_SetString(PyExc_ValueError, "Matrix dimensions must be positive");
+        return NULL;
+    }
+    
+    MatrixObject *result = Matrix_alloc(rows, cols);
+    if (result == NULL) {
+        return NULL;
+    }
+    
+    for (Py_ssize_t i = 0; i < rows; i++) {
+        for (Py_ssize_t j = 0; j < cols; j++) {
+            MATRIX_AT(result, i, j) = value;
+        }
+    }
+    
+    return (PyObject *)result;
+}
+
+/* Matrix.frombuffer - class method */
+static PyObject* Matrix_frombuffer(PyObject *cls, PyObject *args, PyObject *kwds) {
+    PyObject *buffer;
+    PyObject *order_obj = Py_None;
+    int copy = 0;
+    static char *kwlist[] = {"buffer", "order", "copy", NULL};
+    
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|Op", kwlist, &buffer, &order_obj, &copy)) {
+        return NULL;
+    }
+    
+    /* The memoryview keeps the exporter's buffer alive while we share it */
+    PyObject *view_obj = PyMemoryView_FromObject(buffer);
+    if (view_obj == NULL) {
+        return NULL;
+    }
+    Py_buffer *view = PyMemoryView_GET_BUFFER(view_obj);
+    
+    int elementwise = view->itemsize == sizeof(double) && is_double_format(view->format);
+    if (!elementwise && !(view->itemsize == 1 && is_byte_format(view->format))) {
+        Py_DECREF(view_obj);
+        PyErr_SetString(PyExc_TypeError, "Buffer must contain doubles (format 'd') or raw bytes");
+        return NULL;
+    }
+    if (view->len % sizeof(double) != 0) {
+        Py_DECREF(view_obj);
+        PyErr_SetString(PyExc_ValueError, "Buffer size must be a multiple of 8 bytes");
+        return NULL;
+    }
+    
+    Py_ssize_t count = view->len / (Py_ssize_t)sizeof(double);
+    Py_ssize_t rows, cols;
+    if (order_obj != Py_None) {
+        if (!PyTuple_Check(order_obj) || PyTuple_Size(order_obj) != 2) {
+            Py_DECREF(view_obj);
+            PyErr_SetString(PyExc_TypeError, "order must be a tuple of (rows, cols)");
+            return NULL;
+        }
+        rows = PyLong_AsSsize_t(PyTuple_GetItem(order_obj, 0));
+        cols = PyLong_AsSsize_t(PyTuple_GetItem(order_obj, 1));
+        if ((rows == -1 || cols == -1) && PyErr_Occurred()) {
+            Py_DECREF(view_obj);
+            return NULL;
+        }
+    } else if (elementwise && view->ndim == 2) {
+        rows = view->shape[0];
+        cols = view->shape[1];
+    } else {
+        Py_DECREF(view_obj);
+        PyErr_SetString(PyExc_ValueError, "order is required unless the buffer is 2-dimensional");
+        return NULL;
+    }
+    
+    if (rows <= 0 || cols <= 0) {
+        Py_DECREF(view_obj);
+        PyErr_SetString(PyExc_ValueError, "Matrix dimensions must be positive");
+        return NULL;
+    }
+    if (rows > count / cols || rows * cols != count) {
+        Py_DECREF(view_obj);
+        PyErr_SetString(PyExc_ValueError, "Buffer size does not match the requested order");
+        return NULL;
+    }
+    
+    int share = !copy && !view->readonly && PyBuffer_IsContiguous(view, 'C') &&
+                ((uintptr_t)view->buf % sizeof(double)) == 0;
+    
+    MatrixObject *result;
+    if (share) {
+        result = Matrix_obtain();
+        if (result == NULL) {
+            Py_DECREF(view_obj);
+            return NULL;
+        }
+        result->data = (double *)view->buf;
+        result->rows = rows;
+        result->cols = cols;
+        result->row_stride = cols;
+        result->col_stride = 1;
+        result->base = view_obj;
+    } else {
+        result = Matrix_alloc(rows, cols);
+        if (result == NULL) {
+            Py_DECREF(view_obj);
+            return NULL;
+        }
+        if (PyBuffer_ToContiguous(result->data, view, view->len, 'C') < 0) {
+            Py_DECREF(result);
+            Py_DECREF(view_obj);
+            return NULL;
+        }
+        Py_DECREF(view_obj);
+    }
+    
+    return (PyObject *)result;
+}
+
+/* Matrix.__reduce_ex__
+ *
+ * Pickles as Matrix.frombuffer(buffer, order). From protocol 5 the buffer is a
+ * PickleBuffer over the elements, so they can travel out-of-band without a copy.
+ */
+static PyObject* Matrix_reduce_ex(MatrixObject *self, PyObject *args) {
+    int protocol = 0;
+    if (!PyArg_ParseTuple(args, "|i", &protocol)) {
+        return NULL;
+    }
+    
+    MatrixObject *compact = Matrix_compact(self);
+    if (compact == NULL) {
+        return NULL;
+    }
+    PyObject *buffer;
+    if (protocol >= 5) {
+        buffer = PyPickleBuffer_FromObject((PyObject *)compact);
+    } else {
+        buffer = PyBytes_FromStringAndSize((const char *)compact->data,
+                                           (Py_ssize_t)(compact->rows * compact->cols * sizeof(double)));
+    }
+    Py_DECREF(compact);
+    if (buffer == NULL) {
+        return NULL;
+    }
+    
+    PyObject *constructor = PyObject_GetAttrString((PyObject *)&MatrixType, "frombuffer");
+    if (constructor == NULL) {
+        Py_DECREF(buffer);
+        return NULL;
+    }
+    return Py_BuildValue("N(N(nn))", constructor, buffer, self->rows, self->cols);
+}
+
+/* Helper function calling matmath._io.<name>(*args), where the file format lives */
+static PyObject* Matrix_call_io(const char *name, PyObject *args) {
+    if (args == NULL) {
+        return NULL;
+    }
+    PyObject *result = NULL;
+    PyObject *io = PyImport_ImportModule("matmath._io");
+    if (io != NULL) {
+        PyObject *func = PyObject_GetAttrString(io, name);
+        if (func != NULL) {
+            result = PyObject_Call(func, args, NULL);
+            Py_DECREF(func);
+        }
+        Py_DECREF(io);
+    }
+    Py_DECREF(args);
+    return result;
+}
+
+/* Matrix.save */
+static PyObject* Matrix_save(MatrixObject *self, PyObject *args, PyObject *kwds) {
+    PyObject *path;
+    static char *kwlist[] = {"path", NULL};
+    
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O", kwlist, &path)) {
+        return NULL;
+    }
+    return Matrix_call_io("save", PyTuple_Pack(2, (PyObject *)self, path));
+}
+
+/* Matrix.load - class method */
+static PyObject* Matrix_load(PyObject *cls, PyObject *args, PyObject *kwds) {
+    PyObject *path;
+    int mmap = 1;
+    static char *kwlist[] = {"path", "mmap", NULL};
+    
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|p", kwlist, &path, &mmap)) {
         return NULL;
     }
+    return Matrix_call_io("load", Py_BuildValue("(OOO)", cls, path, mmap ? Py_True : Py_False));
+}
+
+/* Matrix.__buffer__ */
+static int Matrix_getbuffer(MatrixObject *self, Py_buffer *view, int flags) {
+    int contiguous = Matrix_is_contiguous(self);
+    if (!contiguous && (flags & PyBUF_STRIDES) != PyBUF_STRIDES) {
+        PyErr_SetString(PyExc_BufferError, "Matrix is not C-contiguous");
+        return -1;
+    }
+    if (!contiguous && ((flags & PyBUF_C_CONTIGUOUS) == PyBUF_C_CONTIGUOUS ||
+                        (flags & PyBUF_F_CONTIGUOUS) == PyBUF_F_CONTIGUOUS ||
+                        (flags & PyBUF_ANY_CONTIGUOUS) == PyBUF_ANY_CONTIGUOUS)) {
+        PyErr_SetString(PyExc_BufferError, "Matrix is not contiguous");
+        return -1;
+    }
     
-    double **data = alloc_matrix(rows, cols);
-    if (data == NULL) {
-        return PyErr_NoMemory();
+    /* shape[0..1] followed by strides[0..1], freed in Matrix_releasebuffer */
+    Py_ssize_t *dims = (Py_ssize_t *)PyMem_Malloc(4 * sizeof(Py_ssize_t));
+    if (dims == NULL) {
+        PyErr_NoMemory();
+        return -1;
     }
+    dims[0] = self->rows;
+    dims[1] = self->cols;
+    dims[2] = self->row_stride * (Py_ssize_t)sizeof(double);
+    dims[3] = self->col_stride * (Py_ssize_t)sizeof(double);
     
-    for (Py_ssize_t i = 0; i < rows; i++) {
-        for (Py_ssize_t j = 0; j < cols; j++) {
-            data[i][j] = value;
-        }
+    view->buf = self->data;
+    view->obj = (PyObject *)self;
+    Py_INCREF(self);
+    view->len = self->rows * self->cols * (Py_ssize_t)sizeof(double);
+    view->readonly = 0;
+    view->itemsize = sizeof(double);
+    view->format = (flags & PyBUF_FORMAT) ? "d" : NULL;
+    view->ndim = 2;
+    view->shape = (flags & PyBUF_ND) == PyBUF_ND ? dims : NULL;
+    view->strides = (flags & PyBUF_STRIDES) == PyBUF_STRIDES ? dims + 2 : NULL;
+    view->suboffsets = NULL;
+    view->internal = dims;
+    if (view->shape == NULL) {
+        view->ndim = 1;
     }
     
-    MatrixObject *result = Matrix_new_from_data(data, rows, cols);
-    free_matrix(data, rows);
-    return (PyObject *)result;
+    self->exports++;
+    Matrix_root(self)->buffer_exports++;
+    return 0;
+}
+
+/* Matrix.__release_buffer__ */
+static void Matrix_releasebuffer(MatrixObject *self, Py_buffer *view) {
+    PyMem_Free(view->internal);
+    self->exports--;
+    Matrix_root(self)->buffer_exports--;
+    /* The elements may have been written through the buffer */
+    Matrix_changed(self);
 }
 
 /* Matrix.order property */
@@ -1231,7 +4982,7 @@ static PyObject* Matrix_richcompare(MatrixObject *self, PyObject *other, int op)
         }
         for (Py_ssize_t i = 0; i < self->rows; i++) {
             for (Py_ssize_t j = 0; j < self->cols; j++) {
-                if (self->data[i][j] != other_mat->data[i][j]) {
+                if (MATRIX_AT(self, i, j) != MATRIX_AT(other_mat, i, j)) {
                     Py_RETURN_FALSE;
                 }
             }
@@ -1243,7 +4994,7 @@ static PyObject* Matrix_richcompare(MatrixObject *self, PyObject *other, int op)
         }
         for (Py_ssize_t i = 0; i < self->rows; i++) {
             for (Py_ssize_t j = 0; j < self->cols; j++) {
-                if (self->data[i][j] != other_mat->data[i][j]) {
+                if (MATRIX_AT(self, i, j) != MATRIX_AT(other_mat, i, j)) {
                     Py_RETURN_TRUE;
                 }
             }
@@ -1256,7 +5007,12 @@ static PyObject* Matrix_richcompare(MatrixObject *self, PyObject *other, int op)
 
 /* Method definitions */
 static PyMethodDef Matrix_methods[] = {
-    {"transpose", (PyCFunction)Matrix_transpose, METH_NOARGS, "Transpose the matrix"},
+    {"transpose", (PyCFunction)Matrix_transpose, METH_VARARGS | METH_KEYWORDS, "Transpose the matrix"},
+    {"row", (PyCFunction)Matrix_row, METH_VARARGS | METH_KEYWORDS, "View of row i sharing the matrix's storage"},
+    {"col", (PyCFunction)Matrix_col, METH_VARARGS | METH_KEYWORDS, "View of column j sharing the matrix's storage"},
+    {"add", (PyCFunction)Matrix_add_method, METH_VARARGS | METH_KEYWORDS, "Add a matrix, optionally into out"},
+    {"sub", (PyCFunction)Matrix_sub_method, METH_VARARGS | METH_KEYWORDS, "Subtract a matrix, optionally into out"},
+    {"matmul", (PyCFunction)Matrix_matmul_method, METH_VARARGS | METH_KEYWORDS, "Matrix multiply, optionally into out"},
     {"determinant", (PyCFunction)Matrix_determinant, METH_NOARGS, "Calculate determinant"},
     {"det", (PyCFunction)Matrix_determinant, METH_NOARGS, "Alias for determinant"},
     {"trace", (PyCFunction)Matrix_trace, METH_NOARGS, "Calculate trace"},
@@ -1281,11 +5037,25 @@ static PyMethodDef Matrix_methods[] = {
     {"adj", (PyCFunction)Matrix_adjoint, METH_NOARGS, "Alias for adjoint"},
     {"inverse", (PyCFunction)Matrix_inverse, METH_NOARGS, "Calculate inverse"},
     {"inv", (PyCFunction)Matrix_inverse, METH_NOARGS, "Alias for inverse"},
+    {"lu", (PyCFunction)Matrix_lu, METH_NOARGS, "LU factorization with partial pivoting"},
+    {"solve", (PyCFunction)Matrix_solve, METH_VARARGS | METH_KEYWORDS, "Solve A x = b for a Vector or Matrix b"},
+    {"solve_triangular", (PyCFunction)Matrix_solve_triangular, METH_VARARGS | METH_KEYWORDS, "Solve A x = b using only the upper (or lower) triangle of A"},
+    {"cholesky", (PyCFunction)Matrix_cholesky, METH_NOARGS, "Cholesky factor L of a positive definite matrix, A = L L^T"},
+    {"qr", (PyCFunction)Matrix_qr, METH_NOARGS, "Householder QR factorization, returns (Q, R)"},
+    {"eigh", (PyCFunction)Matrix_eigh, METH_NOARGS, "Eigenvalues (ascending) and eigenvectors of a symmetric matrix"},
+    {"apply", (PyCFunction)Matrix_apply, METH_VARARGS | METH_KEYWORDS, "Multiply the matrix with each Vector in a sequence or VectorArray"},
     {"pow", (PyCFunction)Matrix_pow_method, METH_VARARGS | METH_KEYWORDS, "Raise to power"},
     {"rotate", (PyCFunction)Matrix_rotate, METH_VARARGS | METH_KEYWORDS, "Rotate matrix"},
     {"identity", (PyCFunction)Matrix_identity, METH_VARARGS | METH_KEYWORDS | METH_CLASS, "Create identity matrix"},
     {"zero", (PyCFunction)Matrix_zero, METH_VARARGS | METH_KEYWORDS | METH_CLASS, "Create zero matrix"},
     {"fill", (PyCFunction)Matrix_fill, METH_VARARGS | METH_KEYWORDS | METH_CLASS, "Create filled matrix"},
+    {"frombuffer", (PyCFunction)Matrix_frombuffer, METH_VARARGS | METH_KEYWORDS | METH_CLASS, "Create matrix from a buffer of doubles"},
+    {"from_rows", (PyCFunction)Matrix_from_rows, METH_VARARGS | METH_KEYWORDS | METH_CLASS, "Create a matrix from an iterable of rows"},
+    {"from_csv", (PyCFunction)Matrix_from_csv, METH_VARARGS | METH_KEYWORDS | METH_CLASS, "Create a matrix from a CSV file or file object"},
+    {"iter_csv", (PyCFunction)Matrix_iter_csv, METH_VARARGS | METH_KEYWORDS, "Iterate over the rows as CSV lines"},
+    {"save", (PyCFunction)Matrix_save, METH_VARARGS | METH_KEYWORDS, "Save the matrix to a binary file"},
+    {"load", (PyCFunction)Matrix_load, METH_VARARGS | METH_KEYWORDS | METH_CLASS, "Load a matrix saved with save(), memory-mapping it by default"},
+    {"__reduce_ex__", (PyCFunction)Matrix_reduce_ex, METH_VARARGS, "Support for pickle"},
     {NULL}
 };
 
@@ -1293,6 +5063,7 @@ static PyMethodDef Matrix_methods[] = {
 static PyGetSetDef Matrix_getsetters[] = {
     {"order", (getter)Matrix_get_order, NULL, "Matrix order (rows, cols)", NULL},
     {"size", (getter)Matrix_get_order, NULL, "Alias for order", NULL},
+    {"T", (getter)Matrix_get_T, NULL, "Transposed view sharing the matrix's storage", NULL},
     {NULL}
 };
 
@@ -1308,6 +5079,19 @@ static PySequenceMethods Matrix_as_sequence = {
     0,                                 /* sq_contains */
 };
 
+/* Mapping methods */
+static PyMappingMethods Matrix_as_mapping = {
+    (lenfunc)Matrix_length,               /* mp_length */
+    (binaryfunc)Matrix_subscript,         /* mp_subscript */
+    (objobjargproc)Matrix_ass_subscript,  /* mp_ass_subscript */
+};
+
+/* Buffer methods */
+static PyBufferProcs Matrix_as_buffer = {
+    (getbufferproc)Matrix_getbuffer,       /* bf_getbuffer */
+    (releasebufferproc)Matrix_releasebuffer, /* bf_releasebuffer */
+};
+
 /* Number methods */
 static PyNumberMethods Matrix_as_number = {
     (binaryfunc)Matrix_add,           /* nb_add */
@@ -1315,7 +5099,7 @@ static PyNumberMethods Matrix_as_number = {
     (binaryfunc)Matrix_mul,           /* nb_multiply */
     0,                                 /* nb_remainder */
     0,                                 /* nb_divmod */
-    0,                                 /* nb_power */
+    (ternaryfunc)Matrix_power,        /* nb_power */
     0,                                 /* nb_negative */
     0,                                 /* nb_positive */
     0,                                 /* nb_absolute */
@@ -1329,8 +5113,8 @@ static PyNumberMethods Matrix_as_number = {
     0,                                 /* nb_int */
     0,                                 /* nb_reserved */
     0,                                 /* nb_float */
-    0,                                 /* nb_inplace_add */
-    0,                                 /* nb_inplace_subtract */
+    (binaryfunc)Matrix_iadd,          /* nb_inplace_add */
+    (binaryfunc)Matrix_isub,          /* nb_inplace_subtract */
     (binaryfunc)Matrix_imul,          /* nb_inplace_multiply */
     0,                                 /* nb_inplace_remainder */
     0,                                 /* nb_inplace_power */
@@ -1341,11 +5125,11 @@ static PyNumberMethods Matrix_as_number = {
     0,                                 /* nb_inplace_or */
     (binaryfunc)Matrix_floordiv,      /* nb_floor_divide */
     (binaryfunc)Matrix_truediv,       /* nb_true_divide */
-    0,                                 /* nb_inplace_floor_divide */
-    0,                                 /* nb_inplace_true_divide */
+    (binaryfunc)Matrix_ifloordiv,     /* nb_inplace_floor_divide */
+    (binaryfunc)Matrix_itruediv,      /* nb_inplace_true_divide */
     0,                                 /* nb_index */
     (binaryfunc)Matrix_matmul,        /* nb_matrix_multiply */
-    0,                                 /* nb_inplace_matrix_multiply */
+    (binaryfunc)Matrix_imatmul,       /* nb_inplace_matrix_multiply */
 };
 
 /* Type definition */
@@ -1363,18 +5147,673 @@ static PyTypeObject MatrixType = {
     .tp_str = (reprfunc)Matrix_str,
     .tp_as_number = &Matrix_as_number,
     .tp_as_sequence = &Matrix_as_sequence,
+    .tp_as_mapping = &Matrix_as_mapping,
+    .tp_as_buffer = &Matrix_as_buffer,
     .tp_iter = (getiterfunc)Matrix_iter,
     .tp_richcompare = (richcmpfunc)Matrix_richcompare,
     .tp_methods = Matrix_methods,
     .tp_getset = Matrix_getsetters,
 };
 
+/* LU.__dealloc__ */
+static void LU_dealloc(LUObject *self) {
+    free_matrix(self->lu);
+    PyMem_Free(self->piv);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+/* LU.__repr__ */
+static PyObject* LU_repr(LUObject *self) {
+    return PyUnicode_FromFormat("<LU factorization of a %zdx%zd matrix>", self->n, self->n);
+}
+
+/* LU.det */
+static PyObject* LU_det(LUObject *self, PyObject *Py_UNUSED(ignored)) {
+    return PyFloat_FromDouble(LU_determinant(self));
+}
+
+/* LU.solve */
+static PyObject* LU_solve(LUObject *self, PyObject *args, PyObject *kwds) {
+    PyObject *b;
+    static char *kwlist[] = {"b", NULL};
+    
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O", kwlist, &b)) {
+        return NULL;
+    }
+    
+    double *data;
+    Py_ssize_t k;
+    PyObject *result = solve_rhs_copy(b, self->n, &data, &k);
+    if (result == NULL) {
+        return NULL;
+    }
+    if (LU_solve_into(self, data, k) < 0) {
+        Py_DECREF(result);
+        return NULL;
+    }
+    return result;
+}
+
+/* LU.inverse */
+static PyObject* LU_inverse(LUObject *self, PyObject *Py_UNUSED(ignored)) {
+    return (PyObject *)LU_inverse_matrix(self);
+}
+
+/* LU.L property */
+static PyObject* LU_get_L(LUObject *self, void *closure) {
+    Py_ssize_t n = self->n;
+    MatrixObject *result = Matrix_alloc(n, n);
+    if (result == NULL) {
+        return NULL;
+    }
+    for (Py_ssize_t i = 0; i < n; i++) {
+        for (Py_ssize_t j = 0; j < n; j++) {
+            result->data[i * n + j] = j < i ? self->lu[i * n + j] : (i == j ? 1.0 : 0.0);
+        }
+    }
+    return (PyObject *)result;
+}
+
+/* LU.U property */
+static PyObject* LU_get_U(LUObject *self, void *closure) {
+    Py_ssize_t n = self->n;
+    MatrixObject *result = Matrix_alloc(n, n);
+    if (result == NULL) {
+        return NULL;
+    }
+    for (Py_ssize_t i = 0; i < n; i++) {
+        for (Py_ssize_t j = 0; j < n; j++) {
+            result->data[i * n + j] = j >= i ? self->lu[i * n + j] : 0.0;
+        }
+    }
+    return (PyObject *)result;
+}
+
+/* LU.P property */
+static PyObject* LU_get_P(LUObject *self, void *closure) {
+    Py_ssize_t n = self->n;
+    MatrixObject *result = Matrix_alloc(n, n);
+    if (result == NULL) {
+        return NULL;
+    }
+    memset(result->data, 0, (size_t)(n * n) * sizeof(double));
+    for (Py_ssize_t i = 0; i < n; i++) {
+        result->data[i * n + i] = 1.0;
+    }
+    for (Py_ssize_t i = 0; i < n; i++) {
+        if (self->piv[i] != i) {
+            swap_rows(result->data, n, i, self->piv[i], n);
+        }
+    }
+    return (PyObject *)result;
+}
+
+/* LU.order property */
+static PyObject* LU_get_order(LUObject *self, void *closure) {
+    return Py_BuildValue("(nn)", self->n, self->n);
+}
+
+/* LU method definitions */
+static PyMethodDef LU_methods[] = {
+    {"det", (PyCFunction)LU_det, METH_NOARGS, "Determinant of the factored matrix"},
+    {"solve", (PyCFunction)LU_solve, METH_VARARGS | METH_KEYWORDS, "Solve A x = b for a Vector or Matrix b"},
+    {"inverse", (PyCFunction)LU_inverse, METH_NOARGS, "Inverse of the factored matrix"},
+    {NULL}
+};
+
+/* LU property definitions */
+static PyGetSetDef LU_getsetters[] = {
+    {"L", (getter)LU_get_L, NULL, "Unit lower triangular factor", NULL},
+    {"U", (getter)LU_get_U, NULL, "Upper triangular factor", NULL},
+    {"P", (getter)LU_get_P, NULL, "Row permutation with P @ A == L @ U", NULL},
+    {"order", (getter)LU_get_order, NULL, "Order of the factored matrix", NULL},
+    {NULL}
+};
+
+/* LU type definition */
+static PyTypeObject LUType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "matmath._matrix.LU",
+    .tp_doc = "LU factorization with partial pivoting, returned by Matrix.lu()",
+    .tp_basicsize = sizeof(LUObject),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_dealloc = (destructor)LU_dealloc,
+    .tp_repr = (reprfunc)LU_repr,
+    .tp_methods = LU_methods,
+    .tp_getset = LU_getsetters,
+};
+
+/* matmath.set_num_threads */
+static PyObject* matrix_set_num_threads(PyObject *module, PyObject *arg) {
+    long n = PyLong_AsLong(arg);
+    if (n == -1 && PyErr_Occurred()) {
+        return NULL;
+    }
+    if (n < 1 || n > MM_MAX_THREADS) {
+        PyErr_Format(PyExc_ValueError, "Number of threads must be between 1 and %d", MM_MAX_THREADS);
+        return NULL;
+    }
+    
+    Py_BEGIN_ALLOW_THREADS
+    mm_set_num_threads((int)n);
+    Py_END_ALLOW_THREADS
+    Py_RETURN_NONE;
+}
+
+/* matmath.get_num_threads */
+static PyObject* matrix_get_num_threads(PyObject *module, PyObject *Py_UNUSED(ignored)) {
+    return PyLong_FromLong(mm_num_threads);
+}
+
+/* matmath.set_profiling */
+static PyObject* matrix_set_profiling(PyObject *module, PyObject *arg) {
+    int enabled = PyObject_IsTrue(arg);
+    if (enabled < 0) {
+        return NULL;
+    }
+    
+    int previous = mm_profiling;
+    mm_profiling = enabled;
+    return PyBool_FromLong(previous);
+}
+
+/* Fused element-wise expressions
+ *
+ * matmath.lazy() compiles a tree of element-wise operations over matrices of
+ * one order and scalars into postfix code, run here by a small stack machine.
+ * The machine evaluates FUSED_BLOCK elements of a row at a time, so all the
+ * intermediates stay in L1 and the whole expression is one pass over its
+ * operands and one write of the result. Operand rows with unit column stride
+ * are read in place; strided ones are gathered into their stack slot first.
+ * Blocks are split across the pool.
+ */
+#define FUSED_BLOCK 256
+
+/* Opcodes, shared with matmath._lazy */
+typedef enum {
+    FUSED_LOAD,              /* Push operand `arg` */
+    FUSED_CONST,             /* Push constant `arg` */
+    FUSED_ADD,
+    FUSED_SUB,
+    FUSED_MUL,
+    FUSED_DIV,
+    FUSED_FLOORDIV,
+    FUSED_NEG,
+    FUSED_OPCODES
+} FusedOp;
+
+typedef struct {
+    const double *values;    /* A block of values, or NULL for `scalar` */
+    double scalar;
+} FusedValue;
+
+typedef struct {
+    const double *data;
+    Py_ssize_t row_stride, col_stride;
+} FusedOperand;
+
+typedef struct {
+    const int *code;         /* Opcode and argument pairs */
+    Py_ssize_t length;
+    const FusedOperand *operands;
+    const double *constants;
+    Py_ssize_t depth;        /* Stack slots the code needs */
+    double *out;
+    Py_ssize_t out_row_stride, out_col_stride;
+    Py_ssize_t cols;
+    Py_ssize_t blocks_per_row;
+    volatile int zero_division;
+    volatile int failed;
+} FusedTask;
+
+#define FUSED_LOOP(expr) \
+    for (Py_ssize_t k = 0; k < len; k++) { \
+        dst[k] = (expr); \
+    }
+
+#define FUSED_CASES(x, y) \
+    switch (op) { \
+    case FUSED_ADD: FUSED_LOOP(x + y) break; \
+    case FUSED_SUB: FUSED_LOOP(x - y) break; \
+    case FUSED_MUL: FUSED_LOOP(x * y) break; \
+    case FUSED_DIV: FUSED_LOOP(x / y) break; \
+    default: FUSED_LOOP(floor(x / y)) break; \
+    }
+
+static void fused_binary(int op, const FusedValue *x, const FusedValue *y, double *dst, Py_ssize_t len) {
+    const double *a = x->values, *b = y->values;
+    if (a != NULL && b != NULL) {
+        FUSED_CASES(a[k], b[k])
+    } else if (a != NULL) {
+        double s = y->scalar;
+        FUSED_CASES(a[k], s)
+    } else {
+        double s = x->scalar;
+        FUSED_CASES(s, b[k])
+    }
+}
+
+static void fused_range(void *ctx, Py_ssize_t start, Py_ssize_t end) {
+    FusedTask *t = (FusedTask *)ctx;
+    double *slots = (double *)PyMem_RawMalloc((size_t)t->depth * FUSED_BLOCK * sizeof(double));
+    FusedValue *stack = (FusedValue *)PyMem_RawMalloc((size_t)t->depth * sizeof(FusedValue));
+    if (slots == NULL || stack == NULL) {
+        t->failed = 1;
+        PyMem_RawFree(slots);
+        PyMem_RawFree(stack);
+        return;
+    }
+    
+    for (Py_ssize_t block = start; block < end; block++) {
+        Py_ssize_t row = block / t->blocks_per_row;
+        Py_ssize_t c0 = (block % t->blocks_per_row) * FUSED_BLOCK;
+        Py_ssize_t len = t->cols - c0 < FUSED_BLOCK ? t->cols - c0 : FUSED_BLOCK;
+        Py_ssize_t sp = 0;
+        for (Py_ssize_t i = 0; i < t->length; i++) {
+            int op = t->code[2 * i], arg = t->code[2 * i + 1];
+            double *slot;
+            if (op == FUSED_LOAD) {
+                const FusedOperand *o = &t->operands[arg];
+                const double *src = o->data + row * o->row_stride + c0 * o->col_stride;
+                if (o->col_stride == 1) {
+                    stack[sp].values = src;
+                } else {
+                    slot = slots + sp * FUSED_BLOCK;
+                    for (Py_ssize_t k = 0; k < len; k++) {
+                        slot[k] = src[k * o->col_stride];
+                    }
+                    stack[sp].values = slot;
+                }
+                sp++;
+            } else if (op == FUSED_CONST) {
+                stack[sp].values = NULL;
+                stack[sp].scalar = t->constants[arg];
+                sp++;
+            } else if (op == FUSED_NEG) {
+                /* The compiler only negates blocks */
+                slot = slots + (sp - 1) * FUSED_BLOCK;
+                const double *x = stack[sp - 1].values;
+                for (Py_ssize_t k = 0; k < len; k++) {
+                    slot[k] = -x[k];
+                }
+                stack[sp - 1].values = slot;
+            } else {
+                FusedValue *x = &stack[sp - 2], *y = &stack[sp - 1];
+                if ((op == FUSED_DIV || op == FUSED_FLOORDIV) &&
+                    (y->values != NULL ? contains_zero(y->values, len) : y->scalar == 0.0)) {
+                    t->zero_division = 1;
+                }
+                slot = slots + (sp - 2) * FUSED_BLOCK;
+                fused_binary(op, x, y, slot, len);
+                x->values = slot;
+                sp--;
+            }
+        }
+        
+        const double *result = stack[0].values;
+        double *dst = t->out + row * t->out_row_stride + c0 * t->out_col_stride;
+        if (t->out_col_stride == 1) {
+            memcpy(dst, result, (size_t)len * sizeof(double));
+        } else {
+            for (Py_ssize_t k = 0; k < len; k++) {
+                dst[k * t->out_col_stride] = result[k];
+            }
+        }
+    }
+    
+    PyMem_RawFree(slots);
+    PyMem_RawFree(stack);
+}
+
+/* Helper function checking fused code and returning the stack depth it
+ * needs, or -1 with ValueError set. Every binary operation must have a
+ * block operand and the code must leave exactly one block. */
+static Py_ssize_t fused_check(const int *code, Py_ssize_t length, Py_ssize_t operands,
+                              Py_ssize_t constants, char *is_block) {
+    Py_ssize_t sp = 0, depth = 0;
+    for (Py_ssize_t i = 0; i < length; i++) {
+        int op = code[2 * i], arg = code[2 * i + 1];
+        int valid;
+        if (op == FUSED_LOAD || op == FUSED_CONST) {
+            valid = arg >= 0 && arg < (op == FUSED_LOAD ? operands : constants);
+            if (valid) {
+                is_block[sp++] = op == FUSED_LOAD;
+            }
+        } else if (op == FUSED_NEG) {
+            valid = sp >= 1 && is_block[sp - 1];
+        } else {
+            valid = op > FUSED_CONST && op < FUSED_OPCODES && sp >= 2 && (is_block[sp - 2] || is_block[sp - 1]);
+            if (valid) {
+                is_block[sp - 2] = 1;
+                sp--;
+            }
+        }
+        if (!valid) {
+            PyErr_Format(PyExc_ValueError, "Invalid fused code at instruction %zd.", i);
+            return -1;
+        }
+        if (sp > depth) {
+            depth = sp;
+        }
+    }
+    if (sp != 1 || !is_block[0]) {
+        PyErr_SetString(PyExc_ValueError, "Fused code must leave a single matrix.");
+        return -1;
+    }
+    return depth;
+}
+
+/* Helper function running fused code over `operands` into `out`, all of one
+ * order and with `out` not overlapping any operand unless it addresses the
+ * same elements */
+static int fused_run(const int *code, Py_ssize_t length, MatrixObject **operands, Py_ssize_t count,
+                     const double *constants, Py_ssize_t depth, MatrixObject *out) {
+    FusedOperand *views = (FusedOperand *)PyMem_Malloc((size_t)count * sizeof(FusedOperand));
+    if (views == NULL) {
+        PyErr_NoMemory();
+        return -1;
+    }
+    
+    /* Compact operands are one long row, so short rows still fill the blocks */
+    int flat = Matrix_is_contiguous(out);
+    for (Py_ssize_t i = 0; i < count && flat; i++) {
+        flat = Matrix_is_contiguous(operands[i]);
+    }
+    Py_ssize_t rows = flat ? 1 : out->rows, cols = flat ? out->rows * out->cols : out->cols;
+    for (Py_ssize_t i = 0; i < count; i++) {
+        MatrixObject *m = operands[i];
+        views[i] = (FusedOperand){m->data, flat ? 0 : m->row_stride, flat ? 1 : m->col_stride};
+    }
+    
+    Py_ssize_t blocks_per_row = (cols + FUSED_BLOCK - 1) / FUSED_BLOCK;
+    FusedTask task = {
+        code, length, views, constants, depth,
+        out->data, flat ? 0 : out->row_stride, flat ? 1 : out->col_stride,
+        cols, blocks_per_row, 0, 0,
+    };
+    for (Py_ssize_t i = 0; i < count; i++) {
+        MM_PIN(operands[i]);
+    }
+    MM_PIN(out);
+    MM_BEGIN_ALLOW_THREADS(rows * cols * length)
+    mm_parallel_for(rows * blocks_per_row, ELEMENTWISE_GRAIN / FUSED_BLOCK + 1, fused_range, &task);
+    MM_END_ALLOW_THREADS
+    for (Py_ssize_t i = 0; i < count; i++) {
+        MM_UNPIN(operands[i]);
+    }
+    MM_UNPIN(out);
+    PyMem_Free(views);
+    
+    if (task.failed) {
+        PyErr_NoMemory();
+        return -1;
+    }
+    if (task.zero_division) {
+        PyErr_SetString(PyExc_ZeroDivisionError, "Division by zero");
+        return -1;
+    }
+    return 0;
+}
+
+/* matmath._matrix._fused
+ *
+ * Evaluates postfix `code` (a flat sequence of opcode, argument pairs) over
+ * a sequence of equally sized matrices and a sequence of floats, into `out`
+ * or a new Matrix. Called by matmath.lazy(); not meant to be used directly.
+ */
+static PyObject* matrix_fused(PyObject *module, PyObject *args, PyObject *kwds) {
+    static char *kwlist[] = {"code", "operands", "constants", "out", NULL};
+    PyObject *code_arg, *operands_arg, *constants_arg, *out = Py_None;
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "OOO|O", kwlist, &code_arg, &operands_arg,
+                                     &constants_arg, &out)) {
+        return NULL;
+    }
+    
+    PyObject *code_seq = PySequence_Fast(code_arg, "code must be a sequence");
+    PyObject *operands_seq = PySequence_Fast(operands_arg, "operands must be a sequence");
+    PyObject *constants_seq = PySequence_Fast(constants_arg, "constants must be a sequence");
+    int *code = NULL;
+    double *constants = NULL;
+    char *is_block = NULL;
+    MatrixObject *result = NULL, *temp = NULL;
+    PyObject *ret = NULL;
+    if (code_seq == NULL || operands_seq == NULL || constants_seq == NULL) {
+        goto done;
+    }
+    
+    Py_ssize_t code_size = PySequence_Fast_GET_SIZE(code_seq);
+    Py_ssize_t count = PySequence_Fast_GET_SIZE(operands_seq);
+    Py_ssize_t nconstants = PySequence_Fast_GET_SIZE(constants_seq);
+    if (code_size % 2 != 0 || count == 0) {
+        PyErr_SetString(PyExc_ValueError, "Fused code must leave a single matrix.");
+        goto done;
+    }
+    code = (int *)PyMem_Malloc((size_t)(code_size ? code_size : 1) * sizeof(int));
+    constants = (double *)PyMem_Malloc((size_t)(nconstants ? nconstants : 1) * sizeof(double));
+    is_block = (char *)PyMem_Malloc((size_t)code_size / 2 + 1);
+    if (code == NULL || constants == NULL || is_block == NULL) {
+        PyErr_NoMemory();
+        goto done;
+    }
+    for (Py_ssize_t i = 0; i < code_size; i++) {
+        long value = PyLong_AsLong(PySequence_Fast_GET_ITEM(code_seq, i));
+        if (value == -1 && PyErr_Occurred()) {
+            goto done;
+        }
+        code[i] = value < INT_MIN || value > INT_MAX ? -1 : (int)value;
+    }
+    for (Py_ssize_t i = 0; i < nconstants; i++) {
+        constants[i] = PyFloat_AsDouble(PySequence_Fast_GET_ITEM(constants_seq, i));
+        if (constants[i] == -1.0 && PyErr_Occurred()) {
+            goto done;
+        }
+    }
+    
+    MatrixObject **operands = (MatrixObject **)PySequence_Fast_ITEMS(operands_seq);
+    for (Py_ssize_t i = 0; i < count; i++) {
+        if (!PyObject_TypeCheck((PyObject *)operands[i], &MatrixType)) {
+            PyErr_SetString(PyExc_TypeError, "operands must be matrices");
+            goto done;
+        }
+        if (operands[i]->rows != operands[0]->rows || operands[i]->cols != operands[0]->cols) {
+            PyErr_SetString(PyExc_ValueError, "The 2 matrices do not have the same order.");
+            goto done;
+        }
+    }
+    Py_ssize_t rows = operands[0]->rows, cols = operands[0]->cols;
+    Py_ssize_t depth = fused_check(code, code_size / 2, count, nconstants, is_block);
+    if (depth < 0) {
+        goto done;
+    }
+    
+    PROFILE_START;
+    if (out == Py_None) {
+        result = Matrix_alloc(rows, cols);
+        if (result == NULL) {
+            goto done;
+        }
+    } else {
+        if (Matrix_check_out(out, rows, cols) < 0) {
+            goto done;
+        }
+        result = (MatrixObject *)out;
+        Py_INCREF(result);
+        Matrix_changed(result);
+    }
+    
+    /* An output partly overlapping an operand is written through a temporary */
+    MatrixObject *target = result;
+    for (Py_ssize_t i = 0; i < count; i++) {
+        if (Matrix_overlaps(result, operands[i]) && !Matrix_same_layout(result, operands[i])) {
+            temp = Matrix_alloc(rows, cols);
+            if (temp == NULL) {
+                goto done;
+            }
+            target = temp;
+            break;
+        }
+    }
+    if (fused_run(code, code_size / 2, operands, count, constants, depth, target) < 0) {
+        goto done;
+    }
+    if (temp != NULL) {
+        Matrix_unpack(result, temp->data);
+    }
+    
+    Py_ssize_t size = rows * cols, arithmetic = 0;
+    for (Py_ssize_t i = 0; i < code_size / 2; i++) {
+        arithmetic += code[2 * i] > FUSED_CONST;
+    }
+    PROFILE_STOP(MM_OP_FUSED, out == Py_None ? size * (Py_ssize_t)sizeof(double) : 0, arithmetic * size);
+    ret = (PyObject *)result;
+    result = NULL;
+    
+done:
+    Py_XDECREF(code_seq);
+    Py_XDECREF(operands_seq);
+    Py_XDECREF(constants_seq);
+    PyMem_Free(code);
+    PyMem_Free(constants);
+    PyMem_Free(is_block);
+    Py_XDECREF(result);
+    Py_XDECREF(temp);
+    return ret;
+}
+
+/* matmath._matrix._set_small_kernels */
+static PyObject* matrix_set_small_kernels(PyObject *module, PyObject *arg) {
+    int enabled = PyObject_IsTrue(arg);
+    if (enabled < 0) {
+        return NULL;
+    }
+    
+    int previous = mm_small_kernels;
+    mm_small_kernels = enabled;
+    return PyBool_FromLong(previous);
+}
+
+/* matmath.stats */
+static PyObject* matrix_stats(PyObject *module, PyObject *Py_UNUSED(ignored)) {
+    PyObject *result = PyDict_New();
+    if (result == NULL) {
+        return NULL;
+    }
+    
+    for (int op = 0; op < MM_OP_COUNT; op++) {
+        ProfileCounter *counter = &mm_profile_counters[op];
+        if (counter->calls == 0) {
+            continue;
+        }
+        PyObject *entry = Py_BuildValue(
+            "{s:L,s:d,s:d,s:N,s:N}",
+            "calls", counter->calls,
+            "total_time", counter->total_time,
+            "max_time", counter->max_time,
+            "bytes", PyLong_FromDouble(counter->bytes),
+            "flops", PyLong_FromDouble(counter->flops));
+        if (entry == NULL || PyDict_SetItemString(result, mm_profile_names[op], entry) < 0) {
+            Py_XDECREF(entry);
+            Py_DECREF(result);
+            return NULL;
+        }
+        Py_DECREF(entry);
+    }
+    return result;
+}
+
+/* matmath.reset_stats */
+static PyObject* matrix_reset_stats(PyObject *module, PyObject *Py_UNUSED(ignored)) {
+    memset(mm_profile_counters, 0, sizeof(mm_profile_counters));
+    Py_RETURN_NONE;
+}
+
+/* matmath.cache_info */
+static PyObject* matrix_cache_info(PyObject *module, PyObject *Py_UNUSED(ignored)) {
+    Py_ssize_t matrices = 0;
+    double bytes = 0.0;
+    for (MatrixCache *cache = cache_list; cache != NULL; cache = cache->next) {
+        matrices++;
+        bytes += MatrixCache_bytes(cache);
+    }
+    return Py_BuildValue("{s:L,s:L,s:L,s:n,s:N}",
+                         "hits", cache_hits,
+                         "misses", cache_misses,
+                         "invalidations", cache_invalidations,
+                         "matrices", matrices,
+                         "bytes", PyLong_FromDouble(bytes));
+}
+
+/* matmath.clear_cache */
+static PyObject* matrix_clear_cache(PyObject *module, PyObject *Py_UNUSED(ignored)) {
+    while (cache_list != NULL) {
+        Matrix_cache_drop(cache_list->owner);
+    }
+    cache_hits = cache_misses = cache_invalidations = 0;
+    Py_RETURN_NONE;
+}
+
+/* matmath.set_caching */
+static PyObject* matrix_set_caching(PyObject *module, PyObject *arg) {
+    int enabled = PyObject_IsTrue(arg);
+    if (enabled < 0) {
+        return NULL;
+    }
+    
+    int previous = cache_enabled;
+    cache_enabled = enabled;
+    if (!enabled) {
+        while (cache_list != NULL) {
+            Matrix_cache_drop(cache_list->owner);
+        }
+    }
+    return PyBool_FromLong(previous);
+}
+
+/* Module functions */
+static PyMethodDef matrixmodule_methods[] = {
+    {"set_num_threads", (PyCFunction)matrix_set_num_threads, METH_O, "Set the number of threads used by large kernels"},
+    {"get_num_threads", (PyCFunction)matrix_get_num_threads, METH_NOARGS, "Get the number of threads used by large kernels"},
+    {"set_profiling", (PyCFunction)matrix_set_profiling, METH_O, "Turn the operation counters on or off; returns the previous setting"},
+    {"stats", (PyCFunction)matrix_stats, METH_NOARGS, "Return the operation counters recorded while profiling"},
+    {"reset_stats", (PyCFunction)matrix_reset_stats, METH_NOARGS, "Clear the operation counters"},
+    {"cache_info", (PyCFunction)matrix_cache_info, METH_NOARGS,
+     "Return the hit, miss and invalidation counts and the size of the derived results cache"},
+    {"clear_cache", (PyCFunction)matrix_clear_cache, METH_NOARGS,
+     "Free every cached derived result and reset the cache counters"},
+    {"set_caching", (PyCFunction)matrix_set_caching, METH_O,
+     "Turn the derived results cache on or off; returns the previous setting"},
+    {"_set_small_kernels", (PyCFunction)matrix_set_small_kernels, METH_O,
+     "Turn the fixed-size 2 x 2 to 4 x 4 kernels on or off; returns the previous setting"},
+    {"_fused", (PyCFunction)matrix_fused, METH_VARARGS | METH_KEYWORDS,
+     "Evaluate a fused element-wise expression compiled by matmath.lazy()"},
+    {NULL}
+};
+
+/* Module teardown; empties the Matrix freelist */
+static void matrixmodule_free(void *module) {
+    while (matrix_numfree > 0) {
+        PyObject_Free(matrix_freelist[--matrix_numfree]);
+    }
+}
+
 /* Module definition */
 static PyModuleDef matrixmodule = {
     PyModuleDef_HEAD_INIT,
     .m_name = "_matrix",
     .m_doc = "C extension for Matrix class",
     .m_size = -1,
+    .m_methods = matrixmodule_methods,
+    .m_free = matrixmodule_free,
+};
+
+/* C API exported to the other extensions */
+static MatmathMatrixAPI Matrix_api = {
+    &MatrixType,
+    Matrix_alloc,
+    mm_parallel_for,
+    &mm_profiling,
+    mm_profile_record,
 };
 
 /* Module initialization */
@@ -1382,11 +5821,29 @@ PyMODINIT_FUNC PyInit__matrix(void) {
     PyObject *m;
     if (PyType_Ready(&MatrixType) < 0)
         return NULL;
+    if (PyType_Ready(&LUType) < 0)
+        return NULL;
+    if (PyType_Ready(&MatrixCSVIterType) < 0)
+        return NULL;
+
+    /* PyCapsule_Import() only looks up attributes, so load the module first
+       whatever order matmath/__init__.py imports the extensions in */
+    m = PyImport_ImportModule("matmath._vector");
+    if (m == NULL)
+        return NULL;
+    Py_DECREF(m);
+    VectorAPI = (MatmathVectorAPI *)PyCapsule_Import(MATMATH_VECTOR_CAPSULE, 0);
+    if (VectorAPI == NULL)
+        return NULL;
 
     m = PyModule_Create(&matrixmodule);
     if (m == NULL)
         return NULL;
 
+#ifndef _WIN32
+    pthread_atfork(NULL, NULL, mm_after_fork_child);
+#endif
+
     Py_INCREF(&MatrixType);
     if (PyModule_AddObject(m, "Matrix", (PyObject *)&MatrixType) < 0) {
         Py_DECREF(&MatrixType);
@@ -1394,5 +5851,19 @@ PyMODINIT_FUNC PyInit__matrix(void) {
         return NULL;
     }
 
+    Py_INCREF(&LUType);
+    if (PyModule_AddObject(m, "LU", (PyObject *)&LUType) < 0) {
+        Py_DECREF(&LUType);
+        Py_DECREF(m);
+        return NULL;
+    }
+
+    PyObject *capsule = PyCapsule_New(&Matrix_api, MATMATH_MATRIX_CAPSULE, NULL);
+    if (PyModule_AddObject(m, "_C_API", capsule) < 0) {
+        Py_XDECREF(capsule);
+        Py_DECREF(m);
+        return NULL;
+    }
+
     return m;
 }
@@ -0,0 +1,59 @@
+/* Matrix object layout and the C API the _matrix extension exports to the
+ * other matmath extensions through the matmath._matrix._C_API capsule.
+ */
+#ifndef MATMATH_MATRIX_H
+#define MATMATH_MATRIX_H
+
+#include <Python.h>
+#include "_profile.h"
+
+/* Matrices of up to this many elements (4 x 4) keep them inside the object */
+#define MATRIX_INLINE_SIZE 16
+
+/* Matrix object structure
+ *
+ * Elements live in a single row-major block. Element (i, j) is stored at
+ * data[i * row_stride + j * col_stride]; freshly allocated matrices always
+ * have row_stride == cols and col_stride == 1. Small matrices point `data`
+ * at `inline_data` instead of a separate block. `version` and
+ * `buffer_exports` are only kept on matrices that own their storage; views
+ * update those of the matrix at the end of their `base` chain.
+ */
+typedef struct {
+    PyObject_HEAD
+    double *data;
+    Py_ssize_t rows;
+    Py_ssize_t cols;
+    Py_ssize_t row_stride;
+    Py_ssize_t col_stride;
+    PyObject *base;          /* Owner of data when it was not allocated here */
+    Py_ssize_t exports;      /* Number of live buffer exports */
+    Py_ssize_t busy;         /* Kernels using data without the GIL (see _parallel.h) */
+    struct MatrixCache *cache;     /* Results derived from the elements, or NULL */
+    unsigned long long version;    /* Bumped on every write to storage owned here */
+    Py_ssize_t buffer_exports;     /* Buffers exported over storage owned here */
+    double inline_data[MATRIX_INLINE_SIZE];
+} MatrixObject;
+
+/* Element access honouring the strides */
+#define MATRIX_AT(m, i, j) ((m)->data[(i) * (m)->row_stride + (j) * (m)->col_stride])
+
+/* Exported functions
+ *
+ * parallel_for runs fn over [0, n) on the worker pool sized by
+ * matmath.set_num_threads(); call it without the GIL. `profiling` is the
+ * switch set by matmath.set_profiling() and profile_record adds to the
+ * operation counters (see _profile.h).
+ */
+typedef struct {
+    PyTypeObject *MatrixType;
+    MatrixObject *(*Matrix_alloc)(Py_ssize_t rows, Py_ssize_t cols);
+    void (*parallel_for)(Py_ssize_t n, Py_ssize_t grain,
+                         void (*fn)(void *ctx, Py_ssize_t start, Py_ssize_t end), void *ctx);
+    const int *profiling;
+    mm_profile_record_fn profile_record;
+} MatmathMatrixAPI;
+
+#define MATMATH_MATRIX_CAPSULE "matmath._matrix._C_API"
+
+#endif /* MATMATH_MATRIX_H */
@@ -0,0 +1,215 @@
+/* Shared threading helpers for the matmath C extensions.
+ *
+ * MM_BEGIN_ALLOW_THREADS / MM_END_ALLOW_THREADS release the GIL around a
+ * pure-double kernel when the amount of work makes it worthwhile. Every
+ * Matrix or Vector whose storage such a kernel uses is pinned around it with
+ * MM_PIN / MM_UNPIN, so another thread cannot re-initialise it (freeing that
+ * storage) while the kernel runs.
+ *
+ * mm_parallel_for splits [0, n) into contiguous chunks and runs them on a
+ * small persistent worker pool (sized by mm_set_num_threads) plus the calling
+ * thread. Callbacks must not touch Python objects: they run without the GIL.
+ * If the pool is already busy (another Python thread is using it) the work
+ * simply runs serially in the caller.
+ *
+ * Define MM_MACROS_ONLY before including to get just the GIL macros.
+ */
+#ifndef MATMATH_PARALLEL_H
+#define MATMATH_PARALLEL_H
+
+#include <Python.h>
+
+#ifdef _WIN32
+#include <windows.h>
+typedef SRWLOCK mm_mutex_t;
+typedef CONDITION_VARIABLE mm_cond_t;
+typedef HANDLE mm_thread_t;
+#define MM_MUTEX_INIT SRWLOCK_INIT
+#define MM_COND_INIT CONDITION_VARIABLE_INIT
+#define mm_mutex_lock(m) AcquireSRWLockExclusive(m)
+#define mm_mutex_trylock(m) (TryAcquireSRWLockExclusive(m) ? 0 : -1)
+#define mm_mutex_unlock(m) ReleaseSRWLockExclusive(m)
+#define mm_cond_wait(c, m) SleepConditionVariableSRW((c), (m), INFINITE, 0)
+#define mm_cond_broadcast(c) WakeAllConditionVariable(c)
+#define MM_THREAD_RETURN DWORD WINAPI
+#else
+#include <pthread.h>
+typedef pthread_mutex_t mm_mutex_t;
+typedef pthread_cond_t mm_cond_t;
+typedef pthread_t mm_thread_t;
+#define MM_MUTEX_INIT PTHREAD_MUTEX_INITIALIZER
+#define MM_COND_INIT PTHREAD_COND_INITIALIZER
+#define mm_mutex_lock(m) pthread_mutex_lock(m)
+#define mm_mutex_trylock(m) pthread_mutex_trylock(m)
+#define mm_mutex_unlock(m) pthread_mutex_unlock(m)
+#define mm_cond_wait(c, m) pthread_cond_wait((c), (m))
+#define mm_cond_broadcast(c) pthread_cond_broadcast(c)
+#define MM_THREAD_RETURN void*
+#endif
+
+/* Work (in doubles touched or multiply-adds) below which the GIL is kept */
+#define MM_NOGIL_THRESHOLD 4096
+
+#define MM_BEGIN_ALLOW_THREADS(work) { \
+    PyThreadState *_mm_save = (work) >= MM_NOGIL_THRESHOLD ? PyEval_SaveThread() : NULL;
+#define MM_END_ALLOW_THREADS \
+    if (_mm_save != NULL) { PyEval_RestoreThread(_mm_save); } }
+
+/* Raise / lower the `busy` count of a Matrix or Vector (or do nothing for
+   NULL); only with the GIL held */
+#define MM_PIN(obj) do { if ((obj) != NULL) { (obj)->busy++; } } while (0)
+#define MM_UNPIN(obj) do { if ((obj) != NULL) { (obj)->busy--; } } while (0)
+
+#ifndef MM_MACROS_ONLY
+
+#define MM_MAX_THREADS 256
+
+typedef void (*mm_range_fn)(void *ctx, Py_ssize_t start, Py_ssize_t end);
+
+/* Pool state. `busy` serialises users of the pool; `lock` guards the job. */
+static mm_mutex_t mm_busy = MM_MUTEX_INIT;
+static mm_mutex_t mm_lock = MM_MUTEX_INIT;
+static mm_cond_t mm_work_cond = MM_COND_INIT;
+static mm_cond_t mm_done_cond = MM_COND_INIT;
+static mm_thread_t mm_workers[MM_MAX_THREADS];
+static int mm_num_workers = 0;
+static int mm_num_threads = 1;
+static int mm_shutdown = 0;
+static unsigned long mm_generation = 0;
+
+static mm_range_fn mm_job_fn = NULL;
+static void *mm_job_ctx = NULL;
+static Py_ssize_t mm_job_n = 0;
+static Py_ssize_t mm_job_chunks = 0;
+static Py_ssize_t mm_job_next = 0;
+static Py_ssize_t mm_job_done = 0;
+
+/* Runs chunks of the current job until none are left; called with mm_lock held */
+static void mm_run_chunks(void) {
+    while (mm_job_next < mm_job_chunks) {
+        Py_ssize_t chunk = mm_job_next++;
+        mm_range_fn fn = mm_job_fn;
+        void *ctx = mm_job_ctx;
+        Py_ssize_t start = mm_job_n * chunk / mm_job_chunks;
+        Py_ssize_t end = mm_job_n * (chunk + 1) / mm_job_chunks;
+        mm_mutex_unlock(&mm_lock);
+        fn(ctx, start, end);
+        mm_mutex_lock(&mm_lock);
+        if (++mm_job_done == mm_job_chunks) {
+            mm_cond_broadcast(&mm_done_cond);
+        }
+    }
+}
+
+static MM_THREAD_RETURN mm_worker_main(void *arg) {
+    unsigned long seen = (unsigned long)(size_t)arg;
+    mm_mutex_lock(&mm_lock);
+    for (;;) {
+        while (mm_generation == seen && !mm_shutdown) {
+            mm_cond_wait(&mm_work_cond, &mm_lock);
+        }
+        if (mm_shutdown) {
+            break;
+        }
+        seen = mm_generation;
+        mm_run_chunks();
+    }
+    mm_mutex_unlock(&mm_lock);
+    return 0;
+}
+
+/* Stops and joins every worker; called with mm_busy held */
+static void mm_stop_workers(void) {
+    mm_mutex_lock(&mm_lock);
+    mm_shutdown = 1;
+    mm_cond_broadcast(&mm_work_cond);
+    mm_mutex_unlock(&mm_lock);
+    for (int i = 0; i < mm_num_workers; i++) {
+#ifdef _WIN32
+        WaitForSingleObject(mm_workers[i], INFINITE);
+        CloseHandle(mm_workers[i]);
+#else
+        pthread_join(mm_workers[i], NULL);
+#endif
+    }
+    mm_num_workers = 0;
+    mm_shutdown = 0;
+}
+
+/* Starts workers until the pool has mm_num_threads - 1 of them; called with mm_busy held */
+static void mm_start_workers(void) {
+    while (mm_num_workers < mm_num_threads - 1) {
+        void *arg = (void *)(size_t)mm_generation;
+#ifdef _WIN32
+        HANDLE handle = CreateThread(NULL, 0, mm_worker_main, arg, 0, NULL);
+        if (handle == NULL) {
+            break;
+        }
+        mm_workers[mm_num_workers++] = handle;
+#else
+        if (pthread_create(&mm_workers[mm_num_workers], NULL, mm_worker_main, arg) != 0) {
+            break;
+        }
+        mm_num_workers++;
+#endif
+    }
+}
+
+#ifndef _WIN32
+/* Worker threads do not survive fork(); start from an empty pool in the child */
+static void mm_after_fork_child(void) {
+    pthread_mutex_t fresh_mutex = PTHREAD_MUTEX_INITIALIZER;
+    pthread_cond_t fresh_cond = PTHREAD_COND_INITIALIZER;
+    mm_busy = fresh_mutex;
+    mm_lock = fresh_mutex;
+    mm_work_cond = fresh_cond;
+    mm_done_cond = fresh_cond;
+    mm_num_workers = 0;
+    mm_shutdown = 0;
+}
+#endif
+
+/* Runs fn over [0, n) in chunks of at least `grain` items. Call without the GIL. */
+static void mm_parallel_for(Py_ssize_t n, Py_ssize_t grain, mm_range_fn fn, void *ctx) {
+    Py_ssize_t chunks = grain > 0 ? n / grain : n;
+    if (chunks > mm_num_threads) {
+        chunks = mm_num_threads;
+    }
+    if (chunks < 2 || mm_mutex_trylock(&mm_busy) != 0) {
+        fn(ctx, 0, n);
+        return;
+    }
+
+    mm_start_workers();
+
+    mm_mutex_lock(&mm_lock);
+    mm_job_fn = fn;
+    mm_job_ctx = ctx;
+    mm_job_n = n;
+    mm_job_chunks = chunks;
+    mm_job_next = 0;
+    mm_job_done = 0;
+    mm_generation++;
+    mm_cond_broadcast(&mm_work_cond);
+    mm_run_chunks();
+    while (mm_job_done < mm_job_chunks) {
+        mm_cond_wait(&mm_done_cond, &mm_lock);
+    }
+    mm_mutex_unlock(&mm_lock);
+
+    mm_mutex_unlock(&mm_busy);
+}
+
+/* Resizes the pool; call without the GIL since it waits for running jobs */
+static void mm_set_num_threads(int n) {
+    mm_mutex_lock(&mm_busy);
+    if (n < mm_num_workers + 1) {
+        mm_stop_workers();
+    }
+    mm_num_threads = n;
+    mm_mutex_unlock(&mm_busy);
+}
+
+#endif /* MM_MACROS_ONLY */
+
+#endif /* MATMATH_PARALLEL_H */
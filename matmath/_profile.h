@@ -0,0 +1,77 @@
+/* Opt-in operation counters shared by the matmath C extensions.
+ *
+ * Instrumented operations bracket their work with MM_PROFILE_START and
+ * MM_PROFILE_STOP. While profiling is off the pair costs one predictable
+ * branch; while it is on, the elapsed wall time, the bytes the operation
+ * allocated and an estimate of its floating point operations are added to
+ * the counters kept by the _matrix extension (and exported to the others
+ * through its capsule). Only calls that succeed are counted, and the
+ * counters are only touched with the GIL held.
+ */
+#ifndef MATMATH_PROFILE_H
+#define MATMATH_PROFILE_H
+
+#include <Python.h>
+
+#ifdef _WIN32
+#include <windows.h>
+#else
+#include <time.h>
+#endif
+
+/* The instrumented operations; the names are in mm_profile_names (_matrix.c) */
+typedef enum {
+    MM_OP_ADD,
+    MM_OP_SUB,
+    MM_OP_MUL,
+    MM_OP_TRUEDIV,
+    MM_OP_FLOORDIV,
+    MM_OP_MATMUL,
+    MM_OP_MATVEC,
+    MM_OP_APPLY,
+    MM_OP_TRANSPOSE,
+    MM_OP_COPY,
+    MM_OP_DETERMINANT,
+    MM_OP_INVERSE,
+    MM_OP_ADJOINT,
+    MM_OP_LU,
+    MM_OP_SOLVE,
+    MM_OP_SOLVE_TRIANGULAR,
+    MM_OP_CHOLESKY,
+    MM_OP_QR,
+    MM_OP_EIGH,
+    MM_OP_POW,
+    MM_OP_FUSED,
+    MM_OP_SPARSE_MATMUL,
+    MM_OP_COUNT
+} mm_op;
+
+typedef void (*mm_profile_record_fn)(mm_op op, double start, double bytes, double flops);
+
+/* Monotonic wall clock in seconds */
+static inline double mm_clock(void) {
+#ifdef _WIN32
+    LARGE_INTEGER now, frequency;
+    QueryPerformanceCounter(&now);
+    QueryPerformanceFrequency(&frequency);
+    return (double)now.QuadPart / (double)frequency.QuadPart;
+#else
+    struct timespec now;
+    clock_gettime(CLOCK_MONOTONIC, &now);
+    return (double)now.tv_sec + (double)now.tv_nsec * 1e-9;
+#endif
+}
+
+/* `enabled` is read once, so an operation that releases the GIL is timed
+ * consistently even if another thread toggles profiling meanwhile. */
+#define MM_PROFILE_START(enabled) \
+    double _mm_profile_start = (enabled) ? mm_clock() : 0.0
+
+#define MM_PROFILE_STOP(record, op, bytes, flops) \
+    do { \
+        if (_mm_profile_start != 0.0) { \
+            (record)((op), _mm_profile_start, (double)(bytes), (double)(flops)); \
+        } \
+    } while (0)
+
+#endif /* MATMATH_PROFILE_H */
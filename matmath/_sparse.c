@@ -0,0 +1,1040 @@
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+#include <math.h>
+#include <string.h>
+
+#define MM_MACROS_ONLY
+#include "_parallel.h"
+#include "_vector.h"
+#include "_matrix.h"
+
+/* SparseMatrix object structure
+ *
+ * Compressed sparse row (CSR) storage. The entries of row i are
+ * indices[indptr[i]:indptr[i + 1]] (column indices, strictly increasing) and
+ * the matching slice of data. Stored values are never zero, so nnz counts the
+ * true non-zeros and every structural predicate can be answered from the
+ * pattern alone.
+ */
+typedef struct {
+    PyObject_HEAD
+    Py_ssize_t rows;
+    Py_ssize_t cols;
+    Py_ssize_t *indptr;      /* rows + 1 offsets into indices/data */
+    Py_ssize_t *indices;
+    double *data;
+} SparseMatrixObject;
+
+#define SPARSE_NNZ(s) ((s)->indptr[(s)->rows])
+
+/* Rows handed to one worker at a time in the sparse kernels */
+#define SPARSE_GRAIN 16384
+
+static PyTypeObject SparseMatrixType;
+static MatmathVectorAPI *VectorAPI = NULL;
+static MatmathMatrixAPI *MatrixAPI = NULL;
+
+/* Operation counters, kept by the _matrix extension (see _profile.h) */
+#define PROFILE_START MM_PROFILE_START(*MatrixAPI->profiling)
+#define PROFILE_STOP(op, bytes, flops) MM_PROFILE_STOP(MatrixAPI->profile_record, op, bytes, flops)
+
+/* Helper function to allocate a sparse matrix with room for nnz entries
+ *
+ * indptr is zeroed; indices and data are left uninitialized.
+ */
+static SparseMatrixObject* SparseMatrix_alloc(Py_ssize_t rows, Py_ssize_t cols, Py_ssize_t nnz) {
+    SparseMatrixObject *self = (SparseMatrixObject *)SparseMatrixType.tp_alloc(&SparseMatrixType, 0);
+    if (self == NULL) {
+        return NULL;
+    }
+
+    self->rows = rows;
+    self->cols = cols;
+    self->indptr = (Py_ssize_t *)PyMem_Calloc((size_t)rows + 1, sizeof(Py_ssize_t));
+    self->indices = (Py_ssize_t *)PyMem_Malloc((size_t)(nnz > 0 ? nnz : 1) * sizeof(Py_ssize_t));
+    self->data = (double *)PyMem_Malloc((size_t)(nnz > 0 ? nnz : 1) * sizeof(double));
+    if (self->indptr == NULL || self->indices == NULL || self->data == NULL) {
+        Py_DECREF(self);
+        PyErr_NoMemory();
+        return NULL;
+    }
+
+    return self;
+}
+
+/* Helper function to give back the slack left after dropping entries */
+static void SparseMatrix_shrink(SparseMatrixObject *self) {
+    size_t nnz = (size_t)(SPARSE_NNZ(self) > 0 ? SPARSE_NNZ(self) : 1);
+    Py_ssize_t *indices = (Py_ssize_t *)PyMem_Realloc(self->indices, nnz * sizeof(Py_ssize_t));
+    double *data = (double *)PyMem_Realloc(self->data, nnz * sizeof(double));
+    if (indices != NULL) {
+        self->indices = indices;
+    }
+    if (data != NULL) {
+        self->data = data;
+    }
+}
+
+/* Helper function returning the position of entry (i, j), or -1 when it is zero */
+static Py_ssize_t SparseMatrix_find(const SparseMatrixObject *self, Py_ssize_t i, Py_ssize_t j) {
+    Py_ssize_t lo = self->indptr[i];
+    Py_ssize_t hi = self->indptr[i + 1];
+    while (lo < hi) {
+        Py_ssize_t mid = lo + (hi - lo) / 2;
+        if (self->indices[mid] < j) {
+            lo = mid + 1;
+        } else {
+            hi = mid;
+        }
+    }
+    return (lo < self->indptr[i + 1] && self->indices[lo] == j) ? lo : -1;
+}
+
+/* Helper function to build a canonical matrix from COO triplets
+ *
+ * Two stable counting sorts (by column, then by row) order the entries, after
+ * which duplicates are summed and zeros dropped in a single pass. Indices must
+ * already be in range.
+ */
+static SparseMatrixObject* SparseMatrix_from_triplets(Py_ssize_t rows, Py_ssize_t cols, const Py_ssize_t *ri,
+                                                      const Py_ssize_t *ci, const double *v, Py_ssize_t n) {
+    Py_ssize_t *order = (Py_ssize_t *)PyMem_Malloc((size_t)(n > 0 ? n : 1) * sizeof(Py_ssize_t));
+    Py_ssize_t *next = (Py_ssize_t *)PyMem_Calloc((size_t)(rows > cols ? rows : cols) + 1, sizeof(Py_ssize_t));
+    if (order == NULL || next == NULL) {
+        PyMem_Free(order);
+        PyMem_Free(next);
+        return (SparseMatrixObject *)PyErr_NoMemory();
+    }
+
+    SparseMatrixObject *self = SparseMatrix_alloc(rows, cols, n);
+    if (self == NULL) {
+        PyMem_Free(order);
+        PyMem_Free(next);
+        return NULL;
+    }
+
+    /* Sort by column */
+    for (Py_ssize_t k = 0; k < n; k++) {
+        next[ci[k] + 1]++;
+    }
+    for (Py_ssize_t j = 0; j < cols; j++) {
+        next[j + 1] += next[j];
+    }
+    for (Py_ssize_t k = 0; k < n; k++) {
+        order[next[ci[k]]++] = k;
+    }
+
+    /* Stable sort by row into the CSR arrays */
+    for (Py_ssize_t k = 0; k < n; k++) {
+        self->indptr[ri[k] + 1]++;
+    }
+    for (Py_ssize_t i = 0; i < rows; i++) {
+        self->indptr[i + 1] += self->indptr[i];
+    }
+    memcpy(next, self->indptr, (size_t)rows * sizeof(Py_ssize_t));
+    for (Py_ssize_t t = 0; t < n; t++) {
+        Py_ssize_t k = order[t];
+        Py_ssize_t dst = next[ri[k]]++;
+        self->indices[dst] = ci[k];
+        self->data[dst] = v[k];
+    }
+    PyMem_Free(order);
+    PyMem_Free(next);
+
+    /* Sum duplicates and drop zeros */
+    Py_ssize_t out = 0, start = 0;
+    for (Py_ssize_t i = 0; i < rows; i++) {
+        Py_ssize_t end = self->indptr[i + 1];
+        Py_ssize_t row_start = out;
+        for (Py_ssize_t p = start; p < end; p++) {
+            if (out > row_start && self->indices[out - 1] == self->indices[p]) {
+                self->data[out - 1] += self->data[p];
+            } else {
+                self->indices[out] = self->indices[p];
+                self->data[out] = self->data[p];
+                out++;
+            }
+        }
+        Py_ssize_t kept = row_start;
+        for (Py_ssize_t p = row_start; p < out; p++) {
+            if (self->data[p] != 0.0) {
+                self->indices[kept] = self->indices[p];
+                self->data[kept] = self->data[p];
+                kept++;
+            }
+        }
+        out = kept;
+        self->indptr[i] = row_start;
+        start = end;
+    }
+    self->indptr[rows] = out;
+
+    if (out < n) {
+        SparseMatrix_shrink(self);
+    }
+    return self;
+}
+
+/* Helper function to read an order tuple */
+static int SparseMatrix_parse_order(PyObject *order_obj, Py_ssize_t *rows, Py_ssize_t *cols) {
+    if (!PyTuple_Check(order_obj) || PyTuple_Size(order_obj) != 2) {
+        PyErr_SetString(PyExc_TypeError, "order must be a tuple of (rows, cols)");
+        return -1;
+    }
+
+    *rows = PyLong_AsSsize_t(PyTuple_GET_ITEM(order_obj, 0));
+    if (*rows == -1 && PyErr_Occurred()) {
+        return -1;
+    }
+    *cols = PyLong_AsSsize_t(PyTuple_GET_ITEM(order_obj, 1));
+    if (*cols == -1 && PyErr_Occurred()) {
+        return -1;
+    }
+
+    if (*rows <= 0 || *cols <= 0) {
+        PyErr_SetString(PyExc_ValueError, "Matrix dimensions must be positive");
+        return -1;
+    }
+    return 0;
+}
+
+/* Helper function to read a sequence of indices below `bound` into a new array */
+static Py_ssize_t* SparseMatrix_read_indices(PyObject *seq, Py_ssize_t n, Py_ssize_t bound) {
+    Py_ssize_t *out = (Py_ssize_t *)PyMem_Malloc((size_t)(n > 0 ? n : 1) * sizeof(Py_ssize_t));
+    if (out == NULL) {
+        return (Py_ssize_t *)PyErr_NoMemory();
+    }
+
+    PyObject **items = PySequence_Fast_ITEMS(seq);
+    for (Py_ssize_t k = 0; k < n; k++) {
+        Py_ssize_t idx = PyNumber_AsSsize_t(items[k], PyExc_IndexError);
+        if (idx == -1 && PyErr_Occurred()) {
+            PyMem_Free(out);
+            return NULL;
+        }
+        if (idx < 0 || idx >= bound) {
+            PyErr_SetString(PyExc_IndexError, "SparseMatrix index out of range");
+            PyMem_Free(out);
+            return NULL;
+        }
+        out[k] = idx;
+    }
+    return out;
+}
+
+/* SparseMatrix.__new__ */
+static PyObject* SparseMatrix_new(PyTypeObject *type, PyObject *args, PyObject *kwds) {
+    PyObject *order_obj, *rows_obj = NULL, *cols_obj = NULL, *values_obj = NULL;
+    static char *kwlist[] = {"order", "rows", "cols", "values", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|OOO", kwlist, &order_obj, &rows_obj, &cols_obj, &values_obj)) {
+        return NULL;
+    }
+
+    Py_ssize_t rows, cols;
+    if (SparseMatrix_parse_order(order_obj, &rows, &cols) < 0) {
+        return NULL;
+    }
+    if ((rows_obj == NULL) != (cols_obj == NULL) || (rows_obj == NULL) != (values_obj == NULL)) {
+        PyErr_SetString(PyExc_TypeError, "rows, cols and values must be given together");
+        return NULL;
+    }
+    if (rows_obj == NULL) {
+        return (PyObject *)SparseMatrix_alloc(rows, cols, 0);
+    }
+
+    PyObject *r_seq = PySequence_Fast(rows_obj, "rows must be a sequence of indices");
+    PyObject *c_seq = r_seq ? PySequence_Fast(cols_obj, "cols must be a sequence of indices") : NULL;
+    PyObject *v_seq = c_seq ? PySequence_Fast(values_obj, "values must be a sequence of numbers") : NULL;
+    Py_ssize_t *ri = NULL, *ci = NULL;
+    double *v = NULL;
+    PyObject *result = NULL;
+    if (v_seq == NULL) {
+        goto done;
+    }
+
+    Py_ssize_t n = PySequence_Fast_GET_SIZE(v_seq);
+    if (PySequence_Fast_GET_SIZE(r_seq) != n || PySequence_Fast_GET_SIZE(c_seq) != n) {
+        PyErr_SetString(PyExc_ValueError, "rows, cols and values must have the same length");
+        goto done;
+    }
+
+    ri = SparseMatrix_read_indices(r_seq, n, rows);
+    ci = ri ? SparseMatrix_read_indices(c_seq, n, cols) : NULL;
+    if (ci == NULL) {
+        goto done;
+    }
+    v = (double *)PyMem_Malloc((size_t)(n > 0 ? n : 1) * sizeof(double));
+    if (v == NULL) {
+        PyErr_NoMemory();
+        goto done;
+    }
+    PyObject **items = PySequence_Fast_ITEMS(v_seq);
+    for (Py_ssize_t k = 0; k < n; k++) {
+        if (!PyLong_Check(items[k]) && !PyFloat_Check(items[k])) {
+            PyErr_SetString(PyExc_TypeError, "All values must be `int` or `float`.");
+            goto done;
+        }
+        v[k] = PyFloat_AsDouble(items[k]);
+        if (v[k] == -1.0 && PyErr_Occurred()) {
+            goto done;
+        }
+    }
+
+    result = (PyObject *)SparseMatrix_from_triplets(rows, cols, ri, ci, v, n);
+
+done:
+    PyMem_Free(ri);
+    PyMem_Free(ci);
+    PyMem_Free(v);
+    Py_XDECREF(r_seq);
+    Py_XDECREF(c_seq);
+    Py_XDECREF(v_seq);
+    return result;
+}
+
+/* SparseMatrix.__del__ */
+static void SparseMatrix_dealloc(SparseMatrixObject *self) {
+    PyMem_Free(self->indptr);
+    PyMem_Free(self->indices);
+    PyMem_Free(self->data);
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+/* SparseMatrix.__repr__ */
+static PyObject* SparseMatrix_repr(SparseMatrixObject *self) {
+    return PyUnicode_FromFormat("<SparseMatrix %zdx%zd with %zd stored entries>",
+                                self->rows, self->cols, SPARSE_NNZ(self));
+}
+
+/* SparseMatrix.__len__ */
+static Py_ssize_t SparseMatrix_len(SparseMatrixObject *self) {
+    return self->rows;
+}
+
+/* SparseMatrix.__getitem__ */
+static PyObject* SparseMatrix_subscript(SparseMatrixObject *self, PyObject *key) {
+    if (!PyTuple_Check(key) || PyTuple_GET_SIZE(key) != 2) {
+        PyErr_SetString(PyExc_TypeError, "SparseMatrix indices must be a tuple of (row, col)");
+        return NULL;
+    }
+
+    Py_ssize_t i = PyNumber_AsSsize_t(PyTuple_GET_ITEM(key, 0), PyExc_IndexError);
+    if (i == -1 && PyErr_Occurred()) {
+        return NULL;
+    }
+    Py_ssize_t j = PyNumber_AsSsize_t(PyTuple_GET_ITEM(key, 1), PyExc_IndexError);
+    if (j == -1 && PyErr_Occurred()) {
+        return NULL;
+    }
+    if (i < 0) {
+        i += self->rows;
+    }
+    if (j < 0) {
+        j += self->cols;
+    }
+    if (i < 0 || i >= self->rows || j < 0 || j >= self->cols) {
+        PyErr_SetString(PyExc_IndexError, "SparseMatrix index out of range");
+        return NULL;
+    }
+
+    Py_ssize_t p = SparseMatrix_find(self, i, j);
+    return PyFloat_FromDouble(p >= 0 ? self->data[p] : 0.0);
+}
+
+/* Helper function to copy a sparse matrix, scaling its values */
+static SparseMatrixObject* SparseMatrix_scaled(SparseMatrixObject *self, double factor) {
+    Py_ssize_t nnz = factor == 0.0 ? 0 : SPARSE_NNZ(self);
+    SparseMatrixObject *result = SparseMatrix_alloc(self->rows, self->cols, nnz);
+    if (result == NULL || nnz == 0) {
+        return result;
+    }
+
+    memcpy(result->indptr, self->indptr, (size_t)(self->rows + 1) * sizeof(Py_ssize_t));
+    memcpy(result->indices, self->indices, (size_t)nnz * sizeof(Py_ssize_t));
+    for (Py_ssize_t p = 0; p < nnz; p++) {
+        result->data[p] = self->data[p] * factor;
+    }
+    return result;
+}
+
+/* Helper function to add (sign = 1) or subtract (sign = -1) two sparse matrices
+ *
+ * Rows are merged like sorted lists; entries that cancel out are dropped.
+ */
+static SparseMatrixObject* SparseMatrix_merge(SparseMatrixObject *a, SparseMatrixObject *b, double sign) {
+    SparseMatrixObject *result = SparseMatrix_alloc(a->rows, a->cols, SPARSE_NNZ(a) + SPARSE_NNZ(b));
+    if (result == NULL) {
+        return NULL;
+    }
+
+    Py_ssize_t out = 0;
+    for (Py_ssize_t i = 0; i < a->rows; i++) {
+        Py_ssize_t p = a->indptr[i], p_end = a->indptr[i + 1];
+        Py_ssize_t q = b->indptr[i], q_end = b->indptr[i + 1];
+        while (p < p_end || q < q_end) {
+            Py_ssize_t j;
+            double value;
+            if (q == q_end || (p < p_end && a->indices[p] < b->indices[q])) {
+                j = a->indices[p];
+                value = a->data[p++];
+            } else if (p == p_end || b->indices[q] < a->indices[p]) {
+                j = b->indices[q];
+                value = sign * b->data[q++];
+            } else {
+                j = a->indices[p];
+                value = a->data[p++] + sign * b->data[q++];
+            }
+            if (value != 0.0) {
+                result->indices[out] = j;
+                result->data[out] = value;
+                out++;
+            }
+        }
+        result->indptr[i + 1] = out;
+    }
+
+    SparseMatrix_shrink(result);
+    return result;
+}
+
+/* Helper function to transpose a sparse matrix with one counting sort */
+static SparseMatrixObject* SparseMatrix_transposed(SparseMatrixObject *self) {
+    Py_ssize_t nnz = SPARSE_NNZ(self);
+    SparseMatrixObject *result = SparseMatrix_alloc(self->cols, self->rows, nnz);
+    if (result == NULL) {
+        return NULL;
+    }
+    Py_ssize_t *next = (Py_ssize_t *)PyMem_Malloc((size_t)self->cols * sizeof(Py_ssize_t));
+    if (next == NULL) {
+        Py_DECREF(result);
+        return (SparseMatrixObject *)PyErr_NoMemory();
+    }
+
+    for (Py_ssize_t p = 0; p < nnz; p++) {
+        result->indptr[self->indices[p] + 1]++;
+    }
+    for (Py_ssize_t j = 0; j < self->cols; j++) {
+        result->indptr[j + 1] += result->indptr[j];
+    }
+    memcpy(next, result->indptr, (size_t)self->cols * sizeof(Py_ssize_t));
+    for (Py_ssize_t i = 0; i < self->rows; i++) {
+        for (Py_ssize_t p = self->indptr[i]; p < self->indptr[i + 1]; p++) {
+            Py_ssize_t dst = next[self->indices[p]]++;
+            result->indices[dst] = i;
+            result->data[dst] = self->data[p];
+        }
+    }
+
+    PyMem_Free(next);
+    return result;
+}
+
+/* SparseMatrix.__add__ / SparseMatrix.__sub__ */
+static PyObject* SparseMatrix_add_or_sub(PyObject *left, PyObject *right, double sign) {
+    if (!PyObject_TypeCheck(left, &SparseMatrixType) || !PyObject_TypeCheck(right, &SparseMatrixType)) {
+        PyErr_SetString(PyExc_TypeError, sign > 0 ? "Can only add SparseMatrix to SparseMatrix"
+                                                  : "Can only subtract SparseMatrix from SparseMatrix");
+        return NULL;
+    }
+
+    SparseMatrixObject *a = (SparseMatrixObject *)left, *b = (SparseMatrixObject *)right;
+    if (a->rows != b->rows || a->cols != b->cols) {
+        PyErr_SetString(PyExc_ValueError, "The 2 matrices do not have the same order.");
+        return NULL;
+    }
+    return (PyObject *)SparseMatrix_merge(a, b, sign);
+}
+
+static PyObject* SparseMatrix_add(PyObject *left, PyObject *right) {
+    return SparseMatrix_add_or_sub(left, right, 1.0);
+}
+
+static PyObject* SparseMatrix_sub(PyObject *left, PyObject *right) {
+    return SparseMatrix_add_or_sub(left, right, -1.0);
+}
+
+/* SparseMatrix.__mul__ (scalar multiplication) */
+static PyObject* SparseMatrix_mul(PyObject *left, PyObject *right) {
+    if (!PyObject_TypeCheck(left, &SparseMatrixType)) {
+        PyObject *tmp = left;
+        left = right;
+        right = tmp;
+    }
+    if (!PyLong_Check(right) && !PyFloat_Check(right)) {
+        PyErr_SetString(PyExc_TypeError, "Can only multiply SparseMatrix by a number");
+        return NULL;
+    }
+
+    double factor = PyFloat_AsDouble(right);
+    if (factor == -1.0 && PyErr_Occurred()) {
+        return NULL;
+    }
+    return (PyObject *)SparseMatrix_scaled((SparseMatrixObject *)left, factor);
+}
+
+/* SparseMatrix.__truediv__ (scalar division) */
+static PyObject* SparseMatrix_truediv(PyObject *left, PyObject *right) {
+    if (!PyObject_TypeCheck(left, &SparseMatrixType)) {
+        Py_RETURN_NOTIMPLEMENTED;
+    }
+    if (!PyLong_Check(right) && !PyFloat_Check(right)) {
+        PyErr_SetString(PyExc_TypeError, "Can only divide SparseMatrix by a number");
+        return NULL;
+    }
+
+    double divisor = PyFloat_AsDouble(right);
+    if (divisor == -1.0 && PyErr_Occurred()) {
+        return NULL;
+    }
+    if (divisor == 0.0) {
+        PyErr_SetString(PyExc_ZeroDivisionError, "division by zero");
+        return NULL;
+    }
+    return (PyObject *)SparseMatrix_scaled((SparseMatrixObject *)left, 1.0 / divisor);
+}
+
+/* SparseMatrix.__neg__ */
+static PyObject* SparseMatrix_neg(SparseMatrixObject *self) {
+    return (PyObject *)SparseMatrix_scaled(self, -1.0);
+}
+
+/* Sparse products
+ *
+ * All kernels walk the rows of one operand and write disjoint rows of the
+ * result, so they split over the worker pool without synchronisation.
+ */
+typedef struct {
+    const SparseMatrixObject *a;
+    const MatrixObject *b;      /* Dense operand, may be a strided view */
+    const double *x;            /* Dense vector operand */
+    double *y;                  /* Contiguous result */
+    Py_ssize_t k;               /* Columns of the result */
+} SparseTask;
+
+/* y = A x */
+static void spmv_range(void *ctx, Py_ssize_t start, Py_ssize_t end) {
+    SparseTask *t = (SparseTask *)ctx;
+    const SparseMatrixObject *a = t->a;
+    for (Py_ssize_t i = start; i < end; i++) {
+        double sum = 0.0;
+        for (Py_ssize_t p = a->indptr[i]; p < a->indptr[i + 1]; p++) {
+            sum += a->data[p] * t->x[a->indices[p]];
+        }
+        t->y[i] = sum;
+    }
+}
+
+/* Y = A B */
+static void spmm_range(void *ctx, Py_ssize_t start, Py_ssize_t end) {
+    SparseTask *t = (SparseTask *)ctx;
+    const SparseMatrixObject *a = t->a;
+    const MatrixObject *b = t->b;
+    Py_ssize_t k = t->k;
+    for (Py_ssize_t i = start; i < end; i++) {
+        double *row = t->y + i * k;
+        memset(row, 0, (size_t)k * sizeof(double));
+        for (Py_ssize_t p = a->indptr[i]; p < a->indptr[i + 1]; p++) {
+            double v = a->data[p];
+            const double *src = b->data + a->indices[p] * b->row_stride;
+            for (Py_ssize_t c = 0; c < k; c++) {
+                row[c] += v * src[c * b->col_stride];
+            }
+        }
+    }
+}
+
+/* Y = B A */
+static void dense_spmm_range(void *ctx, Py_ssize_t start, Py_ssize_t end) {
+    SparseTask *t = (SparseTask *)ctx;
+    const SparseMatrixObject *a = t->a;
+    const MatrixObject *b = t->b;
+    Py_ssize_t k = t->k;
+    for (Py_ssize_t r = start; r < end; r++) {
+        double *row = t->y + r * k;
+        memset(row, 0, (size_t)k * sizeof(double));
+        for (Py_ssize_t i = 0; i < a->rows; i++) {
+            double bi = MATRIX_AT(b, r, i);
+            if (bi == 0.0) {
+                continue;
+            }
+            for (Py_ssize_t p = a->indptr[i]; p < a->indptr[i + 1]; p++) {
+                row[a->indices[p]] += bi * a->data[p];
+            }
+        }
+    }
+}
+
+/* Helper function computing A x (vector_first == 0) or x A (vector_first == 1) */
+static PyObject* SparseMatrix_vector_product(SparseMatrixObject *a, VectorObject *x, int vector_first) {
+    Py_ssize_t expected = vector_first ? a->rows : a->cols;
+    if (x->length != expected) {
+        PyErr_SetString(PyExc_ValueError, "Matrix and vector dimensions incompatible for multiplication");
+        return NULL;
+    }
+
+    PROFILE_START;
+    VectorObject *result = VectorAPI->Vector_alloc(vector_first ? a->cols : a->rows);
+    if (result == NULL) {
+        return NULL;
+    }
+
+    SparseTask task = {a, NULL, x->data, result->data, 1};
+    Py_ssize_t nnz = SPARSE_NNZ(a);
+    MM_PIN(x);
+    MM_BEGIN_ALLOW_THREADS(nnz)
+    if (vector_first) {
+        memset(result->data, 0, (size_t)a->cols * sizeof(double));
+        for (Py_ssize_t i = 0; i < a->rows; i++) {
+            double xi = x->data[i];
+            for (Py_ssize_t p = a->indptr[i]; p < a->indptr[i + 1]; p++) {
+                result->data[a->indices[p]] += xi * a->data[p];
+            }
+        }
+    } else {
+        MatrixAPI->parallel_for(a->rows, SPARSE_GRAIN * a->rows / (nnz + 1) + 1, spmv_range, &task);
+    }
+    MM_END_ALLOW_THREADS
+    MM_UNPIN(x);
+
+    PROFILE_STOP(MM_OP_SPARSE_MATMUL, result->length * sizeof(double), 2 * nnz);
+    return (PyObject *)result;
+}
+
+/* Helper function computing A B (dense_first == 0) or B A (dense_first == 1) */
+static PyObject* SparseMatrix_matrix_product(SparseMatrixObject *a, MatrixObject *b, int dense_first) {
+    if (dense_first ? b->cols != a->rows : a->cols != b->rows) {
+        PyErr_SetString(PyExc_ValueError, "Matrix dimensions incompatible for multiplication");
+        return NULL;
+    }
+
+    PROFILE_START;
+    Py_ssize_t rows = dense_first ? b->rows : a->rows;
+    Py_ssize_t cols = dense_first ? a->cols : b->cols;
+    MatrixObject *result = MatrixAPI->Matrix_alloc(rows, cols);
+    if (result == NULL) {
+        return NULL;
+    }
+
+    SparseTask task = {a, b, NULL, result->data, cols};
+    Py_ssize_t work = dense_first ? b->rows * (a->rows + SPARSE_NNZ(a)) : SPARSE_NNZ(a) * b->cols;
+    MM_PIN(b);
+    MM_BEGIN_ALLOW_THREADS(work)
+    MatrixAPI->parallel_for(rows, SPARSE_GRAIN * rows / (work + 1) + 1,
+                            dense_first ? dense_spmm_range : spmm_range, &task);
+    MM_END_ALLOW_THREADS
+    MM_UNPIN(b);
+
+    PROFILE_STOP(MM_OP_SPARSE_MATMUL, rows * cols * sizeof(double),
+                 2.0 * SPARSE_NNZ(a) * (dense_first ? b->rows : b->cols));
+    return (PyObject *)result;
+}
+
+/* SparseMatrix.__matmul__ (matrix multiplication) */
+static PyObject* SparseMatrix_matmul(PyObject *left, PyObject *right) {
+    if (!PyObject_TypeCheck(left, &SparseMatrixType)) {
+        SparseMatrixObject *self = (SparseMatrixObject *)right;
+        if (PyObject_TypeCheck(left, VectorAPI->VectorType)) {
+            return SparseMatrix_vector_product(self, (VectorObject *)left, 1);
+        }
+        if (PyObject_TypeCheck(left, MatrixAPI->MatrixType)) {
+            return SparseMatrix_matrix_product(self, (MatrixObject *)left, 1);
+        }
+        Py_RETURN_NOTIMPLEMENTED;
+    }
+
+    SparseMatrixObject *self = (SparseMatrixObject *)left;
+    if (PyObject_TypeCheck(right, VectorAPI->VectorType)) {
+        return SparseMatrix_vector_product(self, (VectorObject *)right, 0);
+    }
+    if (PyObject_TypeCheck(right, MatrixAPI->MatrixType)) {
+        return SparseMatrix_matrix_product(self, (MatrixObject *)right, 0);
+    }
+
+    PyErr_SetString(PyExc_TypeError, "Can only matrix multiply SparseMatrix with Matrix or Vector");
+    return NULL;
+}
+
+/* SparseMatrix.__eq__ and __ne__ */
+static PyObject* SparseMatrix_richcompare(SparseMatrixObject *self, PyObject *other, int op) {
+    if ((op != Py_EQ && op != Py_NE) || !PyObject_TypeCheck(other, &SparseMatrixType)) {
+        Py_RETURN_NOTIMPLEMENTED;
+    }
+
+    SparseMatrixObject *b = (SparseMatrixObject *)other;
+    int equal = self->rows == b->rows && self->cols == b->cols && SPARSE_NNZ(self) == SPARSE_NNZ(b);
+    if (equal) {
+        Py_ssize_t nnz = SPARSE_NNZ(self);
+        equal = memcmp(self->indptr, b->indptr, (size_t)(self->rows + 1) * sizeof(Py_ssize_t)) == 0
+             && memcmp(self->indices, b->indices, (size_t)nnz * sizeof(Py_ssize_t)) == 0;
+        for (Py_ssize_t p = 0; equal && p < nnz; p++) {
+            equal = self->data[p] == b->data[p];
+        }
+    }
+
+    if (equal == (op == Py_EQ)) {
+        Py_RETURN_TRUE;
+    }
+    Py_RETURN_FALSE;
+}
+
+/* SparseMatrix.from_dense - class method */
+static PyObject* SparseMatrix_from_dense(PyObject *cls, PyObject *arg) {
+    if (!PyObject_TypeCheck(arg, MatrixAPI->MatrixType)) {
+        PyErr_SetString(PyExc_TypeError, "Argument must be a Matrix");
+        return NULL;
+    }
+
+    MatrixObject *m = (MatrixObject *)arg;
+    Py_ssize_t nnz = 0;
+    for (Py_ssize_t i = 0; i < m->rows; i++) {
+        for (Py_ssize_t j = 0; j < m->cols; j++) {
+            nnz += MATRIX_AT(m, i, j) != 0.0;
+        }
+    }
+
+    SparseMatrixObject *result = SparseMatrix_alloc(m->rows, m->cols, nnz);
+    if (result == NULL) {
+        return NULL;
+    }
+
+    Py_ssize_t out = 0;
+    for (Py_ssize_t i = 0; i < m->rows; i++) {
+        for (Py_ssize_t j = 0; j < m->cols; j++) {
+            double value = MATRIX_AT(m, i, j);
+            if (value != 0.0) {
+                result->indices[out] = j;
+                result->data[out] = value;
+                out++;
+            }
+        }
+        result->indptr[i + 1] = out;
+    }
+    return (PyObject *)result;
+}
+
+/* SparseMatrix.identity - class method */
+static PyObject* SparseMatrix_identity(PyObject *cls, PyObject *args, PyObject *kwds) {
+    Py_ssize_t n = 3;
+    static char *kwlist[] = {"n", NULL};
+
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|n", kwlist, &n)) {
+        return NULL;
+    }
+    if (n <= 0) {
+        PyErr_SetString(PyExc_ValueError, "Matrix size must be positive");
+        return NULL;
+    }
+
+    SparseMatrixObject *result = SparseMatrix_alloc(n, n, n);
+    if (result == NULL) {
+        return NULL;
+    }
+    for (Py_ssize_t i = 0; i < n; i++) {
+        result->indices[i] = i;
+        result->data[i] = 1.0;
+        result->indptr[i + 1] = i + 1;
+    }
+    return (PyObject *)result;
+}
+
+/* SparseMatrix.to_dense */
+static PyObject* SparseMatrix_to_dense(SparseMatrixObject *self, PyObject *Py_UNUSED(ignored)) {
+    MatrixObject *result = MatrixAPI->Matrix_alloc(self->rows, self->cols);
+    if (result == NULL) {
+        return NULL;
+    }
+
+    memset(result->data, 0, (size_t)(self->rows * self->cols) * sizeof(double));
+    for (Py_ssize_t i = 0; i < self->rows; i++) {
+        for (Py_ssize_t p = self->indptr[i]; p < self->indptr[i + 1]; p++) {
+            result->data[i * self->cols + self->indices[p]] = self->data[p];
+        }
+    }
+    return (PyObject *)result;
+}
+
+/* SparseMatrix.to_coo */
+static PyObject* SparseMatrix_to_coo(SparseMatrixObject *self, PyObject *Py_UNUSED(ignored)) {
+    Py_ssize_t nnz = SPARSE_NNZ(self);
+    PyObject *rows = PyList_New(nnz);
+    PyObject *cols = PyList_New(nnz);
+    PyObject *values = PyList_New(nnz);
+    if (rows == NULL || cols == NULL || values == NULL) {
+        goto error;
+    }
+
+    for (Py_ssize_t i = 0; i < self->rows; i++) {
+        for (Py_ssize_t p = self->indptr[i]; p < self->indptr[i + 1]; p++) {
+            PyObject *r = PyLong_FromSsize_t(i);
+            PyObject *c = PyLong_FromSsize_t(self->indices[p]);
+            PyObject *v = PyFloat_FromDouble(self->data[p]);
+            if (r == NULL || c == NULL || v == NULL) {
+                Py_XDECREF(r);
+                Py_XDECREF(c);
+                Py_XDECREF(v);
+                goto error;
+            }
+            PyList_SET_ITEM(rows, p, r);
+            PyList_SET_ITEM(cols, p, c);
+            PyList_SET_ITEM(values, p, v);
+        }
+    }
+    return Py_BuildValue("(NNN)", rows, cols, values);
+
+error:
+    Py_XDECREF(rows);
+    Py_XDECREF(cols);
+    Py_XDECREF(values);
+    return NULL;
+}
+
+/* SparseMatrix.__reduce__ */
+static PyObject* SparseMatrix_reduce(SparseMatrixObject *self, PyObject *Py_UNUSED(ignored)) {
+    PyObject *coo = SparseMatrix_to_coo(self, NULL);
+    if (coo == NULL) {
+        return NULL;
+    }
+    PyObject *result = Py_BuildValue("O((nn)OOO)", (PyObject *)Py_TYPE(self), self->rows, self->cols,
+                                     PyTuple_GET_ITEM(coo, 0), PyTuple_GET_ITEM(coo, 1), PyTuple_GET_ITEM(coo, 2));
+    Py_DECREF(coo);
+    return result;
+}
+
+/* SparseMatrix.copy */
+static PyObject* SparseMatrix_copy(SparseMatrixObject *self, PyObject *Py_UNUSED(ignored)) {
+    return (PyObject *)SparseMatrix_scaled(self, 1.0);
+}
+
+/* SparseMatrix.transpose */
+static PyObject* SparseMatrix_transpose(SparseMatrixObject *self, PyObject *Py_UNUSED(ignored)) {
+    return (PyObject *)SparseMatrix_transposed(self);
+}
+
+/* SparseMatrix.trace */
+static PyObject* SparseMatrix_trace(SparseMatrixObject *self, PyObject *Py_UNUSED(ignored)) {
+    if (self->rows != self->cols) {
+        PyErr_SetString(PyExc_ValueError, "The given matrix is not a square matrix.");
+        return NULL;
+    }
+
+    double total = 0.0;
+    for (Py_ssize_t i = 0; i < self->rows; i++) {
+        Py_ssize_t p = SparseMatrix_find(self, i, i);
+        if (p >= 0) {
+            total += self->data[p];
+        }
+    }
+    return PyFloat_FromDouble(total);
+}
+
+/* SparseMatrix.is_square */
+static PyObject* SparseMatrix_is_square(SparseMatrixObject *self, PyObject *Py_UNUSED(ignored)) {
+    if (self->rows == self->cols) {
+        Py_RETURN_TRUE;
+    }
+    Py_RETURN_FALSE;
+}
+
+/* Helper function checking a_ji == sign * a_ij for every stored entry */
+static int SparseMatrix_mirrors(SparseMatrixObject *self, double sign) {
+    if (self->rows != self->cols) {
+        return 0;
+    }
+    for (Py_ssize_t i = 0; i < self->rows; i++) {
+        for (Py_ssize_t p = self->indptr[i]; p < self->indptr[i + 1]; p++) {
+            Py_ssize_t q = SparseMatrix_find(self, self->indices[p], i);
+            if (q < 0 || self->data[q] != sign * self->data[p]) {
+                return 0;
+            }
+        }
+    }
+    return 1;
+}
+
+/* SparseMatrix.is_symmetric */
+static PyObject* SparseMatrix_is_symmetric(SparseMatrixObject *self, PyObject *Py_UNUSED(ignored)) {
+    return PyBool_FromLong(SparseMatrix_mirrors(self, 1.0));
+}
+
+/* SparseMatrix.is_skew_symmetric */
+static PyObject* SparseMatrix_is_skew_symmetric(SparseMatrixObject *self, PyObject *Py_UNUSED(ignored)) {
+    return PyBool_FromLong(SparseMatrix_mirrors(self, -1.0));
+}
+
+/* Helper function checking every stored column index against its row
+ *
+ * side < 0 requires j <= i, side > 0 requires j >= i and side == 0 requires j == i.
+ */
+static int SparseMatrix_banded(SparseMatrixObject *self, int side) {
+    if (self->rows != self->cols) {
+        return 0;
+    }
+    for (Py_ssize_t i = 0; i < self->rows; i++) {
+        for (Py_ssize_t p = self->indptr[i]; p < self->indptr[i + 1]; p++) {
+            Py_ssize_t j = self->indices[p];
+            if ((side <= 0 && j > i) || (side >= 0 && j < i)) {
+                return 0;
+            }
+        }
+    }
+    return 1;
+}
+
+/* SparseMatrix.is_diagonal */
+static PyObject* SparseMatrix_is_diagonal(SparseMatrixObject *self, PyObject *Py_UNUSED(ignored)) {
+    return PyBool_FromLong(SparseMatrix_banded(self, 0));
+}
+
+/* SparseMatrix.is_lower_triangular */
+static PyObject* SparseMatrix_is_lower_triangular(SparseMatrixObject *self, PyObject *Py_UNUSED(ignored)) {
+    return PyBool_FromLong(SparseMatrix_banded(self, -1));
+}
+
+/* SparseMatrix.is_upper_triangular */
+static PyObject* SparseMatrix_is_upper_triangular(SparseMatrixObject *self, PyObject *Py_UNUSED(ignored)) {
+    return PyBool_FromLong(SparseMatrix_banded(self, 1));
+}
+
+/* SparseMatrix.is_identity */
+static PyObject* SparseMatrix_is_identity(SparseMatrixObject *self, PyObject *Py_UNUSED(ignored)) {
+    if (self->rows != self->cols || !SparseMatrix_banded(self, 0)) {
+        Py_RETURN_FALSE;
+    }
+    for (Py_ssize_t i = 0; i < self->rows; i++) {
+        Py_ssize_t p = self->indptr[i];
+        if (p == self->indptr[i + 1] || fabs(self->data[p] - 1.0) > 1e-10) {
+            Py_RETURN_FALSE;
+        }
+    }
+    Py_RETURN_TRUE;
+}
+
+/* SparseMatrix.is_null */
+static PyObject* SparseMatrix_is_null(SparseMatrixObject *self, PyObject *Py_UNUSED(ignored)) {
+    return PyBool_FromLong(SPARSE_NNZ(self) == 0);
+}
+
+/* SparseMatrix.order property */
+static PyObject* SparseMatrix_get_order(SparseMatrixObject *self, void *closure) {
+    return Py_BuildValue("(nn)", self->rows, self->cols);
+}
+
+/* SparseMatrix.nnz property */
+static PyObject* SparseMatrix_get_nnz(SparseMatrixObject *self, void *closure) {
+    return PyLong_FromSsize_t(SPARSE_NNZ(self));
+}
+
+/* SparseMatrix.T property */
+static PyObject* SparseMatrix_get_T(SparseMatrixObject *self, void *closure) {
+    return (PyObject *)SparseMatrix_transposed(self);
+}
+
+/* SparseMatrix method definitions */
+static PyMethodDef SparseMatrix_methods[] = {
+    {"from_dense", (PyCFunction)SparseMatrix_from_dense, METH_O | METH_CLASS, "Create a sparse matrix from the non-zeros of a Matrix"},
+    {"identity", (PyCFunction)SparseMatrix_identity, METH_VARARGS | METH_KEYWORDS | METH_CLASS, "Create a sparse identity matrix"},
+    {"to_dense", (PyCFunction)SparseMatrix_to_dense, METH_NOARGS, "Convert to a dense Matrix"},
+    {"to_coo", (PyCFunction)SparseMatrix_to_coo, METH_NOARGS, "Return the (rows, cols, values) lists of the stored entries"},
+    {"copy", (PyCFunction)SparseMatrix_copy, METH_NOARGS, "Copy the sparse matrix"},
+    {"__reduce__", (PyCFunction)SparseMatrix_reduce, METH_NOARGS, "Support for pickle"},
+    {"transpose", (PyCFunction)SparseMatrix_transpose, METH_NOARGS, "Transpose the sparse matrix"},
+    {"trace", (PyCFunction)SparseMatrix_trace, METH_NOARGS, "Calculate trace"},
+    {"is_square", (PyCFunction)SparseMatrix_is_square, METH_NOARGS, "Check if matrix is square"},
+    {"is_symmetric", (PyCFunction)SparseMatrix_is_symmetric, METH_NOARGS, "Check if matrix is symmetric"},
+    {"is_skew_symmetric", (PyCFunction)SparseMatrix_is_skew_symmetric, METH_NOARGS, "Check if matrix is skew-symmetric"},
+    {"is_diagonal", (PyCFunction)SparseMatrix_is_diagonal, METH_NOARGS, "Check if matrix is diagonal"},
+    {"is_identity", (PyCFunction)SparseMatrix_is_identity, METH_NOARGS, "Check if matrix is identity"},
+    {"is_null", (PyCFunction)SparseMatrix_is_null, METH_NOARGS, "Check if matrix is null"},
+    {"is_lower_triangular", (PyCFunction)SparseMatrix_is_lower_triangular, METH_NOARGS, "Check if matrix is lower triangular"},
+    {"is_upper_triangular", (PyCFunction)SparseMatrix_is_upper_triangular, METH_NOARGS, "Check if matrix is upper triangular"},
+    {NULL}
+};
+
+/* SparseMatrix property definitions */
+static PyGetSetDef SparseMatrix_getsetters[] = {
+    {"order", (getter)SparseMatrix_get_order, NULL, "Order of the matrix", NULL},
+    {"size", (getter)SparseMatrix_get_order, NULL, "Size of the matrix (alias for order)", NULL},
+    {"nnz", (getter)SparseMatrix_get_nnz, NULL, "Number of stored (non-zero) entries", NULL},
+    {"T", (getter)SparseMatrix_get_T, NULL, "Transpose of the matrix", NULL},
+    {NULL}
+};
+
+/* Number methods */
+static PyNumberMethods SparseMatrix_as_number = {
+    .nb_add = SparseMatrix_add,
+    .nb_subtract = SparseMatrix_sub,
+    .nb_multiply = SparseMatrix_mul,
+    .nb_negative = (unaryfunc)SparseMatrix_neg,
+    .nb_true_divide = SparseMatrix_truediv,
+    .nb_matrix_multiply = SparseMatrix_matmul,
+};
+
+/* Mapping methods */
+static PyMappingMethods SparseMatrix_as_mapping = {
+    .mp_length = (lenfunc)SparseMatrix_len,
+    .mp_subscript = (binaryfunc)SparseMatrix_subscript,
+};
+
+/* SparseMatrix type definition */
+static PyTypeObject SparseMatrixType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "matmath._sparse.SparseMatrix",
+    .tp_doc = "Sparse matrix in compressed sparse row (CSR) form",
+    .tp_basicsize = sizeof(SparseMatrixObject),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT,
+    .tp_new = SparseMatrix_new,
+    .tp_dealloc = (destructor)SparseMatrix_dealloc,
+    .tp_repr = (reprfunc)SparseMatrix_repr,
+    .tp_as_number = &SparseMatrix_as_number,
+    .tp_as_mapping = &SparseMatrix_as_mapping,
+    .tp_richcompare = (richcmpfunc)SparseMatrix_richcompare,
+    .tp_methods = SparseMatrix_methods,
+    .tp_getset = SparseMatrix_getsetters,
+};
+
+/* Module definition */
+static PyModuleDef sparsemodule = {
+    PyModuleDef_HEAD_INIT,
+    .m_name = "_sparse",
+    .m_doc = "C extension for SparseMatrix class",
+    .m_size = -1,
+};
+
+/* Module initialization */
+PyMODINIT_FUNC PyInit__sparse(void) {
+    PyObject *m;
+    if (PyType_Ready(&SparseMatrixType) < 0)
+        return NULL;
+
+    /* PyCapsule_Import() only looks up attributes, so load the modules first
+       whatever order matmath/__init__.py imports the extensions in */
+    m = PyImport_ImportModule("matmath._vector");
+    if (m == NULL)
+        return NULL;
+    Py_DECREF(m);
+    m = PyImport_ImportModule("matmath._matrix");
+    if (m == NULL)
+        return NULL;
+    Py_DECREF(m);
+    VectorAPI = (MatmathVectorAPI *)PyCapsule_Import(MATMATH_VECTOR_CAPSULE, 0);
+    if (VectorAPI == NULL)
+        return NULL;
+    MatrixAPI = (MatmathMatrixAPI *)PyCapsule_Import(MATMATH_MATRIX_CAPSULE, 0);
+    if (MatrixAPI == NULL)
+        return NULL;
+
+    m = PyModule_Create(&sparsemodule);
+    if (m == NULL)
+        return NULL;
+
+    Py_INCREF(&SparseMatrixType);
+    if (PyModule_AddObject(m, "SparseMatrix", (PyObject *)&SparseMatrixType) < 0) {
+        Py_DECREF(&SparseMatrixType);
+        Py_DECREF(m);
+        return NULL;
+    }
+
+    return m;
+}
@@ -2,37 +2,109 @@
 #include <Python.h>
 #define _USE_MATH_DEFINES
 #include <math.h>
+#include <stdint.h>
+#include <string.h>
 #include <structmember.h>
-
-/* Vector object structure */
-typedef struct {
-    PyObject_HEAD
-    double *data;
-    Py_ssize_t length;
-} VectorObject;
+#define MM_MACROS_ONLY
+#include "_parallel.h"
+#include "_vector.h"
 
 /* Forward declarations */
 static PyTypeObject VectorType;
 
-/* Helper function to create a new Vector */
-static VectorObject* Vector_new_from_data(double *data, Py_ssize_t length) {
-    VectorObject *self = (VectorObject *)VectorType.tp_alloc(&VectorType, 0);
+/* Freelist of deallocated Vector objects
+ *
+ * Geometry code creates and drops short vectors at a high rate. Instances of
+ * Vector itself (not of subclasses) are kept here on deallocation and reused
+ * by Vector_obtain, so a short vector costs no allocation at all. Only touched
+ * with the GIL held.
+ */
+#define VECTOR_FREELIST_SIZE 128
+static VectorObject *vector_freelist[VECTOR_FREELIST_SIZE];
+static int vector_numfree = 0;
+
+/* Helper function to create a new, empty Vector, from the freelist when possible */
+static VectorObject* Vector_obtain(void) {
+    if (vector_numfree > 0) {
+        VectorObject *self = vector_freelist[--vector_numfree];
+        PyObject_Init((PyObject *)self, &VectorType);
+        self->data = NULL;
+        self->length = 0;
+        self->base = NULL;
+        self->exports = 0;
+        self->busy = 0;
+        return self;
+    }
+    return (VectorObject *)VectorType.tp_alloc(&VectorType, 0);
+}
+
+/* Helper function to release the storage of a Vector */
+static void Vector_release_data(VectorObject *self) {
+    if (self->base != NULL) {
+        Py_CLEAR(self->base);
+    } else if (self->data != NULL && self->data != self->inline_data) {
+        PyMem_Free(self->data);
+    }
+    self->data = NULL;
+}
+
+/* Helper function to check a buffer holds native doubles */
+static int is_double_format(const char *format) {
+    if (format == NULL) {
+        return 0;
+    }
+    if (format[0] == '@' || format[0] == '=' ||
+#if PY_LITTLE_ENDIAN
+        format[0] == '<'
+#else
+        format[0] == '>' || format[0] == '!'
+#endif
+    ) {
+        format++;
+    }
+    return strcmp(format, "d") == 0;
+}
+
+/* Helper function to check a buffer holds raw bytes */
+static int is_byte_format(const char *format) {
+    return format == NULL || strcmp(format, "B") == 0 ||
+           strcmp(format, "b") == 0 || strcmp(format, "c") == 0;
+}
+
+/* Helper function to create a new Vector with uninitialised storage */
+static VectorObject* Vector_alloc(Py_ssize_t length) {
+    if (length < 0 || (size_t)length > PY_SSIZE_T_MAX / sizeof(double)) {
+        return (VectorObject *)PyErr_NoMemory();
+    }
+    VectorObject *self = Vector_obtain();
     if (self != NULL) {
-        self->data = (double *)PyMem_Malloc(length * sizeof(double));
-        if (self->data == NULL) {
-            Py_DECREF(self);
-            return (VectorObject *)PyErr_NoMemory();
+        if (length <= VECTOR_INLINE_SIZE) {
+            self->data = self->inline_data;
+        } else {
+            self->data = (double *)PyMem_Malloc(length * sizeof(double));
+            if (self->data == NULL) {
+                Py_DECREF(self);
+                return (VectorObject *)PyErr_NoMemory();
+            }
         }
-        memcpy(self->data, data, length * sizeof(double));
         self->length = length;
     }
     return self;
 }
 
+/* Helper function to create a new Vector */
+static VectorObject* Vector_new_from_data(const double *data, Py_ssize_t length) {
+    VectorObject *self = Vector_alloc(length);
+    if (self != NULL && length > 0) {
+        memcpy(self->data, data, length * sizeof(double));
+    }
+    return self;
+}
+
 /* Vector.__new__ */
 static PyObject* Vector_new(PyTypeObject *type, PyObject *args, PyObject *kwds) {
     VectorObject *self;
-    self = (VectorObject *)type->tp_alloc(type, 0);
+    self = type == &VectorType ? Vector_obtain() : (VectorObject *)type->tp_alloc(type, 0);
     if (self != NULL) {
         self->data = NULL;
         self->length = 0;
@@ -51,12 +123,17 @@ static int Vector_init(VectorObject *self, PyObject *args, PyObject *kwds) {
 
     /* Default to [0, 0] if no argument provided */
     if (arr == NULL || arr == Py_None) {
-        self->length = 2;
-        self->data = (double *)PyMem_Malloc(2 * sizeof(double));
-        if (self->data == NULL) {
-            PyErr_NoMemory();
+        if (self->exports > 0) {
+            PyErr_SetString(PyExc_BufferError, "Cannot re-initialise a Vector with exported buffers");
             return -1;
         }
+        if (self->busy > 0) {
+            PyErr_SetString(PyExc_BufferError, "Cannot re-initialise a Vector while another thread is using it");
+            return -1;
+        }
+        Vector_release_data(self);
+        self->length = 2;
+        self->data = self->inline_data;
         self->data[0] = 0.0;
         self->data[1] = 0.0;
         return 0;
@@ -74,27 +151,46 @@ static int Vector_init(VectorObject *self, PyObject *args, PyObject *kwds) {
         return -1;
     }
 
-    double *data = (double *)PyMem_Malloc(length * sizeof(double));
-    if (data == NULL) {
-        PyErr_NoMemory();
-        return -1;
+    /* Short vectors are read into a stack buffer and then stored inline */
+    double small[VECTOR_INLINE_SIZE];
+    double *data = small;
+    if (length > VECTOR_INLINE_SIZE) {
+        data = (double *)PyMem_Malloc(length * sizeof(double));
+        if (data == NULL) {
+            PyErr_NoMemory();
+            return -1;
+        }
     }
 
     for (Py_ssize_t i = 0; i < length; i++) {
         PyObject *item = PyList_GetItem(arr, i);
         if (!PyFloat_Check(item) && !PyLong_Check(item)) {
-            PyMem_Free(data);
+            if (data != small) {
+                PyMem_Free(data);
+            }
             PyErr_SetString(PyExc_TypeError, "All elements of the vector must be `int` or `float`.");
             return -1;
         }
         data[i] = PyFloat_AsDouble(item);
     }
 
-    /* Free old data if exists */
-    if (self->data != NULL) {
-        PyMem_Free(self->data);
+    if (self->exports > 0 || self->busy > 0) {
+        if (data != small) {
+            PyMem_Free(data);
+        }
+        PyErr_SetString(PyExc_BufferError, self->exports > 0 ?
+                        "Cannot re-initialise a Vector with exported buffers" :
+                        "Cannot re-initialise a Vector while another thread is using it");
+        return -1;
     }
 
+    /* Free old data if exists */
+    Vector_release_data(self);
+
+    if (data == small) {
+        memcpy(self->inline_data, small, length * sizeof(double));
+        data = self->inline_data;
+    }
     self->data = data;
     self->length = length;
     return 0;
@@ -102,8 +198,10 @@ static int Vector_init(VectorObject *self, PyObject *args, PyObject *kwds) {
 
 /* Vector.__dealloc__ */
 static void Vector_dealloc(VectorObject *self) {
-    if (self->data != NULL) {
-        PyMem_Free(self->data);
+    Vector_release_data(self);
+    if (Py_IS_TYPE(self, &VectorType) && vector_numfree < VECTOR_FREELIST_SIZE) {
+        vector_freelist[vector_numfree++] = self;
+        return;
     }
     Py_TYPE(self)->tp_free((PyObject *)self);
 }
@@ -174,6 +272,10 @@ static PyObject* Vector_str(VectorObject *self) {
 
 /* Vector.__add__ */
 static PyObject* Vector_add(VectorObject *self, PyObject *other) {
+    if (!PyObject_TypeCheck((PyObject *)self, &VectorType)) {
+        Py_RETURN_NOTIMPLEMENTED;
+    }
+    
     if (!PyObject_TypeCheck(other, &VectorType)) {
         PyErr_SetString(PyExc_ValueError, "The second argument must be a vector.");
         return NULL;
@@ -185,22 +287,31 @@ static PyObject* Vector_add(VectorObject *self, PyObject *other) {
         return NULL;
     }
     
-    double *result_data = (double *)PyMem_Malloc(self->length * sizeof(double));
-    if (result_data == NULL) {
-        return PyErr_NoMemory();
+    VectorObject *result = Vector_alloc(self->length);
+    if (result == NULL) {
+        return NULL;
     }
+    double *result_data = result->data;
     
+    MM_PIN(self);
+    MM_PIN(other_vec);
+    MM_BEGIN_ALLOW_THREADS(self->length)
     for (Py_ssize_t i = 0; i < self->length; i++) {
         result_data[i] = self->data[i] + other_vec->data[i];
     }
+    MM_END_ALLOW_THREADS
+    MM_UNPIN(self);
+    MM_UNPIN(other_vec);
     
-    VectorObject *result = Vector_new_from_data(result_data, self->length);
-    PyMem_Free(result_data);
     return (PyObject *)result;
 }
 
 /* Vector.__sub__ */
 static PyObject* Vector_sub(VectorObject *self, PyObject *other) {
+    if (!PyObject_TypeCheck((PyObject *)self, &VectorType)) {
+        Py_RETURN_NOTIMPLEMENTED;
+    }
+    
     if (!PyObject_TypeCheck(other, &VectorType)) {
         PyErr_SetString(PyExc_ValueError, "The second argument must be a vector.");
         return NULL;
@@ -212,52 +323,73 @@ static PyObject* Vector_sub(VectorObject *self, PyObject *other) {
         return NULL;
     }
     
-    double *result_data = (double *)PyMem_Malloc(self->length * sizeof(double));
-    if (result_data == NULL) {
-        return PyErr_NoMemory();
+    VectorObject *result = Vector_alloc(self->length);
+    if (result == NULL) {
+        return NULL;
     }
+    double *result_data = result->data;
     
+    MM_PIN(self);
+    MM_PIN(other_vec);
+    MM_BEGIN_ALLOW_THREADS(self->length)
     for (Py_ssize_t i = 0; i < self->length; i++) {
         result_data[i] = self->data[i] - other_vec->data[i];
     }
+    MM_END_ALLOW_THREADS
+    MM_UNPIN(self);
+    MM_UNPIN(other_vec);
     
-    VectorObject *result = Vector_new_from_data(result_data, self->length);
-    PyMem_Free(result_data);
     return (PyObject *)result;
 }
 
 /* Vector.__mul__ */
 static PyObject* Vector_mul(VectorObject *self, PyObject *other) {
-    double *result_data = (double *)PyMem_Malloc(self->length * sizeof(double));
-    if (result_data == NULL) {
-        return PyErr_NoMemory();
+    if (!PyObject_TypeCheck((PyObject *)self, &VectorType)) {
+        /* Reflected operand (scalar * vector); both products commute */
+        PyObject *left = (PyObject *)self;
+        self = (VectorObject *)other;
+        other = left;
+    }
+    
+    VectorObject *result = Vector_alloc(self->length);
+    if (result == NULL) {
+        return NULL;
     }
+    double *result_data = result->data;
     
     if (PyFloat_Check(other) || PyLong_Check(other)) {
         /* Scalar multiplication */
         double scalar = PyFloat_AsDouble(other);
+        MM_PIN(self);
+        MM_BEGIN_ALLOW_THREADS(self->length)
         for (Py_ssize_t i = 0; i < self->length; i++) {
             result_data[i] = self->data[i] * scalar;
         }
+        MM_END_ALLOW_THREADS
+        MM_UNPIN(self);
     } else if (PyObject_TypeCheck(other, &VectorType)) {
         /* Element-wise multiplication */
         VectorObject *other_vec = (VectorObject *)other;
         if (self->length != other_vec->length) {
-            PyMem_Free(result_data);
+            Py_DECREF(result);
             PyErr_SetString(PyExc_TypeError, "The dimension of the 2 vectors must be the same.");
             return NULL;
         }
+        MM_PIN(self);
+        MM_PIN(other_vec);
+        MM_BEGIN_ALLOW_THREADS(self->length)
         for (Py_ssize_t i = 0; i < self->length; i++) {
             result_data[i] = self->data[i] * other_vec->data[i];
         }
+        MM_END_ALLOW_THREADS
+        MM_UNPIN(self);
+        MM_UNPIN(other_vec);
     } else {
-        PyMem_Free(result_data);
+        Py_DECREF(result);
         PyErr_SetString(PyExc_TypeError, "The second argument must be a number or a vector.");
         return NULL;
     }
     
-    VectorObject *result = Vector_new_from_data(result_data, self->length);
-    PyMem_Free(result_data);
     return (PyObject *)result;
 }
 
@@ -268,55 +400,183 @@ static PyObject* Vector_rmul(VectorObject *self, PyObject *other) {
 
 /* Vector.__truediv__ */
 static PyObject* Vector_truediv(VectorObject *self, PyObject *other) {
-    double *result_data = (double *)PyMem_Malloc(self->length * sizeof(double));
-    if (result_data == NULL) {
-        return PyErr_NoMemory();
+    if (!PyObject_TypeCheck((PyObject *)self, &VectorType)) {
+        Py_RETURN_NOTIMPLEMENTED;
     }
     
+    VectorObject *result = Vector_alloc(self->length);
+    if (result == NULL) {
+        return NULL;
+    }
+    double *result_data = result->data;
+    
     if (PyFloat_Check(other) || PyLong_Check(other)) {
         /* Scalar division */
         double scalar = PyFloat_AsDouble(other);
         if (scalar == 0.0) {
-            PyMem_Free(result_data);
+            Py_DECREF(result);
             PyErr_SetString(PyExc_ZeroDivisionError, "Division by zero");
             return NULL;
         }
+        MM_PIN(self);
+        MM_BEGIN_ALLOW_THREADS(self->length)
         for (Py_ssize_t i = 0; i < self->length; i++) {
             result_data[i] = self->data[i] / scalar;
         }
+        MM_END_ALLOW_THREADS
+        MM_UNPIN(self);
     } else if (PyObject_TypeCheck(other, &VectorType)) {
         /* Element-wise division */
         VectorObject *other_vec = (VectorObject *)other;
         if (self->length != other_vec->length) {
-            PyMem_Free(result_data);
+            Py_DECREF(result);
             PyErr_SetString(PyExc_TypeError, "The dimension of the 2 vectors must be the same.");
             return NULL;
         }
+        int zero_division = 0;
+        MM_PIN(self);
+        MM_PIN(other_vec);
+        MM_BEGIN_ALLOW_THREADS(self->length)
         for (Py_ssize_t i = 0; i < self->length; i++) {
             if (other_vec->data[i] == 0.0) {
-                PyMem_Free(result_data);
-                PyErr_SetString(PyExc_ZeroDivisionError, "Division by zero");
-                return NULL;
+                zero_division = 1;
+                break;
             }
             result_data[i] = self->data[i] / other_vec->data[i];
         }
+        MM_END_ALLOW_THREADS
+        MM_UNPIN(self);
+        MM_UNPIN(other_vec);
+        if (zero_division) {
+            Py_DECREF(result);
+            PyErr_SetString(PyExc_ZeroDivisionError, "Division by zero");
+            return NULL;
+        }
     } else {
-        PyMem_Free(result_data);
+        Py_DECREF(result);
         PyErr_SetString(PyExc_TypeError, "The second argument must be a number or a vector.");
         return NULL;
     }
     
-    VectorObject *result = Vector_new_from_data(result_data, self->length);
-    PyMem_Free(result_data);
     return (PyObject *)result;
 }
 
+/* Helper for the in-place operators; applies self (op) other directly to self->data */
+static PyObject* Vector_inplace(VectorObject *self, PyObject *other, char op) {
+    VectorObject *other_vec = NULL;
+    const double *values = NULL;
+    double scalar = 0.0;
+    
+    if ((op == '*' || op == '/') && (PyFloat_Check(other) || PyLong_Check(other))) {
+        scalar = PyFloat_AsDouble(other);
+        if (scalar == -1.0 && PyErr_Occurred()) {
+            return NULL;
+        }
+        if (op == '/' && scalar == 0.0) {
+            PyErr_SetString(PyExc_ZeroDivisionError, "Division by zero");
+            return NULL;
+        }
+    } else if (PyObject_TypeCheck(other, &VectorType)) {
+        other_vec = (VectorObject *)other;
+        if (self->length != other_vec->length) {
+            PyErr_SetString(PyExc_TypeError, "The dimension of the 2 vectors must be the same.");
+            return NULL;
+        }
+        values = other_vec->data;
+        if (op == '/') {
+            /* Check every divisor first so a failed /= leaves self untouched */
+            for (Py_ssize_t i = 0; i < self->length; i++) {
+                if (values[i] == 0.0) {
+                    PyErr_SetString(PyExc_ZeroDivisionError, "Division by zero");
+                    return NULL;
+                }
+            }
+        }
+    } else if (op == '+' || op == '-') {
+        PyErr_SetString(PyExc_ValueError, "The second argument must be a vector.");
+        return NULL;
+    } else {
+        PyErr_SetString(PyExc_TypeError, "The second argument must be a number or a vector.");
+        return NULL;
+    }
+    
+    double *data = self->data;
+    Py_ssize_t length = self->length;
+    MM_PIN(self);
+    MM_PIN(other_vec);
+    MM_BEGIN_ALLOW_THREADS(length)
+    switch (op) {
+    case '+':
+        for (Py_ssize_t i = 0; i < length; i++) {
+            data[i] += values[i];
+        }
+        break;
+    case '-':
+        for (Py_ssize_t i = 0; i < length; i++) {
+            data[i] -= values[i];
+        }
+        break;
+    case '*':
+        if (values != NULL) {
+            for (Py_ssize_t i = 0; i < length; i++) {
+                data[i] *= values[i];
+            }
+        } else {
+            for (Py_ssize_t i = 0; i < length; i++) {
+                data[i] *= scalar;
+            }
+        }
+        break;
+    case '/':
+        if (values != NULL) {
+            for (Py_ssize_t i = 0; i < length; i++) {
+                data[i] /= values[i];
+            }
+        } else {
+            for (Py_ssize_t i = 0; i < length; i++) {
+                data[i] /= scalar;
+            }
+        }
+        break;
+    }
+    MM_END_ALLOW_THREADS
+    MM_UNPIN(self);
+    MM_UNPIN(other_vec);
+    
+    Py_INCREF(self);
+    return (PyObject *)self;
+}
+
+/* Vector.__iadd__ */
+static PyObject* Vector_iadd(VectorObject *self, PyObject *other) {
+    return Vector_inplace(self, other, '+');
+}
+
+/* Vector.__isub__ */
+static PyObject* Vector_isub(VectorObject *self, PyObject *other) {
+    return Vector_inplace(self, other, '-');
+}
+
+/* Vector.__imul__ */
+static PyObject* Vector_imul(VectorObject *self, PyObject *other) {
+    return Vector_inplace(self, other, '*');
+}
+
+/* Vector.__itruediv__ */
+static PyObject* Vector_itruediv(VectorObject *self, PyObject *other) {
+    return Vector_inplace(self, other, '/');
+}
+
 /* Vector.modulus */
 static PyObject* Vector_modulus(VectorObject *self, PyObject *Py_UNUSED(ignored)) {
     double sum_of_squares = 0.0;
+    MM_PIN(self);
+    MM_BEGIN_ALLOW_THREADS(self->length)
     for (Py_ssize_t i = 0; i < self->length; i++) {
         sum_of_squares += self->data[i] * self->data[i];
     }
+    MM_END_ALLOW_THREADS
+    MM_UNPIN(self);
     return PyFloat_FromDouble(sqrt(sum_of_squares));
 }
 
@@ -339,9 +599,15 @@ static PyObject* Vector_dot_product(VectorObject *self, PyObject *other) {
     }
     
     double result = 0.0;
+    MM_PIN(self);
+    MM_PIN(other_vec);
+    MM_BEGIN_ALLOW_THREADS(self->length)
     for (Py_ssize_t i = 0; i < self->length; i++) {
         result += self->data[i] * other_vec->data[i];
     }
+    MM_END_ALLOW_THREADS
+    MM_UNPIN(self);
+    MM_UNPIN(other_vec);
     
     return PyFloat_FromDouble(result);
 }
@@ -376,8 +642,27 @@ static PyObject* Vector_cross_product(VectorObject *self, PyObject *other) {
 }
 
 /* Vector.__matmul__ */
-static PyObject* Vector_matmul(VectorObject *self, PyObject *other) {
-    return Vector_cross_product(self, other);
+static PyObject* Vector_matmul(PyObject *self, PyObject *other) {
+    /* Vector @ Matrix is handled by the Matrix type */
+    if (!PyObject_TypeCheck(self, &VectorType) || !PyObject_TypeCheck(other, &VectorType)) {
+        Py_RETURN_NOTIMPLEMENTED;
+    }
+    return Vector_cross_product((VectorObject *)self, other);
+}
+
+/* Vector.__imatmul__ */
+static PyObject* Vector_imatmul(VectorObject *self, PyObject *other) {
+    /* v @ M may be computed by the Matrix type; copy back when the length is kept */
+    PyObject *result = PyNumber_MatrixMultiply((PyObject *)self, other);
+    if (result == NULL || !PyObject_TypeCheck(result, &VectorType) ||
+        ((VectorObject *)result)->length != self->length) {
+        return result;
+    }
+    
+    memcpy(self->data, ((VectorObject *)result)->data, self->length * sizeof(double));
+    Py_DECREF(result);
+    Py_INCREF(self);
+    return (PyObject *)self;
 }
 
 /* Vector.unit_vector */
@@ -391,17 +676,20 @@ static PyObject* Vector_unit_vector(VectorObject *self, PyObject *Py_UNUSED(igno
         return (PyObject *)Vector_new_from_data(self->data, self->length);
     }
     
-    double *result_data = (double *)PyMem_Malloc(self->length * sizeof(double));
-    if (result_data == NULL) {
-        return PyErr_NoMemory();
+    VectorObject *result = Vector_alloc(self->length);
+    if (result == NULL) {
+        return NULL;
     }
+    double *result_data = result->data;
     
+    MM_PIN(self);
+    MM_BEGIN_ALLOW_THREADS(self->length)
     for (Py_ssize_t i = 0; i < self->length; i++) {
         result_data[i] = self->data[i] / mod;
     }
+    MM_END_ALLOW_THREADS
+    MM_UNPIN(self);
     
-    VectorObject *result = Vector_new_from_data(result_data, self->length);
-    PyMem_Free(result_data);
     return (PyObject *)result;
 }
 
@@ -414,17 +702,20 @@ static PyObject* Vector_magnify(VectorObject *self, PyObject *args, PyObject *kw
         return NULL;
     }
     
-    double *result_data = (double *)PyMem_Malloc(self->length * sizeof(double));
-    if (result_data == NULL) {
-        return PyErr_NoMemory();
+    VectorObject *result = Vector_alloc(self->length);
+    if (result == NULL) {
+        return NULL;
     }
+    double *result_data = result->data;
     
+    MM_PIN(self);
+    MM_BEGIN_ALLOW_THREADS(self->length)
     for (Py_ssize_t i = 0; i < self->length; i++) {
         result_data[i] = self->data[i] * magnification;
     }
+    MM_END_ALLOW_THREADS
+    MM_UNPIN(self);
     
-    VectorObject *result = Vector_new_from_data(result_data, self->length);
-    PyMem_Free(result_data);
     return (PyObject *)result;
 }
 
@@ -532,17 +823,20 @@ static PyObject* Vector_argument(VectorObject *self, PyObject *Py_UNUSED(ignored
     double norm = PyFloat_AsDouble(mod_obj);
     Py_DECREF(mod_obj);
     
-    double *result_data = (double *)PyMem_Malloc(self->length * sizeof(double));
-    if (result_data == NULL) {
-        return PyErr_NoMemory();
+    VectorObject *result = Vector_alloc(self->length);
+    if (result == NULL) {
+        return NULL;
     }
+    double *result_data = result->data;
     
+    MM_PIN(self);
+    MM_BEGIN_ALLOW_THREADS(self->length)
     for (Py_ssize_t i = 0; i < self->length; i++) {
         result_data[i] = acos(self->data[i] / norm);
     }
+    MM_END_ALLOW_THREADS
+    MM_UNPIN(self);
     
-    VectorObject *result = Vector_new_from_data(result_data, self->length);
-    PyMem_Free(result_data);
     return (PyObject *)result;
 }
 
@@ -632,6 +926,137 @@ static PyObject* Vector_to_list(VectorObject *self, PyObject *Py_UNUSED(ignored)
     return list;
 }
 
+/* Vector.frombuffer - class method */
+static PyObject* Vector_frombuffer(PyObject *cls, PyObject *args, PyObject *kwds) {
+    PyObject *buffer;
+    int copy = 0;
+    static char *kwlist[] = {"buffer", "copy", NULL};
+    
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|p", kwlist, &buffer, &copy)) {
+        return NULL;
+    }
+    
+    /* The memoryview keeps the exporter's buffer alive while we share it */
+    PyObject *view_obj = PyMemoryView_FromObject(buffer);
+    if (view_obj == NULL) {
+        return NULL;
+    }
+    Py_buffer *view = PyMemoryView_GET_BUFFER(view_obj);
+    
+    int elementwise = view->itemsize == sizeof(double) && is_double_format(view->format);
+    if (!elementwise && !(view->itemsize == 1 && is_byte_format(view->format))) {
+        Py_DECREF(view_obj);
+        PyErr_SetString(PyExc_TypeError, "Buffer must contain doubles (format 'd') or raw bytes");
+        return NULL;
+    }
+    if (view->len % sizeof(double) != 0) {
+        Py_DECREF(view_obj);
+        PyErr_SetString(PyExc_ValueError, "Buffer size must be a multiple of 8 bytes");
+        return NULL;
+    }
+    
+    Py_ssize_t length = view->len / (Py_ssize_t)sizeof(double);
+    if (length == 0) {
+        Py_DECREF(view_obj);
+        PyErr_SetString(PyExc_ValueError, "Buffer cannot be empty");
+        return NULL;
+    }
+    
+    int share = !copy && !view->readonly && PyBuffer_IsContiguous(view, 'C') &&
+                ((uintptr_t)view->buf % sizeof(double)) == 0;
+    
+    VectorObject *result = Vector_obtain();
+    if (result == NULL) {
+        Py_DECREF(view_obj);
+        return NULL;
+    }
+    if (share) {
+        result->data = (double *)view->buf;
+        result->base = view_obj;
+    } else {
+        result->data = length <= VECTOR_INLINE_SIZE ? result->inline_data :
+                       (double *)PyMem_Malloc(length * sizeof(double));
+        if (result->data == NULL) {
+            Py_DECREF(result);
+            Py_DECREF(view_obj);
+            return PyErr_NoMemory();
+        }
+        if (PyBuffer_ToContiguous(result->data, view, view->len, 'C') < 0) {
+            Py_DECREF(result);
+            Py_DECREF(view_obj);
+            return NULL;
+        }
+        Py_DECREF(view_obj);
+    }
+    result->length = length;
+    
+    return (PyObject *)result;
+}
+
+/* Helper function building the reduction to type.frombuffer(buffer[, dim])
+ *
+ * dim is passed on only when it is not negative. From protocol 5 the buffer is
+ * a PickleBuffer over the elements, so they can travel out-of-band without a copy.
+ */
+static PyObject* reduce_to_frombuffer(PyObject *self, const double *data, Py_ssize_t length,
+                                      Py_ssize_t dim, PyObject *args) {
+    int protocol = 0;
+    if (!PyArg_ParseTuple(args, "|i", &protocol)) {
+        return NULL;
+    }
+    
+    PyObject *buffer;
+    if (protocol >= 5) {
+        buffer = PyPickleBuffer_FromObject(self);
+    } else {
+        buffer = PyBytes_FromStringAndSize((const char *)data, (Py_ssize_t)(length * sizeof(double)));
+    }
+    if (buffer == NULL) {
+        return NULL;
+    }
+    PyObject *constructor = PyObject_GetAttrString((PyObject *)Py_TYPE(self), "frombuffer");
+    if (constructor == NULL) {
+        Py_DECREF(buffer);
+        return NULL;
+    }
+    
+    if (dim < 0) {
+        return Py_BuildValue("N(N)", constructor, buffer);
+    }
+    return Py_BuildValue("N(Nn)", constructor, buffer, dim);
+}
+
+/* Vector.__reduce_ex__ */
+static PyObject* Vector_reduce_ex(VectorObject *self, PyObject *args) {
+    return reduce_to_frombuffer((PyObject *)self, self->data, self->length, -1, args);
+}
+
+/* Vector.__buffer__ */
+static int Vector_getbuffer(VectorObject *self, Py_buffer *view, int flags) {
+    static Py_ssize_t itemsize = sizeof(double);
+    
+    view->buf = self->data;
+    view->obj = (PyObject *)self;
+    Py_INCREF(self);
+    view->len = self->length * (Py_ssize_t)sizeof(double);
+    view->readonly = 0;
+    view->itemsize = sizeof(double);
+    view->format = (flags & PyBUF_FORMAT) ? "d" : NULL;
+    view->ndim = 1;
+    view->shape = (flags & PyBUF_ND) == PyBUF_ND ? &self->length : NULL;
+    view->strides = (flags & PyBUF_STRIDES) == PyBUF_STRIDES ? &itemsize : NULL;
+    view->suboffsets = NULL;
+    view->internal = NULL;
+    
+    self->exports++;
+    return 0;
+}
+
+/* Vector.__release_buffer__ */
+static void Vector_releasebuffer(VectorObject *self, Py_buffer *view) {
+    self->exports--;
+}
+
 /* Vector.__eq__ */
 static PyObject* Vector_richcompare(VectorObject *self, PyObject *other, int op) {
     if (!PyObject_TypeCheck(other, &VectorType)) {
@@ -720,6 +1145,8 @@ static PyMethodDef Vector_methods[] = {
     {"is_orthogonal", (PyCFunction)Vector_is_orthogonal, METH_O, "Check if orthogonal"},
     {"copy", (PyCFunction)Vector_copy, METH_NOARGS, "Returns a copy"},
     {"to_list", (PyCFunction)Vector_to_list, METH_NOARGS, "Convert to list"},
+    {"frombuffer", (PyCFunction)Vector_frombuffer, METH_VARARGS | METH_KEYWORDS | METH_CLASS, "Create vector from a buffer of doubles"},
+    {"__reduce_ex__", (PyCFunction)Vector_reduce_ex, METH_VARARGS, "Support for pickle"},
     {NULL}
 };
 
@@ -735,6 +1162,12 @@ static PySequenceMethods Vector_as_sequence = {
     0,                                 /* sq_contains */
 };
 
+/* Buffer methods */
+static PyBufferProcs Vector_as_buffer = {
+    (getbufferproc)Vector_getbuffer,       /* bf_getbuffer */
+    (releasebufferproc)Vector_releasebuffer, /* bf_releasebuffer */
+};
+
 /* Number methods */
 static PyNumberMethods Vector_as_number = {
     (binaryfunc)Vector_add,           /* nb_add */
@@ -756,9 +1189,9 @@ static PyNumberMethods Vector_as_number = {
     0,                                 /* nb_int */
     0,                                 /* nb_reserved */
     0,                                 /* nb_float */
-    0,                                 /* nb_inplace_add */
-    0,                                 /* nb_inplace_subtract */
-    0,                                 /* nb_inplace_multiply */
+    (binaryfunc)Vector_iadd,          /* nb_inplace_add */
+    (binaryfunc)Vector_isub,          /* nb_inplace_subtract */
+    (binaryfunc)Vector_imul,          /* nb_inplace_multiply */
     0,                                 /* nb_inplace_remainder */
     0,                                 /* nb_inplace_power */
     0,                                 /* nb_inplace_lshift */
@@ -769,10 +1202,10 @@ static PyNumberMethods Vector_as_number = {
     0,                                 /* nb_floor_divide */
     (binaryfunc)Vector_truediv,       /* nb_true_divide */
     0,                                 /* nb_inplace_floor_divide */
-    0,                                 /* nb_inplace_true_divide */
+    (binaryfunc)Vector_itruediv,      /* nb_inplace_true_divide */
     0,                                 /* nb_index */
     (binaryfunc)Vector_matmul,        /* nb_matrix_multiply */
-    0,                                 /* nb_inplace_matrix_multiply */
+    (binaryfunc)Vector_imatmul,       /* nb_inplace_matrix_multiply */
 };
 
 /* Type definition */
@@ -790,17 +1223,687 @@ static PyTypeObject VectorType = {
     .tp_str = (reprfunc)Vector_str,
     .tp_as_number = &Vector_as_number,
     .tp_as_sequence = &Vector_as_sequence,
+    .tp_as_buffer = &Vector_as_buffer,
     .tp_hash = (hashfunc)Vector_hash,
     .tp_richcompare = (richcmpfunc)Vector_richcompare,
     .tp_methods = Vector_methods,
 };
 
+/* Module teardown; empties the Vector freelist */
+static void vectormodule_free(void *module) {
+    while (vector_numfree > 0) {
+        PyObject_Free(vector_freelist[--vector_numfree]);
+    }
+}
+
 /* Module definition */
 static PyModuleDef vectormodule = {
     PyModuleDef_HEAD_INIT,
     .m_name = "_vector",
     .m_doc = "C extension for Vector class",
     .m_size = -1,
+    .m_free = vectormodule_free,
+};
+
+/* VectorArray
+ *
+ * A packed container of same-length vectors. The vectorized methods run one
+ * C loop over all rows; indexing returns Vector views sharing the storage.
+ */
+static PyTypeObject VectorArrayType;
+
+/* Helper function to create a new VectorArray of the given type with uninitialised storage */
+static VectorArrayObject* VectorArray_alloc_type(PyTypeObject *type, Py_ssize_t count, Py_ssize_t dim) {
+    if (count < 0 || dim < 0 ||
+        (dim != 0 && count > PY_SSIZE_T_MAX / dim / (Py_ssize_t)sizeof(double))) {
+        return (VectorArrayObject *)PyErr_NoMemory();
+    }
+    VectorArrayObject *self = (VectorArrayObject *)type->tp_alloc(type, 0);
+    if (self != NULL) {
+        size_t size = (size_t)(count * dim) * sizeof(double);
+        self->data = (double *)PyMem_Malloc(size ? size : 1);
+        if (self->data == NULL) {
+            Py_DECREF(self);
+            return (VectorArrayObject *)PyErr_NoMemory();
+        }
+        self->count = count;
+        self->dim = dim;
+    }
+    return self;
+}
+
+/* Helper function to create a new VectorArray with uninitialised storage */
+static VectorArrayObject* VectorArray_alloc(Py_ssize_t count, Py_ssize_t dim) {
+    return VectorArray_alloc_type(&VectorArrayType, count, dim);
+}
+
+/* Helper function to copy one row given as a Vector or a sequence of numbers */
+static int VectorArray_fill_row(double *row, Py_ssize_t dim, PyObject *item) {
+    if (PyObject_TypeCheck(item, &VectorType)) {
+        VectorObject *vec = (VectorObject *)item;
+        if (vec->length != dim) {
+            PyErr_SetString(PyExc_ValueError, "All vectors must have the same dimension.");
+            return -1;
+        }
+        memcpy(row, vec->data, (size_t)dim * sizeof(double));
+        return 0;
+    }
+    
+    PyObject *seq = PySequence_Fast(item, "Each element must be a Vector or a sequence of numbers");
+    if (seq == NULL) {
+        return -1;
+    }
+    if (PySequence_Fast_GET_SIZE(seq) != dim) {
+        Py_DECREF(seq);
+        PyErr_SetString(PyExc_ValueError, "All vectors must have the same dimension.");
+        return -1;
+    }
+    PyObject **values = PySequence_Fast_ITEMS(seq);
+    for (Py_ssize_t j = 0; j < dim; j++) {
+        if (!PyFloat_Check(values[j]) && !PyLong_Check(values[j])) {
+            Py_DECREF(seq);
+            PyErr_SetString(PyExc_TypeError, "All elements of the vector must be `int` or `float`.");
+            return -1;
+        }
+        row[j] = PyFloat_AsDouble(values[j]);
+        if (row[j] == -1.0 && PyErr_Occurred()) {
+            Py_DECREF(seq);
+            return -1;
+        }
+    }
+    Py_DECREF(seq);
+    return 0;
+}
+
+/* VectorArray.__new__ */
+static PyObject* VectorArray_new(PyTypeObject *type, PyObject *args, PyObject *kwds) {
+    PyObject *vectors;
+    Py_ssize_t dim = -1;
+    static char *kwlist[] = {"vectors", "dim", NULL};
+    
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|n", kwlist, &vectors, &dim)) {
+        return NULL;
+    }
+    
+    if (PyObject_TypeCheck(vectors, &VectorArrayType)) {
+        VectorArrayObject *other = (VectorArrayObject *)vectors;
+        VectorArrayObject *self = VectorArray_alloc_type(type, other->count, other->dim);
+        if (self != NULL) {
+            memcpy(self->data, other->data, (size_t)(other->count * other->dim) * sizeof(double));
+        }
+        return (PyObject *)self;
+    }
+    
+    PyObject *seq = PySequence_Fast(vectors, "vectors must be an iterable of Vectors or sequences");
+    if (seq == NULL) {
+        return NULL;
+    }
+    Py_ssize_t count = PySequence_Fast_GET_SIZE(seq);
+    PyObject **items = PySequence_Fast_ITEMS(seq);
+    
+    if (count > 0) {
+        Py_ssize_t first = PyObject_TypeCheck(items[0], &VectorType)
+            ? ((VectorObject *)items[0])->length : PyObject_Length(items[0]);
+        if (first < 0) {
+            Py_DECREF(seq);
+            return NULL;
+        }
+        if (dim >= 0 && dim != first) {
+            Py_DECREF(seq);
+            PyErr_SetString(PyExc_ValueError, "All vectors must have the same dimension.");
+            return NULL;
+        }
+        dim = first;
+    } else if (dim < 0) {
+        dim = 0;
+    }
+    
+    VectorArrayObject *self = VectorArray_alloc_type(type, count, dim);
+    if (self == NULL) {
+        Py_DECREF(seq);
+        return NULL;
+    }
+    for (Py_ssize_t i = 0; i < count; i++) {
+        if (VectorArray_fill_row(self->data + i * dim, dim, items[i]) < 0) {
+            Py_DECREF(seq);
+            Py_DECREF(self);
+            return NULL;
+        }
+    }
+    Py_DECREF(seq);
+    return (PyObject *)self;
+}
+
+/* VectorArray.__dealloc__ */
+static void VectorArray_dealloc(VectorArrayObject *self) {
+    if (self->base != NULL) {
+        Py_CLEAR(self->base);
+    } else if (self->data != NULL) {
+        PyMem_Free(self->data);
+    }
+    Py_TYPE(self)->tp_free((PyObject *)self);
+}
+
+/* VectorArray.__len__ */
+static Py_ssize_t VectorArray_length(VectorArrayObject *self) {
+    return self->count;
+}
+
+/* VectorArray.__getitem__ */
+static PyObject* VectorArray_getitem(VectorArrayObject *self, Py_ssize_t i) {
+    if (i < 0 || i >= self->count) {
+        PyErr_SetString(PyExc_IndexError, "Index out of range");
+        return NULL;
+    }
+    
+    /* A Vector view keeps the array alive through its base */
+    VectorObject *view = Vector_obtain();
+    if (view == NULL) {
+        return NULL;
+    }
+    view->data = self->data + i * self->dim;
+    view->length = self->dim;
+    view->base = (PyObject *)self;
+    Py_INCREF(self);
+    return (PyObject *)view;
+}
+
+/* VectorArray.to_list */
+static PyObject* VectorArray_to_list(VectorArrayObject *self, PyObject *Py_UNUSED(ignored)) {
+    PyObject *result = PyList_New(self->count);
+    if (result == NULL) {
+        return NULL;
+    }
+    
+    for (Py_ssize_t i = 0; i < self->count; i++) {
+        PyObject *row = PyList_New(self->dim);
+        if (row == NULL) {
+            Py_DECREF(result);
+            return NULL;
+        }
+        for (Py_ssize_t j = 0; j < self->dim; j++) {
+            PyObject *item = PyFloat_FromDouble(self->data[i * self->dim + j]);
+            if (item == NULL) {
+                Py_DECREF(row);
+                Py_DECREF(result);
+                return NULL;
+            }
+            PyList_SET_ITEM(row, j, item);
+        }
+        PyList_SET_ITEM(result, i, row);
+    }
+    
+    return result;
+}
+
+/* VectorArray.__repr__ */
+static PyObject* VectorArray_repr(VectorArrayObject *self) {
+    PyObject *list = VectorArray_to_list(self, NULL);
+    if (list == NULL) {
+        return NULL;
+    }
+    PyObject *result = PyUnicode_FromFormat("VectorArray(%R)", list);
+    Py_DECREF(list);
+    return result;
+}
+
+/* VectorArray.copy */
+static PyObject* VectorArray_copy(VectorArrayObject *self, PyObject *Py_UNUSED(ignored)) {
+    VectorArrayObject *result = VectorArray_alloc(self->count, self->dim);
+    if (result != NULL) {
+        memcpy(result->data, self->data, (size_t)(self->count * self->dim) * sizeof(double));
+    }
+    return (PyObject *)result;
+}
+
+/* Helper function resolving the second operand of dot/cross
+ *
+ * A VectorArray of the same shape pairs up row by row; a single Vector is
+ * used against every row (*step is then 0).
+ */
+static int VectorArray_operand(VectorArrayObject *self, PyObject *other, const double **data, Py_ssize_t *step) {
+    if (PyObject_TypeCheck(other, &VectorArrayType)) {
+        VectorArrayObject *arr = (VectorArrayObject *)other;
+        if (arr->count != self->count || arr->dim != self->dim) {
+            PyErr_SetString(PyExc_ValueError, "The 2 vector arrays must have the same shape.");
+            return -1;
+        }
+        *data = arr->data;
+        *step = arr->dim;
+        return 0;
+    }
+    if (PyObject_TypeCheck(other, &VectorType)) {
+        VectorObject *vec = (VectorObject *)other;
+        if (vec->length != self->dim) {
+            PyErr_SetString(PyExc_ValueError, "The dimension of the 2 vectors must be the same.");
+            return -1;
+        }
+        *data = vec->data;
+        *step = 0;
+        return 0;
+    }
+    PyErr_SetString(PyExc_TypeError, "Argument must be a Vector or a VectorArray");
+    return -1;
+}
+
+/* VectorArray.dot */
+static PyObject* VectorArray_dot(VectorArrayObject *self, PyObject *other) {
+    const double *b;
+    Py_ssize_t step;
+    if (VectorArray_operand(self, other, &b, &step) < 0) {
+        return NULL;
+    }
+    /* A Vector operand is pinned below; VectorArrays are never resized */
+    VectorObject *vec = PyObject_TypeCheck(other, &VectorType) ? (VectorObject *)other : NULL;
+    
+    VectorObject *result = Vector_alloc(self->count);
+    if (result == NULL) {
+        return NULL;
+    }
+    Py_ssize_t dim = self->dim;
+    MM_PIN(vec);
+    MM_BEGIN_ALLOW_THREADS(self->count * dim)
+    for (Py_ssize_t i = 0; i < self->count; i++) {
+        const double *a = self->data + i * dim, *bi = b + i * step;
+        double sum = 0.0;
+        for (Py_ssize_t j = 0; j < dim; j++) {
+            sum += a[j] * bi[j];
+        }
+        result->data[i] = sum;
+    }
+    MM_END_ALLOW_THREADS
+    MM_UNPIN(vec);
+    return (PyObject *)result;
+}
+
+/* VectorArray.cross */
+static PyObject* VectorArray_cross(VectorArrayObject *self, PyObject *other) {
+    const double *b;
+    Py_ssize_t step;
+    if (VectorArray_operand(self, other, &b, &step) < 0) {
+        return NULL;
+    }
+    /* A Vector operand is pinned below; VectorArrays are never resized */
+    VectorObject *vec = PyObject_TypeCheck(other, &VectorType) ? (VectorObject *)other : NULL;
+    if (self->dim != 2 && self->dim != 3) {
+        PyErr_SetString(PyExc_ValueError, "The dimension of the 2 vectors must be less than or equal to 3.");
+        return NULL;
+    }
+    
+    VectorArrayObject *result = VectorArray_alloc(self->count, 3);
+    if (result == NULL) {
+        return NULL;
+    }
+    Py_ssize_t dim = self->dim;
+    MM_PIN(vec);
+    MM_BEGIN_ALLOW_THREADS(self->count * 3)
+    for (Py_ssize_t i = 0; i < self->count; i++) {
+        const double *a = self->data + i * dim, *bi = b + i * step;
+        double *r = result->data + i * 3;
+        if (dim == 3) {
+            r[0] = a[1] * bi[2] - a[2] * bi[1];
+            r[1] = a[2] * bi[0] - a[0] * bi[2];
+            r[2] = a[0] * bi[1] - a[1] * bi[0];
+        } else {
+            r[0] = 0.0;
+            r[1] = 0.0;
+            r[2] = a[0] * bi[1] - a[1] * bi[0];
+        }
+    }
+    MM_END_ALLOW_THREADS
+    MM_UNPIN(vec);
+    return (PyObject *)result;
+}
+
+/* VectorArray.modulus */
+static PyObject* VectorArray_modulus(VectorArrayObject *self, PyObject *Py_UNUSED(ignored)) {
+    VectorObject *result = Vector_alloc(self->count);
+    if (result == NULL) {
+        return NULL;
+    }
+    Py_ssize_t dim = self->dim;
+    MM_BEGIN_ALLOW_THREADS(self->count * dim)
+    for (Py_ssize_t i = 0; i < self->count; i++) {
+        const double *a = self->data + i * dim;
+        double sum = 0.0;
+        for (Py_ssize_t j = 0; j < dim; j++) {
+            sum += a[j] * a[j];
+        }
+        result->data[i] = sqrt(sum);
+    }
+    MM_END_ALLOW_THREADS
+    return (PyObject *)result;
+}
+
+/* VectorArray.unit_vector */
+static PyObject* VectorArray_unit_vector(VectorArrayObject *self, PyObject *Py_UNUSED(ignored)) {
+    VectorArrayObject *result = VectorArray_alloc(self->count, self->dim);
+    if (result == NULL) {
+        return NULL;
+    }
+    Py_ssize_t dim = self->dim;
+    MM_BEGIN_ALLOW_THREADS(self->count * dim)
+    for (Py_ssize_t i = 0; i < self->count; i++) {
+        const double *a = self->data + i * dim;
+        double *r = result->data + i * dim;
+        double sum = 0.0;
+        for (Py_ssize_t j = 0; j < dim; j++) {
+            sum += a[j] * a[j];
+        }
+        /* Zero vectors are copied unchanged, as in Vector.unit_vector */
+        double mod = sum == 0.0 ? 1.0 : sqrt(sum);
+        for (Py_ssize_t j = 0; j < dim; j++) {
+            r[j] = a[j] / mod;
+        }
+    }
+    MM_END_ALLOW_THREADS
+    return (PyObject *)result;
+}
+
+/* VectorArray.rotate_2d */
+static PyObject* VectorArray_rotate_2d(VectorArrayObject *self, PyObject *args, PyObject *kwds) {
+    double theta = M_PI;
+    int radians = 1;
+    static char *kwlist[] = {"theta", "radians", NULL};
+    
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "|dp", kwlist, &theta, &radians)) {
+        return NULL;
+    }
+    if (self->dim != 2) {
+        PyErr_SetString(PyExc_ValueError, "The dimension of the vector must be equal to 2.");
+        return NULL;
+    }
+    if (!radians) {
+        theta = theta * M_PI / 180.0;
+    }
+    
+    VectorArrayObject *result = VectorArray_alloc(self->count, 2);
+    if (result == NULL) {
+        return NULL;
+    }
+    double cos_theta = cos(theta);
+    double sin_theta = sin(theta);
+    MM_BEGIN_ALLOW_THREADS(self->count * 2)
+    for (Py_ssize_t i = 0; i < self->count; i++) {
+        double x = self->data[2 * i], y = self->data[2 * i + 1];
+        result->data[2 * i] = x * cos_theta - y * sin_theta;
+        result->data[2 * i + 1] = x * sin_theta + y * cos_theta;
+    }
+    MM_END_ALLOW_THREADS
+    return (PyObject *)result;
+}
+
+/* VectorArray.rotate_3d */
+static PyObject* VectorArray_rotate_3d(VectorArrayObject *self, PyObject *args, PyObject *kwds) {
+    double theta;
+    PyObject *axis_obj;
+    int radians = 1;
+    static char *kwlist[] = {"theta", "axis", "radians", NULL};
+    
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "dO|p", kwlist, &theta, &axis_obj, &radians)) {
+        return NULL;
+    }
+    if (self->dim != 3) {
+        PyErr_SetString(PyExc_ValueError, "The dimension of the vector must be equal to 3.");
+        return NULL;
+    }
+    if (!PyObject_TypeCheck(axis_obj, &VectorType)) {
+        PyErr_SetString(PyExc_TypeError, "Axis must be a Vector");
+        return NULL;
+    }
+    VectorObject *axis = (VectorObject *)axis_obj;
+    if (axis->length != 3) {
+        PyErr_SetString(PyExc_ValueError, "The axis must be a 3D vector.");
+        return NULL;
+    }
+    if (!radians) {
+        theta = theta * M_PI / 180.0;
+    }
+    
+    VectorArrayObject *result = VectorArray_alloc(self->count, 3);
+    if (result == NULL) {
+        return NULL;
+    }
+    
+    /* Rodrigues' rotation formula, row by row as in Vector.rotate_3d */
+    double cos_t = cos(theta);
+    double sin_t = sin(theta);
+    const double *k = axis->data;
+    MM_PIN(axis);
+    MM_BEGIN_ALLOW_THREADS(self->count * 3)
+    for (Py_ssize_t i = 0; i < self->count; i++) {
+        const double *v = self->data + i * 3;
+        double *r = result->data + i * 3;
+        double dot = v[0] * k[0] + v[1] * k[1] + v[2] * k[2];
+        double w[3] = {
+            k[1] * v[2] - k[2] * v[1],
+            k[2] * v[0] - k[0] * v[2],
+            k[0] * v[1] - k[1] * v[0],
+        };
+        for (Py_ssize_t j = 0; j < 3; j++) {
+            double parallel = k[j] * dot;
+            r[j] = parallel + (v[j] - parallel) * cos_t + w[j] * sin_t;
+        }
+    }
+    MM_END_ALLOW_THREADS
+    MM_UNPIN(axis);
+    return (PyObject *)result;
+}
+
+/* VectorArray.argument */
+static PyObject* VectorArray_argument(VectorArrayObject *self, PyObject *Py_UNUSED(ignored)) {
+    VectorArrayObject *result = VectorArray_alloc(self->count, self->dim);
+    if (result == NULL) {
+        return NULL;
+    }
+    Py_ssize_t dim = self->dim;
+    MM_BEGIN_ALLOW_THREADS(self->count * dim)
+    for (Py_ssize_t i = 0; i < self->count; i++) {
+        const double *a = self->data + i * dim;
+        double *r = result->data + i * dim;
+        double sum = 0.0;
+        for (Py_ssize_t j = 0; j < dim; j++) {
+            sum += a[j] * a[j];
+        }
+        double norm = sqrt(sum);
+        for (Py_ssize_t j = 0; j < dim; j++) {
+            r[j] = acos(a[j] / norm);
+        }
+    }
+    MM_END_ALLOW_THREADS
+    return (PyObject *)result;
+}
+
+/* VectorArray.frombuffer - class method */
+static PyObject* VectorArray_frombuffer(PyObject *cls, PyObject *args, PyObject *kwds) {
+    PyObject *buffer;
+    Py_ssize_t dim = -1;
+    int copy = 0;
+    static char *kwlist[] = {"buffer", "dim", "copy", NULL};
+    
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "O|np", kwlist, &buffer, &dim, &copy)) {
+        return NULL;
+    }
+    
+    /* The memoryview keeps the exporter's buffer alive while we share it */
+    PyObject *view_obj = PyMemoryView_FromObject(buffer);
+    if (view_obj == NULL) {
+        return NULL;
+    }
+    Py_buffer *view = PyMemoryView_GET_BUFFER(view_obj);
+    
+    int elementwise = view->itemsize == sizeof(double) && is_double_format(view->format);
+    if (!elementwise && !(view->itemsize == 1 && is_byte_format(view->format))) {
+        Py_DECREF(view_obj);
+        PyErr_SetString(PyExc_TypeError, "Buffer must contain doubles (format 'd') or raw bytes");
+        return NULL;
+    }
+    if (view->len % sizeof(double) != 0) {
+        Py_DECREF(view_obj);
+        PyErr_SetString(PyExc_ValueError, "Buffer size must be a multiple of 8 bytes");
+        return NULL;
+    }
+    
+    Py_ssize_t total = view->len / (Py_ssize_t)sizeof(double);
+    if (dim < 0) {
+        if (!(elementwise && view->ndim == 2)) {
+            Py_DECREF(view_obj);
+            PyErr_SetString(PyExc_ValueError, "dim is required unless the buffer is 2-dimensional");
+            return NULL;
+        }
+        dim = view->shape[1];
+    }
+    if (dim == 0 ? total != 0 : total % dim != 0) {
+        Py_DECREF(view_obj);
+        PyErr_SetString(PyExc_ValueError, "Buffer size does not match the requested dimension");
+        return NULL;
+    }
+    Py_ssize_t count = dim == 0 ? 0 : total / dim;
+    
+    int share = !copy && !view->readonly && PyBuffer_IsContiguous(view, 'C') &&
+                ((uintptr_t)view->buf % sizeof(double)) == 0;
+    
+    if (share) {
+        VectorArrayObject *result = (VectorArrayObject *)VectorArrayType.tp_alloc(&VectorArrayType, 0);
+        if (result == NULL) {
+            Py_DECREF(view_obj);
+            return NULL;
+        }
+        result->data = (double *)view->buf;
+        result->base = view_obj;
+        result->count = count;
+        result->dim = dim;
+        return (PyObject *)result;
+    }
+    
+    VectorArrayObject *result = VectorArray_alloc(count, dim);
+    if (result != NULL && PyBuffer_ToContiguous(result->data, view, view->len, 'C') < 0) {
+        Py_CLEAR(result);
+    }
+    Py_DECREF(view_obj);
+    return (PyObject *)result;
+}
+
+/* VectorArray.__reduce_ex__ */
+static PyObject* VectorArray_reduce_ex(VectorArrayObject *self, PyObject *args) {
+    return reduce_to_frombuffer((PyObject *)self, self->data, self->count * self->dim, self->dim, args);
+}
+
+/* VectorArray.__buffer__ */
+static int VectorArray_getbuffer(VectorArrayObject *self, Py_buffer *view, int flags) {
+    /* shape and strides live in one block released with the view */
+    Py_ssize_t *dims = (Py_ssize_t *)PyMem_Malloc(4 * sizeof(Py_ssize_t));
+    if (dims == NULL) {
+        PyErr_NoMemory();
+        return -1;
+    }
+    dims[0] = self->count;
+    dims[1] = self->dim;
+    dims[2] = self->dim * (Py_ssize_t)sizeof(double);
+    dims[3] = sizeof(double);
+    
+    view->buf = self->data;
+    view->obj = (PyObject *)self;
+    Py_INCREF(self);
+    view->len = self->count * self->dim * (Py_ssize_t)sizeof(double);
+    view->readonly = 0;
+    view->itemsize = sizeof(double);
+    view->format = (flags & PyBUF_FORMAT) ? "d" : NULL;
+    view->ndim = 2;
+    view->shape = (flags & PyBUF_ND) == PyBUF_ND ? dims : NULL;
+    view->strides = (flags & PyBUF_STRIDES) == PyBUF_STRIDES ? dims + 2 : NULL;
+    view->suboffsets = NULL;
+    view->internal = dims;
+    
+    self->exports++;
+    return 0;
+}
+
+/* VectorArray.__release_buffer__ */
+static void VectorArray_releasebuffer(VectorArrayObject *self, Py_buffer *view) {
+    PyMem_Free(view->internal);
+    self->exports--;
+}
+
+/* VectorArray.shape property */
+static PyObject* VectorArray_get_shape(VectorArrayObject *self, void *closure) {
+    return Py_BuildValue("(nn)", self->count, self->dim);
+}
+
+/* VectorArray.dim property */
+static PyObject* VectorArray_get_dim(VectorArrayObject *self, void *closure) {
+    return PyLong_FromSsize_t(self->dim);
+}
+
+/* VectorArray method definitions */
+static PyMethodDef VectorArray_methods[] = {
+    {"modulus", (PyCFunction)VectorArray_modulus, METH_NOARGS, "Returns the modulus of every vector"},
+    {"mod", (PyCFunction)VectorArray_modulus, METH_NOARGS, "Alias for modulus"},
+    {"argument", (PyCFunction)VectorArray_argument, METH_NOARGS, "Returns the argument of every vector"},
+    {"arg", (PyCFunction)VectorArray_argument, METH_NOARGS, "Alias for argument"},
+    {"unit_vector", (PyCFunction)VectorArray_unit_vector, METH_NOARGS, "Returns the unit vector of every vector"},
+    {"rotate_2d", (PyCFunction)VectorArray_rotate_2d, METH_VARARGS | METH_KEYWORDS, "Rotates every 2D vector"},
+    {"rotate_3d", (PyCFunction)VectorArray_rotate_3d, METH_VARARGS | METH_KEYWORDS, "Rotates every 3D vector"},
+    {"dot", (PyCFunction)VectorArray_dot, METH_O, "Row-wise dot product with a Vector or VectorArray"},
+    {"dot_product", (PyCFunction)VectorArray_dot, METH_O, "Alias for dot"},
+    {"cross", (PyCFunction)VectorArray_cross, METH_O, "Row-wise cross product with a Vector or VectorArray"},
+    {"cross_product", (PyCFunction)VectorArray_cross, METH_O, "Alias for cross"},
+    {"copy", (PyCFunction)VectorArray_copy, METH_NOARGS, "Returns a copy"},
+    {"to_list", (PyCFunction)VectorArray_to_list, METH_NOARGS, "Convert to a list of lists"},
+    {"frombuffer", (PyCFunction)VectorArray_frombuffer, METH_VARARGS | METH_KEYWORDS | METH_CLASS, "Create a vector array from a buffer of doubles"},
+    {"__reduce_ex__", (PyCFunction)VectorArray_reduce_ex, METH_VARARGS, "Support for pickle"},
+    {NULL}
+};
+
+/* VectorArray property definitions */
+static PyGetSetDef VectorArray_getsetters[] = {
+    {"shape", (getter)VectorArray_get_shape, NULL, "(count, dim) of the array", NULL},
+    {"dim", (getter)VectorArray_get_dim, NULL, "Dimension of every vector", NULL},
+    {NULL}
+};
+
+/* VectorArray sequence methods */
+static PySequenceMethods VectorArray_as_sequence = {
+    (lenfunc)VectorArray_length,      /* sq_length */
+    0,                                 /* sq_concat */
+    0,                                 /* sq_repeat */
+    (ssizeargfunc)VectorArray_getitem, /* sq_item */
+    0,                                 /* sq_slice */
+    0,                                 /* sq_ass_item */
+    0,                                 /* sq_ass_slice */
+    0,                                 /* sq_contains */
+};
+
+/* VectorArray buffer methods */
+static PyBufferProcs VectorArray_as_buffer = {
+    (getbufferproc)VectorArray_getbuffer,       /* bf_getbuffer */
+    (releasebufferproc)VectorArray_releasebuffer, /* bf_releasebuffer */
+};
+
+/* VectorArray type definition */
+static PyTypeObject VectorArrayType = {
+    PyVarObject_HEAD_INIT(NULL, 0)
+    .tp_name = "matmath._vector.VectorArray",
+    .tp_doc = "Packed array of same-length vectors",
+    .tp_basicsize = sizeof(VectorArrayObject),
+    .tp_itemsize = 0,
+    .tp_flags = Py_TPFLAGS_DEFAULT | Py_TPFLAGS_BASETYPE,
+    .tp_new = VectorArray_new,
+    .tp_dealloc = (destructor)VectorArray_dealloc,
+    .tp_repr = (reprfunc)VectorArray_repr,
+    .tp_as_sequence = &VectorArray_as_sequence,
+    .tp_as_buffer = &VectorArray_as_buffer,
+    .tp_methods = VectorArray_methods,
+    .tp_getset = VectorArray_getsetters,
+};
+
+/* C API exported to the other extensions */
+static MatmathVectorAPI Vector_api = {
+    &VectorType,
+    Vector_alloc,
+    Vector_new_from_data,
+    &VectorArrayType,
+    VectorArray_alloc,
 };
 
 /* Module initialization */
@@ -808,6 +1911,8 @@ PyMODINIT_FUNC PyInit__vector(void) {
     PyObject *m;
     if (PyType_Ready(&VectorType) < 0)
         return NULL;
+    if (PyType_Ready(&VectorArrayType) < 0)
+        return NULL;
 
     m = PyModule_Create(&vectormodule);
     if (m == NULL)
@@ -820,5 +1925,19 @@ PyMODINIT_FUNC PyInit__vector(void) {
         return NULL;
     }
 
+    Py_INCREF(&VectorArrayType);
+    if (PyModule_AddObject(m, "VectorArray", (PyObject *)&VectorArrayType) < 0) {
+        Py_DECREF(&VectorArrayType);
+        Py_DECREF(m);
+        return NULL;
+    }
+
+    PyObject *capsule = PyCapsule_New(&Vector_api, MATMATH_VECTOR_CAPSULE, NULL);
+    if (PyModule_AddObject(m, "_C_API", capsule) < 0) {
+        Py_XDECREF(capsule);
+        Py_DECREF(m);
+        return NULL;
+    }
+
     return m;
 }
@@ -0,0 +1,51 @@
+/* Vector and VectorArray object layouts and the C API the _vector extension exports to the
+ * other matmath extensions through the matmath._vector._C_API capsule.
+ */
+#ifndef MATMATH_VECTOR_H
+#define MATMATH_VECTOR_H
+
+#include <Python.h>
+
+/* Vectors of up to this many elements keep them inside the object */
+#define VECTOR_INLINE_SIZE 4
+
+/* Vector object structure
+ *
+ * `data` points at `inline_data` for short vectors, at a separate block for
+ * longer ones, or into the storage of `base`.
+ */
+typedef struct {
+    PyObject_HEAD
+    double *data;
+    Py_ssize_t length;
+    PyObject *base;          /* Owner of data when it was not allocated here */
+    Py_ssize_t exports;      /* Number of live buffer exports */
+    Py_ssize_t busy;         /* Kernels using data without the GIL (see _parallel.h) */
+    double inline_data[VECTOR_INLINE_SIZE];
+} VectorObject;
+
+/* VectorArray object structure
+ *
+ * `count` vectors of `dim` doubles each, stored row-major in one block.
+ */
+typedef struct {
+    PyObject_HEAD
+    double *data;
+    Py_ssize_t count;
+    Py_ssize_t dim;
+    PyObject *base;          /* Owner of data when it was not allocated here */
+    Py_ssize_t exports;      /* Number of live buffer exports */
+} VectorArrayObject;
+
+/* Exported functions */
+typedef struct {
+    PyTypeObject *VectorType;
+    VectorObject *(*Vector_alloc)(Py_ssize_t length);
+    VectorObject *(*Vector_new_from_data)(const double *data, Py_ssize_t length);
+    PyTypeObject *VectorArrayType;
+    VectorArrayObject *(*VectorArray_alloc)(Py_ssize_t count, Py_ssize_t dim);
+} MatmathVectorAPI;
+
+#define MATMATH_VECTOR_CAPSULE "matmath._vector._C_API"
+
+#endif /* MATMATH_VECTOR_H */
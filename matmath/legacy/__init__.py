@@ -1,7 +1,14 @@
 from matmath.legacy.matrix import Matrix
+from matmath.legacy.parallel import get_num_threads, set_num_threads
+from matmath.legacy.sparse import SparseMatrix
 from matmath.legacy.vector import Vector
+from matmath.legacy.vectorarray import VectorArray
 
 __all__ = [
     "Matrix",
+    "SparseMatrix",
     "Vector",
+    "VectorArray",
+    "get_num_threads",
+    "set_num_threads",
 ]
@@ -1,124 +1,576 @@
-"""A module for matrix operations."""
+"""A module for matrix operations.
+
+Matrices are stored row-major in a flat `array('d')` of doubles, like the C
+engine. Operations work on whole buffers or row slices of them (`map` over
+two buffers, `data[j::cols]` for a column, `sum(map(mul, row, col))` for a
+dot product) rather than indexing elements one at a time, and the
+factorizations are O(n^3).
+
+Slices, `row()`, `col()` and `T` are views: they keep the parent's buffer
+with an offset and a row and column stride, and gather their elements into a
+fresh row-major buffer whenever an operation reads them.
+"""
+
+import math
+import operator
+import sys
+import weakref
+from array import array
+from pickle import PickleBuffer
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Tuple, Union
+
+from matmath import _io
+from matmath.legacy.vector import Vector, _format
+from matmath.legacy.vectorarray import VectorArray
 
-from typing import Any, Iterator, List, Tuple, Union
+number = Union[int, float]
 
 
-number = Union[int, float]
+def _unquote(field: str) -> str:
+    field = field.strip()
+    if len(field) >= 2 and field[0] == field[-1] == '"':
+        return field[1:-1]
+    return field
+
+
+def _pack(rows: Iterable[Union[array, List[float]]]) -> array:
+    """Returns rows of numbers concatenated into one buffer of doubles."""
+    data = array("d")
+    for row in rows:
+        if isinstance(row, array):
+            data.extend(row)
+        else:
+            data.fromlist(row)
+    return data
+
+
+# Derived results cache, as in the C engine: square matrices of more than
+# _CACHE_MIN_SIZE elements remember their determinant, trace, symmetry and
+# triangularity, factorizations and inverse until they are next written to
+_CACHE_MIN_SIZE = 16
+_MISSING = object()
+_caching = True
+_cache_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+_cached_matrices: "weakref.WeakValueDictionary[int, Matrix]" = (
+    weakref.WeakValueDictionary()
+)
+
+
+def cache_info() -> Dict[str, int]:
+    """Returns the counters and the size of the derived results cache.
+
+    Returns
+    -------
+    dict :
+        The `hits`, `misses` and `invalidations` since the last
+        clear_cache(), the number of `matrices` holding cached results and
+        the `bytes` held by the cached factorizations and inverses.
+    """
+    matrices = nbytes = 0
+    for matrix in list(_cached_matrices.values()):
+        cache = matrix._cache
+        if cache is None:
+            continue
+        matrices += 1
+        n = matrix.rows
+        if "lu" in cache:
+            nbytes += 8 * n * n + 8 * n
+        if cache.get("cholesky"):
+            nbytes += 8 * n * n
+        if "inverse" in cache:
+            nbytes += 8 * n * n
+    return dict(_cache_stats, matrices=matrices, bytes=nbytes)
+
+
+def clear_cache() -> None:
+    """Drops every cached derived result and resets the cache counters."""
+    for matrix in list(_cached_matrices.values()):
+        matrix._cache = None
+    _cached_matrices.clear()
+    for key in _cache_stats:
+        _cache_stats[key] = 0
+
+
+def set_caching(enabled: bool) -> bool:
+    """Turns the derived results cache on or off; turning it off drops
+    every cached result.
+
+    Parameters
+    ----------
+    enabled : bool
+        Whether matrices remember derived results.
+
+    Returns
+    -------
+    bool :
+        The previous setting.
+    """
+    global _caching
+    previous = _caching
+    _caching = bool(enabled)
+    if not _caching:
+        for matrix in list(_cached_matrices.values()):
+            matrix._cache = None
+        _cached_matrices.clear()
+    return previous
 
 
 class Matrix:
     """A class to represent a matrix."""
 
-    def __init__(self, mat: List[List[number]]):
-        self.rows: int = len(mat)
-        self.cols: int = len(mat[0])
-        for i, row in enumerate(mat):
-            if len(row) != self.cols:
+    __slots__ = (
+        "_storage",
+        "_view",
+        "_views",
+        "rows",
+        "cols",
+        "_cache",
+        "__weakref__",
+    )
+
+    def __init__(self, mat: Iterable[Iterable[number]]):
+        data = array("d")
+        rows = 0
+        cols = -1
+        for row in mat:
+            values = row if isinstance(row, list) else list(row)
+            if cols < 0:
+                if not values:
+                    raise ValueError("Matrix rows cannot be empty")
+                cols = len(values)
+            elif len(values) != cols:
                 raise ValueError("The matrix is not a proper matrix.")
-            mat[i] = list(row)
-        self.matrix: List[List[number]] = mat
+            try:
+                data.fromlist(values)
+            except TypeError:
+                raise TypeError("All elements must be numbers") from None
+            rows += 1
+        if not rows:
+            raise ValueError("Matrix cannot be empty")
+        if getattr(self, "_views", None):
+            raise BufferError("Cannot re-initialise a Matrix with exported buffers")
+        if getattr(self, "_cache", None) is not None:
+            self._changed()
+        if getattr(self, "_view", None) is not None:
+            self._view[0]._views.pop(id(self), None)
+        self._cache: Union[Dict[str, Any], None] = None
+        self._storage = data
+        # (parent, offset, row stride, column stride) for views, None otherwise
+        self._view: Union[Tuple["Matrix", int, int, int], None] = None
+        self._views: Union["weakref.WeakValueDictionary[int, Matrix]", None] = None
+        self.rows: int = rows
+        self.cols: int = cols
+
+    @classmethod
+    def _from_data(cls, rows: int, cols: int, data: array) -> "Matrix":
+        """Returns a rows x cols matrix taking ownership of a row-major buffer"""
+        matrix = cls.__new__(cls)
+        matrix._storage = data
+        matrix._view = None
+        matrix._views = None
+        matrix.rows = rows
+        matrix.cols = cols
+        matrix._cache = None
+        return matrix
+
+    def _view_of(
+        self, offset: int, rows: int, cols: int, row_stride: int, col_stride: int
+    ) -> "Matrix":
+        """Returns a rows x cols view sharing the buffer of this matrix, with
+        element (i, j) at offset + i * row_stride + j * col_stride of it.
+
+        The view keeps this matrix alive and is one of its `_views`, so this
+        matrix cannot be re-initialised underneath it.
+        """
+        view = Matrix.__new__(Matrix)
+        view._storage = self._storage
+        view._view = (self, offset, row_stride, col_stride)
+        view._views = None
+        view.rows = rows
+        view.cols = cols
+        view._cache = None
+        if self._views is None:
+            self._views = weakref.WeakValueDictionary()
+        self._views[id(view)] = view
+        return view
+
+    def _layout(self) -> Tuple[int, int, int]:
+        """Returns the offset, row stride and column stride into the buffer"""
+        if self._view is None:
+            return 0, self.cols, 1
+        return self._view[1:]
+
+    def _line(self, i: int) -> slice:
+        """Returns the slice of the buffer holding row i"""
+        offset, row_stride, col_stride = self._layout()
+        start = offset + i * row_stride
+        stop = start + self.cols * col_stride
+        return slice(start, stop if stop >= 0 else None, col_stride)
+
+    @property
+    def _data(self) -> array:
+        """The elements in row-major order; gathered into a new buffer for views"""
+        if self._view is None:
+            return self._storage
+        data, storage = array("d"), self._storage
+        for i in range(self.rows):
+            data.extend(storage[self._line(i)])
+        return data
+
+    def _cached(self, key: str, compute: Callable[[], Any]) -> Any:
+        """Returns the derived result `key`, computing it on a cache miss"""
+        if not (
+            _caching
+            and self._view is None
+            and self.rows == self.cols
+            and self.rows * self.cols > _CACHE_MIN_SIZE
+        ):
+            return compute()
+        cache = self._cache
+        if cache is not None and key in cache:
+            _cache_stats["hits"] += 1
+            return cache[key]
+        _cache_stats["misses"] += 1
+        value = compute()
+        if self._cache is None:
+            self._cache = {}
+            _cached_matrices[id(self)] = self
+        self._cache[key] = value
+        return value
+
+    def _changed(self) -> None:
+        """Drops the derived results before the elements are written"""
+        if self._view is not None:
+            self._view[0]._changed()
+        elif self._cache is not None:
+            self._cache = None
+            _cache_stats["invalidations"] += 1
+
+    def _rows(self) -> List[List[float]]:
+        """Returns the rows of the matrix as lists"""
+        # One tolist() converts every element once; list slices are cheap
+        flat, c = self._data.tolist(), self.cols
+        return [flat[i : i + c] for i in range(0, len(flat), c)]
+
+    def _columns(self) -> List[List[float]]:
+        """Returns the columns of the matrix as lists"""
+        flat, c = self._data.tolist(), self.cols
+        return [flat[j::c] for j in range(c)]
 
     def __len__(self) -> int:
         """Returns the number of rows in the matrix"""
         return self.rows
 
     def __iter__(self) -> Iterator[List[number]]:
-        """Returns an iterator over the elements of the matrix"""
-        return iter(self.matrix)
+        """Returns an iterator over the rows of the matrix, as lists"""
+        return iter(self._rows())
+
+    def __getitem__(self, key: Any) -> Any:
+        """Returns row `i` for m[i], the element for m[i, j] and a view of the
+        selected window when slices are involved"""
+        if not isinstance(key, (tuple, slice)):
+            i = self._axis(key, self.rows)[0]
+            return self._storage[self._line(i)].tolist()
+        offset, row_stride, col_stride = self._layout()
+        if (
+            isinstance(key, tuple)
+            and len(key) == 2
+            and not any(isinstance(k, slice) for k in key)
+        ):
+            i, j = key
+            rows, cols = self._axis(i, self.rows), self._axis(j, self.cols)
+            return self._storage[offset + rows[0] * row_stride + cols[0] * col_stride]
+        rows, cols = self._window(key)
+        if not rows:
+            raise ValueError("Matrix cannot be empty")
+        if not cols:
+            raise ValueError("Matrix rows cannot be empty")
+        return self._view_of(
+            offset + rows.start * row_stride + cols.start * col_stride,
+            len(rows),
+            len(cols),
+            row_stride * rows.step,
+            col_stride * cols.step,
+        )
 
-    def __getitem__(self, r: int) -> List[number]:
-        """Returns the element at the specified key"""
-        return self.matrix[r]
+    def __setitem__(self, key: Any, value: Union["Matrix", int, float]) -> None:
+        """Assigns a number or a matrix of matching order to the selected elements"""
+        rows, cols = self._window(key)
+        scalar = isinstance(value, (int, float))
+        if not scalar:
+            if not isinstance(value, Matrix):
+                raise TypeError("Can only assign a number or a Matrix")
+            if value.order != (len(rows), len(cols)):
+                raise ValueError("The 2 matrices do not have the same order.")
+        if not rows or not cols:
+            return
+        # Only a write that is about to happen drops the cached results
+        self._changed()
+        data = self._storage
+        offset, row_stride, col_stride = self._layout()
+        if scalar:
+            for i in rows:
+                for j in cols:
+                    data[offset + i * row_stride + j * col_stride] = value
+            return
+        # value._rows() copies first, so value may overlap the window
+        for i, row in zip(rows, value._rows()):
+            for j, element in zip(cols, row):
+                data[offset + i * row_stride + j * col_stride] = element
+
+    def _window(self, key: Any) -> Tuple[range, range]:
+        if isinstance(key, tuple):
+            if len(key) != 2:
+                raise IndexError("Matrix indices take at most 2 axes")
+            i, j = key
+        else:
+            i, j = key, slice(None)
+        return self._axis(i, self.rows), self._axis(j, self.cols)
+
+    @staticmethod
+    def _axis(index: Any, length: int) -> range:
+        if isinstance(index, slice):
+            return range(length)[index]
+        if not isinstance(index, int):
+            raise TypeError("Matrix indices must be integers, slices or a pair of them")
+        if not -length <= index < length:
+            raise IndexError("Matrix index out of range")
+        index %= length
+        return range(index, index + 1)
+
+    def row(self, i: int) -> "Matrix":
+        """Returns a view of row i as a 1 x cols matrix"""
+        return self[i, :]
+
+    def col(self, j: int) -> "Matrix":
+        """Returns a view of column j as a rows x 1 matrix"""
+        return self[:, j]
+
+    @property
+    def T(self) -> "Matrix":
+        """Returns a view of the transpose"""
+        offset, row_stride, col_stride = self._layout()
+        return self._view_of(offset, self.cols, self.rows, col_stride, row_stride)
 
     def __str__(self):
         """Returns a string representation of the matrix"""
         length = self.rows
         string = ["| "] * length
-        for i in range(len(self.matrix[0])):
-            temp: List[str] = []
-            helper = 0
-            for j in range(length):
-                element = str(self.matrix[j][i])
-                temp.append(element)
-                if len(element) > helper:
-                    helper = len(element)
+        for column in self._columns():
+            temp = [_format(element) for element in column]
+            helper = max(map(len, temp))
             for j in range(length):
                 string[j] += temp[j] + " " * (helper - len(temp[j]) + 1)
         return "|\n".join(string) + "|"
 
     def __repr__(self) -> str:
         sep = ",\n" + " " * 7
-        return f"Matrix({sep.join(list(map(lambda x: str(x)[1:-1], self.matrix)))})"
+        return (
+            f"Matrix({sep.join(', '.join(map(_format, row)) for row in self._rows())})"
+        )
 
     def __eq__(self, other: Any) -> bool:
         """Checks if the matrix is equal to another matrix"""
-        if not isinstance(other, self.__class__):
+        if not isinstance(other, Matrix):
             return False
-        return self.matrix == other.matrix
+        # memoryview compares the doubles in C, with float semantics
+        return self.cols == other.cols and memoryview(self._data) == memoryview(
+            other._data
+        )
 
     def __ne__(self, other: Any) -> bool:
         """Checks if the matrix is not equal to another matrix"""
         return not (self == other)
 
+    def _elementwise(
+        self, other: "Matrix", op: Callable[[float, float], float]
+    ) -> "Matrix":
+        if self.order != other.order:
+            raise ValueError("The 2 matrices do not have the same order.")
+        return Matrix._from_data(
+            self.rows, self.cols, array("d", map(op, self._data, other._data))
+        )
+
+    def _with_data(self, data: List[float]) -> "Matrix":
+        return Matrix._from_data(self.rows, self.cols, array("d", data))
+
     def __add__(self, other: "Matrix") -> "Matrix":
         """Returns the sum of the matrices"""
-        if self.order == other.order:
-            matrix: List[List[number]] = []
-            for i in range(self.rows):
-                temp = [self.matrix[i][j] + other[i][j] for j in range(self.cols)]
-                matrix.append(temp)
-            return Matrix(matrix)
-        raise ValueError("The 2 matrices do not have the same order.")
+        if not isinstance(other, Matrix):
+            raise TypeError("Can only add Matrix to Matrix")
+        return self._elementwise(other, operator.add)
 
     def __sub__(self, other: "Matrix") -> "Matrix":
         """Returns the difference of the matrices"""
-        if self.order == other.order:
-            matrix: List[List[number]] = []
-            for i in range(self.rows):
-                matrix.append(
-                    [self.matrix[i][j] - other[i][j] for j in range(self.cols)]
-                )
-            return Matrix(matrix)
-        raise ValueError("The 2 matrices do not have the same order.")
+        if not isinstance(other, Matrix):
+            raise TypeError("Can only subtract Matrix from Matrix")
+        return self._elementwise(other, operator.sub)
 
     def __mul__(self, other: Union["Matrix", int, float]) -> "Matrix":
         """Returns the product of a matrix and a number/matrix"""
         if isinstance(other, (int, float)):  # Scalar multiplication
-            result = [[(element * other) for element in row] for row in self.matrix]
-            return Matrix(result)
-        if isinstance(other, self.__class__):
-            if self.cols == other.cols and self.rows == other.rows:
-                result: List[List[number]] = []
-                for i in range(self.rows):
-                    temp = [self.matrix[i][j] * other[i][j] for j in range(self.cols)]
-                    result.append(temp)
-                return Matrix(result)
-            raise ValueError("The 2 matrices do not have the same order.")
+            return self._with_data([element * other for element in self._data])
+        if isinstance(other, Matrix):
+            return self._elementwise(other, operator.mul)
         raise TypeError(
             f"Multiplication not supported between {type(self)} and {type(other)}."
         )
 
+    def __rmul__(self, other: Union[int, float]) -> "Matrix":
+        """Returns the product of a number and a matrix"""
+        return self * other
+
+    def __iadd__(self, other: "Matrix") -> "Matrix":
+        """Adds a matrix to this one in place"""
+        return self._inplace(other, operator.add, "Can only add Matrix to Matrix")
+
+    def __isub__(self, other: "Matrix") -> "Matrix":
+        """Subtracts a matrix from this one in place"""
+        return self._inplace(
+            other, operator.sub, "Can only subtract Matrix from Matrix"
+        )
+
     def __imul__(self, other: Union["Matrix", int, float]) -> "Matrix":
-        if isinstance(other, (int, float)):
-            return self * other
-        return other * self
+        """Multiplies the matrix by a number/matrix in place"""
+        return self._inplace(
+            other,
+            operator.mul,
+            "Multiplication not supported between Matrix and given type.",
+        )
+
+    def __itruediv__(self, other: Union["Matrix", int, float]) -> "Matrix":
+        """Divides the matrix by a number/matrix in place"""
+        return self._inplace(
+            other,
+            operator.truediv,
+            "Division not supported between Matrix and given type.",
+        )
+
+    def __ifloordiv__(self, other: Union["Matrix", int, float]) -> "Matrix":
+        """Floor divides the matrix by a number/matrix in place"""
+        return self._inplace(
+            other,
+            operator.floordiv,
+            "Floor division not supported between Matrix and given type.",
+        )
+
+    def __imatmul__(self, other: Union["Matrix", Vector]):
+        """Matrix multiplies in place when the product keeps the order"""
+        result = self @ other
+        if isinstance(result, Matrix) and result.order == self.order:
+            return self._store(result._data)
+        return result
+
+    def _inplace(
+        self, other: Union["Matrix", int, float], op, type_error: str
+    ) -> "Matrix":
+        if isinstance(other, (int, float)) and op not in (operator.add, operator.sub):
+            if other == 0 and op in (operator.truediv, operator.floordiv):
+                raise ZeroDivisionError("Division by zero")
+            return self._store(
+                array("d", [op(element, other) for element in self._data])
+            )
+        if not isinstance(other, Matrix):
+            raise TypeError(type_error)
+        if self.order != other.order:
+            raise ValueError("The 2 matrices do not have the same order.")
+        if op in (operator.truediv, operator.floordiv) and 0 in other._data:
+            raise ZeroDivisionError("Division by zero")
+        return self._store(array("d", map(op, self._data, other._data)))
+
+    def _store(self, data: array) -> "Matrix":
+        """Copies a row-major buffer into the existing storage of the matrix"""
+        self._changed()
+        if self._view is None:
+            self._storage[:] = data
+            return self
+        c = self.cols
+        for i in range(self.rows):
+            self._storage[self._line(i)] = data[i * c : (i + 1) * c]
+        return self
+
+    def _check_out(self, out: Any, order: Tuple[int, int]) -> "Matrix":
+        if not isinstance(out, Matrix):
+            raise TypeError("out must be a Matrix")
+        if out.order != order:
+            raise ValueError(f"out must be a {order[0]}x{order[1]} matrix")
+        return out
+
+    def add(self, other: "Matrix", out: Union["Matrix", None] = None) -> "Matrix":
+        """Returns the sum of the matrices, written into `out` when given.
+
+        Parameters
+        ----------
+        other (Matrix)
+            The matrix to add.
+        out (Matrix, optional)
+            A matrix of the same order to hold the result. It may be this
+            matrix or `other`.
+
+        Returns
+        -------
+        Matrix :
+            `out`, or a new matrix when `out` is None.
+        """
+        if out is None:
+            return self + other
+        self._check_out(out, self.order)
+        return out._store((self + other)._data)
+
+    def sub(self, other: "Matrix", out: Union["Matrix", None] = None) -> "Matrix":
+        """Returns the difference of the matrices, written into `out` when given.
+
+        Parameters
+        ----------
+        other (Matrix)
+            The matrix to subtract.
+        out (Matrix, optional)
+            A matrix of the same order to hold the result. It may be this
+            matrix or `other`.
+
+        Returns
+        -------
+        Matrix :
+            `out`, or a new matrix when `out` is None.
+        """
+        if out is None:
+            return self - other
+        self._check_out(out, self.order)
+        return out._store((self - other)._data)
+
+    def matmul(
+        self, other: Union["Matrix", Vector], out: Union["Matrix", None] = None
+    ) -> Union["Matrix", Vector]:
+        """Returns the matrix product, written into `out` when given.
+
+        Parameters
+        ----------
+        other (Matrix or Vector)
+            The right operand.
+        out (Matrix, optional)
+            A matrix of order (rows, other.cols) to hold the result. It may
+            be either operand. Only supported when `other` is a Matrix.
+
+        Returns
+        -------
+        Matrix or Vector :
+            `out`, or a new matrix/vector when `out` is None.
+        """
+        if out is None:
+            return self @ other
+        if not isinstance(other, Matrix):
+            raise TypeError("out is only supported for Matrix @ Matrix")
+        if self.cols != other.rows:
+            raise ValueError("Matrix dimensions incompatible for multiplication")
+        self._check_out(out, (self.rows, other.cols))
+        return out._store((self @ other)._data)
 
     def __truediv__(self, other: Union["Matrix", int, float]) -> "Matrix":
         """Returns the division of a matrix and a number/matrix"""
         if isinstance(other, (int, float)):
-            result: List[List[number]] = []
-            for row in self.matrix:
-                new_row = [(element * other) for element in row]
-                result.append(new_row)
-            return Matrix(result)
-        if isinstance(other, self.__class__):
-            if self.cols == other.cols and self.rows == other.rows:
-                result: List[List[number]] = []
-                for i in range(self.rows):
-                    temp = [self.matrix[i][j] / other[i][j] for j in range(self.cols)]
-                    result.append(temp)
-                return Matrix(result)
-            raise ValueError("The 2 matrices do not have the same order.")
+            return self._with_data([element / other for element in self._data])
+        if isinstance(other, Matrix):
+            return self._elementwise(other, operator.truediv)
         raise TypeError(
             f"Division not supported between {type(self)} and {type(other)}."
         )
@@ -126,88 +578,392 @@ class Matrix:
     def __floordiv__(self, other: Union["Matrix", int, float]) -> "Matrix":
         """Returns the quotient of a matrix and a number/matrix"""
         if isinstance(other, (int, float)):
-            result: List[List[number]] = []
-            for row in self.matrix:
-                new_row = [(element // other) for element in row]
-                result.append(new_row)
-            return Matrix(result)
-        if isinstance(other, self.__class__):
-            if self.cols == other.cols and self.rows == other.rows:
-                result = []
-                for i in range(self.rows):
-                    temp = [self.matrix[i][j] // other[i][j] for j in range(self.cols)]
-                    result.append(temp)
-                return Matrix(result)
-            raise ValueError("The 2 matrices do not have the same order.")
+            return self._with_data([element // other for element in self._data])
+        if isinstance(other, Matrix):
+            return self._elementwise(other, operator.floordiv)
         raise TypeError(
             f"Multiplication not supported between {type(self)} and {type(other)}."
         )
 
-    def __matmul__(self, other: "Matrix"):
-        """Returns the cross product of two matrices"""
-        if not isinstance(other, self.__class__):
+    def __matmul__(self, other: Union["Matrix", Vector]):
+        """Returns the matrix product of a matrix and a matrix/vector"""
+        mul = operator.mul
+        if isinstance(other, Vector):
+            if len(other) != self.cols:
+                raise ValueError(
+                    "Matrix and Vector dimensions incompatible for multiplication"
+                )
+            x = other._data.tolist()
+            return Vector._from_data(
+                array("d", [sum(map(mul, row, x)) for row in self._rows()])
+            )
+        if not isinstance(other, Matrix):
+            if hasattr(type(other), "__rmatmul__"):
+                return NotImplemented
             raise ValueError(f"Passed object is not of {type(self)}")
-        arr: list[list[number]] = [[0] * other.cols] * self.rows
-        for i in range(self.rows):
-            for j in range(other.cols):
-                for k in range(other.rows):
-                    arr[i][j] += self.matrix[i][k] * other.matrix[k][j]
-        return Matrix(arr)
+        if self.cols != other.rows:
+            raise ValueError("Matrix dimensions incompatible for multiplication")
+        # One dot product of a row of self and a column of other per element
+        columns = other._columns()
+        return Matrix._from_data(
+            self.rows,
+            other.cols,
+            array(
+                "d",
+                [sum(map(mul, row, col)) for row in self._rows() for col in columns],
+            ),
+        )
+
+    def __rmatmul__(self, other: Vector) -> Vector:
+        """Returns the product of a row vector and the matrix"""
+        if not isinstance(other, Vector):
+            return NotImplemented
+        if len(other) != self.rows:
+            raise ValueError(
+                "Matrix and Vector dimensions incompatible for multiplication"
+            )
+        x, mul = other._data.tolist(), operator.mul
+        return Vector._from_data(
+            array("d", [sum(map(mul, x, col)) for col in self._columns()])
+        )
+
+    def apply(
+        self, vectors: Union[Iterable[Vector], VectorArray]
+    ) -> Union[List[Vector], VectorArray]:
+        """Multiplies the matrix with every vector in a sequence.
+
+        Parameters
+        ----------
+        vectors: iterable of Vector, or VectorArray
+            The vectors to transform. Each must have `cols` elements.
+
+        Returns
+        -------
+        list or VectorArray :
+            The transformed vectors, `self @ v` for each `v`. A VectorArray
+            input gives a VectorArray back.
+        """
+        rows, mul = self._rows(), operator.mul
+        if isinstance(vectors, VectorArray):
+            if vectors.dim != self.cols:
+                raise ValueError(
+                    "Matrix and Vector dimensions incompatible for multiplication"
+                )
+            return VectorArray._from_rows(
+                [
+                    array("d", [sum(map(mul, row, x.tolist())) for row in rows])
+                    for x in vectors.rows
+                ],
+                self.rows,
+            )
+        vectors = list(vectors)
+        for vector in vectors:
+            if not isinstance(vector, Vector):
+                raise TypeError("vectors must be an iterable of Vectors")
+        return [self @ vector for vector in vectors]
 
     def pow(self, power: int = 2) -> "Matrix":
-        """Returns the n^th power of the matrix, if mathematically possible."""
-        if self.cols == self.rows:
-            if power > 0:
-                matrix = self.copy()
-                for _ in range(power - 1):
-                    matrix = matrix * self
-                return matrix
-            elif power == 0:
-                return self.identity(self.rows)
-            raise ValueError("The power of the matrix must be a natural number")
-        raise ValueError("The given matrix is not a square matrix.")
+        """Returns the n^th power of the matrix, if mathematically possible.
+
+        Uses exponentiation by squaring, so only O(log n) matrix products are
+        needed. Negative powers raise the inverse of the matrix.
 
-    def identity(self, n: int = 3) -> "Matrix":
+        Parameters
+        ----------
+        power (int, optional)
+            The exponent. Defaults to 2.
+
+        Returns
+        -------
+        Matrix :
+            The matrix raised to the given power.
+
+        Raises
+        ------
+        ValueError
+            Raised if the matrix is not square, or if the power is negative and
+            the matrix is not invertible.
         """
-        identity _summary_
+        if self.cols != self.rows:
+            raise ValueError("The given matrix is not a square matrix.")
+        if power == 0:
+            return self.identity(self.rows)
+        base = self.inverse() if power < 0 else self
+        power = abs(power)
+        result = None
+        while True:
+            if power & 1:
+                result = base if result is None else result @ base
+            power >>= 1
+            if not power:
+                return Matrix._from_data(result.rows, result.cols, result._data[:])
+            base = base @ base
+
+    def __pow__(self, power: int) -> "Matrix":
+        """Returns the matrix raised to an integer power"""
+        if not isinstance(power, int):
+            return NotImplemented
+        return self.pow(power)
+
+    @classmethod
+    def identity(cls, n: int = 3) -> "Matrix":
+        """Returns the identity matrix of order n.
 
         Parameters
         ----------
         n : int
             The order of the identity matrix. defaults to 3.
         """
-        matrix: List[List[number]] = [[0] * n] * n
-        for i in range(n):
-            matrix[i][i] = 1
-        return Matrix(matrix)
-
-    def zero(self, order: Tuple[int, int]) -> "Matrix":
+        if n <= 0:
+            raise ValueError("Matrix size must be positive")
+        data = array("d", bytes(8 * n * n))
+        data[:: n + 1] = array("d", [1.0]) * n
+        return cls._from_data(n, n, data)
+
+    @classmethod
+    def zero(cls, order: Tuple[int, int]) -> "Matrix":
         """Returns a zero matrix of the given order."""
+        return cls.fill(0.0, order)
 
+    @classmethod
+    def fill(cls, value: float, order: Tuple[int, int]) -> "Matrix":
+        """Returns a matrix of the given order filled with the given value."""
+        if not isinstance(order, tuple) or len(order) != 2:
+            raise TypeError("order must be a tuple of (rows, cols)")
         r, c = order
-        matrix: List[List[number]] = [[0] * c] * r
-        return Matrix(matrix)
+        if r <= 0 or c <= 0:
+            raise ValueError("Matrix dimensions must be positive")
+        return cls._from_data(r, c, array("d", [value]) * (r * c))
 
-    def fill(self, value: int, order: Tuple[int, int]) -> "Matrix":
-        """Returns a matrix of the given order filled with the given value."""
+    @classmethod
+    def from_rows(
+        cls, rows: Iterable[Iterable[number]], cols: Union[int, None] = None
+    ) -> "Matrix":
+        """Returns a matrix built from an iterable of rows, such as a generator.
+
+        Parameters
+        ----------
+        rows
+            An iterable yielding rows; each row is any iterable of numbers.
+        cols (int, optional)
+            The expected number of columns.
+
+        Returns
+        -------
+        Matrix :
+            The matrix holding the rows.
+        """
+        matrix = cls(rows)
+        if cols is not None and matrix.cols != cols:
+            raise ValueError("The matrix is not a proper matrix.")
+        return matrix
+
+    @classmethod
+    def from_csv(
+        cls,
+        source: Any,
+        chunk_rows: int = 1024,
+        delimiter: str = ",",
+        header: bool = False,
+    ) -> "Matrix":
+        """Returns a matrix read from a CSV file of numbers.
+
+        Parameters
+        ----------
+        source
+            A path, or a file object opened in text or binary mode.
+        chunk_rows (int, optional)
+            Accepted for compatibility with the C engine, which reads the
+            file about this many rows at a time.
+        delimiter (str, optional)
+            The single character separating the fields.
+        header (bool, optional)
+            Whether to skip the first line.
+
+        Returns
+        -------
+        Matrix :
+            The matrix holding the file's rows.
+        """
+        if chunk_rows <= 0:
+            raise ValueError("chunk_rows must be positive")
+        if len(delimiter) != 1 or delimiter in '"\r\n':
+            raise ValueError("delimiter must be a single character")
+        if not hasattr(source, "read"):
+            with open(source, "rb") as f:
+                return cls.from_csv(f, chunk_rows, delimiter, header)
+
+        data = array("d")
+        cols = None
+        for lineno, line in enumerate(source, 1):
+            if isinstance(line, bytes):
+                line = line.decode()
+            if (header and lineno == 1) or not line.strip():
+                continue
+            fields = line.split(delimiter)
+            cols = len(fields) if cols is None else cols
+            try:
+                if len(fields) != cols:
+                    raise ValueError
+                data.fromlist([float(_unquote(field)) for field in fields])
+            except ValueError:
+                raise ValueError(
+                    f"Line {lineno} of the CSV is not a row of {cols} numbers"
+                ) from None
+        if cols is None:
+            raise ValueError("Matrix cannot be empty")
+        return cls._from_data(len(data) // cols, cols, data)
+
+    def iter_csv(self, delimiter: str = ",") -> Iterator[str]:
+        """Returns an iterator over the rows as CSV lines, ending in a newline.
+
+        Parameters
+        ----------
+        delimiter (str, optional)
+            The single character separating the fields.
+        """
+        if len(delimiter) != 1:
+            raise ValueError("delimiter must be a single character")
+        return (delimiter.join(map(repr, row)) + "\n" for row in self._rows())
+
+    @classmethod
+    def frombuffer(
+        cls, buffer: Any, order: Union[Tuple[int, int], None] = None, copy: bool = False
+    ) -> "Matrix":
+        """Returns a matrix built from a buffer of doubles.
+
+        The pure Python engine cannot share memory, so the data is always copied.
 
+        Parameters
+        ----------
+        buffer
+            Any object supporting the buffer protocol holding doubles
+            (format 'd') or raw bytes.
+        order (tuple, optional)
+            The (rows, cols) of the matrix. Required unless the buffer is 2-D.
+        copy (bool, optional)
+            Accepted for compatibility with the C engine.
+
+        Returns
+        -------
+        Matrix :
+            The matrix holding the buffer's values.
+        """
+        view = memoryview(buffer)
+        if view.itemsize == 1 and view.format in ("B", "b", "c"):
+            view = view.cast("B").cast("d")
+        elif view.format.lstrip("@=") != "d":
+            raise TypeError("Buffer must contain doubles (format 'd') or raw bytes")
+        if view.ndim == 2 and order is None:
+            order = view.shape
+        elif view.ndim != 2 and order is None:
+            raise ValueError("order is required unless the buffer is 2-dimensional")
         r, c = order
-        self.matrix = [[value] * c] * r
-        return Matrix(self.matrix)
+        if r <= 0 or c <= 0:
+            raise ValueError("Matrix dimensions must be positive")
+        values = array("d", view.tobytes())
+        if r * c != len(values):
+            raise ValueError("Buffer size does not match the requested order")
+        return cls._from_data(r, c, values)
+
+    def save(self, path: Any) -> None:
+        """Saves the matrix to a binary file readable by `Matrix.load`.
+
+        Parameters
+        ----------
+        path (str or os.PathLike)
+            The file to write.
+        """
+        _io.save(self, path)
+
+    @classmethod
+    def load(cls, path: Any, mmap: bool = True) -> "Matrix":
+        """Loads a matrix written by `Matrix.save`.
+
+        The pure Python engine cannot share memory, so the file is always read.
+
+        Parameters
+        ----------
+        path (str or os.PathLike)
+            The file to read.
+        mmap (bool, optional)
+            Accepted for compatibility with the C engine.
+
+        Returns
+        -------
+        Matrix :
+            The loaded matrix.
+        """
+        return _io.load(cls, path, mmap=False)
+
+    def __reduce_ex__(self, protocol: int) -> Tuple[Any, ...]:
+        """Pickles as Matrix.frombuffer(buffer, order), like the C engine.
+
+        From protocol 5 the buffer is a PickleBuffer over the elements, so
+        they can travel out-of-band.
+        """
+        buffer = PickleBuffer(self._data) if protocol >= 5 else self._data.tobytes()
+        return type(self).frombuffer, (buffer, (self.rows, self.cols))
 
     def adjoint(self) -> "Matrix":
         """Returns the adjoint representation of the matrix.
 
+        Computed as det(A) A^-1 from one LU factorization when the matrix is
+        invertible, and from the cofactors otherwise.
+
         Returns
         -------
         Matrix :
             The adjoint representation of the matrix.
         """
-        matrix: List[List[number]] = []
-        for i in range(self.rows):
-            temp = [self.cofactor(i, j) for j in range(self.cols)]
-            matrix.append(temp)
-        return Matrix(matrix).transpose()
+        if not self.is_square():
+            raise ValueError("The given matrix is not a square matrix.")
+        factorization = LU(self)
+        if not factorization._is_singular():
+            det = factorization.det()
+            inverse = factorization.inverse()
+            return inverse._store(array("d", [x * det for x in inverse._data]))
+        n = self.rows
+        if n == 1:
+            return self.identity(1)
+        cofactors = array(
+            "d", [self.cofactor(j, i) for i in range(n) for j in range(n)]
+        )
+        return Matrix._from_data(n, n, cofactors)
+
+    def cholesky(self) -> "Matrix":
+        """Returns the Cholesky factor of this symmetric positive definite matrix.
+
+        Only the lower triangle of the matrix is read, so it is not checked
+        for symmetry.
+
+        Returns
+        -------
+        Matrix :
+            The lower triangular L with L @ L.transpose() == A.
+
+        Raises
+        ------
+        ValueError
+            Raised if the matrix is not square or not positive definite.
+        """
+        if not self.is_square():
+            raise ValueError("The given matrix is not a square matrix.")
+        n = self.rows
+        factor = self._cached("cholesky", self._cholesky_factor)
+        if not factor:
+            raise ValueError("The given matrix is not positive definite.")
+        return Matrix._from_data(
+            n,
+            n,
+            _pack(row[: i + 1] + [0.0] * (n - i - 1) for i, row in enumerate(factor)),
+        )
+
+    def _cholesky_factor(self) -> Union[List[List[float]], bool]:
+        """Returns the rows of the Cholesky factor with L^T mirrored above the
+        diagonal, or False if the matrix is not positive definite"""
+        rows = self._rows()
+        return rows if _cholesky(rows) else False
 
     def cofactor(self, i: int, j: int) -> float:
         """Returns the co-factor representation of the matrix.
@@ -233,8 +989,7 @@ class Matrix:
         -------
         a copy of this matrix
         """
-        new_matrix = self.matrix.copy()
-        return Matrix(new_matrix)
+        return Matrix._from_data(self.rows, self.cols, self._data[:])
 
     def cut(self, i: Union[int, None] = None, j: Union[int, None] = None) -> "Matrix":
         """Returns a new matrix after removing the i th row and/or j th column.
@@ -259,21 +1014,24 @@ class Matrix:
         """
         if i is None and j is None:
             return self.copy()
-        matrix: List[List[number]] = []
+        data, cols = self._data, self.cols
+        rows = [data[k : k + cols] for k in range(0, len(data), cols)]
         if i is not None:
             if i < 0 or i >= self.rows:
                 raise ValueError("The row to be removed is not present in the matrix.")
-            for row in self.matrix:
-                matrix.append(row.copy())
-            matrix.pop(i)
+            rows.pop(i)
         if j is not None:
             if j < 0 or j >= self.cols:
                 raise ValueError(
                     "The column to be removed is not present in the matrix."
                 )
-            for i, row in enumerate(matrix):
-                matrix[i] = row[:j] + row[j + 1 :]
-        return Matrix(matrix)
+            rows = [row[:j] + row[j + 1 :] for row in rows]
+            cols -= 1
+        if not rows:
+            raise ValueError("Matrix cannot be empty")
+        if not cols:
+            raise ValueError("Matrix rows cannot be empty")
+        return Matrix._from_data(len(rows), cols, _pack(rows))
 
     def determinant(self) -> number:
         """Returns the determinant of this matrix.
@@ -283,20 +1041,40 @@ class Matrix:
         float :
             The determinant of this matrix.
         """
-        if self.is_square():
-            determinant = 1
-            mat = self.matrix
-            for i in range(self.rows):
-                for j in range(i + 1, self.rows):
-                    if mat[i][i] == 0:
-                        mat[i][i] = 1
-                    x = mat[j][i] / mat[i][i]
-                    for k in range(self.rows):
-                        mat[j][k] -= x * mat[i][k]
-            for i in range(self.rows):
-                determinant *= mat[i][i]
-            return determinant
-        raise ValueError("The given matrix is not a square matrix.")
+        return self._cached("det", lambda: self.lu().det())
+
+    def eigh(self) -> Tuple[Vector, "Matrix"]:
+        """Returns the eigenvalues and eigenvectors of this symmetric matrix.
+
+        The matrix is reduced to tridiagonal form by Householder reflections
+        and diagonalized with the implicit QL algorithm. Only the lower
+        triangle of the matrix is read.
+
+        Returns
+        -------
+        tuple :
+            A Vector of the eigenvalues in ascending order and a Matrix whose
+            columns are the matching unit eigenvectors, so that
+            A @ V == V @ diag(w).
+
+        Raises
+        ------
+        ValueError
+            Raised if the matrix is not square or the iteration does not
+            converge.
+        """
+        if not self.is_square():
+            raise ValueError("The given matrix is not a square matrix.")
+        n = self.rows
+        w, d, e = self._columns(), [0.0] * n, [0.0] * n
+        _tridiagonalize(w, d, e)
+        if not _tridiagonal_ql(w, d, e):
+            raise ValueError("The eigenvalue iteration did not converge.")
+        order = sorted(range(n), key=d.__getitem__)
+        values = Vector._from_data(array("d", [d[i] for i in order]))
+        return values, Matrix._from_data(
+            n, n, array("d", [w[i][r] for r in range(n) for i in order])
+        )
 
     def inverse(self) -> "Matrix":
         """Returns the inverse of this matrix
@@ -306,21 +1084,26 @@ class Matrix:
         Matrix :
             The inverse of this matrix
         """
-        if self.is_square():
-            determinant = self.determinant()
-            if determinant == 0:
+
+        def invert() -> Matrix:
+            factorization = self.lu()
+            if abs(factorization.det()) < 1e-10:
                 raise ValueError("The given matrix is not invertible.")
-            temp = self.adjoint() / determinant
-            return temp.transpose()
-        raise ValueError("The given matrix is not a square matrix.")
+            return factorization.inverse()
+
+        # The cached inverse stays private; every caller gets its own copy
+        inverse = self._cached("inverse", invert)
+        return Matrix._from_data(inverse.rows, inverse.cols, inverse._data[:])
 
     def is_diagonal(self) -> bool:
         """Returns True if the matrix is diagonal, False otherwise."""
         if self.cols == self.rows:
-            for i in range(self.rows):
-                for j in range(self.cols):
-                    if i != j and self.matrix[i][j] != 0:
-                        return False
+            data, n = self._data, self.cols
+            for i in range(n):
+                if any(data[i * n : i * n + i]) or any(
+                    data[i * n + i + 1 : (i + 1) * n]
+                ):
+                    return False
             return True
         return False
 
@@ -332,30 +1115,37 @@ class Matrix:
 
     def is_invertible(self) -> bool:
         """Returns True if the matrix is invertible, False otherwise."""
-        return self.det() != 0
+        if not self.is_square():
+            return False
+        return abs(self.det()) >= 1e-10
 
     def is_lower_triangular(self) -> bool:
         """Returns True if the matrix is lower triangular, False otherwise."""
         if self.cols != self.rows:
             return False
-        for i in range(self.rows):
-            for j in range(i + 1, self.cols):
-                if self.matrix[i][j] != 0:
-                    return False
+        return self._cached("lower", self._lower_triangular)
+
+    def _lower_triangular(self) -> bool:
+        data, n = self._data, self.cols
+        for i in range(n):
+            if any(data[i * n + i + 1 : (i + 1) * n]):
+                return False
         return True
 
     def is_null(self) -> bool:
         """Returns True if the matrix is null, False otherwise."""
-        return self == self.zero((self.rows, self.cols))
+        return not any(self._data)
 
     def is_skew_symmetric(self) -> bool:
         """Returns True if the matrix is skew-symmetric, False otherwise."""
         if self.cols != self.rows:
             return False
-        for i in range(self.rows):
-            for j in range(i, self.cols):
-                if self.matrix[i][j] != -self.matrix[j][i]:
-                    return False
+        # Row i against column i, from the diagonal on
+        data, n = self._data, self.cols
+        for i in range(n):
+            row, col = data[i * n + i : (i + 1) * n], data[i * n + i :: n]
+            if not all(map(operator.eq, row, map(operator.neg, col))):
+                return False
         return True
 
     def is_square(self) -> bool:
@@ -366,22 +1156,154 @@ class Matrix:
         """Returns True if the matrix is symmetric, False otherwise."""
         if self.cols != self.rows:
             return False
-        for i in range(self.rows):
-            for j in range(i, self.cols):
-                if self.matrix[i][j] != self.matrix[j][i]:
-                    return False
+        return self._cached("symmetric", self._symmetric)
+
+    def _symmetric(self) -> bool:
+        # Row i against column i, from the diagonal on
+        data, n = self._data, self.cols
+        for i in range(n):
+            if memoryview(data[i * n + i : (i + 1) * n]) != memoryview(
+                data[i * n + i :: n]
+            ):
+                return False
         return True
 
     def is_upper_triangular(self) -> bool:
         """Returns True if the matrix is upper triangular, False otherwise."""
         if self.cols != self.rows:
             return False
-        for i in range(self.rows):
-            for j in range(i):
-                if self.matrix[i][j] != 0:
-                    return False
+        return self._cached("upper", self._upper_triangular)
+
+    def _upper_triangular(self) -> bool:
+        data, n = self._data, self.cols
+        for i in range(n):
+            if any(data[i * n : i * n + i]):
+                return False
         return True
 
+    def lu(self) -> "LU":
+        """Returns the LU factorization of this matrix with partial pivoting.
+
+        The factorization can be reused to compute the determinant, to solve
+        linear systems and to invert the matrix in O(n^3). It is cached on the
+        matrix, so later calls return the same object until the matrix is
+        written to.
+
+        Returns
+        -------
+        LU :
+            The factorization, satisfying P @ A == L @ U.
+
+        Raises
+        ------
+        ValueError
+            Raised if the matrix is not square.
+        """
+        return self._cached("lu", lambda: LU(self))
+
+    def qr(self) -> Tuple["Matrix", "Matrix"]:
+        """Returns the QR factorization of this matrix by Householder reflections.
+
+        Returns
+        -------
+        tuple :
+            (Q, R) with Q @ R == A. For an m x n matrix and k = min(m, n), Q is
+            m x k with orthonormal columns and R is k x n upper triangular.
+        """
+        m, n = self.rows, self.cols
+        k = min(m, n)
+        at = self._columns()
+        tau = _qr(at, k)
+        qt = [[float(i == j) for j in range(m)] for i in range(k)]
+        for j in range(k - 1, -1, -1):
+            for x in qt[j:]:
+                _reflect(x, at[j], j, tau[j])
+        q = Matrix._from_data(m, k, _pack(list(column) for column in zip(*qt)))
+        r = Matrix._from_data(
+            k,
+            n,
+            array(
+                "d", [at[j][i] if j >= i else 0.0 for i in range(k) for j in range(n)]
+            ),
+        )
+        return q, r
+
+    def solve(self, b: Union[Vector, "Matrix"]) -> Union[Vector, "Matrix"]:
+        """Solves the linear system A x = b without forming the inverse.
+
+        Triangular matrices are solved directly by substitution, symmetric
+        positive definite ones with a Cholesky factorization (half the work
+        of LU) and any other square matrix is factored with `lu()` first.
+        Factorizations are cached, so repeated solves with the same matrix
+        only pay for the substitutions.
+
+        Parameters
+        ----------
+        b: Vector or Matrix
+            The right-hand side. A Matrix is solved column by column.
+
+        Returns
+        -------
+        Vector or Matrix :
+            The solution, of the same type as b.
+
+        Raises
+        ------
+        ValueError
+            Raised if the matrix is not square, the shapes do not match or the
+            matrix is singular.
+        """
+        if not self.is_square():
+            raise ValueError("The given matrix is not a square matrix.")
+        if self.is_upper_triangular():
+            return self.solve_triangular(b)
+        if self.is_lower_triangular():
+            return self.solve_triangular(b, lower=True)
+        if self.is_symmetric():
+            factor = self._cached("cholesky", self._cholesky_factor)
+            if factor:
+                rows, wrap = _rhs_rows(b, self.rows)
+                _solve_lower(factor, rows)
+                _solve_upper(factor, rows)
+                return wrap(rows)
+        return self.lu().solve(b)
+
+    def solve_triangular(
+        self, b: Union[Vector, "Matrix"], lower: bool = False
+    ) -> Union[Vector, "Matrix"]:
+        """Solves A x = b by substitution, treating A as triangular.
+
+        Only the upper (or lower) triangle of the matrix is read.
+
+        Parameters
+        ----------
+        b: Vector or Matrix
+            The right-hand side.
+        lower (bool, optional)
+            Use the lower triangle instead of the upper one. Defaults to False.
+
+        Returns
+        -------
+        Vector or Matrix :
+            The solution, of the same type as b.
+
+        Raises
+        ------
+        ValueError
+            Raised if the matrix is not square, the shapes do not match or a
+            diagonal element is zero.
+        """
+        if not self.is_square():
+            raise ValueError("The given matrix is not a square matrix.")
+        if 0 in self._data[:: self.cols + 1]:
+            raise ValueError("The given matrix is not invertible.")
+        rows, wrap = _rhs_rows(b, self.rows)
+        if lower:
+            _solve_lower(self._rows(), rows)
+        else:
+            _solve_upper(self._rows(), rows)
+        return wrap(rows)
+
     def minor(self, i: int = 0, j: int = 0) -> number:
         """Returns the minor of the Aij element in matrix A.
 
@@ -431,22 +1353,16 @@ class Matrix:
         """
         turns = turns % 4
         if turns == 0:
-            return Matrix(self.matrix)
-        elif turns == 2:
-            rotated = [row[::-1] for row in self.matrix][::-1]
-            return Matrix(rotated)
+            return self.copy()
+        if turns == 2:
+            return Matrix._from_data(self.rows, self.cols, self._data[::-1])
+        # A clockwise turn makes column j, read bottom up, row j
+        data, c = self._data, self.cols
+        if turns == 1:
+            rotated = _pack(data[j::c][::-1] for j in range(c))
         else:
-            rotated = self.matrix
-            for _ in range(turns):
-                rotated = self.__rotate(rotated)
-            return Matrix(rotated)
-
-    def __rotate(self, mat: List[List[number]]):
-        rotated: List[List[number]] = [[0] * len(mat)] * len(mat[0])
-        for i, row in enumerate(mat):
-            for j, element in enumerate(row):
-                rotated[j][len(mat) - i - 1] = element
-        return rotated
+            rotated = _pack(data[j::c] for j in reversed(range(c)))
+        return Matrix._from_data(self.cols, self.rows, rotated)
 
     def trace(self) -> number:
         """Returns a trace of the matrix.
@@ -457,22 +1373,28 @@ class Matrix:
             The trace of the matrix.
         """
         if self.is_square():
-            total = 0.0
-            for i in range(self.rows):
-                total += self.matrix[i][i]
-            return total
+            return self._cached("trace", lambda: sum(self._data[:: self.cols + 1], 0.0))
         raise ValueError("The given matrix is not a square matrix.")
 
-    def transpose(self) -> "Matrix":
+    def transpose(self, out: Union["Matrix", None] = None) -> "Matrix":
         """Transposes the given matrix.
 
+        Parameters
+        ----------
+        out (Matrix, optional)
+            A matrix of order (cols, rows) to hold the result. It may be this
+            matrix when it is square.
+
         Returns
         -------
         arr: Matrix
-            The transposed matrix.
+            The transposed matrix, or `out` when given.
         """
-        arr = [[self.matrix[j][i] for j in range(self.rows)] for i in range(self.cols)]
-        return Matrix(arr)
+        data, c = self._data, self.cols
+        transposed = _pack(data[j::c] for j in range(c))
+        if out is None:
+            return Matrix._from_data(self.cols, self.rows, transposed)
+        return self._check_out(out, (self.cols, self.rows))._store(transposed)
 
     def to_list(self) -> List[List[number]]:
         """Returns the matrix as a list of lists.
@@ -482,7 +1404,7 @@ class Matrix:
         list :
             The matrix as a list of lists.
         """
-        return self.matrix
+        return self._rows()
 
     # Alias
     adj = adjoint
@@ -492,3 +1414,424 @@ class Matrix:
     is_upper_hessenberg = is_upper_triangular
     is_lower_hessenberg = is_lower_triangular
     size = order
+
+
+class LU:
+    """The LU factorization with partial pivoting of a square matrix."""
+
+    def __init__(self, matrix: Matrix):
+        if not matrix.is_square():
+            raise ValueError("The given matrix is not a square matrix.")
+        n = matrix.rows
+        lu = matrix._rows()
+        piv = list(range(n))
+        sign = 1
+        for j in range(n):
+            p = max(range(j, n), key=lambda i: abs(lu[i][j]))
+            piv[j] = p
+            if p != j:
+                lu[j], lu[p] = lu[p], lu[j]
+                sign = -sign
+            pivot = lu[j][j]
+            if pivot == 0:
+                continue
+            pivot_row = lu[j]
+            for i in range(j + 1, n):
+                row = lu[i]
+                factor = row[j] = row[j] / pivot
+                if factor != 0:
+                    for k in range(j + 1, n):
+                        row[k] -= factor * pivot_row[k]
+        self.n = n
+        self._lu = lu
+        self._piv = piv
+        self._sign = sign
+
+    def __repr__(self) -> str:
+        return f"<LU factorization of a {self.n}x{self.n} matrix>"
+
+    def det(self) -> float:
+        """Returns the determinant of the factored matrix."""
+        det = float(self._sign)
+        for i in range(self.n):
+            det *= self._lu[i][i]
+        return det
+
+    def solve(self, b: Union[Vector, Matrix]) -> Union[Vector, Matrix]:
+        """Solves A x = b for x.
+
+        Parameters
+        ----------
+        b: Vector or Matrix
+            The right-hand side. A Matrix is solved column by column.
+
+        Returns
+        -------
+        Vector or Matrix :
+            The solution, of the same type as b.
+
+        Raises
+        ------
+        ValueError
+            Raised if the shapes do not match or the matrix is singular.
+        """
+        rows, wrap = _rhs_rows(b, self.n)
+        return wrap(self._solve(rows))
+
+    def inverse(self) -> Matrix:
+        """Returns the inverse of the factored matrix."""
+        n = self.n
+        rows = self._solve([[float(i == j) for j in range(n)] for i in range(n)])
+        return Matrix._from_data(n, n, _pack(rows))
+
+    def _is_singular(self) -> bool:
+        return any(self._lu[i][i] == 0 for i in range(self.n))
+
+    def _solve(self, b: List[List[float]]) -> List[List[float]]:
+        lu = self._lu
+        if self._is_singular():
+            raise ValueError("The given matrix is not invertible.")
+        for i, p in enumerate(self._piv):
+            if p != i:
+                b[i], b[p] = b[p], b[i]
+        _solve_lower(lu, b, unit_diagonal=True)
+        _solve_upper(lu, b)
+        return b
+
+    @property
+    def L(self) -> Matrix:
+        """The unit lower triangular factor."""
+        n = self.n
+        return Matrix(
+            [
+                [self._lu[i][j] if j < i else float(i == j) for j in range(n)]
+                for i in range(n)
+            ]
+        )
+
+    @property
+    def U(self) -> Matrix:
+        """The upper triangular factor."""
+        n = self.n
+        return Matrix(
+            [[self._lu[i][j] if j >= i else 0.0 for j in range(n)] for i in range(n)]
+        )
+
+    @property
+    def P(self) -> Matrix:
+        """The row permutation, with P @ A == L @ U."""
+        n = self.n
+        rows = [[float(i == j) for j in range(n)] for i in range(n)]
+        for i, p in enumerate(self._piv):
+            if p != i:
+                rows[i], rows[p] = rows[p], rows[i]
+        return Matrix(rows)
+
+    @property
+    def order(self) -> Tuple[int, int]:
+        """The order of the factored matrix."""
+        return self.n, self.n
+
+
+def _rhs_rows(b: Union[Vector, Matrix], n: int):
+    """Returns b as a fresh list of rows and a function turning rows back into
+    b's type."""
+    if isinstance(b, Matrix):
+        if b.rows != n:
+            raise ValueError(
+                "The number of rows of b must match the order of the matrix."
+            )
+        return b.to_list(), lambda rows: Matrix._from_data(b.rows, b.cols, _pack(rows))
+    if isinstance(b, Vector):
+        if len(b) != n:
+            raise ValueError("The length of b must match the order of the matrix.")
+        return [[x] for x in b._data], lambda rows: Vector._from_data(
+            array("d", [row[0] for row in rows])
+        )
+    raise TypeError("b must be a Matrix or a Vector.")
+
+
+def _solve_lower(
+    t: List[List[number]], b: List[List[float]], unit_diagonal: bool = False
+):
+    """Solves T X = B in place using only the lower triangle of T."""
+    for i, row in enumerate(b):
+        for j in range(i):
+            factor = t[i][j]
+            if factor != 0:
+                row[:] = [x - factor * y for x, y in zip(row, b[j])]
+        if not unit_diagonal:
+            diag = t[i][i]
+            row[:] = [x / diag for x in row]
+
+
+def _solve_upper(
+    t: List[List[number]], b: List[List[float]], unit_diagonal: bool = False
+):
+    """Solves T X = B in place using only the upper triangle of T."""
+    n = len(b)
+    for i in range(n - 1, -1, -1):
+        row = b[i]
+        for j in range(i + 1, n):
+            factor = t[i][j]
+            if factor != 0:
+                row[:] = [x - factor * y for x, y in zip(row, b[j])]
+        if not unit_diagonal:
+            diag = t[i][i]
+            row[:] = [x / diag for x in row]
+
+
+def _cholesky(a: List[List[float]]) -> bool:
+    """Factors the rows of A in place into L with A = L L^T, reading only the
+    lower triangle, and mirrors L^T into the upper triangle.
+
+    Returns False if the matrix is not positive definite.
+    """
+    for j, pivot_row in enumerate(a):
+        head = pivot_row[:j]
+        d = pivot_row[j] - sum(x * x for x in head)
+        if not d > 0:
+            return False
+        d = pivot_row[j] = math.sqrt(d)
+        for row in a[j + 1 :]:
+            row[j] = (row[j] - sum(map(operator.mul, row[:j], head))) / d
+    for i, row in enumerate(a):
+        for j in range(i):
+            a[j][i] = row[j]
+    return True
+
+
+def _reflect(x: List[float], v: List[float], j: int, tau: float) -> None:
+    """Applies the reflector I - tau v v^T to x[j:] in place, where v[j] = 1
+    is implied and v[j + 1:] is stored in v."""
+    if tau == 0:
+        return
+    tail = v[j + 1 :]
+    w = tau * (x[j] + sum(map(operator.mul, tail, x[j + 1 :])))
+    x[j] -= w
+    x[j + 1 :] = [a - w * b for a, b in zip(x[j + 1 :], tail)]
+
+
+def _qr(at: List[List[float]], k: int) -> List[float]:
+    """Householder QR of the matrix whose columns are `at`, in place.
+
+    Leaves R on and above the diagonal (transposed) and reflector j below
+    it, in at[j][j + 1:], and returns the scales of the reflectors.
+    """
+    tau = []
+    for j in range(k):
+        x = at[j]
+        tail = sum(v * v for v in x[j + 1 :])
+        scale = 0.0
+        # A column already zero below the diagonal needs no reflection
+        if tail != 0:
+            alpha = x[j]
+            beta = math.sqrt(alpha * alpha + tail)
+            if alpha > 0:
+                beta = -beta
+            scale = (beta - alpha) / beta
+            x[j + 1 :] = [v / (alpha - beta) for v in x[j + 1 :]]
+            x[j] = beta
+        tau.append(scale)
+        for column in at[j + 1 :]:
+            _reflect(column, x, j, scale)
+    return tau
+
+
+_QL_MAX_ITER = 64
+
+
+def _tridiagonalize(w: List[List[float]], d: List[float], e: List[float]) -> None:
+    """Householder reduction of a symmetric matrix to tridiagonal form (tred2).
+
+    `w` holds the transpose of the matrix (only its lower triangle is read)
+    and is replaced by the transpose of the accumulated transformation; the
+    diagonal goes to `d` and the subdiagonal to e[1:].
+    """
+    n = len(w)
+    for j in range(n):
+        d[j] = w[j][n - 1]
+
+    for i in range(n - 1, 0, -1):
+        wi = w[i]
+        scale = sum(abs(x) for x in d[:i])
+        h = 0.0
+        if scale == 0:
+            e[i] = d[i - 1]
+            for j in range(i):
+                d[j] = w[j][i - 1]
+                w[j][i] = 0.0
+                wi[j] = 0.0
+        else:
+            # Householder vector of row i, scaled to avoid underflow
+            d[:i] = [x / scale for x in d[:i]]
+            h = sum(x * x for x in d[:i])
+            f = d[i - 1]
+            g = math.sqrt(h)
+            if f > 0:
+                g = -g
+            e[i] = scale * g
+            h -= f * g
+            d[i - 1] = f - g
+            e[:i] = [0.0] * i
+
+            # e = A d / h, then the similarity transformation
+            for j in range(i):
+                wj = w[j]
+                f = wi[j] = d[j]
+                g = e[j] + wj[j] * f
+                for k in range(j + 1, i):
+                    g += wj[k] * d[k]
+                    e[k] += wj[k] * f
+                e[j] = g
+            e[:i] = [x / h for x in e[:i]]
+            hh = sum(map(operator.mul, e[:i], d[:i])) / (h + h)
+            e[:i] = [x - hh * y for x, y in zip(e[:i], d[:i])]
+            for j in range(i):
+                wj = w[j]
+                f, g = d[j], e[j]
+                wj[j:i] = [
+                    x - (f * y + g * z) for x, y, z in zip(wj[j:i], e[j:i], d[j:i])
+                ]
+                d[j] = wj[i - 1]
+                wj[i] = 0.0
+        d[i] = h
+
+    # Accumulate the transformations
+    for i in range(n - 1):
+        wi, following = w[i], w[i + 1]
+        wi[n - 1] = wi[i]
+        wi[i] = 1.0
+        h = d[i + 1]
+        if h != 0:
+            d[: i + 1] = [x / h for x in following[: i + 1]]
+            for wj in w[: i + 1]:
+                g = sum(map(operator.mul, following[: i + 1], wj[: i + 1]))
+                wj[: i + 1] = [x - g * y for x, y in zip(wj[: i + 1], d[: i + 1])]
+        following[: i + 1] = [0.0] * (i + 1)
+    for j in range(n):
+        d[j] = w[j][n - 1]
+        w[j][n - 1] = 0.0
+    w[n - 1][n - 1] = 1.0
+    e[0] = 0.0
+
+
+def _tridiagonal_ql(w: List[List[float]], d: List[float], e: List[float]) -> bool:
+    """Diagonalizes the tridiagonal matrix left by _tridiagonalize with the
+    implicit QL algorithm (tql2), rotating the rows of `w` into eigenvectors.
+
+    Returns False if an eigenvalue does not converge.
+    """
+    n = len(d)
+    e[:-1] = e[1:]
+    e[-1] = 0.0
+    eps = sys.float_info.epsilon
+    f = tst1 = 0.0
+    for l in range(n):
+        # Find a small subdiagonal element
+        tst1 = max(tst1, abs(d[l]) + abs(e[l]))
+        m = l
+        while m < n - 1 and abs(e[m]) > eps * tst1:
+            m += 1
+
+        iterations = 0
+        while m > l and abs(e[l]) > eps * tst1:
+            iterations += 1
+            if iterations > _QL_MAX_ITER:
+                return False
+
+            # Implicit shift
+            g = d[l]
+            p = (d[l + 1] - g) / (2.0 * e[l])
+            r = math.hypot(p, 1.0)
+            if p < 0:
+                r = -r
+            d[l] = e[l] / (p + r)
+            d[l + 1] = e[l] * (p + r)
+            dl1 = d[l + 1]
+            h = g - d[l]
+            d[l + 2 :] = [x - h for x in d[l + 2 :]]
+            f += h
+
+            # QL sweep, rotating pairs of eigenvector rows
+            p = d[m]
+            c = c2 = c3 = 1.0
+            s = s2 = 0.0
+            el1 = e[l + 1]
+            for i in range(m - 1, l - 1, -1):
+                c3, c2, s2 = c2, c, s
+                g = c * e[i]
+                h = c * p
+                r = math.hypot(p, e[i])
+                e[i + 1] = s * r
+                s = e[i] / r
+                c = p / r
+                p = c * d[i] - s * g
+                d[i + 1] = h + s * (c * g + s * d[i])
+                wa, wb = w[i + 1], w[i]
+                w[i + 1] = [s * y + c * x for x, y in zip(wa, wb)]
+                w[i] = [c * y - s * x for x, y in zip(wa, wb)]
+            p = -s * s2 * c3 * el1 * e[l] / dl1
+            e[l] = s * p
+            d[l] = c * p
+        d[l] += f
+        e[l] = 0.0
+    return True
+
+
+# Operators of the fused code compiled by matmath.lazy(), by opcode; 0 and 1
+# push an operand and a constant, 7 negates
+_FUSED_OPERATORS = {2: "+", 3: "-", 4: "*", 5: "/", 6: "//"}
+
+
+def _fused(
+    code: List[int],
+    operands: List[Matrix],
+    constants: List[float],
+    out: Union[Matrix, None] = None,
+) -> Matrix:
+    """Evaluates postfix element-wise `code` (opcode, argument pairs) over
+    matrices of one order, into `out` or a new matrix.
+
+    The code is turned into the source of one function of an element of each
+    operand, mapped over their buffers in a single pass.
+    """
+    if not operands or any(m.order != operands[0].order for m in operands):
+        raise ValueError("The 2 matrices do not have the same order.")
+    lines: List[str] = []
+    stack: List[Tuple[str, bool]] = []  # (name, is a block rather than a constant)
+    for i in range(0, len(code), 2):
+        op, arg = code[i], code[i + 1]
+        if op in (0, 1) and 0 <= arg < (len(operands) if op == 0 else len(constants)):
+            stack.append((f"x{arg}" if op == 0 else f"c{arg}", op == 0))
+        elif op == 7 and stack and stack[-1][1]:
+            lines.append(f"    t{i} = -{stack.pop()[0]}")
+            stack.append((f"t{i}", True))
+        elif (
+            op in _FUSED_OPERATORS
+            and len(stack) >= 2
+            and (stack[-2][1] or stack[-1][1])
+        ):
+            (x, _), (y, _) = stack[-2:]
+            del stack[-2:]
+            lines.append(f"    t{i} = {x} {_FUSED_OPERATORS[op]} {y}")
+            stack.append((f"t{i}", True))
+        else:
+            raise ValueError(f"Invalid fused code at instruction {i // 2}.")
+    if len(stack) != 1 or not stack[0][1]:
+        raise ValueError("Fused code must leave a single matrix.")
+
+    arguments = ", ".join(f"x{k}" for k in range(len(operands)))
+    body = "".join(line + "\n" for line in lines)
+    source = f"def element({arguments}):\n{body}    return {stack[0][0]}\n"
+    namespace: Dict[str, Any] = {f"c{k}": float(c) for k, c in enumerate(constants)}
+    exec(source, namespace)
+    try:
+        data = array("d", map(namespace["element"], *(m._data for m in operands)))
+    except ZeroDivisionError:
+        raise ZeroDivisionError("Division by zero") from None
+    rows, cols = operands[0].order
+    if out is None:
+        return Matrix._from_data(rows, cols, data)
+    operands[0]._check_out(out, (rows, cols))
+    return out._store(data)
@@ -0,0 +1,32 @@
+"""Thread configuration for the pure Python engine.
+
+The pure Python engine always runs single-threaded; these functions only keep
+code written against the C extensions working.
+"""
+
+_num_threads = 1
+
+
+def set_num_threads(n: int) -> None:
+    """Sets the number of threads used by large kernels.
+
+    Parameters
+    ----------
+    n : int
+        The number of threads. Must be between 1 and 256.
+
+    Raises
+    ------
+    ValueError
+        Raised if n is out of range.
+    """
+    global _num_threads
+    n = int(n)
+    if n < 1 or n > 256:
+        raise ValueError("Number of threads must be between 1 and 256")
+    _num_threads = n
+
+
+def get_num_threads() -> int:
+    """Returns the number of threads used by large kernels."""
+    return _num_threads
@@ -0,0 +1,321 @@
+"""Operation counters for the pure Python engine.
+
+Reports the same operations, with the same byte and FLOP estimates, as the
+counters of the C extensions (see matmath._profile). The instrumented methods
+are only wrapped while profiling is on, so there is no cost otherwise. Only
+the outermost instrumented call is counted, so `m.matmul(x)` records one
+`matmul` and not also the `@` it is built on. Work saved by the derived
+results cache (see Matrix.lu()) is not counted, as in the C engine.
+"""
+
+import functools
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from matmath.legacy import matrix as _matrix
+from matmath.legacy.matrix import Matrix
+from matmath.legacy.sparse import SparseMatrix
+from matmath.legacy.vector import Vector
+
+Cost = Optional[Tuple[str, float, float]]
+
+_enabled = False
+_counters: Dict[
+    str, List[float]
+] = {}  # op -> [calls, total_time, max_time, bytes, flops]
+_originals: List[Tuple[Any, str, Any]] = []
+
+
+class _State(threading.local):
+    """The outermost instrumented call running on the current thread"""
+
+    def __init__(self) -> None:
+        self.depth = 0
+        # Derived results its matrix had cached when it started
+        self.cached: Dict[str, Any] = {}
+        # Whether a Cholesky factorization it ran succeeded, None if it ran none
+        self.cholesky: Optional[bool] = None
+
+
+_state = _State()
+
+
+def _lu_bytes(n: int) -> float:
+    return 8.0 * n * n + 8.0 * n
+
+
+def _lu_flops(n: int) -> float:
+    return 2.0 * n ** 3 / 3.0
+
+
+def _lu_inverse_flops(n: int) -> float:
+    return _lu_flops(n) + 2.0 * n ** 3
+
+
+def _cholesky_flops(n: int) -> float:
+    return n ** 3 / 3.0
+
+
+def _elementwise(op: str) -> Callable[..., Cost]:
+    def cost(result: Any, self: Matrix, *args: Any, **kwargs: Any) -> Cost:
+        size = self.rows * self.cols
+        # In-place operators and out= write into existing storage
+        arguments = (self,) + args + tuple(kwargs.values())
+        allocated = not any(result is argument for argument in arguments)
+        return op, 8.0 * size if allocated else 0.0, float(size)
+
+    return cost
+
+
+def _matmul(result: Any, self: Matrix, other: Any, *args: Any, **kwargs: Any) -> Cost:
+    if isinstance(result, Vector):
+        return "matvec", 8.0 * len(result), 2.0 * self.rows * self.cols
+    m, n = result.order
+    # The product is always formed in new storage, even for @= and out=
+    return "matmul", 8.0 * m * n, 2.0 * m * n * self.cols
+
+
+def _apply(result: Any, self: Matrix, vectors: Any) -> Cost:
+    m, n = self.order
+    count = len(result)
+    return "apply", 8.0 * (count * n + n * m + 2 * count * m), 2.0 * count * m * n
+
+
+def _transpose(result: Matrix, self: Matrix, out: Optional[Matrix] = None) -> Cost:
+    return "transpose", 0.0 if result is out else 8.0 * self.rows * self.cols, 0.0
+
+
+def _copy(result: Matrix, self: Matrix) -> Cost:
+    return "copy", 8.0 * self.rows * self.cols, 0.0
+
+
+def _factorization(op: str) -> Callable[..., Cost]:
+    def cost(result: Any, self: Matrix) -> Cost:
+        n = self.rows
+        if op == "determinant" or op == "lu":
+            if "lu" in _state.cached or (
+                op == "determinant" and "det" in _state.cached
+            ):
+                return None
+            return op, _lu_bytes(n), _lu_flops(n)
+        if op == "inverse" and "inverse" in _state.cached:
+            return None
+        if op == "inverse" and "lu" in _state.cached:
+            return op, 8.0 * n * n, 2.0 * n ** 3
+        flops = _lu_inverse_flops(n) + (n * n if op == "adjoint" else 0)
+        return op, _lu_bytes(n) + 8.0 * n * n, flops
+
+    return cost
+
+
+def _solve(result: Any, self: Matrix, b: Any) -> Cost:
+    n = self.rows
+    k = 1 if isinstance(b, Vector) else b.cols
+    if self._upper_triangular() or self._lower_triangular():
+        return "solve", 8.0 * n * k, float(n * n * k)
+    if self._symmetric():
+        if "cholesky" in _state.cached:
+            if _state.cached["cholesky"]:
+                return "solve", 8.0 * n * k, 2.0 * n * n * k
+        elif _state.cholesky:
+            return (
+                "solve",
+                8.0 * n * k + 8.0 * n * n,
+                _cholesky_flops(n) + 2.0 * n * n * k,
+            )
+    if "lu" in _state.cached:
+        return "solve", 8.0 * n * k, 2.0 * n * n * k
+    return "solve", 8.0 * n * k + _lu_bytes(n), _lu_flops(n) + 2.0 * n * n * k
+
+
+def _solve_triangular(result: Any, self: Matrix, b: Any, lower: bool = False) -> Cost:
+    n = self.rows
+    k = 1 if isinstance(b, Vector) else b.cols
+    return "solve_triangular", 8.0 * n * k, float(n * n * k)
+
+
+def _cholesky_cost(result: Matrix, self: Matrix) -> Cost:
+    if "cholesky" in _state.cached:
+        return None
+    n = self.rows
+    return "cholesky", 8.0 * n * n, _cholesky_flops(n)
+
+
+def _qr(result: Any, self: Matrix) -> Cost:
+    # Factoring with k reflectors, then forming the m x k Q
+    m, n = self.order
+    k = min(m, n)
+    flops = 4.0 * m * n * k - 2.0 * n * k * k + 2.0 * k * k * k / 3.0
+    return "qr", 8.0 * (m * n + 2 * m * k + k * n + k), flops
+
+
+def _eigh(result: Any, self: Matrix) -> Cost:
+    n = self.rows
+    return "eigh", 8.0 * (2 * n * n + 2 * n), 9.0 * n ** 3
+
+
+def _pow(result: Any, self: Matrix, power: int = 2) -> Cost:
+    n = self.rows
+    power = abs(power)
+    if power <= 1:
+        return "pow", 8.0 * n * n, 0.0
+    # One product per squaring and one per extra set bit
+    products = power.bit_length() - 1 + bin(power).count("1") - 1
+    return "pow", 16.0 * n * n, 2.0 * n ** 3 * products
+
+
+def _fused(
+    result: Matrix, code: Any, operands: Any, constants: Any, out: Any = None
+) -> Cost:
+    size = result.rows * result.cols
+    # One FLOP per element for each arithmetic opcode (all but the two loads)
+    arithmetic = sum(1 for op in code[::2] if op > 1)
+    return "fused", 0.0 if out is not None else 8.0 * size, float(arithmetic * size)
+
+
+def _sparse_matmul(dense_first: bool) -> Callable[..., Cost]:
+    def cost(result: Any, self: SparseMatrix, other: Any) -> Cost:
+        if isinstance(result, Vector):
+            return "sparse_matmul", 8.0 * len(result), 2.0 * self.nnz
+        rows, cols = result.order
+        return (
+            "sparse_matmul",
+            8.0 * rows * cols,
+            2.0 * self.nnz * (rows if dense_first else cols),
+        )
+
+    return cost
+
+
+# (class or module, attribute names, cost)
+_INSTRUMENTED: List[Tuple[Any, Tuple[str, ...], Callable[..., Cost]]] = [
+    (Matrix, ("__add__", "__iadd__", "add"), _elementwise("add")),
+    (Matrix, ("__sub__", "__isub__", "sub"), _elementwise("sub")),
+    (Matrix, ("__mul__", "__rmul__", "__imul__"), _elementwise("mul")),
+    (Matrix, ("__truediv__", "__itruediv__"), _elementwise("truediv")),
+    (Matrix, ("__floordiv__", "__ifloordiv__"), _elementwise("floordiv")),
+    (Matrix, ("__matmul__", "__rmatmul__", "__imatmul__", "matmul"), _matmul),
+    (Matrix, ("apply",), _apply),
+    (Matrix, ("transpose",), _transpose),
+    (Matrix, ("copy",), _copy),
+    (Matrix, ("determinant", "det"), _factorization("determinant")),
+    (Matrix, ("inverse", "inv"), _factorization("inverse")),
+    (Matrix, ("adjoint", "adj"), _factorization("adjoint")),
+    (Matrix, ("lu",), _factorization("lu")),
+    (Matrix, ("solve",), _solve),
+    (Matrix, ("solve_triangular",), _solve_triangular),
+    (Matrix, ("cholesky",), _cholesky_cost),
+    (Matrix, ("qr",), _qr),
+    (Matrix, ("eigh",), _eigh),
+    (Matrix, ("pow", "__pow__"), _pow),
+    (_matrix, ("_fused",), _fused),
+    (SparseMatrix, ("__matmul__",), _sparse_matmul(False)),
+    (SparseMatrix, ("__rmatmul__",), _sparse_matmul(True)),
+]
+
+
+def _record(op: str, elapsed: float, nbytes: float, flops: float) -> None:
+    counter = _counters.setdefault(op, [0, 0.0, 0.0, 0.0, 0.0])
+    counter[0] += 1
+    counter[1] += elapsed
+    counter[2] = max(counter[2], elapsed)
+    counter[3] += nbytes
+    counter[4] += flops
+
+
+def _wrap(method: Callable[..., Any], cost: Callable[..., Cost]) -> Callable[..., Any]:
+    @functools.wraps(method)
+    def wrapper(*args: Any, **kwargs: Any) -> Any:
+        state = _state
+        if state.depth:
+            return method(*args, **kwargs)
+        subject = args[0] if args else None
+        state.cached = dict(subject._cache or {}) if isinstance(subject, Matrix) else {}
+        state.cholesky = None
+        state.depth += 1
+        try:
+            start = time.perf_counter()
+            result = method(*args, **kwargs)
+            elapsed = time.perf_counter() - start
+        finally:
+            state.depth -= 1
+        if result is not NotImplemented:
+            counted = cost(result, *args, **kwargs)
+            if counted is not None:
+                _record(counted[0], elapsed, *counted[1:])
+        return result
+
+    return wrapper
+
+
+def _watch_cholesky(method: Callable[..., Any]) -> Callable[..., Any]:
+    """Wraps Matrix._cholesky_factor to note whether solve() used Cholesky"""
+
+    @functools.wraps(method)
+    def wrapper(self: Matrix) -> Any:
+        factor = method(self)
+        _state.cholesky = bool(factor)
+        return factor
+
+    return wrapper
+
+
+def set_profiling(enabled: bool) -> bool:
+    """Turns the operation counters on or off.
+
+    Parameters
+    ----------
+    enabled : bool
+        Whether to record operations.
+
+    Returns
+    -------
+    bool :
+        The previous setting.
+    """
+    global _enabled
+    enabled = bool(enabled)
+    previous = _enabled
+    if enabled and not previous:
+        for cls, names, cost in _INSTRUMENTED:
+            for name in names:
+                original = cls.__dict__[name]
+                _originals.append((cls, name, original))
+                setattr(cls, name, _wrap(original, cost))
+        original = Matrix.__dict__["_cholesky_factor"]
+        _originals.append((Matrix, "_cholesky_factor", original))
+        Matrix._cholesky_factor = _watch_cholesky(original)
+    elif previous and not enabled:
+        while _originals:
+            cls, name, original = _originals.pop()
+            setattr(cls, name, original)
+    _enabled = enabled
+    return previous
+
+
+def stats() -> Dict[str, Dict[str, Any]]:
+    """Returns the operation counters recorded while profiling.
+
+    Returns
+    -------
+    dict :
+        Maps each operation called since the last reset_stats() to a dict
+        with its `calls`, `total_time` and `max_time` (in seconds), `bytes`
+        allocated and estimated `flops`.
+    """
+    return {
+        op: {
+            "calls": int(calls),
+            "total_time": total,
+            "max_time": longest,
+            "bytes": int(nbytes),
+            "flops": int(flops),
+        }
+        for op, (calls, total, longest, nbytes, flops) in _counters.items()
+    }
+
+
+def reset_stats() -> None:
+    """Clears the operation counters."""
+    _counters.clear()
@@ -0,0 +1,347 @@
+"""A module for sparse matrices stored in compressed sparse row (CSR) form."""
+
+from typing import Any, Iterable, List, Tuple, Union
+
+from matmath.legacy.matrix import Matrix
+from matmath.legacy.vector import Vector
+
+number = Union[int, float]
+
+
+class SparseMatrix:
+    """A class to represent a sparse matrix.
+
+    The entries of row `i` are `indices[indptr[i]:indptr[i + 1]]` (sorted
+    column indices) and the matching slice of `data`. Zeros are never stored.
+    """
+
+    def __init__(
+        self,
+        order: Tuple[int, int],
+        rows: Iterable[int] = (),
+        cols: Iterable[int] = (),
+        values: Iterable[number] = (),
+    ):
+        n_rows, n_cols = self._parse_order(order)
+        rows, cols, values = list(rows), list(cols), list(values)
+        if not len(rows) == len(cols) == len(values):
+            raise ValueError("rows, cols and values must have the same length")
+        entries: List[dict] = [{} for _ in range(n_rows)]
+        for i, j, value in zip(rows, cols, values):
+            if not isinstance(value, (int, float)):
+                raise TypeError("All values must be `int` or `float`.")
+            if not (0 <= i < n_rows and 0 <= j < n_cols):
+                raise IndexError("SparseMatrix index out of range")
+            entries[i][j] = entries[i].get(j, 0.0) + float(value)
+        self._build(
+            n_rows,
+            n_cols,
+            ([(j, v) for j, v in sorted(row.items()) if v != 0] for row in entries),
+        )
+
+    def _build(
+        self, n_rows: int, n_cols: int, rows: Iterable[List[Tuple[int, float]]]
+    ) -> None:
+        self.rows: int = n_rows
+        self.cols: int = n_cols
+        self.indptr: List[int] = [0]
+        self.indices: List[int] = []
+        self.data: List[float] = []
+        for row in rows:
+            for j, value in row:
+                self.indices.append(j)
+                self.data.append(value)
+            self.indptr.append(len(self.indices))
+
+    @classmethod
+    def _from_rows(
+        cls, n_rows: int, n_cols: int, rows: Iterable[List[Tuple[int, float]]]
+    ) -> "SparseMatrix":
+        result = cls.__new__(cls)
+        result._build(n_rows, n_cols, rows)
+        return result
+
+    @staticmethod
+    def _parse_order(order: Any) -> Tuple[int, int]:
+        if not isinstance(order, tuple) or len(order) != 2:
+            raise TypeError("order must be a tuple of (rows, cols)")
+        n_rows, n_cols = order
+        if n_rows <= 0 or n_cols <= 0:
+            raise ValueError("Matrix dimensions must be positive")
+        return n_rows, n_cols
+
+    def _row(self, i: int) -> List[Tuple[int, float]]:
+        start, end = self.indptr[i], self.indptr[i + 1]
+        return list(zip(self.indices[start:end], self.data[start:end]))
+
+    def _find(self, i: int, j: int) -> int:
+        lo, hi = self.indptr[i], self.indptr[i + 1]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self.indices[mid] < j:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo if lo < self.indptr[i + 1] and self.indices[lo] == j else -1
+
+    def __len__(self) -> int:
+        """Returns the number of rows in the matrix"""
+        return self.rows
+
+    def __getitem__(self, key: Tuple[int, int]) -> float:
+        """Returns the element at (row, col)"""
+        if not isinstance(key, tuple) or len(key) != 2:
+            raise TypeError("SparseMatrix indices must be a tuple of (row, col)")
+        i, j = key
+        if not (-self.rows <= i < self.rows and -self.cols <= j < self.cols):
+            raise IndexError("SparseMatrix index out of range")
+        p = self._find(i % self.rows, j % self.cols)
+        return self.data[p] if p >= 0 else 0.0
+
+    def __repr__(self) -> str:
+        """Returns a summary of the sparse matrix"""
+        return f"<SparseMatrix {self.rows}x{self.cols} with {self.nnz} stored entries>"
+
+    def __eq__(self, other: Any) -> bool:
+        """Returns True if both sparse matrices are equal, False otherwise"""
+        if not isinstance(other, SparseMatrix):
+            return NotImplemented
+        return (
+            self.order == other.order
+            and self.indptr == other.indptr
+            and self.indices == other.indices
+            and self.data == other.data
+        )
+
+    def __ne__(self, other: Any) -> bool:
+        """Returns True if the sparse matrices differ, False otherwise"""
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    def _merge(self, other: Any, sign: float, type_error: str) -> "SparseMatrix":
+        if not isinstance(other, SparseMatrix):
+            raise TypeError(type_error)
+        if self.order != other.order:
+            raise ValueError("The 2 matrices do not have the same order.")
+        rows = []
+        for i in range(self.rows):
+            merged = dict(self._row(i))
+            for j, value in other._row(i):
+                merged[j] = merged.get(j, 0.0) + sign * value
+            rows.append([(j, v) for j, v in sorted(merged.items()) if v != 0])
+        return self._from_rows(self.rows, self.cols, rows)
+
+    def __add__(self, other: "SparseMatrix") -> "SparseMatrix":
+        """Adds two sparse matrices"""
+        return self._merge(other, 1.0, "Can only add SparseMatrix to SparseMatrix")
+
+    def __sub__(self, other: "SparseMatrix") -> "SparseMatrix":
+        """Subtracts two sparse matrices"""
+        return self._merge(
+            other, -1.0, "Can only subtract SparseMatrix from SparseMatrix"
+        )
+
+    def _scaled(self, factor: float) -> "SparseMatrix":
+        if factor == 0:
+            return self._from_rows(self.rows, self.cols, ([] for _ in range(self.rows)))
+        result = self._from_rows(self.rows, self.cols, ())
+        result.indptr = list(self.indptr)
+        result.indices = list(self.indices)
+        result.data = [value * factor for value in self.data]
+        return result
+
+    def __mul__(self, other: number) -> "SparseMatrix":
+        """Multiplies the sparse matrix by a number"""
+        if not isinstance(other, (int, float)):
+            raise TypeError("Can only multiply SparseMatrix by a number")
+        return self._scaled(other)
+
+    def __rmul__(self, other: number) -> "SparseMatrix":
+        """Multiplies a number by the sparse matrix"""
+        return self.__mul__(other)
+
+    def __truediv__(self, other: number) -> "SparseMatrix":
+        """Divides the sparse matrix by a number"""
+        if not isinstance(other, (int, float)):
+            raise TypeError("Can only divide SparseMatrix by a number")
+        return self._scaled(1 / other)
+
+    def __neg__(self) -> "SparseMatrix":
+        """Negates the sparse matrix"""
+        return self._scaled(-1.0)
+
+    def __matmul__(self, other: Union[Matrix, Vector]) -> Union[Matrix, Vector]:
+        """Returns the product of the sparse matrix and a matrix/vector"""
+        if isinstance(other, Vector):
+            if len(other) != self.cols:
+                raise ValueError(
+                    "Matrix and vector dimensions incompatible for multiplication"
+                )
+            x = other.to_list()
+            return Vector(
+                [sum(v * x[j] for j, v in self._row(i)) for i in range(self.rows)]
+            )
+        if isinstance(other, Matrix):
+            if other.rows != self.cols:
+                raise ValueError("Matrix dimensions incompatible for multiplication")
+            dense = other.to_list()
+            result = []
+            for i in range(self.rows):
+                row = [0.0] * other.cols
+                for j, v in self._row(i):
+                    row = [x + v * y for x, y in zip(row, dense[j])]
+                result.append(row)
+            return Matrix(result)
+        raise TypeError("Can only matrix multiply SparseMatrix with Matrix or Vector")
+
+    def __rmatmul__(self, other: Union[Matrix, Vector]) -> Union[Matrix, Vector]:
+        """Returns the product of a matrix/row vector and the sparse matrix"""
+        if isinstance(other, Vector):
+            if len(other) != self.rows:
+                raise ValueError(
+                    "Matrix and vector dimensions incompatible for multiplication"
+                )
+            return Vector(self._left_product(other.to_list()))
+        if isinstance(other, Matrix):
+            if other.cols != self.rows:
+                raise ValueError("Matrix dimensions incompatible for multiplication")
+            return Matrix([self._left_product(row) for row in other])
+        return NotImplemented
+
+    def _left_product(self, x: List[number]) -> List[float]:
+        result = [0.0] * self.cols
+        for i, xi in enumerate(x):
+            if xi != 0:
+                for j, v in self._row(i):
+                    result[j] += xi * v
+        return result
+
+    @classmethod
+    def from_dense(cls, matrix: Matrix) -> "SparseMatrix":
+        """Returns a sparse matrix holding the non-zero elements of a matrix."""
+        if not isinstance(matrix, Matrix):
+            raise TypeError("Argument must be a Matrix")
+        return cls._from_rows(
+            matrix.rows,
+            matrix.cols,
+            ([(j, v) for j, v in enumerate(row) if v != 0] for row in matrix),
+        )
+
+    @classmethod
+    def identity(cls, n: int = 3) -> "SparseMatrix":
+        """Returns a sparse identity matrix of order n."""
+        if n <= 0:
+            raise ValueError("Matrix size must be positive")
+        return cls._from_rows(n, n, ([(i, 1.0)] for i in range(n)))
+
+    def to_dense(self) -> Matrix:
+        """Returns the sparse matrix as a dense Matrix."""
+        result = [[0.0] * self.cols for _ in range(self.rows)]
+        for i in range(self.rows):
+            for j, v in self._row(i):
+                result[i][j] = v
+        return Matrix(result)
+
+    def to_coo(self) -> Tuple[List[int], List[int], List[float]]:
+        """Returns the (rows, cols, values) lists of the stored entries."""
+        rows = [
+            i
+            for i in range(self.rows)
+            for _ in range(self.indptr[i], self.indptr[i + 1])
+        ]
+        return rows, list(self.indices), list(self.data)
+
+    def copy(self) -> "SparseMatrix":
+        """Returns a copy of the sparse matrix."""
+        return self._scaled(1.0)
+
+    def transpose(self) -> "SparseMatrix":
+        """Returns the transpose of the sparse matrix."""
+        columns: List[List[Tuple[int, float]]] = [[] for _ in range(self.cols)]
+        for i in range(self.rows):
+            for j, v in self._row(i):
+                columns[j].append((i, v))
+        return self._from_rows(self.cols, self.rows, columns)
+
+    @property
+    def T(self) -> "SparseMatrix":
+        """Returns the transpose of the sparse matrix."""
+        return self.transpose()
+
+    @property
+    def order(self) -> Tuple[int, int]:
+        """Returns the order (rows, cols) of the sparse matrix."""
+        return self.rows, self.cols
+
+    size = order
+
+    @property
+    def nnz(self) -> int:
+        """Returns the number of stored (non-zero) entries."""
+        return self.indptr[-1]
+
+    def trace(self) -> float:
+        """Returns the trace of the sparse matrix."""
+        if not self.is_square():
+            raise ValueError("The given matrix is not a square matrix.")
+        total = 0.0
+        for i in range(self.rows):
+            p = self._find(i, i)
+            if p >= 0:
+                total += self.data[p]
+        return total
+
+    def is_square(self) -> bool:
+        """Returns True if the matrix is square, False otherwise."""
+        return self.rows == self.cols
+
+    def _mirrors(self, sign: float) -> bool:
+        if not self.is_square():
+            return False
+        for i in range(self.rows):
+            for j, v in self._row(i):
+                p = self._find(j, i)
+                if p < 0 or self.data[p] != sign * v:
+                    return False
+        return True
+
+    def is_symmetric(self) -> bool:
+        """Returns True if the matrix is symmetric, False otherwise."""
+        return self._mirrors(1.0)
+
+    def is_skew_symmetric(self) -> bool:
+        """Returns True if the matrix is skew-symmetric, False otherwise."""
+        return self._mirrors(-1.0)
+
+    def _banded(self, lower: bool, upper: bool) -> bool:
+        if not self.is_square():
+            return False
+        for i in range(self.rows):
+            for j, _ in self._row(i):
+                if (j > i and not upper) or (j < i and not lower):
+                    return False
+        return True
+
+    def is_diagonal(self) -> bool:
+        """Returns True if the matrix is diagonal, False otherwise."""
+        return self._banded(False, False)
+
+    def is_lower_triangular(self) -> bool:
+        """Returns True if the matrix is lower triangular, False otherwise."""
+        return self._banded(True, False)
+
+    def is_upper_triangular(self) -> bool:
+        """Returns True if the matrix is upper triangular, False otherwise."""
+        return self._banded(False, True)
+
+    def is_identity(self) -> bool:
+        """Returns True if the matrix is identity, False otherwise."""
+        return (
+            self.is_diagonal()
+            and self.nnz == self.rows
+            and all(abs(v - 1.0) <= 1e-10 for v in self.data)
+        )
+
+    def is_null(self) -> bool:
+        """Returns True if the matrix is null, False otherwise."""
+        return self.nnz == 0
@@ -1,66 +1,88 @@
 """A module to represent vectors in n-dimensional space."""
 
+import operator
+from array import array
 from math import acos, cos, pi, sin, sqrt
-from typing import Any, List, Optional, Union
+from pickle import PickleBuffer
+from typing import Any, Iterable, List, Optional, Tuple, Union
+
+
+def _format(x: float) -> str:
+    return "%.10g" % x
 
 
 class Vector:
-    """A class to represent a vector in n-dimensional space."""
+    """A class to represent a vector in n-dimensional space.
 
-    vector: List[float]
-    length: int
+    The elements are stored as doubles in a flat `array('d')`, like the
+    C engine, so arithmetic runs over the buffer with `map` instead of
+    indexing element by element.
+    """
 
-    def __init__(self, arr: Optional[List[float]] = None):
+    __slots__ = ("_data",)
+
+    def __init__(self, arr: Optional[Iterable[float]] = None):
         if arr is None:
             arr = [0, 0]
+        arr = list(arr)
         for i in arr:
             if not isinstance(i, (int, float)):
                 raise TypeError("All elements of the vector must be `int` or `float`.")
-        self.vector = arr
-        self.length = len(arr)
+        self._data = array("d", arr)
+
+    @classmethod
+    def _from_data(cls, data: array) -> "Vector":
+        """Returns a vector taking ownership of a buffer of doubles"""
+        vector = cls.__new__(cls)
+        vector._data = data
+        return vector
 
     def __len__(self) -> int:
         """returns the number of elements in the vector"""
-        return self.length
+        return len(self._data)
 
-    def __getitem__(self, key: int) -> float:
+    def __getitem__(self, key: Union[int, slice]) -> Union[float, List[float]]:
         """Returns the element at key in the vector"""
-        return self.vector[key]
+        if isinstance(key, slice):
+            return self._data[key].tolist()
+        return self._data[key]
 
     def __repr__(self) -> str:
         """Returns a string construction of the vector"""
-        return f"Vector({str(self.vector)})"
+        return f"Vector([{', '.join(map(_format, self._data))}])"
 
     def __str__(self) -> str:
         """Returns a string representation of the vector"""
-        return "<" + str(self.vector)[1:-1] + ">"
+        return "<" + ", ".join(map(_format, self._data)) + ">"
 
     def __add__(self, other: "Vector") -> "Vector":
         """Adds 2 vectors of the same dimension"""
-        if not isinstance(other, self.__class__):
+        if not isinstance(other, Vector):
             raise ValueError("The second argument must be a vector.")
-        if self.length == len(other.vector):
-            result = [i + j for i, j in zip(self.vector, other.vector)]
-            return Vector(result)
+        if len(self._data) == len(other._data):
+            return Vector._from_data(
+                array("d", map(operator.add, self._data, other._data))
+            )
         raise TypeError("The dimension of the 2 vectors must be the same.")
 
     def __sub__(self, other: "Vector") -> "Vector":
         """Subtracts 2 vectors of the same dimension"""
-        if not isinstance(other, self.__class__):
+        if not isinstance(other, Vector):
             raise ValueError("The second argument must be a vector.")
-        if self.length == len(other.vector):
-            result = [i - j for i, j in zip(self.vector, other.vector)]
-            return Vector(result)
+        if len(self._data) == len(other._data):
+            return Vector._from_data(
+                array("d", map(operator.sub, self._data, other._data))
+            )
         raise TypeError("The dimension of the 2 vectors must be the same.")
 
     def __mul__(self, other: Union[int, float, "Vector"]) -> "Vector":
         """Returns the product of vector and a number"""
         if isinstance(other, (int, float)):
-            result = [i * other for i in self.vector]
-            return Vector(result)
-        if isinstance(other, self.__class__):
-            result = [i * j for i, j in zip(self.vector, other.vector)]
-            return Vector(result)
+            return Vector._from_data(array("d", [i * other for i in self._data]))
+        if isinstance(other, Vector):
+            return Vector._from_data(
+                array("d", map(operator.mul, self._data, other._data))
+            )
         raise TypeError("The second argument must be a number or a vector.")
 
     def __rmul__(self, other: float) -> "Vector":
@@ -69,21 +91,68 @@ class Vector:
 
     def __matmul__(self, other: "Vector") -> "Vector":
         """Matrix multiplication (cross product) of two vectors"""
+        if not isinstance(other, Vector):
+            return NotImplemented
         return self.cross_product(other)
 
     def __truediv__(self, other: Union[int, float, "Vector"]) -> "Vector":
         """Divides the vector with the given number"""
         if isinstance(other, (int, float)):
-            result = [i / other for i in self.vector]
-            return Vector(result)
-        if isinstance(other, self.__class__):
-            result = [i / j for i, j in zip(self.vector, other.vector)]
-            return Vector(result)
+            return Vector._from_data(array("d", [i / other for i in self._data]))
+        if isinstance(other, Vector):
+            return Vector._from_data(
+                array("d", map(operator.truediv, self._data, other._data))
+            )
         raise TypeError("The second argument must be a number or a vector.")
 
+    def __iadd__(self, other: "Vector") -> "Vector":
+        """Adds a vector to this one in place"""
+        return self._inplace(other, operator.add)
+
+    def __isub__(self, other: "Vector") -> "Vector":
+        """Subtracts a vector from this one in place"""
+        return self._inplace(other, operator.sub)
+
+    def __imul__(self, other: Union[int, float, "Vector"]) -> "Vector":
+        """Multiplies the vector by a number/vector in place"""
+        return self._inplace(other, operator.mul)
+
+    def __itruediv__(self, other: Union[int, float, "Vector"]) -> "Vector":
+        """Divides the vector by a number/vector in place"""
+        return self._inplace(other, operator.truediv)
+
+    def __imatmul__(self, other: Any) -> "Vector":
+        """Matrix multiplies in place when the product keeps the length"""
+        result = self @ other
+        if isinstance(result, Vector) and len(result) == len(self._data):
+            self._data[:] = result._data
+            return self
+        return result
+
+    def _inplace(self, other: Union[int, float, "Vector"], op) -> "Vector":
+        # Writes through the existing buffer, which VectorArray views share
+        if isinstance(other, (int, float)) and op in (operator.mul, operator.truediv):
+            if op is operator.truediv and other == 0:
+                raise ZeroDivisionError("Division by zero")
+            self._data[:] = array("d", [op(i, other) for i in self._data])
+            return self
+        if not isinstance(other, Vector):
+            if op in (operator.add, operator.sub):
+                raise ValueError("The second argument must be a vector.")
+            raise TypeError("The second argument must be a number or a vector.")
+        if len(self._data) != len(other._data):
+            raise TypeError("The dimension of the 2 vectors must be the same.")
+        if op is operator.truediv and 0 in other._data:
+            raise ZeroDivisionError("Division by zero")
+        self._data[:] = array("d", map(op, self._data, other._data))
+        return self
+
     def __eq__(self, other: Any) -> bool:
         """Tells whether the vectors are equal or not"""
-        return isinstance(other, self.__class__) and self.vector == other.vector
+        # memoryview compares the doubles in C, with float semantics
+        return isinstance(other, Vector) and memoryview(self._data) == memoryview(
+            other._data
+        )
 
     def __ne__(self, other: Any) -> bool:
         """Tells whether the vectors are not equal"""
@@ -91,11 +160,11 @@ class Vector:
 
     def __hash__(self) -> int:
         """Returns the hash of the vector"""
-        return hash(tuple(self.vector))
+        return hash(tuple(self._data))
 
     def __bool__(self) -> bool:
         """Returns True if the vector is non-zero"""
-        return any(self.vector)
+        return any(self._data)
 
     def __abs__(self) -> float:
         """Returns the modulus of the vector"""
@@ -103,7 +172,7 @@ class Vector:
 
     def copy(self) -> "Vector":
         """Returns a copy of the vector"""
-        return Vector(self.vector)
+        return Vector._from_data(array("d", self._data))
 
     def modulus(self) -> float:
         """Returns the modulus (length/magnitude) of the vector
@@ -113,8 +182,7 @@ class Vector:
         float
             magnitude of the length of the vector.
         """
-        sum_of_squares = sum(map(lambda x: x * x, self.vector))
-        return sqrt(sum_of_squares)
+        return sqrt(sum(map(operator.mul, self._data, self._data)))
 
     def argument(self) -> "Vector":
         """Returns the argument of the given vector
@@ -125,7 +193,7 @@ class Vector:
             A vector containing angle which the vector makes with respect to the axes.
         """
         norm = self.modulus()
-        return Vector(list(map(lambda x: acos(x / norm), self.vector)))
+        return Vector._from_data(array("d", [acos(x / norm) for x in self._data]))
 
     def unit_vector(self) -> "Vector":
         """Returns the unit vector of the given vector
@@ -137,9 +205,8 @@ class Vector:
         """
         mod = self.modulus()
         if mod == 0:
-            return Vector(self.vector)
-        unit_vector = [ele / mod for ele in self.vector]
-        return Vector(unit_vector)
+            return self.copy()
+        return Vector._from_data(array("d", [ele / mod for ele in self._data]))
 
     def magnify(self, magnification: float = 1) -> "Vector":
         """Returns the scaled-up or scaled-down version of the vector
@@ -154,8 +221,9 @@ class Vector:
         Vector
             A vector (= vector * magnification) in the same direction as the given vector.
         """
-        new_vector = [ele * magnification for ele in self.vector]
-        return Vector(new_vector)
+        return Vector._from_data(
+            array("d", [ele * magnification for ele in self._data])
+        )
 
     def rotate_2d(self, theta: float = pi, radians: bool = True) -> "Vector":
         """Rotates the given vector by the given angle in clockwise direction
@@ -177,9 +245,9 @@ class Vector:
         ValueError
             Raised if the dimension of vector is not equal to 2.
         """
-        if self.length != 2:
+        if len(self._data) != 2:
             raise ValueError("The dimension of the vector must be equal to 2.")
-        x, y = self.vector
+        x, y = self._data
         if not radians:
             theta = theta * pi / 180
         new_x = x * cos(theta) - y * sin(theta)
@@ -208,7 +276,7 @@ class Vector:
         ValueError
             If the vector or the axis is not 3D.
         """
-        if self.length != 3:
+        if len(self._data) != 3:
             raise ValueError("The dimension of the vector must be equal to 3.")
 
         if not radians:
@@ -241,11 +309,8 @@ class Vector:
         ValueError
             Raised if the dimension of vectors are not equal.
         """
-        if self.length == other.length:
-            result = sum(
-                elem1 * elem2 for elem1, elem2 in zip(self.vector, other.vector)
-            )
-            return result
+        if len(self._data) == len(other._data):
+            return sum(map(operator.mul, self._data, other._data))
         raise ValueError("The dimension of the 2 vectors must be the same.")
 
     def cross_product(self, other: "Vector") -> "Vector":
@@ -268,15 +333,20 @@ class Vector:
         ValueError
             Raised if the dimension of vectors is not equal to 2 or 3.
         """
-        if self.length == len(other):
-            if self.length == 3:
-                a1, a2, a3 = self.vector
-                b1, b2, b3 = other.vector
-                return Vector([a2 * b3 - a3 * b2, a3 * b1 - a1 * b3, a1 * b2 - a2 * b1])
-            elif self.length == 2:
-                a1, a2 = self.vector
-                b1, b2 = other.vector
-                return Vector([0, 0, a1 * b2 - a2 * b1])
+        length = len(self._data)
+        if length == len(other):
+            if length == 3:
+                a1, a2, a3 = self._data
+                b1, b2, b3 = other._data
+                return Vector._from_data(
+                    array(
+                        "d", (a2 * b3 - a3 * b2, a3 * b1 - a1 * b3, a1 * b2 - a2 * b1)
+                    )
+                )
+            elif length == 2:
+                a1, a2 = self._data
+                b1, b2 = other._data
+                return Vector._from_data(array("d", (0.0, 0.0, a1 * b2 - a2 * b1)))
             raise ValueError(
                 "The dimension of the 2 vectors must be less than or equal to 3."
             )
@@ -285,24 +355,54 @@ class Vector:
     def is_unit(self) -> bool:
         """Tells whether the vector is a unit vector or not"""
         sum_of_squares = 0.0
-        for i in self.vector:
-            sum_of_squares += i**2
+        for i in self._data:
+            sum_of_squares += i ** 2
             if sum_of_squares > 1:
                 return False
         return sum_of_squares == 1
 
     def is_parallel(self, other: "Vector") -> bool:
         """Tells whether the vectors are parallel or not"""
-        ratio = self.vector[0] / other.vector[0]
-        return all(i / j == ratio for i, j in zip(self.vector, other.vector))
+        ratio = self._data[0] / other._data[0]
+        return all(i / j == ratio for i, j in zip(self._data, other._data))
 
     def is_orthogonal(self, other: "Vector") -> bool:
         """Tells whether the vectors are orthogonal or not"""
         return self.dot_product(other) == 0
 
+    @classmethod
+    def frombuffer(cls, buffer: Any, copy: bool = False) -> "Vector":
+        """Returns a vector built from a buffer of doubles.
+
+        The pure Python engine cannot share memory, so the data is always copied.
+
+        Parameters
+        ----------
+        buffer
+            Any object supporting the buffer protocol holding doubles
+            (format 'd') or raw bytes.
+        copy (bool, optional)
+            Accepted for compatibility with the C engine.
+        """
+        view = memoryview(buffer)
+        if view.itemsize == 1 and view.format in ("B", "b", "c"):
+            view = view.cast("B").cast("d")
+        elif view.format.lstrip("@=") != "d":
+            raise TypeError("Buffer must contain doubles (format 'd') or raw bytes")
+        if view.ndim != 1:
+            view = view.cast("B").cast("d")
+        if len(view) == 0:
+            raise ValueError("Buffer cannot be empty")
+        return cls._from_data(array("d", view.tobytes()))
+
+    def __reduce_ex__(self, protocol: int) -> Tuple[Any, ...]:
+        """Pickles as Vector.frombuffer(buffer), like the C engine."""
+        buffer = PickleBuffer(self._data) if protocol >= 5 else self._data.tobytes()
+        return type(self).frombuffer, (buffer,)
+
     def to_list(self) -> List[float]:
         """Returns the vector as a list"""
-        return self.vector
+        return self._data.tolist()
 
     # Alias
     arg = argument
@@ -0,0 +1,184 @@
+"""A module to represent many vectors of the same dimension."""
+
+from array import array
+from math import pi
+from typing import Any, Iterable, Iterator, List, Optional, Tuple, Union
+
+from matmath.legacy.vector import Vector
+
+
+class VectorArray:
+    """A class to represent a packed array of same-length vectors.
+
+    Every vector is an `array('d')` row, which the Vectors returned by
+    indexing and iteration share.
+    """
+
+    def __init__(self, vectors: Iterable[Any], dim: Optional[int] = None):
+        rows: List[array] = []
+        for item in vectors:
+            if isinstance(item, Vector):
+                rows.append(array("d", item._data))
+                continue
+            values = list(item)
+            for value in values:
+                if not isinstance(value, (int, float)):
+                    raise TypeError(
+                        "All elements of the vector must be `int` or `float`."
+                    )
+            rows.append(array("d", values))
+        if rows:
+            if dim is not None and dim != len(rows[0]):
+                raise ValueError("All vectors must have the same dimension.")
+            dim = len(rows[0])
+        for row in rows:
+            if len(row) != dim:
+                raise ValueError("All vectors must have the same dimension.")
+        self.rows = rows
+        self.dim: int = dim or 0
+
+    def __len__(self) -> int:
+        """Returns the number of vectors in the array"""
+        return len(self.rows)
+
+    def __getitem__(self, key: int) -> Vector:
+        """Returns the vector at key, sharing the array's storage"""
+        # Integers only, as for the C engine's sequence protocol
+        if not hasattr(type(key), "__index__"):
+            raise TypeError(
+                f"sequence index must be integer, not '{type(key).__name__}'"
+            )
+        return self._view(self.rows[key])
+
+    def __iter__(self) -> Iterator[Vector]:
+        """Returns an iterator over the vectors of the array"""
+        return (self._view(row) for row in self.rows)
+
+    def __repr__(self) -> str:
+        """Returns a string construction of the vector array"""
+        return f"VectorArray({self.to_list()})"
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """Returns the (count, dim) of the array."""
+        return len(self.rows), self.dim
+
+    @classmethod
+    def frombuffer(
+        cls, buffer: Any, dim: Optional[int] = None, copy: bool = False
+    ) -> "VectorArray":
+        """Returns a vector array built from a buffer of doubles.
+
+        The pure Python engine cannot share memory, so the data is always copied.
+
+        Parameters
+        ----------
+        buffer
+            Any object supporting the buffer protocol holding doubles
+            (format 'd') or raw bytes.
+        dim (int, optional)
+            The dimension of every vector. Required unless the buffer is 2-D.
+        copy (bool, optional)
+            Accepted for compatibility with the C engine.
+
+        Returns
+        -------
+        VectorArray :
+            The vector array holding the buffer's values.
+        """
+        view = memoryview(buffer)
+        if view.itemsize == 1 and view.format in ("B", "b", "c"):
+            view = view.cast("B").cast("d")
+        elif view.format.lstrip("@=") != "d":
+            raise TypeError("Buffer must contain doubles (format 'd') or raw bytes")
+        if view.ndim == 2 and dim is None:
+            dim = view.shape[1]
+        elif view.ndim != 2 and dim is None:
+            raise ValueError("dim is required unless the buffer is 2-dimensional")
+        values = array("d", view.tobytes())
+        if (len(values) % dim if dim else len(values)) != 0:
+            raise ValueError("Buffer size does not match the requested dimension")
+        count = len(values) // dim if dim else 0
+        return cls._from_rows(
+            [values[i * dim : (i + 1) * dim] for i in range(count)], dim
+        )
+
+    @classmethod
+    def _from_rows(cls, rows: List[array], dim: int) -> "VectorArray":
+        """Returns a vector array taking ownership of rows of doubles"""
+        result = cls.__new__(cls)
+        result.rows = rows
+        result.dim = dim
+        return result
+
+    def _view(self, row: array) -> Vector:
+        return Vector._from_data(row)
+
+    def _pairs(
+        self, other: Union[Vector, "VectorArray"]
+    ) -> Iterator[Tuple[Vector, Vector]]:
+        if isinstance(other, VectorArray):
+            if other.shape != self.shape:
+                raise ValueError("The 2 vector arrays must have the same shape.")
+            return zip(self, other)
+        if isinstance(other, Vector):
+            if len(other) != self.dim:
+                raise ValueError("The dimension of the 2 vectors must be the same.")
+            return ((row, other) for row in self)
+        raise TypeError("Argument must be a Vector or a VectorArray")
+
+    def _wrap(self, vectors: Iterable[Vector], dim: int) -> "VectorArray":
+        return VectorArray._from_rows([v._data for v in vectors], dim)
+
+    def dot(self, other: Union[Vector, "VectorArray"]) -> Vector:
+        """Returns the row-wise dot products with a vector or vector array."""
+        return Vector([a.dot_product(b) for a, b in self._pairs(other)])
+
+    def cross(self, other: Union[Vector, "VectorArray"]) -> "VectorArray":
+        """Returns the row-wise cross products with a vector or vector array."""
+        pairs = list(self._pairs(other))
+        if self.dim not in (2, 3):
+            raise ValueError(
+                "The dimension of the 2 vectors must be less than or equal to 3."
+            )
+        return self._wrap((a.cross_product(b) for a, b in pairs), 3)
+
+    def modulus(self) -> Vector:
+        """Returns the modulus of every vector."""
+        return Vector([row.modulus() for row in self])
+
+    def unit_vector(self) -> "VectorArray":
+        """Returns the unit vector of every vector."""
+        return self._wrap((row.unit_vector() for row in self), self.dim)
+
+    def rotate_2d(self, theta: float = pi, radians: bool = True) -> "VectorArray":
+        """Rotates every 2D vector by theta."""
+        if self.dim != 2:
+            raise ValueError("The dimension of the vector must be equal to 2.")
+        return self._wrap((row.rotate_2d(theta, radians) for row in self), 2)
+
+    def rotate_3d(
+        self, theta: float, axis: Vector, radians: bool = True
+    ) -> "VectorArray":
+        """Rotates every 3D vector around the given axis."""
+        if self.dim != 3:
+            raise ValueError("The dimension of the vector must be equal to 3.")
+        return self._wrap((row.rotate_3d(theta, axis, radians) for row in self), 3)
+
+    def argument(self) -> "VectorArray":
+        """Returns the argument of every vector."""
+        return self._wrap((row.argument() for row in self), self.dim)
+
+    def copy(self) -> "VectorArray":
+        """Returns a copy of the vector array."""
+        return VectorArray._from_rows([array("d", row) for row in self.rows], self.dim)
+
+    def to_list(self) -> List[List[float]]:
+        """Returns the vector array as a list of lists."""
+        return [row.tolist() for row in self.rows]
+
+    # Alias
+    arg = argument
+    cross_product = cross
+    dot_product = dot
+    mod = modulus
@@ -0,0 +1,289 @@
+"""Iterative solvers for large linear systems A x = b.
+
+The solvers only need `A @ v` for a `Vector` `v`, so `A` can be a `Matrix`,
+a `SparseMatrix` or any object implementing the matrix-vector product. Every
+step is expressed with `Vector` operators (in place where possible), so with
+the C extensions all of the O(n) work runs in the compiled kernels.
+
+Each solver accepts a `callback(iteration, residual)` called once per
+iteration with the residual norm ||b - A x||; returning True from it stops
+the solver early. A RuntimeWarning is issued when the iteration cap is hit
+before the tolerance is reached.
+"""
+
+import math
+import warnings
+from typing import Any, Callable, List, Optional
+
+from matmath import Vector
+
+__all__ = ["cg", "gmres", "jacobi"]
+
+Callback = Optional[Callable[[int, float], Any]]
+
+
+def _setup(b: Vector, x0: Optional[Vector], maxiter: Optional[int]):
+    if not isinstance(b, Vector):
+        raise TypeError("b must be a Vector")
+    if x0 is None:
+        x = b * 0.0
+    else:
+        if not isinstance(x0, Vector):
+            raise TypeError("x0 must be a Vector")
+        if len(x0) != len(b):
+            raise ValueError("x0 and b must have the same dimension")
+        x = x0.copy()
+    if maxiter is None:
+        maxiter = 10 * len(b)
+    elif maxiter < 0:
+        raise ValueError("maxiter must not be negative")
+    return x, maxiter
+
+
+def _threshold(b: Vector, tol: float) -> float:
+    if tol < 0:
+        raise ValueError("tol must not be negative")
+    bnorm = b.modulus()
+    return tol * (bnorm if bnorm > 0 else 1.0)
+
+
+def _not_converged(name: str, maxiter: int, residual: float) -> None:
+    warnings.warn(
+        f"{name} did not converge in {maxiter} iterations (residual {residual:.3g})",
+        RuntimeWarning,
+        stacklevel=3,
+    )
+
+
+def cg(
+    A: Any,
+    b: Vector,
+    x0: Optional[Vector] = None,
+    tol: float = 1e-10,
+    maxiter: Optional[int] = None,
+    callback: Callback = None,
+) -> Vector:
+    """Solves A x = b with the conjugate gradient method.
+
+    A must be symmetric positive definite.
+
+    Parameters
+    ----------
+    A
+        A Matrix, SparseMatrix or any object supporting `A @ Vector`.
+    b (Vector)
+        The right-hand side.
+    x0 (Vector, optional)
+        The initial guess. Defaults to the zero vector.
+    tol (float, optional)
+        Stop once ||b - A x|| <= tol * ||b||.
+    maxiter (int, optional)
+        The maximum number of iterations. Defaults to 10 * len(b).
+    callback (callable, optional)
+        Called as callback(iteration, residual) after every iteration.
+
+    Returns
+    -------
+    Vector :
+        The approximate solution.
+
+    Raises
+    ------
+    ValueError
+        Raised if A is found not to be positive definite.
+    """
+    x, maxiter = _setup(b, x0, maxiter)
+    threshold = _threshold(b, tol)
+    r = b - A @ x
+    rs = r.dot(r)
+    residual = math.sqrt(rs)
+    if residual <= threshold:
+        return x
+
+    p = r.copy()
+    for iteration in range(1, maxiter + 1):
+        Ap = A @ p
+        curvature = p.dot(Ap)
+        if curvature <= 0:
+            raise ValueError("The matrix is not positive definite.")
+        alpha = rs / curvature
+        x += p * alpha
+        r -= Ap * alpha
+        rs_next = r.dot(r)
+        residual = math.sqrt(rs_next)
+        if (
+            callback is not None and callback(iteration, residual)
+        ) or residual <= threshold:
+            return x
+        p *= rs_next / rs
+        p += r
+        rs = rs_next
+
+    _not_converged("cg", maxiter, residual)
+    return x
+
+
+def gmres(
+    A: Any,
+    b: Vector,
+    x0: Optional[Vector] = None,
+    tol: float = 1e-10,
+    maxiter: Optional[int] = None,
+    restart: int = 20,
+    callback: Callback = None,
+) -> Vector:
+    """Solves A x = b with the restarted GMRES method.
+
+    Works for any non-singular A. The Krylov basis is orthogonalised with
+    modified Gram-Schmidt and the least-squares problem is updated with
+    Givens rotations, so the residual is known at every iteration without
+    forming x.
+
+    Parameters
+    ----------
+    A
+        A Matrix, SparseMatrix or any object supporting `A @ Vector`.
+    b (Vector)
+        The right-hand side.
+    x0 (Vector, optional)
+        The initial guess. Defaults to the zero vector.
+    tol (float, optional)
+        Stop once ||b - A x|| <= tol * ||b||.
+    maxiter (int, optional)
+        The maximum number of iterations (matrix-vector products), counted
+        across restarts. Defaults to 10 * len(b).
+    restart (int, optional)
+        The number of iterations between restarts, which bounds the number
+        of basis vectors kept in memory.
+    callback (callable, optional)
+        Called as callback(iteration, residual) after every iteration.
+
+    Returns
+    -------
+    Vector :
+        The approximate solution.
+    """
+    x, maxiter = _setup(b, x0, maxiter)
+    if restart < 1:
+        raise ValueError("restart must be positive")
+    threshold = _threshold(b, tol)
+
+    iteration = 0
+    while True:
+        r = b - A @ x
+        residual = r.modulus()
+        if residual <= threshold:
+            return x
+        if iteration >= maxiter:
+            _not_converged("gmres", maxiter, residual)
+            return x
+
+        basis = [r / residual]
+        columns: List[List[float]] = []  # Columns of the rotated Hessenberg matrix
+        cosines: List[float] = []
+        sines: List[float] = []
+        g = [residual]
+        stop = False
+        while len(columns) < restart and iteration < maxiter:
+            w = A @ basis[-1]
+            h = []
+            for v in basis:
+                hij = w.dot(v)
+                w -= v * hij
+                h.append(hij)
+            h_next = w.modulus()
+
+            for i, (c, s) in enumerate(zip(cosines, sines)):
+                h[i], h[i + 1] = c * h[i] + s * h[i + 1], c * h[i + 1] - s * h[i]
+            denominator = math.hypot(h[-1], h_next)
+            c, s = (
+                (h[-1] / denominator, h_next / denominator)
+                if denominator
+                else (1.0, 0.0)
+            )
+            h[-1] = denominator
+            cosines.append(c)
+            sines.append(s)
+            g.append(-s * g[-1])
+            g[-2] *= c
+            columns.append(h)
+
+            iteration += 1
+            residual = abs(g[-1])
+            stop = callback is not None and bool(callback(iteration, residual))
+            if stop or residual <= threshold or h_next == 0:
+                break
+            basis.append(w / h_next)
+
+        # Back substitution on the triangular system, then x += V y
+        k = len(columns)
+        y = [0.0] * k
+        for i in reversed(range(k)):
+            total = g[i] - sum(columns[j][i] * y[j] for j in range(i + 1, k))
+            y[i] = total / columns[i][i] if columns[i][i] else 0.0
+        for v, yi in zip(basis, y):
+            x += v * yi
+        if stop:
+            return x
+
+
+def jacobi(
+    A: Any,
+    b: Vector,
+    x0: Optional[Vector] = None,
+    tol: float = 1e-10,
+    maxiter: Optional[int] = None,
+    callback: Callback = None,
+) -> Vector:
+    """Solves A x = b with the Jacobi method.
+
+    Converges when A is strictly diagonally dominant (and for some other
+    matrices). Each iteration computes x += (b - A x) / diag(A).
+
+    Parameters
+    ----------
+    A
+        A Matrix, SparseMatrix or any object supporting `A @ Vector` and
+        element access `A[i, i]`.
+    b (Vector)
+        The right-hand side.
+    x0 (Vector, optional)
+        The initial guess. Defaults to the zero vector.
+    tol (float, optional)
+        Stop once ||b - A x|| <= tol * ||b||.
+    maxiter (int, optional)
+        The maximum number of iterations. Defaults to 10 * len(b).
+    callback (callable, optional)
+        Called as callback(iteration, residual) after every iteration.
+
+    Returns
+    -------
+    Vector :
+        The approximate solution.
+
+    Raises
+    ------
+    ValueError
+        Raised if the diagonal of A contains a zero.
+    """
+    x, maxiter = _setup(b, x0, maxiter)
+    threshold = _threshold(b, tol)
+    diagonal = [A[i, i] for i in range(len(b))]
+    if 0 in diagonal:
+        raise ValueError("The diagonal of the matrix must not contain zeros.")
+    diagonal = Vector(diagonal)
+
+    r = b - A @ x
+    residual = r.modulus()
+    for iteration in range(1, maxiter + 1):
+        if residual <= threshold:
+            return x
+        x += r / diagonal
+        r = b - A @ x
+        residual = r.modulus()
+        if callback is not None and callback(iteration, residual):
+            return x
+
+    if residual > threshold:
+        _not_converged("jacobi", maxiter, residual)
+    return x
@@ -0,0 +1,29 @@
+"""Inputs and assertions shared by the test modules."""
+
+import random
+import unittest
+
+from matmath import Matrix, Vector
+
+
+def random_matrix(rows, cols, seed, low=-1.0, high=1.0):
+    rng = random.Random(seed)
+    return Matrix([[rng.uniform(low, high) for _ in range(cols)] for _ in range(rows)])
+
+
+def random_vector(n, seed, low=-1.0, high=1.0):
+    rng = random.Random(seed)
+    return Vector([rng.uniform(low, high) for _ in range(n)])
+
+
+class MatrixTestCase(unittest.TestCase):
+    def assertMatrixAlmostEqual(self, m1, m2, places=7):
+        self.assertEqual(m1.order, m2.order)
+        for row1, row2 in zip(m1.to_list(), m2.to_list()):
+            for x, y in zip(row1, row2):
+                self.assertAlmostEqual(x, y, places=places)
+
+    def assertVectorAlmostEqual(self, v1, v2, places=7):
+        self.assertEqual(len(v1), len(v2))
+        for x, y in zip(v1, v2):
+            self.assertAlmostEqual(x, y, places=places)
@@ -0,0 +1,181 @@
+import unittest
+
+import matmath
+from matmath import Matrix, Vector
+
+
+def spd_matrix(n):
+    return Matrix([[n + 1.0 if i == j else 1.0 for j in range(n)] for i in range(n)])
+
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.addCleanup(matmath.set_caching, matmath.set_caching(True))
+        matmath.clear_cache()
+        self.addCleanup(matmath.clear_cache)
+        self.a = spd_matrix(6)
+
+    def assertCounts(self, hits, misses, invalidations=0):
+        info = matmath.cache_info()
+        self.assertEqual(
+            (info["hits"], info["misses"], info["invalidations"]),
+            (hits, misses, invalidations),
+        )
+
+    def test_shared_factorization(self):
+        self.assertTrue(self.a.is_invertible())
+        det = self.a.determinant()
+        inverse = self.a.inverse()
+        # is_invertible() missed det and lu; determinant() hit det;
+        # inverse() missed inverse and hit lu
+        self.assertCounts(2, 3)
+        self.assertAlmostEqual(det, self.a.lu().det())
+        self.assertIs(self.a.lu(), self.a.lu())
+        self.assertEqual(self.a.inverse(), inverse)
+        info = matmath.cache_info()
+        self.assertEqual(info["matrices"], 1)
+        self.assertEqual(info["bytes"], 2 * 6 * 6 * 8 + 6 * 8)
+
+    def test_derived_values(self):
+        self.assertEqual(self.a.trace(), 42)
+        self.assertEqual(self.a.trace(), 42)
+        self.assertTrue(self.a.is_symmetric())
+        self.assertTrue(self.a.is_symmetric())
+        self.assertFalse(self.a.is_upper_triangular())
+        self.assertFalse(self.a.is_lower_triangular())
+        self.assertFalse(self.a.is_upper_triangular())
+        self.assertCounts(3, 4)
+
+    def test_results_are_private(self):
+        inverse = self.a.inverse()
+        inverse[0, 0] = 100
+        self.assertNotEqual(self.a.inverse()[0, 0], 100)
+        factor = self.a.cholesky()
+        factor[1, 1] = 100
+        self.assertNotEqual(self.a.cholesky()[1, 1], 100)
+        self.assertEqual(self.a.cholesky()[0, 1], 0)
+
+    def test_solve_reuses_factorization(self):
+        v = Vector([1.0] * 6)
+        x = self.a.solve(v)
+        with matmath.profile() as p:
+            y = self.a.solve(v)
+            self.a.cholesky()
+        self.assertEqual(x, y)
+        # Only the substitutions are done again
+        self.assertEqual(p.stats["solve"]["flops"], 2 * 6 * 6)
+        self.assertNotIn("cholesky", p.stats)
+
+        b = Matrix([[float((i * 3 + j * 7) % 11) for j in range(6)] for i in range(6)])
+        self.assertFalse(b.is_symmetric())
+        b.solve(v)
+        with matmath.profile() as p:
+            b.inverse()
+            b.determinant()
+        self.assertEqual(p.stats["inverse"]["flops"], 2 * 6 ** 3)
+        self.assertNotIn("determinant", p.stats)
+
+    def test_not_positive_definite(self):
+        self.a[0, 0] = -1
+        self.a[0, 0] = -1
+        with self.assertRaises(ValueError):
+            self.a.cholesky()
+        with self.assertRaises(ValueError):
+            self.a.cholesky()
+        x = self.a.solve(Vector([1.0] * 6))
+        self.assertAlmostEqual((self.a @ x)[0], 1.0)
+
+    def test_invalidation(self):
+        det = self.a.determinant()
+        self.a[0, 0] = 1
+        self.assertCounts(0, 2, 1)
+        self.assertNotAlmostEqual(self.a.determinant(), det)
+        inverse = self.a.inverse()
+        self.a += spd_matrix(6)
+        self.assertNotEqual(self.a.inverse(), inverse)
+        self.a.determinant()
+        self.a.add(self.a, out=self.a)
+        self.a.determinant()
+        self.a.transpose(out=self.a)
+        self.assertAlmostEqual(self.a.determinant(), self.a.lu().det())
+        trace = self.a.trace()
+        self.a.__init__(spd_matrix(6).to_list())
+        self.assertNotEqual(self.a.trace(), trace)
+        self.assertEqual(matmath.cache_info()["invalidations"], 5)
+
+    def test_failed_write_keeps_cache(self):
+        det = self.a.determinant()
+        with self.assertRaises(TypeError):
+            self.a[0, 0] = "1"
+        with self.assertRaises(ValueError):
+            self.a[0:2, 0:2] = Matrix([[1, 2, 3]])
+        with self.assertRaises(IndexError):
+            self.a[6, 0] = 1
+        self.a[0:0, :] = 1
+        self.assertEqual(self.a.determinant(), det)
+        self.assertCounts(1, 2)
+
+    def test_small_and_rectangular_not_cached(self):
+        small = spd_matrix(4)
+        small.determinant()
+        small.inverse()
+        wide = Matrix([[1, 2, 3, 4, 5, 6]] * 5)
+        wide.is_symmetric()
+        self.assertFalse(wide.is_invertible())
+        self.assertCounts(0, 0)
+        self.assertEqual(matmath.cache_info()["matrices"], 0)
+
+    def test_clear_cache(self):
+        b = spd_matrix(5)
+        self.a.inverse()
+        b.lu()
+        self.assertEqual(matmath.cache_info()["matrices"], 2)
+        matmath.clear_cache()
+        self.assertEqual(
+            matmath.cache_info(),
+            {"hits": 0, "misses": 0, "invalidations": 0, "matrices": 0, "bytes": 0},
+        )
+        self.a.inverse()
+        self.assertCounts(0, 2)
+
+    def test_set_caching(self):
+        self.a.determinant()
+        self.assertTrue(matmath.set_caching(False))
+        self.assertEqual(matmath.cache_info()["matrices"], 0)
+        self.assertIsNot(self.a.lu(), self.a.lu())
+        self.assertCounts(0, 2)
+        self.assertFalse(matmath.set_caching(True))
+        self.assertIs(self.a.lu(), self.a.lu())
+
+    @unittest.skipUnless(
+        Matrix.__module__ == "matmath._matrix", "needs the C extension"
+    )
+    def test_views(self):
+        big = Matrix([[float(i == j) * 10 + 1 for j in range(8)] for i in range(8)])
+        window = big[1:7, 1:7]
+        det = window.determinant()
+        self.assertEqual(window.determinant(), det)
+        # Writes through the parent or another view reach the window's cache
+        big[2, 2] = 20
+        self.assertNotEqual(window.determinant(), det)
+        det = window.determinant()
+        big.T[3, 3] = 30
+        self.assertNotEqual(window.determinant(), det)
+        self.assertEqual(big.T.is_symmetric(), big.is_symmetric())
+
+    @unittest.skipUnless(
+        Matrix.__module__ == "matmath._matrix", "needs the C extension"
+    )
+    def test_exported_buffers(self):
+        det = self.a.determinant()
+        with memoryview(self.a) as view:
+            view[0, 0] = 1.0
+            # Not cached while the buffer may be written
+            self.assertNotAlmostEqual(self.a.determinant(), det)
+            self.assertIsNot(self.a.lu(), self.a.lu())
+            view[0, 0] = 7.0
+        self.assertAlmostEqual(self.a.determinant(), det)
+
+
+if __name__ == "__main__":
+    unittest.main()
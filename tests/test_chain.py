@@ -0,0 +1,75 @@
+import unittest
+
+import matmath
+from matmath import Matrix, multi_dot
+from matmath._chain import _chain_order
+from tests.helpers import MatrixTestCase, random_matrix, random_vector
+
+
+class TestMultiDot(MatrixTestCase):
+    def test_chain_order(self):
+        # The textbook example: 10x30, 30x5, 5x60 is cheapest as (AB)C
+        self.assertEqual(_chain_order([10, 30, 5, 60])[0][2], 1)
+        # and 50x10, 10x40, 40x30, 30x5 as A(B(CD))
+        split = _chain_order([50, 10, 40, 30, 5])
+        self.assertEqual(split[0][3], 0)
+        self.assertEqual(split[1][3], 1)
+
+    def test_multi_dot_matrices(self):
+        a, b = random_matrix(20, 3, 1), random_matrix(3, 25, 2)
+        c, d = random_matrix(25, 4, 3), random_matrix(4, 6, 4)
+        self.assertMatrixAlmostEqual(multi_dot([a, b]), a @ b)
+        self.assertMatrixAlmostEqual(multi_dot([a, b, c]), a @ b @ c)
+        self.assertMatrixAlmostEqual(multi_dot((a, b, c, d)), a @ b @ c @ d)
+        self.assertMatrixAlmostEqual(multi_dot(iter([b, c, d])), b @ c @ d)
+
+    def test_multi_dot_vectors(self):
+        a, b = random_matrix(8, 5, 1), random_matrix(5, 8, 2)
+        u, v = random_vector(8, 3), random_vector(8, 4)
+        self.assertVectorAlmostEqual(multi_dot([a, b, v]), a @ (b @ v))
+        self.assertVectorAlmostEqual(multi_dot([u, a, b]), (u @ a) @ b)
+        self.assertAlmostEqual(multi_dot([u, a, b, v]), u.dot(a @ (b @ v)))
+        self.assertAlmostEqual(multi_dot([u, v]), u.dot(v))
+
+    def test_multi_dot_order(self):
+        # A @ B @ C @ v left to right would do two n x n x n products
+        n = 40
+        a, b, c = (random_matrix(n, n, seed) for seed in range(3))
+        v = random_vector(n, 3)
+        with matmath.profile() as p:
+            result = multi_dot([a, b, c, v])
+        self.assertEqual(p.stats["matvec"]["calls"], 3)
+        self.assertNotIn("matmul", p.stats)
+        self.assertVectorAlmostEqual(result, a @ (b @ (c @ v)))
+
+    @unittest.skipUnless(
+        Matrix.__module__ == "matmath._matrix", "needs the C extension"
+    )
+    def test_multi_dot_reuses_intermediates(self):
+        # Ties split first, so this is a @ (b @ (c @ d)) and the product
+        # c @ d, consumed by then, holds the result
+        n = 10
+        a, b, c, d = (random_matrix(n, n, seed) for seed in range(4))
+        with matmath.profile() as p:
+            result = multi_dot([a, b, c, d])
+        self.assertEqual(p.stats["matmul"]["calls"], 3)
+        self.assertEqual(p.stats["matmul"]["bytes"], 2 * n * n * 8)
+        self.assertMatrixAlmostEqual(result, a @ b @ c @ d)
+
+    def test_multi_dot_errors(self):
+        a, b = random_matrix(3, 4, 1), random_matrix(3, 4, 2)
+        v = random_vector(4, 3)
+        with self.assertRaises(ValueError):
+            multi_dot([a])
+        with self.assertRaises(ValueError):
+            multi_dot([a, b])
+        with self.assertRaises(ValueError):
+            multi_dot([v, a])
+        with self.assertRaises(TypeError):
+            multi_dot([a, v, a.transpose()])
+        with self.assertRaises(TypeError):
+            multi_dot([a, [[1], [2], [3], [4]]])
+
+
+if __name__ == "__main__":
+    unittest.main()
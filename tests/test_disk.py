@@ -0,0 +1,135 @@
+import os
+import tempfile
+import unittest
+from array import array
+
+import matmath
+from matmath import DiskMatrix, Matrix
+from tests.helpers import MatrixTestCase, random_matrix
+
+
+class TestDiskMatrix(MatrixTestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.dir = directory.name
+        self.a = random_matrix(37, 23, 1)
+        self.b = random_matrix(23, 41, 2)
+
+    def save(self, matrix, name, **kwargs):
+        path = os.path.join(self.dir, name)
+        matrix.save(path)
+        disk = DiskMatrix(path, **kwargs)
+        self.addCleanup(disk.close)
+        return disk
+
+    def test_open(self):
+        a = self.save(self.a, "a.mm")
+        self.assertEqual(a.order, (37, 23))
+        self.assertEqual(len(a), 37)
+        self.assertEqual(a.to_matrix(), self.a)
+        self.assertIn("a.mm", repr(a))
+
+        # A headerless file of raw doubles, after a preamble
+        path = os.path.join(self.dir, "a.raw")
+        with open(path, "wb") as f:
+            f.write(b"\0" * 16)
+            array("d", [x for row in self.a.to_list() for x in row]).tofile(f)
+        with DiskMatrix(path, order=(37, 23), offset=16) as raw:
+            self.assertEqual(raw.to_matrix(), self.a)
+
+    def test_matmul(self):
+        expected = self.a @ self.b
+        b = self.save(self.b, "b.mm", tile=8)
+        for max_tiles in (4, 8):
+            # With 8 tiles the left operand's row of three tiles stays resident
+            a = self.save(self.a, f"a{max_tiles}.mm", tile=8, max_tiles=max_tiles)
+            self.assertMatrixAlmostEqual((a @ b).to_matrix(), expected)
+        self.assertMatrixAlmostEqual((a @ self.b).to_matrix(), expected)
+        self.assertMatrixAlmostEqual((self.a @ b).to_matrix(), expected)
+        out = DiskMatrix.create(os.path.join(self.dir, "c.mm"), (37, 41), tile=16)
+        self.addCleanup(out.close)
+        self.assertIs(a.matmul(b, out=out), out)
+        out.flush()
+        self.assertMatrixAlmostEqual(Matrix.load(out.path), expected)
+
+    def test_matmul_tiles(self):
+        a = self.save(self.a, "a.mm", tile=10)
+        with matmath.profile() as p:
+            (a @ self.b).close()
+        # 4 x 5 output tiles, each summing 3 tile products
+        self.assertEqual(p.stats["matmul"]["calls"], 4 * 5 * 3)
+        self.assertEqual(p.stats["matmul"]["flops"], 2 * 37 * 23 * 41)
+
+    def test_add(self):
+        a = self.save(self.a, "a.mm", tile=4)
+        b = self.save(random_matrix(37, 23, 3), "b.mm", mode="r+")
+        self.assertEqual((a + self.a).to_matrix(), self.a + self.a)
+        a.add(a, out=b)
+        self.assertEqual(b.to_matrix(), self.a * 2)
+        b.add(self.a, out=b)
+        self.assertEqual(b.to_matrix(), self.a * 2 + self.a)
+
+    def test_transpose(self):
+        a = self.save(self.a, "a.mm", tile=5)
+        self.assertEqual(a.transpose().to_matrix(), self.a.transpose())
+        self.assertEqual(a.T.T.to_matrix(), self.a)
+
+    def test_iter_rows(self):
+        a = self.save(self.a, "a.mm", tile=10)
+        # 100 elements per tile is 4 rows of 23
+        self.assertEqual([band.order for band in a.iter_rows()][:2], [(4, 23), (4, 23)])
+        bands = list(a.iter_rows(10))
+        self.assertEqual([band.order[0] for band in bands], [10, 10, 10, 7])
+        self.assertEqual(bands[3], self.a[30:37, :])
+        self.assertEqual(list(a), self.a.to_list())
+        with self.assertRaises(ValueError):
+            next(a.iter_rows(0))
+
+    def test_temporary_results(self):
+        a = self.save(self.a, "a.mm")
+        c = a @ self.b
+        self.assertEqual(os.path.dirname(c.path), self.dir)
+        c.close()
+        self.assertFalse(os.path.exists(c.path))
+        c.close()
+        t = a.transpose()
+        path = t.path
+        del t
+        self.assertFalse(os.path.exists(path))
+
+    def test_errors(self):
+        a = self.save(self.a, "a.mm")
+        b = self.save(self.b, "b.mm", mode="r+")
+        with self.assertRaises(ValueError):
+            a @ a
+        with self.assertRaises(ValueError):
+            a + b
+        with self.assertRaises(TypeError):
+            a + 1
+        with self.assertRaises(ValueError):
+            self.b.transpose() @ a
+        with self.assertRaises(ValueError):
+            a.add(a, out=a)  # read-only
+        square = self.save(random_matrix(23, 23, 3), "square.mm", mode="r+")
+        with self.assertRaises(ValueError):
+            square.matmul(square, out=square)
+        with self.assertRaises(ValueError):
+            square.transpose(out=square)
+        with self.assertRaises(TypeError):
+            a.matmul(self.b, out=self.a)
+        with self.assertRaises(ValueError):
+            DiskMatrix(a.path, max_tiles=3)
+        with self.assertRaises(ValueError):
+            DiskMatrix(a.path, mode="w")
+        with self.assertRaises(ValueError):
+            DiskMatrix(a.path, order=(100, 100))
+        path = os.path.join(self.dir, "junk")
+        with open(path, "wb") as f:
+            f.write(b"not a matrix" * 10)
+        with self.assertRaises(ValueError):
+            DiskMatrix(path)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+
+import matmath
+from matmath import LazyMatrix, Matrix, lazy
+from tests.helpers import random_matrix
+
+
+class TestLazy(unittest.TestCase):
+    def setUp(self):
+        self.a = Matrix([[1, 2], [3, 4]])
+        self.b = Matrix([[5, 6], [7, 8]])
+        self.c = Matrix([[1, 1], [2, 2]])
+        self.d = Matrix([[2, 4], [8, 16]])
+
+    def test_lazy_expression(self):
+        a, b, c, d = lazy(self.a, self.b, self.c, self.d)
+        expression = (a + b) * 0.5 - c / d
+        self.assertIsInstance(expression, LazyMatrix)
+        self.assertEqual(expression.order, (2, 2))
+        self.assertEqual(expression.eval(), (self.a + self.b) * 0.5 - self.c / self.d)
+
+    def test_lazy_mixed_operands(self):
+        a = lazy(self.a)
+        self.assertEqual((a + self.b).eval(), self.a + self.b)
+        self.assertEqual((a * self.b // self.c).eval(), self.a * self.b // self.c)
+        self.assertEqual((2 * a).eval(), self.a * 2)
+        self.assertEqual((a - a * a).eval(), self.a - self.a * self.a)
+
+    def test_lazy_scalars(self):
+        a = lazy(self.a)
+        self.assertEqual((a + 1).eval().to_list(), [[2, 3], [4, 5]])
+        self.assertEqual((10 - a).eval().to_list(), [[9, 8], [7, 6]])
+        self.assertEqual((12 / a).eval().to_list(), [[12, 6], [4, 3]])
+        self.assertEqual((7 // a).eval().to_list(), [[7, 3], [2, 1]])
+        self.assertEqual((-a + 1).eval().to_list(), [[0, -1], [-2, -3]])
+        self.assertEqual((+a).eval(), self.a)
+
+    def test_lazy_reads_at_eval(self):
+        a = lazy(self.a)
+        expression = a * 2
+        self.a[0, 0] = 10
+        self.assertEqual(expression.eval().to_list(), [[20, 4], [6, 8]])
+
+    def test_lazy_out(self):
+        a, b = lazy(self.a, self.b)
+        out = Matrix([[0, 0], [0, 0]])
+        result = (a * b + 1).eval(out=out)
+        self.assertIs(result, out)
+        self.assertEqual(out.to_list(), [[6, 13], [22, 33]])
+        # In place over an operand
+        (a * b - a).eval(out=self.a)
+        self.assertEqual(self.a.to_list(), [[4, 10], [18, 28]])
+        with self.assertRaises(ValueError):
+            (a + b).eval(out=Matrix([[0, 0, 0]]))
+        with self.assertRaises(TypeError):
+            (a + b).eval(out=[[0, 0], [0, 0]])
+
+    def test_lazy_zero_division(self):
+        a, c = lazy(self.a, self.c)
+        with self.assertRaises(ZeroDivisionError):
+            (a / (c - self.c)).eval()
+        with self.assertRaises(ZeroDivisionError):
+            (a // 0).eval()
+        with self.assertRaises(ZeroDivisionError):
+            (1 / (a - 1)).eval()
+
+    def test_lazy_errors(self):
+        a = lazy(self.a)
+        with self.assertRaises(ValueError):
+            a + Matrix([[1, 2, 3]])
+        with self.assertRaises(ValueError):
+            a + lazy(Matrix([[1], [2]]))
+        with self.assertRaises(TypeError):
+            a + "x"
+        with self.assertRaises(TypeError):
+            lazy([[1, 2]])
+
+    def test_lazy_large(self):
+        # Several blocks per row, split across threads
+        x = random_matrix(300, 700, 1, low=1, high=2)
+        y = random_matrix(300, 700, 2, low=1, high=2)
+        lx, ly = lazy(x, y)
+        self.assertEqual(((lx - ly) * (lx + ly) / ly).eval(), (x - y) * (x + y) / y)
+        self.addCleanup(matmath.set_num_threads, matmath.get_num_threads())
+        matmath.set_num_threads(4)
+        self.assertEqual((lx * 3 - ly // 0.5).eval(), x * 3 - y // 0.5)
+
+    def test_lazy_views(self):
+        x = random_matrix(40, 32, 3, low=1, high=2)
+        square = random_matrix(30, 30, 4, low=1, high=2)
+        window = x[3:33:1, 1:31]
+        strided = x[::2, ::3]
+        self.assertEqual((lazy(window) + square.T).eval(), window + square.transpose())
+        self.assertEqual((lazy(strided) * 2).eval(), strided * 2)
+        expected = square + square.transpose()
+        (lazy(square) + square.T).eval(out=square)
+        self.assertEqual(square, expected)
+
+    def test_lazy_long_chain(self):
+        expression = lazy(self.a)
+        for _ in range(5000):
+            expression = expression + 1
+        self.assertEqual(expression.eval().to_list(), [[5001, 5002], [5003, 5004]])
+
+    def test_lazy_profile(self):
+        a, b = lazy(self.a, self.b)
+        with matmath.profile() as p:
+            ((a + b) * 0.5 - a).eval()
+            (a - b).eval(out=self.c)
+        fused = p.stats["fused"]
+        self.assertEqual(fused["calls"], 2)
+        self.assertEqual(fused["bytes"], 32)
+        self.assertEqual(fused["flops"], 16)
+        self.assertNotIn("add", p.stats)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,23 @@
+import array
+import importlib
+import io
+import os
+import pickle
+import random
+import shutil
+import sys
+import tempfile
+import threading
 import unittest
-from matmath import Matrix
+import warnings
+from unittest import mock
 
+import matmath
+from matmath import Matrix, Vector
+from tests.helpers import MatrixTestCase
 
-class TestMatrix(unittest.TestCase):
+
+class TestMatrix(MatrixTestCase):
     def test_matrix_init(self):
         mat = [[1, 2], [3, 4]]
         matrix = Matrix(mat)
@@ -45,6 +60,42 @@ class TestMatrix(unittest.TestCase):
         result = m1 @ m2
         self.assertEqual(result.to_list(), [[4, 4], [10, 8]])
 
+    def test_matrix_matmul_blocked(self):
+        # Checked against a naive product: orders that skip packing, and ones
+        # that are not multiples of the 4 x 8 register tile and cross the
+        # 64-row, 256-deep and 1024-wide blocks of the packed kernel
+        rng = random.Random(3)
+
+        def values(rows, cols):
+            return [[rng.uniform(-1, 1) for _ in range(cols)] for _ in range(rows)]
+
+        def naive(a, b):
+            cols = list(zip(*b))
+            return [[sum(x * y for x, y in zip(row, col)) for col in cols] for row in a]
+
+        def check(result, expected):
+            self.assertEqual(result.order, (len(expected), len(expected[0])))
+            error = max(
+                abs(x - y)
+                for row, expected_row in zip(result.to_list(), expected)
+                for x, y in zip(row, expected_row)
+            )
+            self.assertLess(error, 1e-12)
+
+        for m, p, n in ((5, 3, 9), (33, 35, 37), (67, 259, 21), (5, 259, 1030)):
+            a, b = values(m, p), values(p, n)
+            expected = naive(a, b)
+            check(Matrix(a) @ Matrix(b), expected)
+
+            # A transposed view, a view with a row stride and an offset, and
+            # views with a column stride
+            at = Matrix([list(col) for col in zip(*a)]).T
+            padded = Matrix([[0.0] * 3 + row + [0.0] * 2 for row in a for _ in (0, 1)])
+            spread = Matrix([[x for x in row for _ in (0, 1)] for row in b])
+            check(at @ Matrix(b), expected)
+            check(padded[::2, 3 : 3 + p] @ spread[:, ::2], expected)
+            check(Matrix(a) @ spread[:, 1::2], expected)
+
     def test_matrix_transpose(self):
         m1 = Matrix([[1, 2], [3, 4]])
         result = m1.transpose()
@@ -54,6 +105,327 @@ class TestMatrix(unittest.TestCase):
         m1 = Matrix([[1, 2], [3, 4]])
         # 1*4 - 2*3 = -2
         self.assertAlmostEqual(m1.determinant(), -2.0)
+        m2 = Matrix([[0, 1], [1, 0]])
+        self.assertAlmostEqual(m2.determinant(), -1.0)
+        self.assertEqual(m2.to_list(), [[0, 1], [1, 0]])
+        self.assertEqual(Matrix([[1, 2], [2, 4]]).determinant(), 0)
+
+    def test_matrix_lu(self):
+        m1 = Matrix([[2, 1, 1], [1, 3, 2], [1, 0, 0]])
+        lu = m1.lu()
+        self.assertAlmostEqual(lu.det(), -1.0)
+        for row, expected in zip((lu.P @ m1).to_list(), (lu.L @ lu.U).to_list()):
+            for x, y in zip(row, expected):
+                self.assertAlmostEqual(x, y)
+        x = lu.solve(Vector([1, 2, 3]))
+        for value, expected in zip(x.to_list(), [3, 9, -14]):
+            self.assertAlmostEqual(value, expected)
+        inverse = lu.inverse()
+        for row, expected in zip(
+            inverse.to_list(), [[0, 0, 1], [-2, 1, 3], [3, -1, -5]]
+        ):
+            for value, y in zip(row, expected):
+                self.assertAlmostEqual(value, y)
+        for row, expected in zip(m1.inverse().to_list(), inverse.to_list()):
+            for value, y in zip(row, expected):
+                self.assertAlmostEqual(value, y)
+
+        singular = Matrix([[1, 2], [2, 4]])
+        self.assertFalse(singular.is_invertible())
+        with self.assertRaises(ValueError):
+            singular.inverse()
+        with self.assertRaises(ValueError):
+            singular.lu().solve(Vector([1, 2]))
+        with self.assertRaises(ValueError):
+            Matrix([[1, 2, 3], [4, 5, 6]]).lu()
+
+    def test_matrix_solve(self):
+        m1 = Matrix([[2, 1, 1], [1, 3, 2], [1, 0, 0]])
+        x = m1.solve(Vector([1, 2, 3]))
+        for value, expected in zip(x.to_list(), [3, 9, -14]):
+            self.assertAlmostEqual(value, expected)
+        xs = m1.solve(Matrix([[1, 4], [2, 7], [3, 1]]))
+        for row, expected in zip(xs.to_list(), [[3, 1], [9, 2], [-14, 0]]):
+            for value, y in zip(row, expected):
+                self.assertAlmostEqual(value, y)
+
+        upper = Matrix([[2, 1], [0, 4]])
+        self.assertEqual(upper.solve(Vector([3, 4])).to_list(), [1, 1])
+        lower = Matrix([[2, 0], [1, 4]])
+        self.assertEqual(lower.solve(Vector([2, 5])).to_list(), [1, 1])
+        full = Matrix([[2, 1], [1, 4]])
+        self.assertEqual(full.solve_triangular(Vector([3, 4])).to_list(), [1, 1])
+        self.assertEqual(
+            full.solve_triangular(Vector([2, 5]), lower=True).to_list(), [1, 1]
+        )
+
+        with self.assertRaises(ValueError):
+            Matrix([[1, 2], [0, 0]]).solve(Vector([1, 2]))
+        with self.assertRaises(ValueError):
+            full.solve(Vector([1, 2, 3]))
+        with self.assertRaises(TypeError):
+            full.solve([1, 2])
+
+        # Symmetric positive definite systems go through Cholesky, others fall
+        # back to LU
+        spd = Matrix([[4, 2, 0], [2, 5, 1], [0, 1, 3]])
+        for value, expected in zip(
+            spd.solve(spd @ Vector([1, -2, 3])).to_list(), [1, -2, 3]
+        ):
+            self.assertAlmostEqual(value, expected)
+        indefinite = Matrix([[1, 2], [2, 1]])
+        for value, expected in zip(indefinite.solve(Vector([5, 4])).to_list(), [1, 2]):
+            self.assertAlmostEqual(value, expected)
+        with self.assertRaises(ValueError):
+            Matrix([[1, 1], [1, 1]]).solve(Vector([1, 2]))
+
+    def test_matrix_cholesky(self):
+        a = Matrix([[4, 2, 0], [2, 5, 1], [0, 1, 3]])
+        l = a.cholesky()
+        self.assertTrue(l.is_lower_triangular())
+        self.assertMatrixAlmostEqual(
+            l, Matrix([[2, 0, 0], [1, 2, 0], [0, 0.5, 11 ** 0.5 / 2]])
+        )
+        self.assertMatrixAlmostEqual(l @ l.transpose(), a)
+
+        # Only the lower triangle is read
+        b = a.copy()
+        b[0, 1] = b[1, 2] = 100
+        self.assertEqual(b.cholesky(), l)
+
+        # Large enough for the blocked trailing updates
+        n = 150
+        c = Matrix(
+            [
+                [1.0 / (1 + abs(i - j)) + (n if i == j else 0) for j in range(n)]
+                for i in range(n)
+            ]
+        )
+        l = c.cholesky()
+        self.assertTrue(l.is_lower_triangular())
+        self.assertMatrixAlmostEqual(l @ l.transpose(), c)
+
+        with self.assertRaises(ValueError):
+            Matrix([[1, 2], [2, 1]]).cholesky()
+        with self.assertRaises(ValueError):
+            Matrix([[1, 2, 3], [4, 5, 6]]).cholesky()
+
+    def test_matrix_qr(self):
+        for rows in (
+            [[12, -51, 4], [6, 167, -68], [-4, 24, -41]],
+            [[1, 2], [3, 4], [5, 6]],
+            [[1, 2, 3], [4, 5, 6]],
+            [[1, 1], [1, 1]],
+            [[3, 0], [0, 0]],
+        ):
+            a = Matrix(rows)
+            q, r = a.qr()
+            m, n = a.order
+            k = min(m, n)
+            self.assertEqual(q.order, (m, k))
+            self.assertEqual(r.order, (k, n))
+            self.assertMatrixAlmostEqual(q @ r, a)
+            self.assertMatrixAlmostEqual(q.transpose() @ q, Matrix.identity(k))
+            for i in range(k):
+                for j in range(i):
+                    self.assertEqual(r[i, j], 0)
+        _, r = Matrix([[12, -51, 4], [6, 167, -68], [-4, 24, -41]]).qr()
+        self.assertEqual([abs(round(r[i, i])) for i in range(3)], [14, 175, 35])
+
+    def test_matrix_eigh(self):
+        a = Matrix([[2, -1, 0], [-1, 2, -1], [0, -1, 2]])
+        w, v = a.eigh()
+        for value, expected in zip(w.to_list(), [2 - 2 ** 0.5, 2, 2 + 2 ** 0.5]):
+            self.assertAlmostEqual(value, expected)
+        d = Matrix([[w[i] if i == j else 0 for j in range(3)] for i in range(3)])
+        self.assertMatrixAlmostEqual(a @ v, v @ d)
+        self.assertMatrixAlmostEqual(v.transpose() @ v, Matrix.identity(3))
+
+        # Only the lower triangle is read
+        b = a.copy()
+        b[0, 2] = 100
+        self.assertEqual(b.eigh()[0], w)
+
+        n = 40
+        c = Matrix(
+            [
+                [float((i * 7 + j * 7) % 11 + (i == j) * i) for j in range(n)]
+                for i in range(n)
+            ]
+        )
+        w, v = c.eigh()
+        values = w.to_list()
+        self.assertEqual(values, sorted(values))
+        d = Matrix([[values[i] if i == j else 0 for j in range(n)] for i in range(n)])
+        self.assertMatrixAlmostEqual(c @ v, v @ d, places=6)
+        self.assertMatrixAlmostEqual(v.transpose() @ v, Matrix.identity(n))
+
+        w, v = Matrix([[3]]).eigh()
+        self.assertEqual((w.to_list(), v.to_list()), ([3], [[1]]))
+        self.assertEqual(Matrix.identity(4).eigh()[0].to_list(), [1, 1, 1, 1])
+        with self.assertRaises(ValueError):
+            Matrix([[1, 2, 3], [4, 5, 6]]).eigh()
+
+    def test_matrix_vector_product(self):
+        m1 = Matrix([[1, 2, 3], [4, 5, 6]])
+        self.assertEqual((m1 @ Vector([1, 1, 1])).to_list(), [6, 15])
+        self.assertEqual((Vector([1, 2]) @ m1).to_list(), [9, 12, 15])
+        results = m1.apply([Vector([1, 0, 0]), Vector([0, 0, 1])])
+        self.assertEqual([v.to_list() for v in results], [[1, 4], [3, 6]])
+        self.assertEqual(m1.apply([]), [])
+        with self.assertRaises(ValueError):
+            m1 @ Vector([1, 2])
+        with self.assertRaises(ValueError):
+            Vector([1, 2, 3]) @ m1
+        with self.assertRaises(TypeError):
+            m1.apply([[1, 2, 3]])
+
+    def test_matrix_pow(self):
+        fib = Matrix([[1, 1], [1, 0]])
+        self.assertEqual(fib.pow(10).to_list(), [[89, 55], [55, 34]])
+        self.assertEqual((fib ** 10).to_list(), [[89, 55], [55, 34]])
+        self.assertEqual(fib.pow().to_list(), [[2, 1], [1, 1]])
+        self.assertEqual((fib ** 0).to_list(), [[1, 0], [0, 1]])
+        self.assertEqual(fib.to_list(), [[1, 1], [1, 0]])
+
+        m1 = Matrix([[2, 1], [1, 1]])
+        for row, expected in zip((m1 ** -2).to_list(), [[2, -3], [-3, 5]]):
+            for value, y in zip(row, expected):
+                self.assertAlmostEqual(value, y)
+        with self.assertRaises(ValueError):
+            Matrix([[1, 2], [2, 4]]) ** -1
+        with self.assertRaises(ValueError):
+            Matrix([[1, 2, 3], [4, 5, 6]]).pow(2)
+
+    def test_matrix_inplace(self):
+        m1 = Matrix([[1, 2], [3, 4]])
+        same = m1
+        m1 += Matrix([[1, 1], [1, 1]])
+        m1 -= Matrix([[2, 2], [2, 2]])
+        m1 *= 4
+        m1 /= 2
+        m1 //= Matrix([[1, 1], [1, 3]])
+        self.assertIs(m1, same)
+        self.assertEqual(m1.to_list(), [[0, 2], [4, 2]])
+        m1 @= Matrix([[0, 1], [1, 0]])
+        self.assertIs(m1, same)
+        self.assertEqual(m1.to_list(), [[2, 0], [2, 4]])
+        self.assertEqual((0.5 * m1).to_list(), [[1, 0], [1, 2]])
+
+        rect = Matrix([[1, 2, 3], [4, 5, 6]])
+        product = rect
+        product @= Matrix([[1], [1], [1]])
+        self.assertEqual(product.to_list(), [[6], [15]])
+        self.assertEqual(rect.to_list(), [[1, 2, 3], [4, 5, 6]])
+        with self.assertRaises(ZeroDivisionError):
+            m1 /= 0
+        with self.assertRaises(ValueError):
+            m1 += rect
+        self.assertEqual(m1.to_list(), [[2, 0], [2, 4]])
+
+    def test_matrix_out(self):
+        m1 = Matrix([[1, 2], [3, 4]])
+        m2 = Matrix([[5, 6], [7, 8]])
+        out = Matrix([[0, 0], [0, 0]])
+        self.assertIs(m1.add(m2, out=out), out)
+        self.assertEqual(out.to_list(), [[6, 8], [10, 12]])
+        self.assertIs(m1.sub(m2, out=out), out)
+        self.assertEqual(out.to_list(), [[-4, -4], [-4, -4]])
+        self.assertEqual(m1.add(m2).to_list(), [[6, 8], [10, 12]])
+        self.assertIs(m1.matmul(m2, out=m1), m1)
+        self.assertEqual(m1.to_list(), [[19, 22], [43, 50]])
+        self.assertEqual(m2.matmul(Vector([1, 1])).to_list(), [11, 15])
+        self.assertIs(m2.transpose(out=m2), m2)
+        self.assertEqual(m2.to_list(), [[5, 7], [6, 8]])
+
+        rect = Matrix([[1, 2, 3], [4, 5, 6]])
+        out = Matrix([[0, 0], [0, 0], [0, 0]])
+        self.assertIs(rect.transpose(out=out), out)
+        self.assertEqual(out.to_list(), [[1, 4], [2, 5], [3, 6]])
+        with self.assertRaises(ValueError):
+            rect.transpose(out=rect)
+        with self.assertRaises(ValueError):
+            m1.matmul(m2, out=out)
+        with self.assertRaises(TypeError):
+            m1.add(m2, out=[[0, 0], [0, 0]])
+
+    def test_matrix_indexing(self):
+        m1 = Matrix([[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+        self.assertEqual(m1[1], [4, 5, 6])
+        self.assertEqual(m1[1, 2], 6)
+        self.assertEqual(m1[-1, -3], 7)
+        self.assertEqual(m1[0:2, 1:].to_list(), [[2, 3], [5, 6]])
+        self.assertEqual(m1[::2, ::-1].to_list(), [[3, 2, 1], [9, 8, 7]])
+        self.assertEqual(m1[1:].to_list(), [[4, 5, 6], [7, 8, 9]])
+        self.assertEqual(m1.row(0).to_list(), [[1, 2, 3]])
+        self.assertEqual(m1.col(-1).to_list(), [[3], [6], [9]])
+        self.assertEqual(m1.T.to_list(), m1.transpose().to_list())
+        self.assertEqual([row for row in m1], [[1, 2, 3], [4, 5, 6], [7, 8, 9]])
+        self.assertEqual((m1.T @ m1).to_list(), (m1.transpose() @ m1).to_list())
+        self.assertEqual(m1[0:2, 0:2].det(), -3)
+
+        m1[2] = 0
+        m1[0, 0] = 10
+        m1[0:2, 1:] = Matrix([[1, 1], [1, 1]])
+        self.assertEqual(m1.to_list(), [[10, 1, 1], [4, 1, 1], [0, 0, 0]])
+        m1[:, 0] = m1[0, :].T
+        self.assertEqual(m1.to_list(), [[10, 1, 1], [1, 1, 1], [1, 0, 0]])
+        m1[1:, 1:] *= 5
+        self.assertEqual(m1.to_list(), [[10, 1, 1], [1, 5, 5], [1, 0, 0]])
+        with self.assertRaises(IndexError):
+            m1[3, 0]
+        with self.assertRaises(IndexError):
+            m1[0, 0, 0]
+        with self.assertRaises(TypeError):
+            m1["a"]
+        with self.assertRaises(ValueError):
+            m1[0:2, 0:2] = Matrix([[1, 2, 3]])
+
+    def test_matrix_views(self):
+        m1 = Matrix([[1, 2, 3], [4, 5, 6]])
+        row, col, block, t = m1.row(1), m1.col(0), m1[:, 1:], m1.T
+        row *= 10
+        self.assertEqual(m1.to_list(), [[1, 2, 3], [40, 50, 60]])
+        self.assertEqual(col.to_list(), [[1], [40]])
+        self.assertEqual(t.to_list(), [[1, 40], [2, 50], [3, 60]])
+        block += Matrix([[1, 1], [1, 1]])
+        self.assertEqual(m1.to_list(), [[1, 3, 4], [40, 51, 61]])
+        t[0, 1] = 0
+        self.assertEqual(m1[1, 0], 0)
+        self.assertEqual(t.to_list(), [[1, 0], [3, 51], [4, 61]])
+        if Matrix.__module__ == "matmath._matrix":
+            self.assertEqual(memoryview(t).tolist(), [[1, 0], [3, 51], [4, 61]])
+
+        # Views of views, reversed strides and out= all share the storage
+        corner = t[::-1, :][0:2, 1]
+        self.assertEqual(corner.to_list(), [[61], [51]])
+        corner -= Matrix([[1], [1]])
+        self.assertEqual(m1.to_list(), [[1, 3, 4], [0, 50, 60]])
+        with self.assertRaises(BufferError):
+            t.__init__([[1]])
+        Matrix([[7], [8]]).transpose(out=col.T)
+        self.assertEqual(m1.to_list(), [[7, 3, 4], [8, 50, 60]])
+        m1.row(0).matmul(Matrix.identity(3), out=m1.row(1))
+        self.assertEqual(m1.to_list(), [[7, 3, 4], [7, 3, 4]])
+        self.assertEqual(pickle.loads(pickle.dumps(t)).to_list(), t.to_list())
+        self.assertEqual(t.copy().order, (3, 2))
+
+        with self.assertRaises(BufferError):
+            m1.__init__([[1]])
+        del row, col, block, t, corner
+        m1.__init__([[1]])
+        self.assertEqual(m1.to_list(), [[1]])
+
+        # Writes through a view drop the results cached on the parent
+        square = Matrix.identity(5) * 2
+        self.assertEqual(square.det(), 32)
+        square.row(0)[0, 0] = 3
+        self.assertEqual(square.det(), 48)
+
+        # Matrices are never empty, whichever way they are made
+        for key in (slice(1, 1), (slice(None), slice(5, None)), (0, slice(2, 1))):
+            with self.assertRaises(ValueError):
+                square[key]
 
     def test_matrix_trace(self):
         m1 = Matrix([[1, 2], [3, 4]])
@@ -75,6 +447,299 @@ class TestMatrix(unittest.TestCase):
         self.assertEqual(m1.order, (2, 3))
         self.assertEqual(m1.size, (2, 3))
 
+    def test_matrix_frombuffer(self):
+        buf = array.array("d", [1, 2, 3, 4, 5, 6])
+        m1 = Matrix.frombuffer(buf, (2, 3))
+        self.assertEqual(m1.to_list(), [[1, 2, 3], [4, 5, 6]])
+        m2 = Matrix.frombuffer(buf.tobytes(), (3, 2))
+        self.assertEqual(m2.to_list(), [[1, 2], [3, 4], [5, 6]])
+        with self.assertRaises(ValueError):
+            Matrix.frombuffer(buf, (4, 2))
+
+    @unittest.skipUnless(
+        Matrix.__module__ == "matmath._matrix", "needs the C extension"
+    )
+    def test_matrix_buffer_protocol(self):
+        m1 = Matrix([[1, 2, 3], [4, 5, 6]])
+        view = memoryview(m1)
+        self.assertEqual(view.format, "d")
+        self.assertEqual(view.shape, (2, 3))
+        self.assertEqual(view.tolist(), [[1, 2, 3], [4, 5, 6]])
+
+        buf = array.array("d", [1, 2, 3, 4])
+        shared = Matrix.frombuffer(buf, (2, 2))
+        buf[0] = 10
+        self.assertEqual(shared.to_list(), [[10, 2], [3, 4]])
+
+    def test_num_threads(self):
+        original = matmath.get_num_threads()
+        self.addCleanup(matmath.set_num_threads, original)
+        matmath.set_num_threads(3)
+        self.assertEqual(matmath.get_num_threads(), 3)
+        with self.assertRaises(ValueError):
+            matmath.set_num_threads(0)
+
+    @unittest.skipUnless(
+        Matrix.__module__ == "matmath._matrix", "needs the C extension"
+    )
+    def test_threaded_kernels(self):
+        n = 160
+        a = Matrix.frombuffer(
+            array.array("d", [(i % 7) - 3 for i in range(n * n)]), (n, n)
+        )
+        b = Matrix.frombuffer(
+            array.array("d", [(i % 5) + 1 for i in range(n * n)]), (n, n)
+        )
+        original = matmath.get_num_threads()
+        self.addCleanup(matmath.set_num_threads, original)
+        matmath.set_num_threads(1)
+        expected = ((a @ b).to_list(), (a + b).to_list(), a.transpose().to_list())
+        matmath.set_num_threads(4)
+        self.assertEqual(
+            ((a @ b).to_list(), (a + b).to_list(), a.transpose().to_list()), expected
+        )
+
+        results = []
+        workers = [
+            threading.Thread(target=lambda: results.append((a @ b).to_list()))
+            for _ in range(3)
+        ]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        self.assertEqual(results, [expected[0]] * 3)
+
+    @unittest.skipUnless(
+        Matrix.__module__ == "matmath._matrix", "needs the C extension"
+    )
+    def test_reinit_during_kernel(self):
+        n = 600
+        rows = [[(i * 7 + j) % 11 - 5 for j in range(n)] for i in range(n)]
+        a = Matrix(rows)
+        b = Matrix.frombuffer(
+            array.array("d", [(i % 5) + 1 for i in range(n * n)]), (n, n)
+        )
+        v = Vector([float(i % 3) for i in range(n)])
+        expected = ((a @ b).to_list(), (v @ a).to_list())
+
+        # Re-initialising an operand the kernel is reading must wait for it
+        results = []
+        worker = threading.Thread(
+            target=lambda: results.extend(
+                ((a @ b).to_list(), (v @ a).to_list()) for _ in range(4)
+            )
+        )
+        worker.start()
+        while worker.is_alive():
+            for target, values in ((a, rows), (v, v.to_list())):
+                try:
+                    target.__init__(values)
+                except BufferError:
+                    pass
+        worker.join()
+        self.assertEqual(results, [expected] * 4)
+        a.__init__([[1, 2], [3, 4]])
+        self.assertEqual(a.to_list(), [[1, 2], [3, 4]])
+
+    @unittest.skipUnless(
+        Matrix.__module__ == "matmath._matrix", "needs the C extension"
+    )
+    def test_small_kernels(self):
+        import matmath._matrix as engine
+
+        self.addCleanup(engine._set_small_kernels, True)
+        for n in (2, 3, 4):
+            big = Matrix(
+                [
+                    [(i * 7 + j * 3) % 5 + (i == j) * 4 for j in range(n + 1)]
+                    for i in range(n + 1)
+                ]
+            )
+            b = Matrix(
+                [[(i + 1) * (j - 2) for j in range(n)] for i in range(n)]
+            )  # rank 1
+            v = Vector(list(range(1, n + 1)))
+            for a in (big[:n, :n], big[1:, 1:].T, big[n:0:-1, :n]):
+                results = []
+                for enabled in (False, True):
+                    engine._set_small_kernels(enabled)
+                    out = Matrix.zero((n, n))
+                    a.matmul(b, out=out.T)
+                    results.append(
+                        [
+                            (a @ b).to_list(),
+                            (b @ a).to_list(),
+                            [(a @ v).to_list()],
+                            [(v @ a).to_list()],
+                            a.transpose().to_list(),
+                            [[a.determinant(), b.determinant()]],
+                            a.inverse().to_list(),
+                            a.adjoint().to_list(),
+                            b.adjoint().to_list(),
+                            out.to_list(),
+                        ]
+                    )
+                    self.assertTrue(a.is_invertible())
+                    self.assertFalse(b.is_invertible())
+                    with self.assertRaises(ValueError):
+                        b.inverse()
+                for generic, small in zip(*results):
+                    for generic_row, small_row in zip(generic, small):
+                        for x, y in zip(generic_row, small_row):
+                            self.assertAlmostEqual(x, y, places=9)
+
+    def test_matrix_pickle(self):
+        mat = Matrix([[1.5, 2], [3, 4], [5, 6]])
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            self.assertEqual(pickle.loads(pickle.dumps(mat, protocol)), mat)
+        buffers = []
+        data = pickle.dumps(mat, 5, buffer_callback=buffers.append)
+        self.assertEqual(pickle.loads(data, buffers=buffers), mat)
+        self.assertEqual(
+            pickle.loads(pickle.dumps(mat[1:, ::-1], 5)), Matrix([[4, 3], [6, 5]])
+        )
+
+    def test_matrix_pickle_without_extensions(self):
+        # A fresh matmath whose C extensions cannot be imported falls back to
+        # the pure Python engine, whose objects must pickle at every protocol too
+        with mock.patch.dict(sys.modules):
+            for name in list(sys.modules):
+                if name == "matmath" or name.startswith("matmath."):
+                    del sys.modules[name]
+            for name in ("matmath._matrix", "matmath._sparse", "matmath._vector"):
+                sys.modules[name] = None
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", ImportWarning)
+                engine = importlib.import_module("matmath")
+            self.assertEqual(engine.Matrix.__module__, "matmath.legacy.matrix")
+
+            mat = engine.Matrix([[1.5, 2], [3, 4], [5, 6]])
+            vec = engine.Vector([1.5, 2, 3])
+            for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+                for obj in (mat, vec):
+                    copy = pickle.loads(pickle.dumps(obj, protocol))
+                    self.assertIs(type(copy), type(obj))
+                    self.assertEqual(copy, obj)
+            buffers = []
+            data = pickle.dumps(mat, 5, buffer_callback=buffers.append)
+            self.assertEqual(len(buffers), 1)
+            self.assertEqual(pickle.loads(data, buffers=buffers), mat)
+
+    def test_matrix_save_load(self):
+        mat = Matrix([[1.5, 2, 3], [4, 5, 6]])
+        path = os.path.join(tempfile.mkdtemp(), "matrix.bin")
+        self.addCleanup(shutil.rmtree, os.path.dirname(path))
+        mat.save(path)
+        self.assertEqual(os.path.getsize(path), 32 + 6 * 8)
+        for mmap in (True, False):
+            loaded = Matrix.load(path, mmap=mmap)
+            self.assertEqual(loaded, mat)
+            loaded[0, 0] = 99
+        self.assertEqual(Matrix.load(path), mat)
+        # A strided view is written compact
+        mat.T[::2, :].save(path)
+        self.assertEqual(Matrix.load(path).to_list(), [[1.5, 4], [3, 6]])
+        mat.save(path)
+        with open(path, "r+b") as f:
+            f.truncate(40)
+        with self.assertRaises(ValueError):
+            Matrix.load(path)
+        with open(path, "wb") as f:
+            f.write(b"not a matrix file at all, nope!!")
+        with self.assertRaises(ValueError):
+            Matrix.load(path)
+
+    def test_matrix_from_rows(self):
+        rows = [(1, 2), (3, 4)]
+        self.assertEqual(Matrix(rows).to_list(), [[1, 2], [3, 4]])
+        self.assertEqual(rows, [(1, 2), (3, 4)])
+        self.assertEqual(Matrix(row for row in rows).to_list(), [[1, 2], [3, 4]])
+        generated = Matrix.from_rows(([i, i * 2] for i in range(3)), cols=2)
+        self.assertEqual(generated.to_list(), [[0, 0], [1, 2], [2, 4]])
+        mixed = Matrix.from_rows([array.array("d", [1, 2]), Vector([3, 4]), [5, 6]])
+        self.assertEqual(mixed.to_list(), [[1, 2], [3, 4], [5, 6]])
+        with self.assertRaises(ValueError):
+            Matrix.from_rows([[1, 2, 3]], cols=2)
+        with self.assertRaises(ValueError):
+            Matrix.from_rows(iter([]))
+        with self.assertRaises(ValueError):
+            Matrix.from_rows(iter([[1, 2], [3]]))
+
+    def test_matrix_csv(self):
+        mat = Matrix([[1.5, -2, 3e-300], [float("inf"), 5, 6.25]])
+        lines = list(mat.iter_csv())
+        self.assertEqual(lines, ["1.5,-2.0,3e-300\n", "inf,5.0,6.25\n"])
+        self.assertEqual(Matrix.from_csv(io.StringIO("".join(lines))), mat)
+        self.assertEqual(
+            list(mat[:, 1:].iter_csv(delimiter=";")), ["-2.0;3e-300\n", "5.0;6.25\n"]
+        )
+
+        text = b'a,b\r\n 1 , "2"\r\n\r\n3,4'
+        self.assertEqual(
+            Matrix.from_csv(io.BytesIO(text), header=True).to_list(), [[1, 2], [3, 4]]
+        )
+        self.assertEqual(
+            Matrix.from_csv(
+                io.StringIO("1;2\n3;4\n5;6\n"), delimiter=";", chunk_rows=1
+            ).to_list(),
+            [[1, 2], [3, 4], [5, 6]],
+        )
+        for bad in ("1,2\n3\n", "1,2\n3,x\n", "1,,2\n", ""):
+            with self.assertRaises(ValueError):
+                Matrix.from_csv(io.StringIO(bad))
+
+        # Blanks that are the delimiter separate fields rather than pad them
+        for delimiter in ("\t", " "):
+            text = "".join(mat.iter_csv(delimiter=delimiter))
+            self.assertEqual(
+                text,
+                lines[0].replace(",", delimiter) + lines[1].replace(",", delimiter),
+            )
+            self.assertEqual(
+                Matrix.from_csv(io.StringIO(text), delimiter=delimiter), mat
+            )
+        self.assertEqual(
+            Matrix.from_csv(
+                io.BytesIO(b"1 \t2\n\t\n3\t 4\n"), delimiter="\t"
+            ).to_list(),
+            [[1, 2], [3, 4]],
+        )
+        for bad in ("1  2\n", " 1 2\n"):
+            with self.assertRaises(ValueError):
+                Matrix.from_csv(io.StringIO(bad), delimiter=" ")
+
+        path = os.path.join(tempfile.mkdtemp(), "matrix.csv")
+        self.addCleanup(shutil.rmtree, os.path.dirname(path))
+        big = Matrix.from_rows([i + j / 7 for j in range(13)] for i in range(500))
+        with open(path, "w") as f:
+            f.writelines(big.iter_csv())
+        self.assertEqual(Matrix.from_csv(path, chunk_rows=7), big)
+
+    def test_matrix_reuse(self):
+        # Matrices up to 4 x 4 are recycled; none may see another's elements
+        for n in (1, 2, 4, 5):
+            results = []
+            for i in range(200):
+                mat = Matrix([[i] * n] * n) @ Matrix.identity(n) + Matrix.fill(
+                    1, (n, n)
+                )
+                results.append(mat.transpose())
+                del mat
+            for i, mat in enumerate(results):
+                self.assertEqual(mat.to_list(), [[i + 1] * n] * n)
+
+        mat = Matrix([[1, 2], [3, 4]])
+        view = mat[:, ::-1]
+        del mat
+        self.assertEqual(view.to_list(), [[2, 1], [4, 3]])
+        mat = Matrix([[2, 0], [0, 2]])
+        self.assertEqual(mat.pow(3), Matrix([[8, 0], [0, 8]]))
+        self.assertEqual(mat.pow(-2), Matrix([[0.25, 0], [0, 0.25]]))
+        mat.__init__([[1] * 6] * 6)
+        mat.__init__([[5]])
+        self.assertEqual(mat.to_list(), [[5]])
+
 
 if __name__ == "__main__":
     unittest.main()
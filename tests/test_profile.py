@@ -0,0 +1,166 @@
+import sys
+import threading
+import unittest
+
+import matmath
+import matmath.legacy as legacy
+import matmath.legacy.profile as legacy_profile
+from matmath import Matrix, SparseMatrix, Vector
+
+try:
+    import matmath._matrix as c_matrix
+    import matmath._sparse as c_sparse
+    import matmath._vector as c_vector
+except ImportError:
+    c_matrix = None
+
+
+def workload(M, V, S):
+    a = M([[4.0, 1, 0], [2, 3, 1], [0, 1, 5]])
+    v = V([1.0, 2, 3])
+    s = S.from_dense(a)
+    a @ a, a @ v, v @ a, a + a, a - a, a * 2, 2 * a, a / 2, a // 2
+    a.transpose(), a.copy(), a.determinant(), a.inverse(), a.adjoint(), a.lu()
+    a.solve(v), a.solve_triangular(v), a.apply([v, v]), a.pow(3), a ** -2
+    a.cholesky(), a.qr(), a.eigh(), M([[1.0, 2], [3, 4], [5, 6]]).qr(), (
+        a + a.transpose()
+    ).solve(v)
+    s @ v, v @ s, s @ a, a @ s, a.minor(0, 0)
+    # Symmetric but indefinite: Cholesky fails and the solve falls back to LU
+    M([[1.0, 2, 0], [2, 1, 0], [0, 0, 1]]).solve(v)
+    b = a.copy()
+    b += a
+    b @= a
+    b.matmul(a, out=b)
+    # (a * 2 - a) / 2, as compiled by matmath.lazy()
+    fused = sys.modules[M.__module__]._fused
+    fused([0, 0, 1, 0, 4, 0, 0, 0, 3, 0, 1, 0, 5, 0], [a], [2.0])
+    fused([0, 0, 7, 0], [a], [], b)
+    # Larger matrices reuse derived results until they are written to
+    c = M([[7.0 if i == j else 1.0 for j in range(5)] for i in range(5)])
+    d = M([[float((i * 3 + j * 7) % 11) for j in range(5)] for i in range(5)])
+    w = V([1.0, 2, 3, 4, 5])
+    c.lu(), c.determinant(), c.inverse(), c.inverse(), c.solve(
+        w
+    ), c.cholesky(), c.solve(w)
+    d.solve(w), d.solve(w), d.inverse(), d.determinant()
+    c[0, 0] = 8.0
+    c.cholesky(), c.solve(w), c.determinant(), c.inverse()
+
+
+class TestProfile(unittest.TestCase):
+    def setUp(self):
+        matmath.set_profiling(False)
+        matmath.reset_stats()
+        self.a = Matrix([[2, 1], [1, 3]])
+        self.v = Vector([1, 2])
+
+    def test_disabled(self):
+        self.a @ self.a
+        self.a.inverse()
+        self.assertEqual(matmath.stats(), {})
+
+    def test_profile(self):
+        with matmath.profile() as p:
+            self.a @ self.a
+            self.a.matmul(self.a)
+            self.a @ self.v
+            self.a.inverse()
+        self.assertEqual(set(p.stats), {"matmul", "matvec", "inverse"})
+        matmul = p.stats["matmul"]
+        self.assertEqual(matmul["calls"], 2)
+        self.assertEqual(matmul["flops"], 2 * 2 * 2 ** 3)
+        self.assertEqual(matmul["bytes"], 2 * 4 * 8)
+        self.assertGreaterEqual(matmul["total_time"], matmul["max_time"])
+        self.assertGreater(matmul["max_time"], 0)
+        self.assertEqual(p.stats["matvec"]["flops"], 2 * 4)
+        self.assertIn("inverse", str(p))
+
+        # Profiling is off again after the block
+        self.a @ self.a
+        self.assertEqual(matmath.stats()["matmul"]["calls"], 2)
+
+    def test_reset(self):
+        with matmath.profile():
+            self.a.determinant()
+        with matmath.profile(reset=False) as p:
+            self.a.determinant()
+        self.assertEqual(p.stats["determinant"]["calls"], 2)
+        with matmath.profile() as p:
+            self.a.lu()
+        self.assertEqual(set(p.stats), {"lu"})
+        matmath.reset_stats()
+        self.assertEqual(matmath.stats(), {})
+
+    def test_nested(self):
+        with matmath.profile():
+            with matmath.profile(reset=False):
+                pass
+            self.assertTrue(matmath.set_profiling(True))
+            self.a.copy()
+        self.assertFalse(matmath.set_profiling(False))
+        self.assertEqual(matmath.stats()["copy"]["calls"], 1)
+
+    def test_errors_not_counted(self):
+        with matmath.profile() as p:
+            with self.assertRaises(ValueError):
+                Matrix([[1, 2], [2, 4]]).inverse()
+        self.assertNotIn("inverse", p.stats)
+
+    def test_sparse(self):
+        s = SparseMatrix((2, 2), [0, 1], [0, 1], [1.0, 2.0])
+        with matmath.profile() as p:
+            s @ self.v
+            self.a @ s
+        self.assertEqual(p.stats["sparse_matmul"]["calls"], 2)
+        self.assertEqual(p.stats["sparse_matmul"]["flops"], 2 * 2 + 2 * 2 * 2)
+
+    @unittest.skipIf(c_matrix is None, "C extensions not built")
+    def test_engines_agree(self):
+        engines = [
+            (c_matrix, (c_matrix.Matrix, c_vector.Vector, c_sparse.SparseMatrix)),
+            (legacy_profile, (legacy.Matrix, legacy.Vector, legacy.SparseMatrix)),
+        ]
+        results = []
+        for engine, types in engines:
+            engine.reset_stats()
+            engine.set_profiling(True)
+            try:
+                workload(*types)
+            finally:
+                engine.set_profiling(False)
+            results.append(
+                {
+                    op: (s["calls"], s["bytes"], s["flops"])
+                    for op, s in engine.stats().items()
+                }
+            )
+        self.assertEqual(results[0], results[1])
+
+    def test_legacy_threads(self):
+        # Each thread counts its own outermost calls
+        a = legacy.Matrix([[2.0, 1], [1, 3]])
+        legacy_profile.reset_stats()
+        legacy_profile.set_profiling(True)
+        legacy_profile._state.depth += 1  # as if inside a call on this thread
+        try:
+            worker = threading.Thread(target=a.copy)
+            worker.start()
+            worker.join()
+            a.copy()
+        finally:
+            legacy_profile._state.depth -= 1
+            legacy_profile.set_profiling(False)
+        self.assertEqual(legacy_profile.stats()["copy"]["calls"], 1)
+
+    def test_legacy_unwrapped(self):
+        # The pure Python engine only wraps its methods while profiling
+        add = legacy.Matrix.__dict__["__add__"]
+        legacy_profile.set_profiling(True)
+        self.assertIsNot(legacy.Matrix.__dict__["__add__"], add)
+        legacy_profile.set_profiling(False)
+        self.assertIs(legacy.Matrix.__dict__["__add__"], add)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import random
+import unittest
+import warnings
+
+from matmath import Matrix, SparseMatrix, Vector
+from matmath.solvers import cg, gmres, jacobi
+
+
+def poisson(n):
+    rows, cols, values = [], [], []
+    for i in range(n):
+        rows.append(i), cols.append(i), values.append(2.5)
+        if i > 0:
+            rows.append(i), cols.append(i - 1), values.append(-1)
+        if i < n - 1:
+            rows.append(i), cols.append(i + 1), values.append(-1)
+    return SparseMatrix((n, n), rows, cols, values)
+
+
+class TestSolvers(unittest.TestCase):
+    def setUp(self):
+        rng = random.Random(3)
+        n = 20
+        self.dominant = Matrix(
+            [
+                [rng.random() + (2 * n if i == j else 0) for j in range(n)]
+                for i in range(n)
+            ]
+        )
+        self.b = Vector([rng.random() for _ in range(n)])
+
+    def assertSolves(self, A, x, b, tol=1e-8):
+        self.assertLessEqual((b - A @ x).modulus(), tol * b.modulus())
+
+    def test_cg(self):
+        A = poisson(200)
+        b = Vector([1.0] * 200)
+        self.assertSolves(A, cg(A, b), b)
+        self.assertSolves(A.to_dense(), cg(A.to_dense(), b), b)
+        spd = self.dominant + self.dominant.transpose()
+        self.assertSolves(spd, cg(spd, self.b), self.b)
+        with self.assertRaises(ValueError):
+            cg(Matrix([[1, 0], [0, -1]]), Vector([0, 1]))
+
+    def test_gmres(self):
+        self.assertSolves(self.dominant, gmres(self.dominant, self.b), self.b)
+        self.assertSolves(
+            self.dominant, gmres(self.dominant, self.b, restart=3), self.b
+        )
+        A = Matrix([[0, 1], [1, 0]])
+        self.assertSolves(A, gmres(A, Vector([2, 3])), Vector([2, 3]))
+
+    def test_jacobi(self):
+        self.assertSolves(self.dominant, jacobi(self.dominant, self.b), self.b)
+        A = poisson(50)
+        b = Vector([1.0] * 50)
+        self.assertSolves(A, jacobi(A, b, maxiter=1000), b)
+        with self.assertRaises(ValueError):
+            jacobi(Matrix([[0, 1], [1, 0]]), Vector([1, 1]))
+
+    def test_x0(self):
+        x = gmres(self.dominant, self.b)
+        history = []
+        jacobi(self.dominant, self.b, x0=x, callback=lambda k, r: history.append(k))
+        self.assertLessEqual(len(history), 1)
+        self.assertSolves(self.dominant, jacobi(self.dominant, self.b, x0=x), self.b)
+        with self.assertRaises(ValueError):
+            cg(self.dominant, self.b, x0=Vector([0, 0]))
+
+    def test_callback(self):
+        A = poisson(100)
+        b = Vector([1.0] * 100)
+        for solver in (cg, gmres, jacobi):
+            history = []
+            solver(A, b, callback=lambda k, r: history.append((k, r)))
+            self.assertEqual([k for k, _ in history], list(range(1, len(history) + 1)))
+            self.assertLess(history[-1][1], history[0][1])
+
+            stopped = []
+            solver(A, b, callback=lambda k, r: stopped.append(k) or k == 3)
+            self.assertEqual(stopped, [1, 2, 3])
+
+    def test_not_converged(self):
+        A = poisson(100)
+        b = Vector([1.0] * 100)
+        for solver in (cg, gmres, jacobi):
+            with warnings.catch_warnings(record=True) as caught:
+                warnings.simplefilter("always")
+                solver(A, b, maxiter=2)
+            self.assertEqual(len(caught), 1)
+            self.assertIs(caught[0].category, RuntimeWarning)
+
+
+if __name__ == "__main__":
+    unittest.main()
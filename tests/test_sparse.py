@@ -0,0 +1,126 @@
+import pickle
+import random
+import unittest
+
+from matmath import Matrix, SparseMatrix, Vector
+
+
+class TestSparseMatrix(unittest.TestCase):
+    def setUp(self):
+        # [[0, 4, 0, -1],
+        #  [4, 0, 0,  0],
+        #  [0, 0, 0, 2.5]]
+        self.a = SparseMatrix(
+            (3, 4), [0, 2, 0, 1, 2, 0], [1, 3, 1, 0, 3, 3], [1, 2, 3, 4, 0.5, -1]
+        )
+        self.dense = Matrix([[0, 4, 0, -1], [4, 0, 0, 0], [0, 0, 0, 2.5]])
+
+    def test_init(self):
+        # Duplicates are summed and the result is stored in row/column order
+        self.assertEqual(self.a.order, (3, 4))
+        self.assertEqual(self.a.nnz, 4)
+        self.assertEqual(
+            self.a.to_coo(), ([0, 0, 1, 2], [1, 3, 0, 3], [4.0, -1.0, 4.0, 2.5])
+        )
+        self.assertEqual(SparseMatrix((2, 2), [0, 0], [1, 1], [1, -1]).nnz, 0)
+        self.assertTrue(SparseMatrix((2, 3)).is_null())
+        with self.assertRaises(IndexError):
+            SparseMatrix((2, 2), [2], [0], [1])
+        with self.assertRaises(ValueError):
+            SparseMatrix((2, 2), [0, 1], [0], [1])
+        with self.assertRaises(ValueError):
+            SparseMatrix((0, 2))
+        with self.assertRaises(TypeError):
+            SparseMatrix((2, 2), [0], [0], ["1"])
+
+    def test_getitem(self):
+        self.assertEqual(self.a[0, 1], 4)
+        self.assertEqual(self.a[1, 2], 0)
+        self.assertEqual(self.a[-1, -1], 2.5)
+        self.assertEqual(len(self.a), 3)
+        with self.assertRaises(IndexError):
+            self.a[3, 0]
+
+    def test_dense_conversion(self):
+        self.assertEqual(self.a.to_dense(), self.dense)
+        self.assertEqual(SparseMatrix.from_dense(self.dense), self.a)
+        self.assertNotEqual(SparseMatrix.from_dense(self.dense * 2), self.a)
+
+    def test_matmul(self):
+        v = Vector([1, 2, 3, 4])
+        self.assertEqual((self.a @ v).to_list(), (self.dense @ v).to_list())
+        w = Vector([1, 2, 3])
+        self.assertEqual((w @ self.a).to_list(), (w @ self.dense).to_list())
+        m = Matrix([[1, 2], [3, 4], [5, 6], [7, 8]])
+        self.assertEqual(self.a @ m, self.dense @ m)
+        left = Matrix([[1, 2, 3], [4, 5, 6]])
+        self.assertEqual(left @ self.a, left @ self.dense)
+        with self.assertRaises(ValueError):
+            self.a @ Vector([1, 2, 3])
+        with self.assertRaises(TypeError):
+            self.a @ self.a
+
+    def test_matmul_random(self):
+        rng = random.Random(12)
+        n = 200
+        entries = [
+            (rng.randrange(n), rng.randrange(n), rng.random()) for _ in range(600)
+        ]
+        a = SparseMatrix((n, n), *zip(*entries))
+        dense = a.to_dense()
+        x = Vector([rng.random() for _ in range(n)])
+        for p, q in zip((a @ x).to_list(), (dense @ x).to_list()):
+            self.assertAlmostEqual(p, q)
+
+    def test_arithmetic(self):
+        self.assertEqual((self.a + self.a).to_dense(), self.dense * 2)
+        self.assertTrue((self.a - self.a).is_null())
+        self.assertEqual((self.a - self.a).nnz, 0)
+        self.assertEqual((2 * self.a).to_dense(), self.dense * 2)
+        self.assertEqual((self.a * 2).to_dense(), self.dense * 2)
+        self.assertEqual((self.a / 2).to_dense(), self.dense * 0.5)
+        self.assertEqual((-self.a).to_dense(), self.dense * -1)
+        self.assertEqual((self.a * 0).nnz, 0)
+        with self.assertRaises(ValueError):
+            self.a + self.a.T
+        with self.assertRaises(TypeError):
+            self.a + self.dense
+
+    def test_transpose(self):
+        self.assertEqual(self.a.transpose().to_dense(), self.dense.transpose())
+        self.assertEqual(self.a.T.order, (4, 3))
+        self.assertEqual(self.a.T.T, self.a)
+
+    def test_properties(self):
+        s = SparseMatrix((3, 3), [0, 1, 1, 2, 2], [1, 0, 2, 1, 2], [2, 2, 3, 3, 5])
+        self.assertTrue(s.is_square())
+        self.assertTrue(s.is_symmetric())
+        self.assertFalse(s.is_skew_symmetric())
+        self.assertFalse(s.is_diagonal())
+        self.assertEqual(s.trace(), 5)
+        k = SparseMatrix((2, 2), [0, 1], [1, 0], [3, -3])
+        self.assertTrue(k.is_skew_symmetric())
+        self.assertFalse(k.is_symmetric())
+        self.assertTrue(SparseMatrix.identity(4).is_identity())
+        self.assertTrue(SparseMatrix.identity(4).is_diagonal())
+        self.assertFalse((SparseMatrix.identity(4) * 2).is_identity())
+        lower = SparseMatrix((2, 2), [0, 1, 1], [0, 0, 1], [1, 2, 3])
+        self.assertTrue(lower.is_lower_triangular())
+        self.assertFalse(lower.is_upper_triangular())
+        self.assertTrue(lower.T.is_upper_triangular())
+        self.assertFalse(self.a.is_symmetric())
+        with self.assertRaises(ValueError):
+            self.a.trace()
+
+    def test_copy(self):
+        c = self.a.copy()
+        self.assertEqual(c, self.a)
+        self.assertIsNot(c, self.a)
+
+    def test_pickle(self):
+        for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+            self.assertEqual(pickle.loads(pickle.dumps(self.a, protocol)), self.a)
+
+
+if __name__ == "__main__":
+    unittest.main()
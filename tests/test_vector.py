@@ -1,4 +1,7 @@
+import array
+import pickle
 import unittest
+
 from matmath import Vector
 
 
@@ -80,6 +83,31 @@ class TestVector(unittest.TestCase):
         vec1 = Vector([2, 4, 6])
         self.assertEqual(vec1 / 2, Vector([1, 2, 3]))
 
+    def test_inplace(self):
+        vec1 = Vector([1, 2, 3])
+        same = vec1
+        vec1 += Vector([1, 1, 1])
+        vec1 -= Vector([0, 1, 2])
+        vec1 *= 3
+        vec1 /= Vector([2, 3, 2])
+        self.assertIs(vec1, same)
+        self.assertEqual(vec1, Vector([3, 2, 3]))
+        vec1 @= Vector([0, 0, 1])
+        self.assertIs(vec1, same)
+        self.assertEqual(vec1, Vector([2, -3, 0]))
+        with self.assertRaises(ZeroDivisionError):
+            vec1 /= Vector([1, 0, 1])
+        with self.assertRaises(TypeError):
+            vec1 += Vector([1, 2])
+        self.assertEqual(vec1, Vector([2, -3, 0]))
+
+        values = [1, 2]
+        vec2 = Vector(values)
+        copy = vec2.copy()
+        vec2 *= 2
+        self.assertEqual(values, [1, 2])
+        self.assertEqual(copy, Vector([1, 2]))
+
     def test_matmul(self):
         vec2 = Vector([4, 5, 6])
         vec1 = Vector([1, 2, 3])
@@ -108,7 +136,53 @@ class TestVector(unittest.TestCase):
         self.assertTrue(Vector([1, 0]).is_unit())
         self.assertFalse(Vector([1, 1]).is_unit())
 
+    def test_frombuffer(self):
+        buf = array.array("d", [1, 2, 3])
+        self.assertEqual(Vector.frombuffer(buf), Vector([1, 2, 3]))
+        self.assertEqual(Vector.frombuffer(buf.tobytes()), Vector([1, 2, 3]))
+        with self.assertRaises(TypeError):
+            Vector.frombuffer(array.array("i", [1, 2]))
+
+    @unittest.skipUnless(
+        Vector.__module__ == "matmath._vector", "needs the C extension"
+    )
+    def test_buffer_protocol(self):
+        vec = Vector([1, 2, 3])
+        self.assertEqual(memoryview(vec).tolist(), [1, 2, 3])
+        buf = array.array("d", [1, 2])
+        shared = Vector.frombuffer(buf)
+        buf[1] = 5
+        self.assertEqual(shared, Vector([1, 5]))
+
+    def test_pickle(self):
+        vec = Vector([1.5, 2, 3])
+        for protocol in range(pickle.HIGHEST_PROTOCOL + 1):
+            self.assertEqual(pickle.loads(pickle.dumps(vec, protocol)), vec)
+
+    def test_reuse(self):
+        # Short vectors are recycled; none may see another's elements
+        for n in (1, 3, 4, 5, 9):
+            results = []
+            for i in range(200):
+                vec = Vector([i] * n) * 2 + Vector([1] * n)
+                results.append(vec)
+                del vec
+            for i, vec in enumerate(results):
+                self.assertEqual(vec.to_list(), [2 * i + 1] * n)
+
+        vec = Vector([1, 2, 3, 4, 5, 6])
+        vec.__init__([7, 8])
+        self.assertEqual(vec, Vector([7, 8]))
+        vec.__init__()
+        self.assertEqual(vec, Vector([0, 0]))
+        vec.__init__([1, 2, 3, 4, 5, 6])
+        self.assertEqual(vec, Vector([1, 2, 3, 4, 5, 6]))
+
+        class Sub(Vector):
+            pass
+
+        self.assertEqual(Sub([1, 2]) + Vector([1, 1]), Vector([2, 3]))
+
 
 if __name__ == "__main__":
     unittest.main()
-
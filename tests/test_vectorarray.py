@@ -0,0 +1,98 @@
+import array
+import math
+import pickle
+import unittest
+
+from matmath import Matrix, Vector, VectorArray
+
+
+class TestVectorArray(unittest.TestCase):
+    def test_init(self):
+        arr = VectorArray([Vector([1, 2, 3]), [4, 5, 6]])
+        self.assertEqual(arr.shape, (2, 3))
+        self.assertEqual(len(arr), 2)
+        self.assertEqual(arr.to_list(), [[1, 2, 3], [4, 5, 6]])
+        self.assertEqual(VectorArray([], dim=3).shape, (0, 3))
+        with self.assertRaises(ValueError):
+            VectorArray([[1, 2], [1, 2, 3]])
+        with self.assertRaises(TypeError):
+            VectorArray([[1, "2"]])
+
+    def test_getitem(self):
+        arr = VectorArray([[1, 2], [3, 4]])
+        self.assertEqual(arr[1], Vector([3, 4]))
+        self.assertEqual([v.to_list() for v in arr], [[1, 2], [3, 4]])
+        with self.assertRaises(IndexError):
+            arr[2]
+        for key in (slice(0, 1), 1.0, "0"):
+            with self.assertRaises(TypeError):
+                arr[key]
+
+    def test_frombuffer(self):
+        buf = array.array("d", [1, 2, 3, 4, 5, 6])
+        arr = VectorArray.frombuffer(buf, dim=3)
+        self.assertEqual(arr.to_list(), [[1, 2, 3], [4, 5, 6]])
+        with self.assertRaises(ValueError):
+            VectorArray.frombuffer(buf, dim=4)
+
+    @unittest.skipUnless(
+        VectorArray.__module__ == "matmath._vector", "needs the C extension"
+    )
+    def test_views(self):
+        buf = array.array("d", [1, 2, 3, 4])
+        arr = VectorArray.frombuffer(buf, dim=2)
+        row = arr[1]
+        buf[2] = 10
+        self.assertEqual(row.to_list(), [10, 4])
+        self.assertEqual(memoryview(arr).shape, (2, 2))
+
+    def test_dot_and_cross(self):
+        arr = VectorArray([[1, 2, 3], [4, 5, 6]])
+        self.assertEqual(arr.dot(Vector([1, 0, 1])).to_list(), [4, 10])
+        self.assertEqual(arr.dot(arr).to_list(), [14, 77])
+        self.assertEqual(
+            arr.cross(Vector([0, 0, 1])).to_list(), [[2, -1, 0], [5, -4, 0]]
+        )
+        self.assertEqual(arr.cross(arr).to_list(), [[0, 0, 0], [0, 0, 0]])
+        with self.assertRaises(ValueError):
+            arr.dot(Vector([1, 2]))
+
+    def test_modulus_and_unit_vector(self):
+        arr = VectorArray([[3, 4], [0, 0]])
+        self.assertEqual(arr.modulus().to_list(), [5, 0])
+        for row, expected in zip(arr.unit_vector().to_list(), [[0.6, 0.8], [0, 0]]):
+            for value, y in zip(row, expected):
+                self.assertAlmostEqual(value, y)
+        for value, y in zip(
+            VectorArray([[3, 4]]).argument()[0].to_list(),
+            Vector([3, 4]).argument().to_list(),
+        ):
+            self.assertAlmostEqual(value, y)
+
+    def test_rotate(self):
+        arr = VectorArray([[1, 0], [0, 2]])
+        rotated = arr.rotate_2d(90, radians=False)
+        for row, expected in zip(rotated.to_list(), [[0, 1], [-2, 0]]):
+            for value, y in zip(row, expected):
+                self.assertAlmostEqual(value, y)
+        arr3 = VectorArray([[1, 0, 0], [0, 1, 1]])
+        rotated = arr3.rotate_3d(math.pi / 2, Vector([0, 0, 1]))
+        for row, expected in zip(rotated.to_list(), [[0, 1, 0], [-1, 0, 1]]):
+            for value, y in zip(row, expected):
+                self.assertAlmostEqual(value, y)
+
+    def test_matrix_apply(self):
+        arr = VectorArray([[1, 2], [3, 4]])
+        result = Matrix([[0, 1], [1, 0], [1, 1]]).apply(arr)
+        self.assertEqual(result.to_list(), [[2, 1, 3], [4, 3, 7]])
+
+    def test_pickle(self):
+        arr = VectorArray([[1, 2], [3, 4.5]])
+        for protocol in range(2, pickle.HIGHEST_PROTOCOL + 1):
+            self.assertEqual(
+                pickle.loads(pickle.dumps(arr, protocol)).to_list(), arr.to_list()
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()